@@ -4,6 +4,7 @@ import requests
 import logging
 
 from mercadolibre.functions.Auth.mongo_config import get_meli_config, update_meli_tokens
+from mercadolibre.services.meli_service import MeliService
 
 logger = logging.getLogger(__name__)
 
@@ -49,7 +50,7 @@ def refresh_meli_tokens():
 
         # Make the POST request to MercadoLibre OAuth endpoint
         response = requests.post(
-            "https://api.mercadolibre.com/oauth/token",
+            MeliService.TOKEN_URL,
             data=data,
             headers=headers,
             timeout=30,
@@ -5,7 +5,7 @@ Provides reusable methods for fetching, mapping, and creating customers.
 
 import logging
 from dataclasses import asdict, dataclass
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from mercadolibre.services.internal_api_service import (
     get_internal_api_service,
 )
@@ -51,6 +51,10 @@ class BaseCustomerService:
         """Fetch customer data from MercadoLibre using FetchUser helper."""
         return self.meli_service.get_user(customer_id)
 
+    async def aget_customer_from_meli(self, customer_id: str) -> Optional[Dict[str, Any]]:
+        """get_customer_from_meli() async."""
+        return await self.meli_service.aget_user(customer_id)
+
     def map_customer_to_wms(self, meli_customer: Dict[str, Any]) -> Dict[str, Any]:
         """Map MercadoLibre customer to WMS format using CustomerMapper."""
         try:
@@ -74,36 +78,27 @@ class BaseCustomerService:
                 original_request=original_request,
                 json=[wms_customer],  # WMS expects an array
             )
+            return self._creation_result(response)
 
-            if response.status_code not in (200, 201):
-                raise WMSRequestError(
-                    status_code=response.status_code,
-                    message=response.text[:200],
-                )
-
-            wms_response = response.json()
-            created = wms_response.get("created", [])
-            errors = wms_response.get("errors", [])
-
-            if created:
-                return ServiceResult(
-                    success=True,
-                    action="created",
-                    wms_response=wms_response,
-                )
-            elif errors:
-                return ServiceResult(
-                    success=False,
-                    action="error",
-                    wms_response=wms_response,
-                    message=f"WMS errors: {', '.join(errors)}",
-                )
+        except WMSRequestError as e:
+            logger.error(str(e))
+            return ServiceResult(success=False, action="error", message=e.message)
 
-            return ServiceResult(
-                success=True,
-                action="processed",
-                wms_response=wms_response,
+        except Exception as e:
+            logger.exception("Unexpected error creating customer in WMS")
+            return ServiceResult(success=False, action="error", message=str(e))
+
+    async def acreate_customer_in_wms(
+        self, wms_customer: Dict[str, Any], original_request: Any = None
+    ) -> ServiceResult:
+        """create_customer_in_wms() async."""
+        try:
+            response = await self.internal_api_service.apost(
+                self.CUSTOMER_ENDPOINT,
+                original_request=original_request,
+                json=[wms_customer],  # WMS expects an array
             )
+            return self._creation_result(response)
 
         except WMSRequestError as e:
             logger.error(str(e))
@@ -112,3 +107,106 @@ class BaseCustomerService:
         except Exception as e:
             logger.exception("Unexpected error creating customer in WMS")
             return ServiceResult(success=False, action="error", message=str(e))
+
+    def upsert_customers_in_wms(
+        self, wms_customers: List[Dict[str, Any]], original_request: Any = None
+    ) -> Dict[str, Any]:
+        """
+        Create or update a list of customers in WMS with one POST in upsert
+        mode, the WMS merges them by item.
+
+        Returns:
+            inserted, updated and unchanged counts and the errors of the WMS
+
+        Raises:
+            WMSRequestError: the WMS did not process the list
+        """
+        response = self.internal_api_service.post(
+            self.CUSTOMER_ENDPOINT,
+            original_request=original_request,
+            params={"mode": "upsert"},
+            json=wms_customers,
+        )
+        return upsert_result(response)
+
+    async def aupsert_customers_in_wms(
+        self, wms_customers: List[Dict[str, Any]], original_request: Any = None
+    ) -> Dict[str, Any]:
+        """upsert_customers_in_wms() async."""
+        response = await self.internal_api_service.apost(
+            self.CUSTOMER_ENDPOINT,
+            original_request=original_request,
+            params={"mode": "upsert"},
+            json=wms_customers,
+        )
+        return upsert_result(response)
+
+    def _creation_result(self, response: Any) -> ServiceResult:
+        """Result of the WMS response to a customer creation."""
+        if response.status_code not in (200, 201):
+            raise WMSRequestError(
+                status_code=response.status_code,
+                message=response.text[:200],
+            )
+
+        wms_response = response.json()
+        created = wms_response.get("created", [])
+        errors = wms_response.get("errors", [])
+
+        if created:
+            return ServiceResult(
+                success=True,
+                action="created",
+                wms_response=wms_response,
+            )
+        elif errors:
+            return ServiceResult(
+                success=False,
+                action="error",
+                wms_response=wms_response,
+                message=f"WMS errors: {', '.join(errors)}",
+            )
+
+        return ServiceResult(
+            success=True,
+            action="processed",
+            wms_response=wms_response,
+        )
+
+
+def upsert_result(response: Any) -> Dict[str, Any]:
+    """
+    Body of the WMS response to an upsert POST. 400 is the answer of a list
+    whose records were all rejected, their errors are in the body.
+    """
+    if response.status_code not in (200, 207, 400):
+        raise WMSRequestError(
+            status_code=response.status_code,
+            message=response.text[:200],
+        )
+
+    wms_response = response.json()
+    if "errors" not in wms_response:
+        raise WMSRequestError(
+            status_code=response.status_code,
+            message=response.text[:200],
+        )
+    return wms_response
+
+
+def upsert_errors(wms_response: Dict[str, Any]) -> Dict[str, str]:
+    """Errors of an upsert response by item, the WMS writes them as "error: <item> <message>"."""
+    errors = {}
+    for error in wms_response.get("errors", []):
+        item, _, message = str(error).removeprefix("error: ").partition(" ")
+        errors[item] = message or str(error)
+    return errors
+
+
+def unique_ids(ids: List[Any]) -> List[str]:
+    """IDs as strings without empty values and repetitions, in their order."""
+    return list(dict.fromkeys(str(i) for i in ids if i))
+
+
+def chunked(records: List[Any], size: int) -> List[List[Any]]:
+    return [records[i : i + size] for i in range(0, len(records), size)]
@@ -1,134 +1,249 @@
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor
 
+from mercadolibre.services.async_http import gather_limited
 from mercadolibre.utils.exceptions import UserMappingError, WMSRequestError
-from mercadolibre.utils.mapper.data_mapper import CustomerMapper
-from .base_customer_service import BaseCustomerService, ServiceResult
+from .base_customer_service import (
+    BaseCustomerService,
+    ServiceResult,
+    chunked,
+    unique_ids,
+    upsert_errors,
+)
 
 logger = logging.getLogger(__name__)
 
+# Customers fetched at once, in threads or awaited
+MAX_CONCURRENT = 5
+
+# Customers sent to WMS per upsert POST
+UPSERT_CHUNK_SIZE = 500
+
 
 class MeliCustomerSyncService:
-    """Service to synchronize MercadoLibre customers with WMS (create only)."""
+    """
+    Service to synchronize MercadoLibre customers with WMS (create or
+    update). The customers are fetched concurrently and sent to WMS as
+    upsert lists, UPSERT_CHUNK_SIZE customers per POST.
+    """
 
     def __init__(self):
         self.base_service = BaseCustomerService()
 
-    def _sync_single_customer(
-        self, customer_id: str, original_request: Any = None
-    ) -> ServiceResult:
-        """Sync a single customer (create only)."""
+    def _fetch_customer(self, customer_id: str) -> Union[Dict[str, Any], ServiceResult]:
+        """Customer mapped to WMS, or the ServiceResult of the failure."""
         try:
             customer_data = self.base_service.get_customer_from_meli(customer_id)
-            if not customer_data:
-                return ServiceResult(
-                    success=False,
-                    action="error",
-                    message="Customer not found in MercadoLibre",
-                    error="not_found",
-                )
-
-            wms_customer: CustomerMapper = self.base_service.map_customer_to_wms(
-                customer_data
-            )
-            result = self.base_service.create_customer_in_wms(
-                wms_customer, original_request
-            )
+            return self._map_customer(customer_data)
+        except Exception as e:
+            return self._error_result(customer_id, e)
 
-            # Keep raw WMS response
-            result.wms_response = {
-                "customer_id": customer_id,
-                "wms_data": wms_customer,
-                "raw": result.wms_response,
-            }
+    async def _afetch_customer(
+        self, customer_id: str
+    ) -> Union[Dict[str, Any], ServiceResult]:
+        """_fetch_customer() awaited in the event loop."""
+        try:
+            customer_data = await self.base_service.aget_customer_from_meli(customer_id)
+            return self._map_customer(customer_data)
+        except Exception as e:
+            return self._error_result(customer_id, e)
 
-            return result
+    def _map_customer(
+        self, customer_data: Optional[Dict[str, Any]]
+    ) -> Union[Dict[str, Any], ServiceResult]:
+        if not customer_data:
+            return ServiceResult(
+                success=False,
+                action="error",
+                message="Customer not found in MercadoLibre",
+                error="not_found",
+            )
+        return self.base_service.map_customer_to_wms(customer_data)
 
-        except (UserMappingError, WMSRequestError) as e:
+    def _error_result(self, customer_id: str, e: Exception) -> ServiceResult:
+        if isinstance(e, (UserMappingError, WMSRequestError)):
             return ServiceResult(
                 success=False,
                 action="error",
                 message=str(e),
                 error=getattr(e, "status_code", "mapping_or_wms_error"),
             )
-        except Exception as e:
-            logger.exception(f"Unexpected error syncing customer {customer_id}")
-            return ServiceResult(
-                success=False, action="error", message=str(e), error="unexpected_error"
-            )
+
+        logger.exception(f"Unexpected error syncing customer {customer_id}")
+        return ServiceResult(
+            success=False, action="error", message=str(e), error="unexpected_error"
+        )
 
     def sync_specific_customers(
         self, customer_ids: List[str], original_request: Any = None
     ) -> Dict[str, Any]:
-        """Sync multiple customers in parallel (create only)."""
+        """
+        Sync multiple customers (create or update): the repeated IDs are
+        dropped, the customers are fetched from MercadoLibre in parallel and
+        sent to WMS in upsert POSTs.
+        """
+        customer_ids = unique_ids(customer_ids or [])
+        if not customer_ids:
+            return self._empty_summary()
+
+        results_summary = self._new_summary()
+
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT) as executor:
+            fetched = list(executor.map(self._fetch_customer, customer_ids))
+
+        pending = self._add_fetched(results_summary, customer_ids, fetched)
+        for chunk in chunked(pending, UPSERT_CHUNK_SIZE):
+            try:
+                wms_response = self.base_service.upsert_customers_in_wms(
+                    [wms_customer for _, wms_customer in chunk], original_request
+                )
+            except Exception as e:
+                self._add_chunk_exception(results_summary, chunk, e)
+                continue
+            self._add_upserted(results_summary, chunk, wms_response)
+
+        return self._finish_summary(results_summary)
+
+    async def async_specific_customers(
+        self, customer_ids: List[str], original_request: Any = None
+    ) -> Dict[str, Any]:
+        """
+        sync_specific_customers() for the async views: the customers are
+        awaited concurrently in the event loop, no threads.
+        """
+        customer_ids = unique_ids(customer_ids or [])
+        if not customer_ids:
+            return self._empty_summary()
+
+        results_summary = self._new_summary()
+
+        fetched = await gather_limited(
+            (self._afetch_customer(cid) for cid in customer_ids), MAX_CONCURRENT
+        )
+
+        pending = self._add_fetched(results_summary, customer_ids, fetched)
+        for chunk in chunked(pending, UPSERT_CHUNK_SIZE):
+            try:
+                wms_response = await self.base_service.aupsert_customers_in_wms(
+                    [wms_customer for _, wms_customer in chunk], original_request
+                )
+            except Exception as e:
+                self._add_chunk_exception(results_summary, chunk, e)
+                continue
+            self._add_upserted(results_summary, chunk, wms_response)
+
+        return self._finish_summary(results_summary)
+
+    def _new_summary(self) -> Dict[str, Any]:
         results_summary = {
             "success": True,
             "message": "",
             "total_processed": 0,
+            "total_synced": 0,
             "total_created": 0,
+            "total_updated": 0,
+            "total_unchanged": 0,
             "total_failed": 0,
-            "customers_created": [],
+            "customers_synced": [],
             "customers_failed": [],
             "processed_at": datetime.now().isoformat(),
         }
+        # Previous name of customers_synced, the same list for the clients still reading it
+        results_summary["customers_created"] = results_summary["customers_synced"]
+        return results_summary
 
-        if not customer_ids:
-            results_summary.update(
-                {
-                    "success": False,
-                    "total_failed": 1,
-                    "customers_failed": [
-                        {"customer_id": None, "message": "No customer IDs provided"}
-                    ],
-                }
+    def _empty_summary(self) -> Dict[str, Any]:
+        results_summary = self._new_summary()
+        results_summary.update(
+            {
+                "success": False,
+                "total_failed": 1,
+                "customers_failed": [
+                    {"customer_id": None, "message": "No customer IDs provided"}
+                ],
+            }
+        )
+        return results_summary
+
+    def _add_fetched(
+        self,
+        results_summary: Dict[str, Any],
+        customer_ids: List[str],
+        fetched: List[Union[Dict[str, Any], ServiceResult]],
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Record the customers that could not be fetched, return the others."""
+        pending = []
+        for cid, result in zip(customer_ids, fetched):
+            if isinstance(result, ServiceResult):
+                self._add_failure(results_summary, cid, result.message, result.error)
+            else:
+                pending.append((cid, result))
+        return pending
+
+    def _add_upserted(
+        self,
+        results_summary: Dict[str, Any],
+        chunk: List[Tuple[str, Dict[str, Any]]],
+        wms_response: Dict[str, Any],
+    ) -> None:
+        results_summary["total_created"] += wms_response.get("inserted", 0)
+        results_summary["total_updated"] += wms_response.get("updated", 0)
+        results_summary["total_unchanged"] += wms_response.get("unchanged", 0)
+
+        errors = upsert_errors(wms_response)
+        for cid, wms_customer in chunk:
+            error = errors.get(str(wms_customer.get("item")))
+            if error is not None:
+                self._add_failure(results_summary, cid, f"WMS error: {error}", "wms_error")
+                continue
+
+            results_summary["total_processed"] += 1
+            results_summary["total_synced"] += 1
+            results_summary["customers_synced"].append(
+                {"customer_id": cid, "wms_data": wms_customer}
             )
-            return results_summary
 
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = {
-                cid: executor.submit(self._sync_single_customer, cid, original_request)
-                for cid in customer_ids
+    def _add_failure(
+        self,
+        results_summary: Dict[str, Any],
+        cid: str,
+        message: Optional[str],
+        error: Any = None,
+    ) -> None:
+        results_summary["total_processed"] += 1
+        results_summary["total_failed"] += 1
+        results_summary["customers_failed"].append(
+            {
+                "customer_id": cid,
+                "message": message,
+                "error": error or "unknown",
             }
+        )
 
-            for cid, future in futures.items():
-                try:
-                    result: ServiceResult = future.result()
-                    results_summary["total_processed"] += 1
-
-                    if result.success and result.action == "created":
-                        results_summary["total_created"] += 1
-                        results_summary["customers_created"].append(result.wms_response)
-                    else:
-                        results_summary["total_failed"] += 1
-                        results_summary["customers_failed"].append(
-                            {
-                                "customer_id": cid,
-                                "message": result.message,
-                                "error": result.error or "unknown",
-                            }
-                        )
-
-                except Exception as e:
-                    logger.exception(f"Exception processing customer {cid}")
-                    results_summary["total_processed"] += 1
-                    results_summary["total_failed"] += 1
-                    results_summary["customers_failed"].append(
-                        {
-                            "customer_id": cid,
-                            "message": str(e),
-                            "error": "exception",
-                        }
-                    )
+    def _add_chunk_exception(
+        self,
+        results_summary: Dict[str, Any],
+        chunk: List[Tuple[str, Dict[str, Any]]],
+        e: BaseException,
+    ) -> None:
+        logger.error(f"Exception upserting {len(chunk)} customers in WMS", exc_info=e)
+        for cid, _ in chunk:
+            self._add_failure(
+                results_summary, cid, str(e), getattr(e, "status_code", "exception")
+            )
 
+    def _finish_summary(self, results_summary: Dict[str, Any]) -> Dict[str, Any]:
         if results_summary["total_failed"] == 0:
             results_summary["message"] = (
-                f"All {results_summary['total_processed']} customers created successfully"
+                f"All {results_summary['total_processed']} customers synced successfully"
             )
-        elif results_summary["total_created"] > 0:
+        elif results_summary["total_synced"] > 0:
             results_summary["message"] = (
-                f"{results_summary['total_created']} customers created, "
+                f"{results_summary['total_synced']} customers synced "
+                f"({results_summary['total_created']} created, "
+                f"{results_summary['total_updated']} updated), "
                 f"{results_summary['total_failed']} failed"
             )
         else:
@@ -34,33 +34,39 @@ class InventoryCreateService:
             product_data = self.meli_service.get_product(product_id)
             
             if not product_data:
-                return {
-                    'success': False,
-                    'message': f'Product {product_id} not found in MercadoLibre'
-                }
-            
-            # Map product data to WMS inventory format
-            inventory = InventoryMapper.from_meli_item(product_data)
-            inventory_data = inventory.to_wms_format()
+                return self._not_found(product_id)
             
             # Create inventory in WMS
             response = self.internal_service.post(
                 'wms/adapter/v2/inventory',
-                json=inventory_data,
+                json=self._inventory_data(product_data),
                 original_request=request
             )
             
-            if response.status_code != 201:
-                return {
-                    'success': False,
-                    'message': f'Error creating inventory in WMS: {response.text}'
-                }
+            return self._result(product_id, response)
             
+        except Exception as e:
+            logger.exception(f"Error creating inventory for product {product_id}")
             return {
-                'success': True,
-                'message': f'Inventory created successfully for product {product_id}',
-                'data': response.json()
+                'success': False,
+                'message': f'Unexpected error: {str(e)}'
             }
+    
+    async def acreate_inventory(self, product_id: str, request: HttpRequest) -> Dict[str, Any]:
+        """create_inventory() awaited in the event loop."""
+        try:
+            product_data = await self.meli_service.aget_product(product_id)
+            
+            if not product_data:
+                return self._not_found(product_id)
+            
+            response = await self.internal_service.apost(
+                'wms/adapter/v2/inventory',
+                json=self._inventory_data(product_data),
+                original_request=request
+            )
+            
+            return self._result(product_id, response)
             
         except Exception as e:
             logger.exception(f"Error creating inventory for product {product_id}")
@@ -68,6 +74,30 @@ class InventoryCreateService:
                 'success': False,
                 'message': f'Unexpected error: {str(e)}'
             }
+    
+    def _not_found(self, product_id: str) -> Dict[str, Any]:
+        return {
+            'success': False,
+            'message': f'Product {product_id} not found in MercadoLibre'
+        }
+    
+    def _inventory_data(self, product_data: Dict[str, Any]) -> Dict[str, Any]:
+        # Map product data to WMS inventory format
+        inventory = InventoryMapper.from_meli_item(product_data)
+        return inventory.to_wms_format()
+    
+    def _result(self, product_id: str, response: Any) -> Dict[str, Any]:
+        if response.status_code != 201:
+            return {
+                'success': False,
+                'message': f'Error creating inventory in WMS: {response.text}'
+            }
+        
+        return {
+            'success': True,
+            'message': f'Inventory created successfully for product {product_id}',
+            'data': response.json()
+        }
 
 
 # Singleton instance
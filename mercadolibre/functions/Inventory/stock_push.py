@@ -0,0 +1,187 @@
+"""Service for pushing WMS stock to MercadoLibre."""
+
+import re
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional
+
+from project.config_db.repository import PublishedStockRepository
+from mercadolibre.services.meli_service import get_meli_service
+from wmsAdapterV2.models import TdaWmsInv
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+# MercadoLibre item IDs: site prefix + number, e.g. MLM123456
+ITEM_ID_PATTERN = re.compile(r"^[A-Z]{3}\d+$")
+
+STOCK_FIELDS = ("saldowms", "saldopt")
+
+
+def get_meli_item_id(productoean: Optional[str], referencia: Optional[str]) -> Optional[str]:
+    """
+    MercadoLibre item of an inventory row.
+
+    Inventory created from MeLi keeps the item ID in referencia
+    (InventoryMapper) and products created from MeLi use it as productoean
+    (ProductMapper).
+    """
+    for value in (referencia, productoean):
+        value = str(value or "").strip().upper()
+        if ITEM_ID_PATTERN.match(value):
+            return value
+    return None
+
+
+class InventoryStockPushService:
+    """Service for pushing WMS stock to MercadoLibre available quantities."""
+
+    def __init__(self, max_workers: int = 5, chunk_size: int = 2000, tenant: Optional[str] = None):
+        self.meli_service = get_meli_service(tenant)
+        self.published_repo = PublishedStockRepository()
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+
+    def push_stock(
+        self,
+        db_name: str,
+        field: str = "saldowms",
+        warehouses: Optional[List[str]] = None,
+        dry_run: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Send to MercadoLibre the items whose WMS stock changed since the last push.
+
+        Args:
+            db_name: Tenant database
+            field: Inventory balance published, saldowms or saldopt
+            warehouses: Only add up the stock of these bod
+            dry_run: Compute the changes without sending them
+
+        Returns:
+            Dict with operation results
+        """
+        if field not in STOCK_FIELDS:
+            return {
+                'success': False,
+                'message': f'field must be one of {", ".join(STOCK_FIELDS)}'
+            }
+
+        try:
+            stock, unmapped = self._read_stock(db_name, field, warehouses)
+            published = self.published_repo.get_quantities(db_name)
+
+            # Items never pushed are compared with their current MeLi quantity
+            unknown = [item_id for item_id in stock if item_id not in published]
+            current = self.meli_service.get_items_quantities(unknown) if unknown else {}
+            not_found = {item_id for item_id in unknown if item_id not in current}
+
+            changes = {}
+            seeded = {}
+            for item_id, quantity in stock.items():
+                if item_id in not_found:
+                    continue
+                if published.get(item_id, current.get(item_id)) != quantity:
+                    changes[item_id] = quantity
+                elif item_id in current:
+                    seeded[item_id] = quantity
+
+            data = {
+                'items': len(stock),
+                'changed': len(changes),
+                'unchanged': len(stock) - len(changes) - len(not_found),
+                'unmapped_rows': unmapped,
+                'not_found': sorted(not_found),
+                'updated': 0,
+                'failed': [],
+            }
+
+            if dry_run:
+                data['changes'] = changes
+                return {
+                    'success': True,
+                    'message': f'{len(changes)} items would be updated',
+                    'data': data
+                }
+
+            updated, failed = self._send_changes(changes)
+            self.published_repo.save_quantities(
+                db_name, {**seeded, **{item_id: changes[item_id] for item_id in updated}}
+            )
+
+            data['updated'] = len(updated)
+            data['failed'] = failed
+
+            return {
+                'success': not failed,
+                'message': f'{len(updated)} items updated, {len(failed)} failed',
+                'data': data
+            }
+
+        except Exception as e:
+            logger.exception(f"Error pushing stock to MercadoLibre for {db_name}")
+            return {
+                'success': False,
+                'message': f'Unexpected error: {str(e)}'
+            }
+
+    def _read_stock(self, db_name: str, field: str, warehouses: Optional[List[str]]):
+        """Add up the WMS stock by MeLi item, reading the inventory by chunks."""
+        queryset = TdaWmsInv.objects.using(db_name)
+        if warehouses:
+            queryset = queryset.filter(bod__in=warehouses)
+
+        stock = defaultdict(int)
+        unmapped = 0
+        rows = queryset.values_list("productoean", "referencia", field).iterator(
+            chunk_size=self.chunk_size
+        )
+        for productoean, referencia, quantity in rows:
+            item_id = get_meli_item_id(productoean, referencia)
+            if item_id is None:
+                unmapped += 1
+                continue
+            stock[item_id] += quantity or 0
+
+        # MeLi takes whole, non negative quantities
+        return {item_id: max(int(quantity), 0) for item_id, quantity in stock.items()}, unmapped
+
+    def _send_changes(self, changes: Dict[str, int]):
+        """Update the changed items concurrently, paced by the MeLi rate limiter."""
+        updated = []
+        failed = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            future_to_item = {
+                executor.submit(self.meli_service.update_item_stock, item_id, quantity): item_id
+                for item_id, quantity in changes.items()
+            }
+
+            for future in as_completed(future_to_item):
+                item_id = future_to_item[future]
+                try:
+                    future.result()
+                    updated.append(item_id)
+                except Exception as e:
+                    logger.error(f"Error updating stock of item {item_id}: {e}")
+                    failed.append({'item_id': item_id, 'error': str(e)})
+
+        return updated, failed
+
+
+# One service per tenant, each pushes to the MeLi seller of its tenant
+_stock_push_services: Dict[Optional[str], InventoryStockPushService] = {}
+_stock_push_services_lock = threading.Lock()
+
+
+def get_stock_push_service(tenant: Optional[str] = None) -> InventoryStockPushService:
+    """Get or create the inventory stock push service of a tenant."""
+    service = _stock_push_services.get(tenant)
+    if service is None:
+        with _stock_push_services_lock:
+            service = _stock_push_services.get(tenant)
+            if service is None:
+                service = _stock_push_services[tenant] = InventoryStockPushService(tenant=tenant)
+    return service
@@ -34,33 +34,39 @@ class InventoryUpdateService:
             product_data = self.meli_service.get_product(product_id)
             
             if not product_data:
-                return {
-                    'success': False,
-                    'message': f'Product {product_id} not found in MercadoLibre'
-                }
-            
-            # Map product data to WMS inventory format
-            inventory = InventoryMapper.from_meli_item(product_data)
-            inventory_data = inventory.to_wms_format()
+                return self._not_found(product_id)
             
             # Update inventory in WMS using product_id as referencia
             response = self.internal_service.put(
                 f'wms/adapter/v2/inventory?referencia={product_id}',
-                json=inventory_data,
+                json=self._inventory_data(product_data),
                 original_request=request
             )
             
-            if response.status_code not in [200, 201]:
-                return {
-                    'success': False,
-                    'message': f'Error updating inventory in WMS: {response.text}'
-                }
+            return self._result(product_id, response)
             
+        except Exception as e:
+            logger.exception(f"Error updating inventory for product {product_id}")
             return {
-                'success': True,
-                'message': f'Inventory updated successfully for product {product_id}',
-                'data': response.json()
+                'success': False,
+                'message': f'Unexpected error: {str(e)}'
             }
+    
+    async def aupdate_inventory(self, product_id: str, request: HttpRequest) -> Dict[str, Any]:
+        """update_inventory() awaited in the event loop."""
+        try:
+            product_data = await self.meli_service.aget_product(product_id)
+            
+            if not product_data:
+                return self._not_found(product_id)
+            
+            response = await self.internal_service.aput(
+                f'wms/adapter/v2/inventory?referencia={product_id}',
+                json=self._inventory_data(product_data),
+                original_request=request
+            )
+            
+            return self._result(product_id, response)
             
         except Exception as e:
             logger.exception(f"Error updating inventory for product {product_id}")
@@ -68,6 +74,30 @@ class InventoryUpdateService:
                 'success': False,
                 'message': f'Unexpected error: {str(e)}'
             }
+    
+    def _not_found(self, product_id: str) -> Dict[str, Any]:
+        return {
+            'success': False,
+            'message': f'Product {product_id} not found in MercadoLibre'
+        }
+    
+    def _inventory_data(self, product_data: Dict[str, Any]) -> Dict[str, Any]:
+        # Map product data to WMS inventory format
+        inventory = InventoryMapper.from_meli_item(product_data)
+        return inventory.to_wms_format()
+    
+    def _result(self, product_id: str, response: Any) -> Dict[str, Any]:
+        if response.status_code not in [200, 201]:
+            return {
+                'success': False,
+                'message': f'Error updating inventory in WMS: {response.text}'
+            }
+        
+        return {
+            'success': True,
+            'message': f'Inventory updated successfully for product {product_id}',
+            'data': response.json()
+        }
 
 
 # Singleton instance
@@ -5,21 +5,33 @@ Handles order sync operations from MercadoLibre to WMS.
 import logging
 from datetime import datetime
 from typing import Dict, Any, List, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 
-from mercadolibre.services.meli_service import MeliService
+from asgiref.sync import sync_to_async
+
+from mercadolibre.services.async_http import gather_limited
+from mercadolibre.services.meli_service import get_meli_service
 from mercadolibre.services.internal_api_service import InternalAPIService
 from mercadolibre.utils.mapper.data_mapper import OrderMapper
 
 logger = logging.getLogger(__name__)
 
+# Orders synced at once, in threads or awaited
+MAX_CONCURRENT = 5
+
 
 class MeliOrderSyncService:
     """Service for synchronizing orders from MercadoLibre to WMS."""
     
-    def __init__(self):
-        """Initialize the order sync service."""
-        self.meli = MeliService()
+    def __init__(self, tenant: Optional[str] = None):
+        """
+        Initialize the order sync service.
+
+        Args:
+            tenant: Tenant whose MeLi configuration is used, None for the default one
+        """
+        self.meli = get_meli_service(tenant)
+        self.config_repo = self.meli.repo
         self.wms = InternalAPIService()
         self.ORDER_ENDPOINT = "/wms/adapter/v2/sale_order"
         
@@ -46,37 +58,16 @@ class MeliOrderSyncService:
             logger.info(f"Starting order synchronization (status={status}, limit={limit})...")
             
             # Get MeLi configuration to get seller ID
-            from project.config_db.repository import MeliConfigRepository
-            config = MeliConfigRepository().get_config()
+            user_id = self.config_repo.get_user_account_id()
             
-            if not config or not config.user_id:
-                return {
-                    'success': False,
-                    'message': 'MercadoLibre user ID not configured',
-                    'total_processed': 0,
-                    'total_created': 0,
-                    'total_updated': 0,
-                    'total_errors': 1,
-                    'orders': [],
-                    'errors': ['User ID not found in configuration'],
-                    'processed_at': datetime.now().isoformat()
-                }
+            if not user_id:
+                return self._no_user_summary()
             
             # Get orders from MercadoLibre
-            orders = self.meli.get_user_orders(config.user_id, status, limit)
+            orders = self.meli.get_user_orders(user_id, status, limit)
             
             if not orders:
-                return {
-                    'success': True,
-                    'message': 'No orders found to sync',
-                    'total_processed': 0,
-                    'total_created': 0,
-                    'total_updated': 0,
-                    'total_errors': 0,
-                    'orders': [],
-                    'errors': [],
-                    'processed_at': datetime.now().isoformat()
-                }
+                return self._no_orders_summary()
             
             # Extract order IDs
             order_ids = [str(order.get('id')) for order in orders]
@@ -86,17 +77,36 @@ class MeliOrderSyncService:
             
         except Exception as e:
             logger.exception("Error in full order sync")
-            return {
-                'success': False,
-                'message': f'Full sync error: {str(e)}',
-                'total_processed': 0,
-                'total_created': 0,
-                'total_updated': 0,
-                'total_errors': 1,
-                'orders': [],
-                'errors': [str(e)],
-                'processed_at': datetime.now().isoformat()
-            }
+            return self._error_summary(f'Full sync error: {str(e)}', [str(e)], 1)
+    
+    async def async_all_orders(
+        self,
+        original_request: Any = None,
+        status: Optional[str] = None,
+        limit: int = 50
+    ) -> Dict[str, Any]:
+        """sync_all_orders() awaited in the event loop, no threads."""
+        try:
+            logger.info(f"Starting order synchronization (status={status}, limit={limit})...")
+            
+            # The configuration is read from Mongo, outside the event loop
+            user_id = await sync_to_async(self.config_repo.get_user_account_id, thread_sensitive=False)()
+            
+            if not user_id:
+                return self._no_user_summary()
+            
+            orders = await self.meli.aget_user_orders(user_id, status, limit)
+            
+            if not orders:
+                return self._no_orders_summary()
+            
+            order_ids = [str(order.get('id')) for order in orders]
+            
+            return await self.async_specific_orders(order_ids, original_request)
+            
+        except Exception as e:
+            logger.exception("Error in full order sync")
+            return self._error_summary(f'Full sync error: {str(e)}', [str(e)], 1)
     
     def sync_specific_orders(
         self,
@@ -117,34 +127,14 @@ class MeliOrderSyncService:
         """
         try:
             if not order_ids:
-                return {
-                    'success': False,
-                    'message': 'No order IDs provided',
-                    'total_processed': 0,
-                    'total_created': 0,
-                    'total_updated': 0,
-                    'total_errors': 1,
-                    'orders': [],
-                    'errors': ['Order IDs list is empty'],
-                    'processed_at': datetime.now().isoformat()
-                }
+                return self._error_summary('No order IDs provided', ['Order IDs list is empty'], 1)
             
             logger.info(f"Starting sync for {len(order_ids)} orders (force_update={force_update})")
             
-            results = {
-                'success': True,
-                'message': '',
-                'total_processed': 0,
-                'total_created': 0,
-                'total_updated': 0,
-                'total_errors': 0,
-                'orders': [],
-                'errors': [],
-                'processed_at': datetime.now().isoformat()
-            }
+            results = self._new_summary()
             
             # Process orders in parallel
-            with ThreadPoolExecutor(max_workers=5) as executor:
+            with ThreadPoolExecutor(max_workers=MAX_CONCURRENT) as executor:
                 futures = []
                 for order_id in order_ids:
                     future = executor.submit(
@@ -158,54 +148,120 @@ class MeliOrderSyncService:
                 # Collect results
                 for order_id, future in futures:
                     try:
-                        result = future.result()
-                        results['orders'].append(result)
-                        results['total_processed'] += 1
-                        
-                        if result['success']:
-                            if result.get('action') == 'created':
-                                results['total_created'] += 1
-                            elif result.get('action') == 'updated':
-                                results['total_updated'] += 1
-                        else:
-                            results['total_errors'] += 1
-                            results['errors'].append(
-                                f"Order {order_id}: {result.get('message', 'Unknown error')}"
-                            )
-                            
+                        self._add_result(results, order_id, future.result())
                     except Exception as e:
-                        logger.exception(f"Error processing order {order_id}")
-                        results['total_processed'] += 1
-                        results['total_errors'] += 1
-                        results['errors'].append(f"Order {order_id}: {str(e)}")
-            
-            # Update overall success status
-            if results['total_errors'] == 0:
-                results['message'] = f"All {results['total_processed']} orders synced successfully"
-            elif results['total_errors'] < results['total_processed']:
-                results['message'] = (
-                    f"{results['total_processed'] - results['total_errors']} orders synced, "
-                    f"{results['total_errors']} errors"
-                )
-            else:
-                results['success'] = False
-                results['message'] = f"All {results['total_errors']} orders failed to sync"
+                        self._add_exception(results, order_id, e)
             
-            return results
+            return self._finish_summary(results)
             
         except Exception as e:
             logger.exception("Error in specific order sync")
-            return {
-                'success': False,
-                'message': f'Sync error: {str(e)}',
-                'total_processed': 0,
-                'total_created': 0,
-                'total_updated': 0,
-                'total_errors': len(order_ids) if order_ids else 1,
-                'orders': [],
-                'errors': [str(e)],
-                'processed_at': datetime.now().isoformat()
-            }
+            return self._error_summary(
+                f'Sync error: {str(e)}', [str(e)], len(order_ids) if order_ids else 1
+            )
+    
+    async def async_specific_orders(
+        self,
+        order_ids: List[str],
+        original_request: Any = None,
+        force_update: bool = False
+    ) -> Dict[str, Any]:
+        """sync_specific_orders() awaited in the event loop, no threads."""
+        try:
+            if not order_ids:
+                return self._error_summary('No order IDs provided', ['Order IDs list is empty'], 1)
+            
+            logger.info(f"Starting sync for {len(order_ids)} orders (force_update={force_update})")
+            
+            results = self._new_summary()
+            
+            order_results = await gather_limited(
+                (self._async_single_order(order_id, original_request, force_update) for order_id in order_ids),
+                MAX_CONCURRENT,
+                return_exceptions=True,
+            )
+            for order_id, result in zip(order_ids, order_results):
+                if isinstance(result, Exception):
+                    self._add_exception(results, order_id, result)
+                else:
+                    self._add_result(results, order_id, result)
+            
+            return self._finish_summary(results)
+            
+        except Exception as e:
+            logger.exception("Error in specific order sync")
+            return self._error_summary(
+                f'Sync error: {str(e)}', [str(e)], len(order_ids) if order_ids else 1
+            )
+    
+    def _new_summary(self) -> Dict[str, Any]:
+        return {
+            'success': True,
+            'message': '',
+            'total_processed': 0,
+            'total_created': 0,
+            'total_updated': 0,
+            'total_errors': 0,
+            'orders': [],
+            'errors': [],
+            'processed_at': datetime.now().isoformat()
+        }
+    
+    def _error_summary(self, message: str, errors: List[str], total_errors: int) -> Dict[str, Any]:
+        results = self._new_summary()
+        results.update({
+            'success': False,
+            'message': message,
+            'total_errors': total_errors,
+            'errors': errors,
+        })
+        return results
+    
+    def _no_user_summary(self) -> Dict[str, Any]:
+        return self._error_summary(
+            'MercadoLibre user ID not configured', ['User ID not found in configuration'], 1
+        )
+    
+    def _no_orders_summary(self) -> Dict[str, Any]:
+        results = self._new_summary()
+        results['message'] = 'No orders found to sync'
+        return results
+    
+    def _add_result(self, results: Dict[str, Any], order_id: str, result: Dict[str, Any]) -> None:
+        results['orders'].append(result)
+        results['total_processed'] += 1
+        
+        if result['success']:
+            if result.get('action') == 'created':
+                results['total_created'] += 1
+            elif result.get('action') == 'updated':
+                results['total_updated'] += 1
+        else:
+            results['total_errors'] += 1
+            results['errors'].append(
+                f"Order {order_id}: {result.get('message', 'Unknown error')}"
+            )
+    
+    def _add_exception(self, results: Dict[str, Any], order_id: str, e: BaseException) -> None:
+        logger.error(f"Error processing order {order_id}", exc_info=e)
+        results['total_processed'] += 1
+        results['total_errors'] += 1
+        results['errors'].append(f"Order {order_id}: {str(e)}")
+    
+    def _finish_summary(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        # Update overall success status
+        if results['total_errors'] == 0:
+            results['message'] = f"All {results['total_processed']} orders synced successfully"
+        elif results['total_errors'] < results['total_processed']:
+            results['message'] = (
+                f"{results['total_processed'] - results['total_errors']} orders synced, "
+                f"{results['total_errors']} errors"
+            )
+        else:
+            results['success'] = False
+            results['message'] = f"All {results['total_errors']} orders failed to sync"
+        
+        return results
     
     def _sync_single_order(
         self,
@@ -272,6 +328,47 @@ class MeliOrderSyncService:
                 'error': str(e)
             }
     
+    async def _async_single_order(
+        self,
+        order_id: str,
+        original_request: Any = None,
+        force_update: bool = False
+    ) -> Dict[str, Any]:
+        """_sync_single_order() awaited in the event loop."""
+        try:
+            logger.info(f"Syncing order {order_id}")
+            
+            order_data = await self.meli.aget_order(order_id)
+            if not order_data:
+                return {
+                    'success': False,
+                    'message': f'Order {order_id} not found in MercadoLibre',
+                    'order_id': order_id,
+                    'action': 'error'
+                }
+            
+            # MeliService has no get_customer, the sync path always maps the
+            # order without buyer details; the async path does the same
+            wms_order = OrderMapper.from_meli_order(order_data, None).to_dict()
+            
+            result = await self._acreate_order_in_wms(wms_order, original_request)
+            
+            result['order_id'] = order_id
+            result['ml_data'] = order_data
+            result['wms_data'] = wms_order
+            
+            return result
+            
+        except Exception as e:
+            logger.exception(f"Error syncing order {order_id}")
+            return {
+                'success': False,
+                'message': f'Sync error: {str(e)}',
+                'order_id': order_id,
+                'action': 'error',
+                'error': str(e)
+            }
+    
     def _create_order_in_wms(
         self,
         wms_order: Dict[str, Any],
@@ -284,58 +381,84 @@ class MeliOrderSyncService:
                 original_request=original_request,
                 json=[wms_order]  # WMS expects array format
             )
+            return self._creation_result(response)
+                
+        except Exception as e:
+            logger.exception("Error creating order in WMS")
+            return {
+                'success': False,
+                'message': f'WMS error: {str(e)}',
+                'action': 'error',
+                'error': str(e)
+            }
+    
+    async def _acreate_order_in_wms(
+        self,
+        wms_order: Dict[str, Any],
+        original_request: Any = None
+    ) -> Dict[str, Any]:
+        """_create_order_in_wms() awaited in the event loop."""
+        try:
+            response = await self.wms.apost(
+                self.ORDER_ENDPOINT,
+                original_request=original_request,
+                json=[wms_order]
+            )
+            return self._creation_result(response)
+                
+        except Exception as e:
+            logger.exception("Error creating order in WMS")
+            return {
+                'success': False,
+                'message': f'WMS error: {str(e)}',
+                'action': 'error',
+                'error': str(e)
+            }
+    
+    def _creation_result(self, response: Any) -> Dict[str, Any]:
+        """Result of the sale order POST from the WMS response."""
+        if response.status_code in (200, 201):
+            wms_response = response.json()
             
-            if response.status_code in (200, 201):
-                wms_response = response.json()
+            # Parse WMS response
+            if isinstance(wms_response, dict):
+                created = wms_response.get('created', [])
+                errors = wms_response.get('errors', [])
                 
-                # Parse WMS response
-                if isinstance(wms_response, dict):
-                    created = wms_response.get('created', [])
-                    errors = wms_response.get('errors', [])
-                    
-                    if created:
-                        return {
-                            'success': True,
-                            'message': 'Order created successfully',
-                            'action': 'created',
-                            'wms_response': wms_response
-                        }
-                    elif errors:
-                        return {
-                            'success': False,
-                            'message': f'WMS errors: {", ".join(errors)}',
-                            'action': 'error',
-                            'wms_response': wms_response
-                        }
-                    else:
-                        return {
-                            'success': True,
-                            'message': 'Order processed by WMS',
-                            'action': 'processed',
-                            'wms_response': wms_response
-                        }
-                else:
+                if created:
                     return {
                         'success': True,
                         'message': 'Order created successfully',
                         'action': 'created',
                         'wms_response': wms_response
                     }
+                elif errors:
+                    return {
+                        'success': False,
+                        'message': f'WMS errors: {", ".join(errors)}',
+                        'action': 'error',
+                        'wms_response': wms_response
+                    }
+                else:
+                    return {
+                        'success': True,
+                        'message': 'Order processed by WMS',
+                        'action': 'processed',
+                        'wms_response': wms_response
+                    }
             else:
                 return {
-                    'success': False,
-                    'message': f'WMS request failed: {response.status_code}',
-                    'action': 'error',
-                    'error': response.text[:200] if response.text else 'No details'
+                    'success': True,
+                    'message': 'Order created successfully',
+                    'action': 'created',
+                    'wms_response': wms_response
                 }
-                
-        except Exception as e:
-            logger.exception("Error creating order in WMS")
+        else:
             return {
                 'success': False,
-                'message': f'WMS error: {str(e)}',
+                'message': f'WMS request failed: {response.status_code}',
                 'action': 'error',
-                'error': str(e)
+                'error': response.text[:200] if response.text else 'No details'
             }
 
 
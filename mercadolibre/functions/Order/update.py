@@ -6,7 +6,7 @@ import logging
 from datetime import datetime
 from typing import Dict, Any, Optional
 
-from mercadolibre.services.meli_service import MeliService
+from mercadolibre.services.meli_service import get_meli_service
 from mercadolibre.services.internal_api_service import InternalAPIService
 from mercadolibre.utils.mapper.data_mapper import OrderMapper
 
@@ -18,7 +18,7 @@ class OrderUpdateService:
     
     def __init__(self):
         """Initialize the order update service."""
-        self.meli = MeliService()
+        self.meli = get_meli_service()
         self.wms = InternalAPIService()
         self.ORDER_ENDPOINT = "/wms/adapter/v2/sale_order"
         
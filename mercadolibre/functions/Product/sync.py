@@ -1,17 +1,23 @@
 """MercadoLibre to WMS synchronization and creation service."""
 
+import asyncio
 import logging
 from typing import List, Dict, Any, Optional
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from asgiref.sync import sync_to_async
+
+from mercadolibre.services.async_http import gather_limited
 from mercadolibre.services.meli_service import get_meli_service
 from mercadolibre.services.internal_api_service import get_internal_api_service
-from project.config_db import MeliConfigRepository
 from mercadolibre.utils.mapper.data_mapper import ProductMapper, BarCodeMapper
 
 logger = logging.getLogger(__name__)
 
+# Barcodes posted at once by the async sync
+MAX_CONCURRENT = 5
+
 
 class MeliWMSSyncService:
     """Service for synchronizing MercadoLibre products with WMS (creation and sync operations only)."""
@@ -20,11 +26,17 @@ class MeliWMSSyncService:
     PRODUCT_ENDPOINT = "wms/adapter/v2/art"
     BARCODE_ENDPOINT = "wms/base/v2/tRelacionCodbarras"
 
-    def __init__(self):
-        """Initialize sync service with required services."""
-        self.meli = get_meli_service()
+    def __init__(self, tenant: Optional[str] = None):
+        """
+        Initialize sync service with required services.
+
+        Args:
+            tenant: Tenant whose MeLi configuration is used, None for the default one
+        """
+        self.tenant = tenant
+        self.meli = get_meli_service(tenant)
         self.wms = get_internal_api_service()
-        self.config_repo = MeliConfigRepository()
+        self.config_repo = self.meli.repo
 
     def sync_all_products(self, original_request: Any = None) -> Dict[str, Any]:
         """
@@ -80,6 +92,44 @@ class MeliWMSSyncService:
             logger.exception("Error in full sync")
             return {"success": False, "message": f"Full sync error: {str(e)}"}
 
+    async def async_all_products(self, original_request: Any = None) -> Dict[str, Any]:
+        """sync_all_products() awaited in the event loop, no threads."""
+        try:
+            logger.info("Starting full product sync...")
+
+            product_ids = await self.aget_user_products_ids()
+            if not product_ids:
+                return {"success": False, "message": "No products found for user"}
+
+            logger.info(f"Found {len(product_ids)} products to sync")
+
+            meli_items = await self.aget_products_details(product_ids)
+            if not meli_items:
+                return {"success": False, "message": "Could not get product details"}
+
+            wms_products = self.map_products_to_wms(meli_items)
+
+            products_result, barcodes_result = await asyncio.wait_for(
+                asyncio.gather(
+                    self.acreate_products_batch(wms_products, original_request),
+                    self.acreate_barcodes_batch(meli_items, original_request),
+                ),
+                timeout=30,
+            )
+
+            return {
+                "success": products_result["success"] and barcodes_result["success"],
+                "message": f"{products_result['message']} | {barcodes_result['message']}",
+                "products": products_result,
+                "barcodes": barcodes_result,
+                "total_products": len(product_ids),
+                "synced_at": datetime.now().isoformat(),
+            }
+
+        except Exception as e:
+            logger.exception("Error in full sync")
+            return {"success": False, "message": f"Full sync error: {str(e)}"}
+
     def get_user_products_ids(self) -> List[str]:
         """
         Get all product IDs for the configured MercadoLibre user.
@@ -98,6 +148,20 @@ class MeliWMSSyncService:
             logger.error(f"Error extracting product IDs: {e}")
             return []
 
+    async def aget_user_products_ids(self) -> List[str]:
+        """get_user_products_ids() awaited in the event loop."""
+        try:
+            # The configuration is read from Mongo, outside the event loop
+            user_id = await sync_to_async(self.config_repo.get_user_account_id, thread_sensitive=False)()
+            if not user_id:
+                raise ValueError("No user account ID configured")
+
+            return await self.meli.aget_user_products(user_id)
+
+        except Exception as e:
+            logger.error(f"Error extracting product IDs: {e}")
+            return []
+
     def get_products_details(self, product_ids: List[str]) -> List[Dict[str, Any]]:
         """
         Get detailed information for multiple products.
@@ -117,6 +181,17 @@ class MeliWMSSyncService:
             logger.error(f"Error getting products details: {e}")
             return []
 
+    async def aget_products_details(self, product_ids: List[str]) -> List[Dict[str, Any]]:
+        """get_products_details() awaited in the event loop."""
+        if not product_ids:
+            return []
+
+        try:
+            return await self.meli.aget_products_batch(product_ids)
+        except Exception as e:
+            logger.error(f"Error getting products details: {e}")
+            return []
+
     def get_product_detail(self, product_id: str) -> Optional[Dict[str, Any]]:
         """
         Get detailed information for a single product including description.
@@ -194,24 +269,44 @@ class MeliWMSSyncService:
             response = self.wms.post(
                 self.PRODUCT_ENDPOINT, original_request=original_request, json=products
             )
+            return self._products_result(products, response)
 
-            if response.status_code in (200, 201):
-                return {
-                    "success": True,
-                    "message": f"Successfully created {len(products)} products",
-                    "data": response.json() if response.text else {},
-                    "action": "create",
-                }
-            else:
-                return {
-                    "success": False,
-                    "message": f"WMS error: {response.status_code} - {response.text}",
-                }
+        except Exception as e:
+            logger.error(f"Error creating products in WMS: {e}")
+            return {"success": False, "message": f"Error creating products: {str(e)}"}
+
+    async def acreate_products_batch(
+        self, products: List[Dict], original_request: Any = None
+    ) -> Dict[str, Any]:
+        """create_products_batch() awaited in the event loop."""
+        if not products:
+            return {"success": False, "message": "No products to create"}
+
+        try:
+            response = await self.wms.apost(
+                self.PRODUCT_ENDPOINT, original_request=original_request, json=products
+            )
+            return self._products_result(products, response)
 
         except Exception as e:
             logger.error(f"Error creating products in WMS: {e}")
             return {"success": False, "message": f"Error creating products: {str(e)}"}
 
+    def _products_result(self, products: List[Dict], response: Any) -> Dict[str, Any]:
+        """Result of the product POST from the WMS response."""
+        if response.status_code in (200, 201):
+            return {
+                "success": True,
+                "message": f"Successfully created {len(products)} products",
+                "data": response.json() if response.text else {},
+                "action": "create",
+            }
+        else:
+            return {
+                "success": False,
+                "message": f"WMS error: {response.status_code} - {response.text}",
+            }
+
     def create_barcodes_batch(
         self, meli_items: List[Dict], original_request: Any = None
     ) -> Dict[str, Any]:
@@ -243,23 +338,47 @@ class MeliWMSSyncService:
                         original_request=original_request,
                         json=barcode_data,
                     )
+                    self._add_barcode_result(
+                        results, errors, product_data, barcode_mapper, response
+                    )
+                else:
+                    logger.warning(
+                        f"No barcode found for item {product_data.get('id')}"
+                    )
 
-                    if response.status_code in (200, 201):
-                        results.append(
-                            {
-                                "item_id": product_data.get("id"),
-                                "barcode": barcode_mapper.codbarrasasignado,
-                                "success": True,
-                                "action": "created",
-                            }
-                        )
-                    else:
-                        errors.append(
-                            {
-                                "item_id": product_data.get("id"),
-                                "error": f'WMS error: {response.status_code} - {response.text[:200] if response.text else "No message"}',
-                            }
-                        )
+            except Exception as e:
+                logger.error(f"Error creating barcode: {e}")
+                errors.append({"item_id": item.get("id"), "error": str(e)})
+
+        return self._barcodes_result(results, errors)
+
+    async def acreate_barcodes_batch(
+        self, meli_items: List[Dict], original_request: Any = None
+    ) -> Dict[str, Any]:
+        """
+        create_barcodes_batch() awaited in the event loop, up to
+        MAX_CONCURRENT barcodes are posted at once.
+        """
+        results = []
+        errors = []
+
+        async def create_barcode(item):
+            try:
+                product_data = item.get("body", item)
+                barcode_mapper = BarCodeMapper.from_meli_item(product_data)
+
+                if barcode_mapper:
+                    barcode_data = barcode_mapper.to_dict()
+                    logger.info(f"Processing barcode creation: {barcode_data}")
+
+                    response = await self.wms.apost(
+                        self.BARCODE_ENDPOINT,
+                        original_request=original_request,
+                        json=barcode_data,
+                    )
+                    self._add_barcode_result(
+                        results, errors, product_data, barcode_mapper, response
+                    )
                 else:
                     logger.warning(
                         f"No barcode found for item {product_data.get('id')}"
@@ -269,6 +388,36 @@ class MeliWMSSyncService:
                 logger.error(f"Error creating barcode: {e}")
                 errors.append({"item_id": item.get("id"), "error": str(e)})
 
+        await gather_limited((create_barcode(item) for item in meli_items), MAX_CONCURRENT)
+
+        return self._barcodes_result(results, errors)
+
+    def _add_barcode_result(
+        self,
+        results: List[Dict],
+        errors: List[Dict],
+        product_data: Dict,
+        barcode_mapper: Any,
+        response: Any,
+    ) -> None:
+        if response.status_code in (200, 201):
+            results.append(
+                {
+                    "item_id": product_data.get("id"),
+                    "barcode": barcode_mapper.codbarrasasignado,
+                    "success": True,
+                    "action": "created",
+                }
+            )
+        else:
+            errors.append(
+                {
+                    "item_id": product_data.get("id"),
+                    "error": f'WMS error: {response.status_code} - {response.text[:200] if response.text else "No message"}',
+                }
+            )
+
+    def _barcodes_result(self, results: List[Dict], errors: List[Dict]) -> Dict[str, Any]:
         return {
             "success": len(results) > 0 or len(errors) == 0,
             "message": f"Created {len(results)} barcodes, {len(errors)} errors",
@@ -302,24 +451,7 @@ class MeliWMSSyncService:
 
             # If force_update is True, delegate to update service
             if force_update:
-                from .update import get_update_service
-
-                update_service = get_update_service()
-
-                results = []
-                for product_id in product_ids:
-                    result = update_service.update_single_product(
-                        product_id, original_request
-                    )
-                    results.append(result)
-
-                successful = sum(1 for r in results if r["success"])
-                return {
-                    "success": successful > 0,
-                    "message": f"Updated {successful}/{len(product_ids)} products",
-                    "results": results,
-                    "synced_at": datetime.now().isoformat(),
-                }
+                return self._update_products(product_ids, original_request)
 
             # If not force_update, create new products (sync mode)
             meli_items = self.get_products_details(product_ids)
@@ -354,6 +486,81 @@ class MeliWMSSyncService:
             logger.exception("Error in specific sync")
             return {"success": False, "message": f"Sync error: {str(e)}"}
 
+    async def async_specific_products(
+        self,
+        product_ids: List[str],
+        original_request: Any = None,
+        force_update: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        sync_specific_products() awaited in the event loop. The update of
+        force_update runs the update service in a thread.
+        """
+        try:
+            logger.info(
+                f"Syncing {len(product_ids)} specific products (force_update={force_update})..."
+            )
+
+            if force_update:
+                return await sync_to_async(self._update_products, thread_sensitive=False)(
+                    product_ids, original_request
+                )
+
+            meli_items = await self.aget_products_details(product_ids)
+
+            if not meli_items:
+                return {"success": False, "message": "Could not get product details"}
+
+            wms_products = self.map_products_to_wms(meli_items)
+
+            products_result, barcodes_result = await asyncio.wait_for(
+                asyncio.gather(
+                    self.acreate_products_batch(wms_products, original_request),
+                    self.acreate_barcodes_batch(meli_items, original_request),
+                ),
+                timeout=15,
+            )
+
+            return {
+                "success": products_result["success"],
+                "message": f"{products_result['message']} | {barcodes_result['message']}",
+                "products": products_result,
+                "barcodes": barcodes_result,
+                "product_ids": product_ids,
+                "synced_at": datetime.now().isoformat(),
+            }
+
+        except Exception as e:
+            logger.exception("Error in specific sync")
+            return {"success": False, "message": f"Sync error: {str(e)}"}
+
+    def _update_products(
+        self, product_ids: List[str], original_request: Any = None
+    ) -> Dict[str, Any]:
+        """Update existing products through the update service."""
+        from .update import ProductUpdateService, get_update_service
+
+        update_service = (
+            get_update_service()
+            if self.tenant is None
+            else ProductUpdateService(self.tenant)
+        )
+
+        results = update_service.update_products_batch(
+            product_ids, original_request
+        )
+
+        # Not found/unmapped products report success, the rest overall_success
+        successful = sum(
+            1 for r in results if r.get("overall_success", r.get("success"))
+        )
+        return {
+            "success": successful > 0,
+            "message": f"Updated {successful}/{len(product_ids)} products",
+            "results": results,
+            "synced_at": datetime.now().isoformat(),
+        }
+
 
 # Singleton instance
 _sync_service: Optional[MeliWMSSyncService] = None
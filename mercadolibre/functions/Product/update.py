@@ -1,7 +1,8 @@
 """Product and Barcode Update Operations."""
 
 import logging
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 from mercadolibre.services.meli_service import get_meli_service
@@ -17,10 +18,15 @@ class ProductUpdateService:
     # Endpoints
     PRODUCT_ENDPOINT = 'wms/adapter/v2/art'
     BARCODE_ENDPOINT = 'wms/base/v2/tRelacionCodbarras'
+
+    # Batch updates: values per prefetch filter, rows per page and concurrent PUTs
+    PREFETCH_CHUNK_SIZE = 100
+    PREFETCH_PAGE_SIZE = 500
+    UPDATE_WORKERS = 5
     
-    def __init__(self):
+    def __init__(self, tenant: Optional[str] = None):
         """Initialize update service with required services."""
-        self.meli = get_meli_service()
+        self.meli = get_meli_service(tenant)
         self.wms = get_internal_api_service()
 
     
@@ -116,6 +122,395 @@ class ProductUpdateService:
                 'updated_at': datetime.now().isoformat()
             }
     
+    def update_products_batch(
+        self,
+        product_ids: List[str],
+        original_request: Any = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Update several products in WMS with grouped requests.
+
+        The MercadoLibre items come from the multiget, the WMS articles and
+        barcodes of all of them are read with one productoean/idinternoean
+        filter per chunk, the changes are computed in memory and the new
+        products and barcodes are sent as single list POSTs. Updates still go
+        one PUT per product (the article PUT selects the record by id) but run
+        concurrently.
+
+        Args:
+            product_ids: MercadoLibre Product IDs to update
+            original_request: Original Django request for auth
+
+        Returns:
+            One result per product, same format as update_single_product
+        """
+        product_ids = list(dict.fromkeys(product_ids))
+        results = {}
+
+        try:
+            logger.info(f"Starting batch update for {len(product_ids)} products...")
+
+            # Step 1: Get fresh product details from MercadoLibre
+            try:
+                meli_items = {
+                    item['id']: item
+                    for item in self.meli.get_products_batch(product_ids)
+                    if item.get('id')
+                }
+            except Exception as e:
+                logger.error(f"Error getting products batch: {e}")
+                meli_items = {}
+
+            # Step 2: Map products to WMS format
+            pending = {}
+            for product_id in product_ids:
+                meli_item = meli_items.get(product_id)
+                if not meli_item:
+                    results[product_id] = {
+                        'success': False,
+                        'message': f'Product {product_id} not found in MercadoLibre',
+                        'product_id': product_id
+                    }
+                    continue
+
+                wms_product = self._map_product_to_wms(meli_item)
+                if not wms_product:
+                    results[product_id] = {
+                        'success': False,
+                        'message': 'Could not map product to WMS format',
+                        'product_id': product_id
+                    }
+                    continue
+
+                if not wms_product.get('productoean'):
+                    results[product_id] = {
+                        'success': False,
+                        'message': 'Product EAN not found in mapped data',
+                        'product_id': product_id
+                    }
+                    continue
+
+                barcode_mapper = BarCodeMapper.from_meli_item(meli_item)
+                pending[product_id] = {
+                    'meli_item': meli_item,
+                    'wms_product': wms_product,
+                    'barcode_data': barcode_mapper.to_dict() if barcode_mapper else None
+                }
+
+            if not pending:
+                return [results[product_id] for product_id in product_ids]
+
+            # Step 3: Prefetch the WMS articles and barcodes of the batch
+            existing_products = self._prefetch_wms_records(
+                self.PRODUCT_ENDPOINT,
+                'productoean',
+                [p['wms_product']['productoean'] for p in pending.values()],
+                original_request
+            )
+            existing_barcodes = self._prefetch_wms_records(
+                self.BARCODE_ENDPOINT,
+                'idinternoean',
+                [p['barcode_data']['idinternoean'] for p in pending.values() if p['barcode_data']],
+                original_request
+            )
+
+            # Step 4: Update products, grouped by operation
+            product_results = self._apply_products_batch(
+                pending, existing_products, original_request
+            )
+
+            # Step 5: Update barcodes, grouped by operation
+            barcode_results = self._apply_barcodes_batch(
+                pending, product_results, existing_barcodes, original_request
+            )
+
+            for product_id, product in pending.items():
+                results[product_id] = self._build_final_response(
+                    product_id,
+                    product['wms_product']['productoean'],
+                    product_results[product_id],
+                    barcode_results[product_id]
+                )
+
+            return [results[product_id] for product_id in product_ids]
+
+        except Exception as e:
+            logger.exception("Error in batch product update, falling back to single updates")
+            return [
+                results[product_id] if product_id in results
+                else self.update_single_product(product_id, original_request)
+                for product_id in product_ids
+            ]
+
+    def _prefetch_wms_records(
+        self,
+        endpoint: str,
+        field: str,
+        values: List[str],
+        original_request: Any = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Read the WMS records whose field is in values, by chunks of values
+        and following the X-Next-Cursor pages.
+
+        Returns:
+            Records by field value, the first match is kept
+        """
+        records = {}
+        values = list(dict.fromkeys(str(v) for v in values if v))
+
+        for i in range(0, len(values), self.PREFETCH_CHUNK_SIZE):
+            params = {
+                field: ','.join(values[i : i + self.PREFETCH_CHUNK_SIZE]),
+                'limit': self.PREFETCH_PAGE_SIZE
+            }
+
+            while True:
+                response = self.wms.get(endpoint, original_request=original_request, params=params)
+                if response.status_code != 200:
+                    raise ValueError(f'WMS read of {endpoint} failed: {response.status_code}')
+
+                page = response.json()
+                if isinstance(page, dict):
+                    page = [page]
+                for record in page:
+                    records.setdefault(str(record.get(field)), record)
+
+                next_cursor = response.headers.get('X-Next-Cursor')
+                if not next_cursor:
+                    break
+                params = {**params, 'cursor': next_cursor}
+
+        return records
+
+    def _apply_products_batch(
+        self,
+        pending: Dict[str, Dict[str, Any]],
+        existing_products: Dict[str, Dict[str, Any]],
+        original_request: Any = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Decide each product operation in memory and send the grouped requests."""
+        product_results = {}
+        to_create = {}
+        to_update = {}
+
+        for product_id, product in pending.items():
+            wms_product = product['wms_product']
+            meli_id = wms_product['productoean']
+            current_ean = wms_product.get('referencia')
+            existing_product = existing_products.get(str(meli_id))
+
+            update_data = {
+                k: v for k, v in wms_product.items() if v is not None
+            }
+
+            if not existing_product:
+                to_create[product_id] = update_data
+                continue
+
+            previous_ean = existing_product.get('referencia')
+            ean_changed = bool(previous_ean and previous_ean != current_ean)
+
+            if not ean_changed and not self._needs_product_update(existing_product, update_data)['needs_update']:
+                product_results[product_id] = {
+                    'success': True,
+                    'message': 'Producto ya sincronizado, no requiere actualización',
+                    'action': 'already_synchronized',
+                    'meli_id': meli_id,
+                    'current_ean': current_ean,
+                    'previous_ean': previous_ean,
+                    'ean_changed': False,
+                    'needs_update': False,
+                    'synchronized': True,
+                    'existing_product': existing_product
+                }
+                continue
+
+            if 'id' in existing_product:
+                update_data['id'] = existing_product['id']
+            to_update[product_id] = (
+                existing_product, update_data, meli_id, current_ean, previous_ean, ean_changed
+            )
+
+        if to_create:
+            logger.info(f"Creating {len(to_create)} products in WMS with one request")
+            response = self.wms.post(
+                self.PRODUCT_ENDPOINT,
+                original_request=original_request,
+                json=list(to_create.values())
+            )
+            errors = self._get_batch_errors(response)
+
+            for product_id, update_data in to_create.items():
+                meli_id = update_data['productoean']
+                current_ean = update_data.get('referencia')
+                error = self._find_batch_error(errors, meli_id)
+
+                if errors is not None and error is None:
+                    product_results[product_id] = {
+                        'success': True,
+                        'message': 'Product created successfully (not found in WMS)',
+                        'action': 'created',
+                        'meli_id': meli_id,
+                        'current_ean': current_ean,
+                        'existing_product': None
+                    }
+                elif error and 'already exists' in error.lower():
+                    product_results[product_id] = {
+                        'success': True,
+                        'message': 'Product already exists in WMS (creation detected existing)',
+                        'action': 'exists',
+                        'meli_id': meli_id,
+                        'current_ean': current_ean,
+                        'existing_product': None
+                    }
+                else:
+                    product_results[product_id] = {
+                        'success': False,
+                        'message': f'Product creation failed: {response.status_code}',
+                        'error': (error or response.text or 'No details')[:200],
+                        'action': 'failed',
+                        'meli_id': meli_id,
+                        'current_ean': current_ean
+                    }
+
+        if to_update:
+            logger.info(f"Updating {len(to_update)} products in WMS")
+            with ThreadPoolExecutor(max_workers=self.UPDATE_WORKERS) as executor:
+                future_to_product = {
+                    executor.submit(self._put_existing_product, *args, original_request): product_id
+                    for product_id, args in to_update.items()
+                }
+
+                for future in as_completed(future_to_product):
+                    product_id = future_to_product[future]
+                    try:
+                        product_results[product_id] = future.result()
+                    except Exception as e:
+                        logger.exception(f"Error updating product {product_id} in WMS")
+                        product_results[product_id] = {
+                            'success': False,
+                            'message': f'WMS operation error: {str(e)}',
+                            'error': str(e),
+                            'action': 'error'
+                        }
+
+        return product_results
+
+    def _apply_barcodes_batch(
+        self,
+        pending: Dict[str, Dict[str, Any]],
+        product_results: Dict[str, Dict[str, Any]],
+        existing_barcodes: Dict[str, Dict[str, Any]],
+        original_request: Any = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Resolve each barcode with the prefetched records and create the missing ones at once."""
+        barcode_results = {}
+        to_create = {}
+
+        for product_id, product in pending.items():
+            product_result = product_results[product_id]
+            barcode_data = product['barcode_data']
+
+            if not (product_result['success'] or product_result.get('action') in ['exists', 'already_synchronized']):
+                logger.warning(f"Skipping barcode update due to product operation failure: {product_result.get('message')}")
+                barcode_results[product_id] = {'success': False, 'message': 'Barcode not processed'}
+
+            elif product_result.get('ean_changed') and product_result.get('previous_ean'):
+                # EAN changes touch several barcode records, kept on the single path
+                barcode_results[product_id] = self.update_single_barcode_with_product_info(
+                    product['meli_item'],
+                    product_result.get('existing_product'),
+                    True,
+                    product_result.get('previous_ean'),
+                    original_request
+                )
+
+            elif not barcode_data:
+                barcode_results[product_id] = {
+                    'success': False,
+                    'message': 'No se encontró EAN en el producto de MercadoLibre'
+                }
+
+            elif str(barcode_data['idinternoean']) in existing_barcodes:
+                barcode_results[product_id] = {
+                    'success': True,
+                    'message': 'Barcode already exists and is synchronized',
+                    'barcode': barcode_data['codbarrasasignado'],
+                    'action': 'already_synchronized',
+                    'ean_change': False,
+                    'existing_barcode': existing_barcodes[str(barcode_data['idinternoean'])]
+                }
+
+            else:
+                to_create[product_id] = {
+                    k: v for k, v in barcode_data.items() if v is not None
+                }
+
+        if to_create:
+            logger.info(f"Creating {len(to_create)} barcodes in WMS with one request")
+            response = self.wms.post(
+                self.BARCODE_ENDPOINT,
+                original_request=original_request,
+                json=list(to_create.values())
+            )
+            errors = self._get_batch_errors(response)
+
+            for product_id, barcode_data in to_create.items():
+                error = self._find_batch_error(
+                    errors, barcode_data['idinternoean'], barcode_data['codbarrasasignado']
+                )
+
+                if errors is not None and error is None:
+                    barcode_results[product_id] = {
+                        'success': True,
+                        'message': 'Barcode created successfully (did not exist in WMS)',
+                        'barcode': barcode_data['codbarrasasignado'],
+                        'action': 'created',
+                        'ean_change': False
+                    }
+                elif error and 'already exists' in error.lower():
+                    barcode_results[product_id] = {
+                        'success': True,
+                        'message': 'Barcode already exists (race condition detected)',
+                        'barcode': barcode_data['codbarrasasignado'],
+                        'action': 'exists',
+                        'ean_change': False
+                    }
+                else:
+                    barcode_results[product_id] = {
+                        'success': False,
+                        'message': f'Barcode creation failed with status {response.status_code}',
+                        'error_details': (error or response.text or f'HTTP {response.status_code}')[:200],
+                        'status_code': response.status_code,
+                        'action': 'creation_failed',
+                        'ean_change': False
+                    }
+
+        return barcode_results
+
+    def _get_batch_errors(self, response) -> Optional[List[str]]:
+        """
+        Errors of a WMS list POST ("error: <key> <message>"), or None when
+        the request failed as a whole.
+        """
+        if response.status_code not in (200, 201, 207, 400):
+            return None
+        try:
+            body = response.json()
+        except ValueError:
+            return None
+        if not isinstance(body, dict) or 'errors' not in body:
+            return None
+        return [str(error) for error in body['errors']]
+
+    def _find_batch_error(self, errors: Optional[List[str]], *keys: Any) -> Optional[str]:
+        """Error of a WMS list POST that belongs to the record with any of the keys."""
+        for error in errors or []:
+            if any(error.startswith(f"error: {key} ") for key in keys):
+                return error
+        return None
+
     def update_single_barcode(
         self,
         meli_item: Dict[str, Any],
@@ -893,74 +1288,10 @@ class ProductUpdateService:
             # Step 4: Update product only if needed
             if existing_product and needs_update:
                 # Product exists and needs update
-                logger.info(f"Product needs update - updating via PUT (EAN changed: {ean_changed})")
-                
-                update_params = {}
-                if 'id' in existing_product:
-                    update_params['id'] = existing_product['id']
-                
-                update_response = self.wms.put(
-                    self.PRODUCT_ENDPOINT,
-                    original_request=original_request,
-                    params=update_params,
-                    json=update_data
+                return self._put_existing_product(
+                    existing_product, update_data, meli_id, current_ean,
+                    previous_ean, ean_changed, original_request
                 )
-                
-                if update_response.status_code in (200, 201):
-                    return {
-                        'success': True,
-                        'message': 'Product updated successfully via reference search',
-                        'action': 'updated',
-                        'meli_id': meli_id,
-                        'current_ean': current_ean,
-                        'previous_ean': previous_ean,
-                        'ean_changed': ean_changed,
-                        'needs_update': True,
-                        'synchronized': False,
-                        'existing_product': existing_product
-                    }
-                elif update_response.status_code == 400:
-                    error_text = update_response.text.lower()
-                    
-                    if 'already exists' in error_text:
-                        return {
-                            'success': True,
-                            'message': 'Product already exists and is up to date',
-                            'action': 'exists',
-                            'meli_id': meli_id,
-                            'current_ean': current_ean,
-                            'previous_ean': previous_ean,
-                            'ean_changed': ean_changed,
-                            'needs_update': False,
-                            'synchronized': True,
-                            'existing_product': existing_product
-                        }
-                    else:
-                        logger.error(f"Product update failed with 400: {update_response.text}")
-                        return {
-                            'success': False,
-                            'message': f'Product update failed: {update_response.text[:200] if update_response.text else "Unknown error"}',
-                            'error': update_response.text[:200] if update_response.text else 'No details',
-                            'action': 'update_failed',
-                            'meli_id': meli_id,
-                            'current_ean': current_ean,
-                            'previous_ean': previous_ean,
-                            'ean_changed': ean_changed,
-                            'needs_update': True,
-                            'existing_product': existing_product
-                        }
-                else:
-                    return {
-                        'success': False,
-                        'message': f'Product update failed: {update_response.status_code}',
-                        'error': update_response.text[:200] if update_response.text else 'No details',
-                        'action': 'update_failed',
-                        'meli_id': meli_id,
-                        'current_ean': current_ean,
-                        'previous_ean': previous_ean,
-                        'ean_changed': ean_changed,
-                        'needs_update': True
-                    }
             
             else:
                 # Product doesn't exist - create it
@@ -1008,6 +1339,86 @@ class ProductUpdateService:
                 'action': 'error'
             }
 
+    def _put_existing_product(
+        self,
+        existing_product: Dict[str, Any],
+        update_data: Dict[str, Any],
+        meli_id: str,
+        current_ean: Optional[str],
+        previous_ean: Optional[str],
+        ean_changed: bool,
+        original_request: Any = None
+    ) -> Dict[str, Any]:
+        """Update an existing WMS product by its id and build the operation result."""
+        logger.info(f"Product needs update - updating via PUT (EAN changed: {ean_changed})")
+        
+        update_params = {}
+        if 'id' in existing_product:
+            update_params['id'] = existing_product['id']
+        
+        update_response = self.wms.put(
+            self.PRODUCT_ENDPOINT,
+            original_request=original_request,
+            params=update_params,
+            json=update_data
+        )
+        
+        if update_response.status_code in (200, 201):
+            return {
+                'success': True,
+                'message': 'Product updated successfully via reference search',
+                'action': 'updated',
+                'meli_id': meli_id,
+                'current_ean': current_ean,
+                'previous_ean': previous_ean,
+                'ean_changed': ean_changed,
+                'needs_update': True,
+                'synchronized': False,
+                'existing_product': existing_product
+            }
+        elif update_response.status_code == 400:
+            error_text = update_response.text.lower()
+            
+            if 'already exists' in error_text:
+                return {
+                    'success': True,
+                    'message': 'Product already exists and is up to date',
+                    'action': 'exists',
+                    'meli_id': meli_id,
+                    'current_ean': current_ean,
+                    'previous_ean': previous_ean,
+                    'ean_changed': ean_changed,
+                    'needs_update': False,
+                    'synchronized': True,
+                    'existing_product': existing_product
+                }
+            else:
+                logger.error(f"Product update failed with 400: {update_response.text}")
+                return {
+                    'success': False,
+                    'message': f'Product update failed: {update_response.text[:200] if update_response.text else "Unknown error"}',
+                    'error': update_response.text[:200] if update_response.text else 'No details',
+                    'action': 'update_failed',
+                    'meli_id': meli_id,
+                    'current_ean': current_ean,
+                    'previous_ean': previous_ean,
+                    'ean_changed': ean_changed,
+                    'needs_update': True,
+                    'existing_product': existing_product
+                }
+        else:
+            return {
+                'success': False,
+                'message': f'Product update failed: {update_response.status_code}',
+                'error': update_response.text[:200] if update_response.text else 'No details',
+                'action': 'update_failed',
+                'meli_id': meli_id,
+                'current_ean': current_ean,
+                'previous_ean': previous_ean,
+                'ean_changed': ean_changed,
+                'needs_update': True
+            }
+
     def _build_operation_result(self, success, status, message, action=None, **extra_data):
         """Build a standardized operation result"""
         result = {
@@ -1131,6 +1542,12 @@ def update_single_product(product_id: str, original_request: Any = None) -> Dict
     return service.update_single_product(product_id, original_request)
 
 
+def update_products_batch(product_ids: List[str], original_request: Any = None) -> List[Dict[str, Any]]:
+    """Update several products with grouped requests - convenience function."""
+    service = get_update_service()
+    return service.update_products_batch(product_ids, original_request)
+
+
 def update_single_barcode(meli_item: Dict[str, Any], original_request: Any = None) -> Dict[str, Any]:
     """Update a single barcode - convenience function."""
     service = get_update_service()
@@ -2,6 +2,7 @@ from dataclasses import asdict, dataclass
 from typing import Any, Dict, Optional
 
 import logging
+from mercadolibre.functions.Customer.base_customer_service import upsert_result
 from mercadolibre.services.internal_api_service import (
     get_internal_api_service,
 )
@@ -41,6 +42,9 @@ class BaseSupplierService:
     def get_supplier_from_meli(self, supplier_id):
         return self.meli_service.get_user(supplier_id)
 
+    async def aget_supplier_from_meli(self, supplier_id):
+        return await self.meli_service.aget_user(supplier_id)
+
     def map_supplier_to_wms(self, meli_supplier):
         try:
             mapper = self.supplier_mapper.from_meli_to_wms_supplier(meli_supplier)
@@ -57,42 +61,29 @@ class BaseSupplierService:
 
     def create_supplier_in_wms(self, wms_supplier, original_request):
         try:
-            print(f"{original_request}")
             response = self.internal_api_service.post(
                 self.SUPPLIER_ENDPOINT,
                 original_request=original_request,
                 json=[wms_supplier],  # WMS expects an array
             )
+            return self._creation_result(response)
 
-            if response.status_code not in (200, 201):
-                raise WMSRequestError(
-                    status_code=response.status_code,
-                    message=response.text[:200],
-                )
-
-            wms_response = response.json()
-            created = wms_response.get("created", [])
-            errors = wms_response.get("errors", [])
-
-            if created:
-                return ServiceResult(
-                    success=True,
-                    action="created",
-                    wms_response=wms_response,
-                )
-            elif errors:
-                return ServiceResult(
-                    success=False,
-                    action="error",
-                    wms_response=wms_response,
-                    message=f"WMS errors: {', '.join(errors)}",
-                )
+        except WMSRequestError as e:
+            logger.error(str(e))
+            return ServiceResult(success=False, action="error", message=e.message)
 
-            return ServiceResult(
-                success=True,
-                action="processed",
-                wms_response=wms_response,
+        except Exception as e:
+            logger.exception("Unexpected error creating customer in WMS")
+            return ServiceResult(success=False, action="error", message=str(e))
+
+    async def acreate_supplier_in_wms(self, wms_supplier, original_request):
+        try:
+            response = await self.internal_api_service.apost(
+                self.SUPPLIER_ENDPOINT,
+                original_request=original_request,
+                json=[wms_supplier],  # WMS expects an array
             )
+            return self._creation_result(response)
 
         except WMSRequestError as e:
             logger.error(str(e))
@@ -101,3 +92,56 @@ class BaseSupplierService:
         except Exception as e:
             logger.exception("Unexpected error creating customer in WMS")
             return ServiceResult(success=False, action="error", message=str(e))
+
+    def upsert_suppliers_in_wms(self, wms_suppliers, original_request):
+        """
+        Create or update a list of suppliers in WMS with one POST in upsert
+        mode, the WMS merges them by item.
+        """
+        response = self.internal_api_service.post(
+            self.SUPPLIER_ENDPOINT,
+            original_request=original_request,
+            params={"mode": "upsert"},
+            json=wms_suppliers,
+        )
+        return upsert_result(response)
+
+    async def aupsert_suppliers_in_wms(self, wms_suppliers, original_request):
+        response = await self.internal_api_service.apost(
+            self.SUPPLIER_ENDPOINT,
+            original_request=original_request,
+            params={"mode": "upsert"},
+            json=wms_suppliers,
+        )
+        return upsert_result(response)
+
+    def _creation_result(self, response):
+        if response.status_code not in (200, 201):
+            raise WMSRequestError(
+                status_code=response.status_code,
+                message=response.text[:200],
+            )
+
+        wms_response = response.json()
+        created = wms_response.get("created", [])
+        errors = wms_response.get("errors", [])
+
+        if created:
+            return ServiceResult(
+                success=True,
+                action="created",
+                wms_response=wms_response,
+            )
+        elif errors:
+            return ServiceResult(
+                success=False,
+                action="error",
+                wms_response=wms_response,
+                message=f"WMS errors: {', '.join(errors)}",
+            )
+
+        return ServiceResult(
+            success=True,
+            action="processed",
+            wms_response=wms_response,
+        )
@@ -2,131 +2,229 @@ from concurrent.futures import ThreadPoolExecutor
 import datetime
 from typing import Any, List, Optional, Dict
 from mercadolibre.functions.Supplier.base_supplier_service import BaseSupplierService
-from mercadolibre.functions.Customer.base_customer_service import ServiceResult
+from mercadolibre.functions.Customer.base_customer_service import (
+    ServiceResult,
+    chunked,
+    unique_ids,
+    upsert_errors,
+)
+from mercadolibre.services.async_http import gather_limited
 from mercadolibre.utils.exceptions import UserMappingError
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Suppliers fetched at once, in threads or awaited
+MAX_CONCURRENT = 5
+
+# Suppliers sent to WMS per upsert POST
+UPSERT_CHUNK_SIZE = 500
+
 
 class MeliSupplierService:
+    """
+    Service to synchronize MercadoLibre suppliers with WMS (create or
+    update). The suppliers are fetched concurrently and sent to WMS as
+    upsert lists, UPSERT_CHUNK_SIZE suppliers per POST.
+    """
 
     def __init__(self):
         self.base_supplier_service = BaseSupplierService()
 
-    def _sync_single_supplier(
-        self, supplier_id: str, original_request: Any = None
-    ) -> ServiceResult:
-        """Sync a single supplier (create only)."""
+    def _fetch_supplier(self, supplier_id: str):
+        """Supplier mapped to WMS, or the ServiceResult of the failure."""
         try:
             supplier_data = self.base_supplier_service.get_supplier_from_meli(
                 supplier_id
             )
-            if not supplier_data:
-                return ServiceResult(
-                    success=False,
-                    action="error",
-                    message="Supplier not found in MercadoLibre",
-                    error="not_found",
-                )
+            return self._map_supplier(supplier_data)
+        except Exception as e:
+            return self._error_result(supplier_id, e)
 
-            wms_supplier = self.base_supplier_service.map_supplier_to_wms(supplier_data)
-
-            result = self.base_supplier_service.create_supplier_in_wms(
-                wms_supplier, original_request
+    async def _afetch_supplier(self, supplier_id: str):
+        """_fetch_supplier() awaited in the event loop."""
+        try:
+            supplier_data = await self.base_supplier_service.aget_supplier_from_meli(
+                supplier_id
             )
+            return self._map_supplier(supplier_data)
+        except Exception as e:
+            return self._error_result(supplier_id, e)
 
-            # Keep raw WMS response
-            result.wms_response = {
-                "supplier_id": supplier_id,
-                "wms_data": wms_supplier,
-                "raw": result.wms_response,
-            }
-
-            return result
+    def _map_supplier(self, supplier_data):
+        if not supplier_data:
+            return ServiceResult(
+                success=False,
+                action="error",
+                message="Supplier not found in MercadoLibre",
+                error="not_found",
+            )
+        return self.base_supplier_service.map_supplier_to_wms(supplier_data)
 
-        except UserMappingError as e:
+    def _error_result(self, supplier_id, e) -> ServiceResult:
+        if isinstance(e, UserMappingError):
             return ServiceResult(
                 success=False, action="error", message=str(e), error="mapping_error"
             )
 
+        logger.exception(f"Unexpected error syncing supplier {supplier_id}")
+        return ServiceResult(
+            success=False, action="error", message=str(e), error="exception"
+        )
+
     def sync_specific_suppliers(
         self,
         suppliers_ids: List[str],
         original_request: Any = None,
     ) -> Dict[str, Any]:
+        """
+        Sync multiple suppliers (create or update): the repeated IDs are
+        dropped, the suppliers are fetched from MercadoLibre in parallel and
+        sent to WMS in upsert POSTs.
+        """
+        suppliers_ids = unique_ids(suppliers_ids or [])
+        if not suppliers_ids:
+            return self._empty_summary()
+
+        results_summary = self._new_summary()
+
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT) as executor:
+            fetched = list(executor.map(self._fetch_supplier, suppliers_ids))
+
+        pending = self._add_fetched(results_summary, suppliers_ids, fetched)
+        for chunk in chunked(pending, UPSERT_CHUNK_SIZE):
+            try:
+                wms_response = self.base_supplier_service.upsert_suppliers_in_wms(
+                    [wms_supplier for _, wms_supplier in chunk], original_request
+                )
+            except Exception as e:
+                self._add_chunk_exception(results_summary, chunk, e)
+                continue
+            self._add_upserted(results_summary, chunk, wms_response)
+
+        return self._finish_summary(results_summary)
+
+    async def async_specific_suppliers(
+        self,
+        suppliers_ids: List[str],
+        original_request: Any = None,
+    ) -> Dict[str, Any]:
+        """sync_specific_suppliers() awaited in the event loop, no threads."""
+        suppliers_ids = unique_ids(suppliers_ids or [])
+        if not suppliers_ids:
+            return self._empty_summary()
+
+        results_summary = self._new_summary()
 
+        fetched = await gather_limited(
+            (self._afetch_supplier(sid) for sid in suppliers_ids), MAX_CONCURRENT
+        )
+
+        pending = self._add_fetched(results_summary, suppliers_ids, fetched)
+        for chunk in chunked(pending, UPSERT_CHUNK_SIZE):
+            try:
+                wms_response = await self.base_supplier_service.aupsert_suppliers_in_wms(
+                    [wms_supplier for _, wms_supplier in chunk], original_request
+                )
+            except Exception as e:
+                self._add_chunk_exception(results_summary, chunk, e)
+                continue
+            self._add_upserted(results_summary, chunk, wms_response)
+
+        return self._finish_summary(results_summary)
+
+    def _new_summary(self) -> Dict[str, Any]:
         results_summary = {
             "success": True,
             "message": "",
             "total_processed": 0,
+            "total_synced": 0,
             "total_created": 0,
+            "total_updated": 0,
+            "total_unchanged": 0,
             "total_failed": 0,
-            "suppliers_created": [],
+            "suppliers_synced": [],
             "suppliers_failed": [],
             "processed_at": datetime.datetime.now().isoformat(),
         }
+        # Previous name of suppliers_synced, the same list for the clients still reading it
+        results_summary["suppliers_created"] = results_summary["suppliers_synced"]
+        return results_summary
 
-        if not suppliers_ids:
-            results_summary.update(
-                {
-                    "success": False,
-                    "total_failed": 1,
-                    "suppliers_failed": [
-                        {
-                            "supplier_id": None,
-                            "error_type": "empty_list",
-                            "message": "No supplier IDs provided",
-                        }
-                    ],
-                }
+    def _empty_summary(self) -> Dict[str, Any]:
+        results_summary = self._new_summary()
+        results_summary.update(
+            {
+                "success": False,
+                "total_failed": 1,
+                "suppliers_failed": [
+                    {
+                        "supplier_id": None,
+                        "error_type": "empty_list",
+                        "message": "No supplier IDs provided",
+                    }
+                ],
+            }
+        )
+        return results_summary
+
+    def _add_fetched(self, results_summary, suppliers_ids, fetched):
+        """Record the suppliers that could not be fetched, return the others."""
+        pending = []
+        for sid, result in zip(suppliers_ids, fetched):
+            if isinstance(result, ServiceResult):
+                self._add_failure(results_summary, sid, result.message, result.error)
+            else:
+                pending.append((sid, result))
+        return pending
+
+    def _add_upserted(self, results_summary, chunk, wms_response) -> None:
+        results_summary["total_created"] += wms_response.get("inserted", 0)
+        results_summary["total_updated"] += wms_response.get("updated", 0)
+        results_summary["total_unchanged"] += wms_response.get("unchanged", 0)
+
+        errors = upsert_errors(wms_response)
+        for sid, wms_supplier in chunk:
+            error = errors.get(str(wms_supplier.get("item")))
+            if error is not None:
+                self._add_failure(results_summary, sid, f"WMS error: {error}", "wms_error")
+                continue
+
+            results_summary["total_processed"] += 1
+            results_summary["total_synced"] += 1
+            results_summary["suppliers_synced"].append(
+                {"supplier_id": sid, "wms_data": wms_supplier}
             )
-            return results_summary
 
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = {
-                sid: executor.submit(self._sync_single_supplier, sid, original_request)
-                for sid in suppliers_ids
+    def _add_failure(self, results_summary, sid, message, error_type=None) -> None:
+        results_summary["total_processed"] += 1
+        results_summary["total_failed"] += 1
+        results_summary["suppliers_failed"].append(
+            {
+                "supplier_id": sid,
+                "error_type": error_type or "unknown",
+                "message": message,
             }
+        )
 
-            for sid, future in futures.items():
-                try:
-                    result: ServiceResult = future.result()
-                    results_summary["total_processed"] += 1
-
-                    if result.success and result.action == "created":
-                        results_summary["total_created"] += 1
-                        results_summary["suppliers_created"].append(result.wms_response)
-                    else:
-                        results_summary["total_failed"] += 1
-                        results_summary["suppliers_failed"].append(
-                            {
-                                "supplier_id": sid,
-                                "error_type": result.error or "unknown",
-                                "message": result.message,
-                            }
-                        )
-
-                except Exception as e:
-                    logger.exception(f"Exception processing supplier {sid}")
-                    results_summary["total_processed"] += 1
-                    results_summary["total_failed"] += 1
-                    results_summary["suppliers_failed"].append(
-                        {
-                            "supplier_id": sid,
-                            "error_type": "exception",
-                            "message": str(e),
-                        }
-                    )
+    def _add_chunk_exception(self, results_summary, chunk, e) -> None:
+        logger.error(f"Exception upserting {len(chunk)} suppliers in WMS", exc_info=e)
+        for sid, _ in chunk:
+            self._add_failure(
+                results_summary, sid, str(e), getattr(e, "status_code", "exception")
+            )
 
+    def _finish_summary(self, results_summary) -> Dict[str, Any]:
         if results_summary["total_failed"] == 0:
             results_summary["message"] = (
                 f"All {results_summary['total_processed']} suppliers synced successfully"
             )
-        elif results_summary["total_created"] > 0:
+        elif results_summary["total_synced"] > 0:
             results_summary["message"] = (
-                f"{results_summary['total_created']} suppliers created, "
+                f"{results_summary['total_synced']} suppliers synced "
+                f"({results_summary['total_created']} created, "
+                f"{results_summary['total_updated']} updated), "
                 f"{results_summary['total_failed']} failed"
             )
         else:
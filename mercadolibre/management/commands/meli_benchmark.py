@@ -0,0 +1,142 @@
+"""Measure the MercadoLibre sync throughput against the local simulator."""
+
+import json
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+
+from mercadolibre.services.internal_api_service import InternalAPIService
+from mercadolibre.services.meli_service import MeliService, register_meli_service
+from mercadolibre.services.rate_limiter import RateLimiter
+from mercadolibre.utils.meli_simulator import InMemoryConfigRepository, MeliSimulator
+
+SUITES = ("products", "orders", "customers", "suppliers")
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the product, order, customer and supplier syncs against a local "
+        "MercadoLibre simulator and report items/s, p95 latency, API calls per item and WMS calls"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--suite", action="append", dest="suites", choices=SUITES,
+                            help="Suite to run, can be repeated. All by default")
+        parser.add_argument("--catalog", type=int, default=200, help="Items of the simulated seller")
+        parser.add_argument("--orders", type=int, default=100, help="Orders of the simulated seller")
+        parser.add_argument("--users", type=int, default=50, help="Simulated buyers")
+        parser.add_argument("--latency-ms", type=float, default=20, help="Latency of every MeLi response")
+        parser.add_argument("--jitter-ms", type=float, default=10, help="Random extra latency")
+        parser.add_argument("--rate-429", type=float, default=0, help="Probability of a 429 response")
+        parser.add_argument("--token-ttl", type=float, default=0, help="Access token life in seconds, 0 never expires")
+        parser.add_argument("--page-size", type=int, default=50, help="Default limit of the search endpoints")
+        parser.add_argument("--meli-rate", type=float,
+                            help="Requests per second to the simulator, MELI_RATE_LIMIT by default")
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    def handle(self, *args, **options):
+        simulator = MeliSimulator(
+            catalog_size=options["catalog"],
+            orders=options["orders"],
+            users=options["users"],
+            latency=options["latency_ms"] / 1000,
+            jitter=options["jitter_ms"] / 1000,
+            rate_429=options["rate_429"],
+            token_ttl=options["token_ttl"],
+            page_size=options["page_size"],
+        )
+
+        with simulator:
+            meli = MeliService(base_url=simulator.url, repo=InMemoryConfigRepository(simulator.config()))
+            if options["meli_rate"] is not None:
+                meli.rate_limiter = RateLimiter(rate=options["meli_rate"], burst=max(int(options["meli_rate"]), 1))
+            register_meli_service(meli)
+
+            # The simulator also answers the WMS writes
+            wms = InternalAPIService(base_url=simulator.url)
+
+            latencies = []
+            latencies_lock = threading.Lock()
+
+            def record_latency(response, *args, **kwargs):
+                with latencies_lock:
+                    latencies.append(response.elapsed.total_seconds())
+
+            meli.session.hooks["response"].append(record_latency)
+
+            report = []
+            for suite in options["suites"] or SUITES:
+                simulator.reset_stats()
+                latencies.clear()
+
+                started = time.perf_counter()
+                items, result = getattr(self, f"_run_{suite}")(simulator, wms)
+                elapsed = time.perf_counter() - started
+
+                api_calls = simulator.api_calls()
+                report.append({
+                    "suite": suite,
+                    "success": bool(result.get("success")),
+                    "items": items,
+                    "seconds": round(elapsed, 3),
+                    "items_per_second": round(items / elapsed, 2) if elapsed else 0,
+                    "p95_latency_ms": round(_percentile(latencies, 95) * 1000, 1),
+                    "api_calls": api_calls,
+                    "api_calls_per_item": round(api_calls / items, 2) if items else 0,
+                    "wms_calls": simulator.wms_calls(),
+                    "status": {str(k): v for k, v in sorted(simulator.status.items())},
+                })
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(
+            f"{'suite':<10} {'items':>6} {'seconds':>8} {'items/s':>8} {'p95 ms':>8} {'calls/item':>10} {'wms calls':>9}  status"
+        )
+        for row in report:
+            self.stdout.write(
+                f"{row['suite']:<10} {row['items']:>6} {row['seconds']:>8} {row['items_per_second']:>8} "
+                f"{row['p95_latency_ms']:>8} {row['api_calls_per_item']:>10} "
+                f"{row['wms_calls']:>9}  {row['status']}"
+            )
+
+    def _run_products(self, simulator, wms):
+        from mercadolibre.functions.Product.sync import MeliWMSSyncService
+
+        service = MeliWMSSyncService()
+        service.wms = wms
+        result = service.sync_all_products()
+        return result.get("total_products", 0), result
+
+    def _run_orders(self, simulator, wms):
+        from mercadolibre.functions.Order.create import MeliOrderSyncService
+
+        service = MeliOrderSyncService()
+        service.wms = wms
+        order_ids = list(simulator.orders)
+        return len(order_ids), service.sync_specific_orders(order_ids)
+
+    def _run_customers(self, simulator, wms):
+        from mercadolibre.functions.Customer.sync import MeliCustomerSyncService
+
+        service = MeliCustomerSyncService()
+        service.base_service.internal_api_service = wms
+        user_ids = list(simulator.users)
+        return len(user_ids), service.sync_specific_customers(user_ids)
+
+    def _run_suppliers(self, simulator, wms):
+        from mercadolibre.functions.Supplier.sync import MeliSupplierService
+
+        service = MeliSupplierService()
+        service.base_supplier_service.internal_api_service = wms
+        user_ids = list(simulator.users)
+        return len(user_ids), service.sync_specific_suppliers(user_ids)
+
+
+def _percentile(values, percent):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
@@ -0,0 +1,301 @@
+"""Load test of the MercadoLibre sync endpoints in one WSGI and one ASGI worker."""
+
+import asyncio
+import itertools
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from django.urls import path
+
+from mercadolibre.services.internal_api_service import get_internal_api_service
+from mercadolibre.services.meli_service import MeliService, register_meli_service
+from mercadolibre.services.rate_limiter import RateLimiter
+from mercadolibre.utils.meli_simulator import InMemoryConfigRepository, MeliSimulator
+
+SERVERS = ("wsgi", "asgi")
+SUITES = ("customers", "suppliers", "orders", "products", "inventory")
+
+# Key of the simulated tenant, the /wms/ml/ views never open its database
+API_KEY = "meli-server-benchmark"
+
+
+def _urlpatterns():
+    from mercadolibre.views.Customer import MeliCustomerSyncView
+    from mercadolibre.views.inventory import MeliInventoryView
+    from mercadolibre.views.order import MeliOrderSyncView
+    from mercadolibre.views.Product import MeliProductSyncView
+    from mercadolibre.views.Supplier import SupplierSyncView
+
+    return [
+        path("wms/ml/v1/customer/", MeliCustomerSyncView.as_view()),
+        path("wms/ml/v1/product/", MeliProductSyncView.as_view()),
+        path("wms/ml/v1/inventory/", MeliInventoryView.as_view()),
+        path("wms/ml/v1/order/", MeliOrderSyncView.as_view()),
+        path("wms/ml/v1/supplier/", SupplierSyncView.as_view()),
+    ]
+
+
+class URLConf:
+    """ROOT_URLCONF of the run, only the views under test are routed."""
+
+    def __init__(self):
+        self.urlpatterns = _urlpatterns()
+
+
+class Command(BaseCommand):
+    help = (
+        "Send concurrent POSTs to the MercadoLibre sync endpoints through the "
+        "Django WSGI handler (a worker with --threads threads) and the ASGI "
+        "handler (one event loop with --concurrency requests in flight), "
+        "against a local MercadoLibre simulator, and report requests/s, p95 "
+        "latency and peak threads"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--server", action="append", dest="servers", choices=SERVERS,
+                            help="Handler to run, can be repeated. Both by default")
+        parser.add_argument("--suite", action="append", dest="suites", choices=SUITES,
+                            help="Endpoint to load, can be repeated. customers by default")
+        parser.add_argument("--requests", type=int, default=200, help="Requests per suite and handler")
+        parser.add_argument("--batch", type=int, default=5, help="IDs per request")
+        parser.add_argument("--threads", type=int, default=4, help="Threads of the WSGI worker")
+        parser.add_argument("--concurrency", type=int, default=16,
+                            help="Requests in flight in the ASGI worker, their MeLi calls share the "
+                                 "RESILIENCE MAX_CONCURRENT bulkhead")
+        parser.add_argument("--catalog", type=int, default=200, help="Items of the simulated seller")
+        parser.add_argument("--orders", type=int, default=100, help="Orders of the simulated seller")
+        parser.add_argument("--users", type=int, default=100, help="Simulated buyers")
+        parser.add_argument("--latency-ms", type=float, default=50, help="Latency of every MeLi response")
+        parser.add_argument("--jitter-ms", type=float, default=10, help="Random extra latency")
+        parser.add_argument("--meli-rate", type=float,
+                            help="Requests per second to the simulator, MELI_RATE_LIMIT by default")
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    def handle(self, *args, **options):
+        simulator = MeliSimulator(
+            catalog_size=options["catalog"],
+            orders=options["orders"],
+            users=options["users"],
+            latency=options["latency_ms"] / 1000,
+            jitter=options["jitter_ms"] / 1000,
+        )
+
+        report = []
+        with simulator:
+            meli = MeliService(base_url=simulator.url, repo=InMemoryConfigRepository(simulator.config()))
+            if options["meli_rate"] is not None:
+                meli.rate_limiter = RateLimiter(rate=options["meli_rate"], burst=max(int(options["meli_rate"]), 1))
+            register_meli_service(meli)
+
+            # The simulator also answers the WMS writes, of the singleton and
+            # of the services that open their own InternalAPIService
+            get_internal_api_service(simulator.url)
+
+            with override_settings(
+                ROOT_URLCONF=URLConf(),
+                WMS_BASE_URL=simulator.url,
+                API_KEYS={**settings.API_KEYS, API_KEY: "benchmark"},
+            ):
+                for suite in options["suites"] or ["customers"]:
+                    bodies = _bodies(suite, simulator, options["requests"], options["batch"])
+                    for server in options["servers"] or SERVERS:
+                        simulator.reset_stats()
+                        report.append(getattr(self, f"_run_{server}")(suite, bodies, options))
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(
+            f"{'suite':<10} {'server':<6} {'in flight':>9} {'requests':>8} {'seconds':>8} "
+            f"{'req/s':>8} {'p95 ms':>8} {'threads':>7}  status"
+        )
+        for row in report:
+            self.stdout.write(
+                f"{row['suite']:<10} {row['server']:<6} {row['in_flight']:>9} {row['requests']:>8} "
+                f"{row['seconds']:>8} {row['requests_per_second']:>8} {row['p95_latency_ms']:>8} "
+                f"{row['peak_threads']:>7}  {row['status']}"
+            )
+
+    def _run_wsgi(self, suite, bodies, options):
+        handler = WSGIHandler()
+        route = _route(suite)
+
+        def send(body):
+            started = time.perf_counter()
+            statuses = []
+            environ = {
+                "REQUEST_METHOD": "POST",
+                "PATH_INFO": route,
+                "QUERY_STRING": "",
+                "SERVER_NAME": "testserver",
+                "SERVER_PORT": "80",
+                "SERVER_PROTOCOL": "HTTP/1.1",
+                "CONTENT_TYPE": "application/json",
+                "CONTENT_LENGTH": str(len(body)),
+                "HTTP_AUTHORIZATION": API_KEY,
+                "wsgi.input": BytesIO(body),
+                "wsgi.url_scheme": "http",
+                "wsgi.errors": BytesIO(),
+            }
+            response = handler(environ, lambda status, headers: statuses.append(int(status[:3])))
+            b"".join(response)
+            response.close()
+            return statuses[0], time.perf_counter() - started
+
+        with _ThreadSampler() as sampler:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options["threads"]) as executor:
+                results = list(executor.map(send, bodies))
+            elapsed = time.perf_counter() - started
+
+        return _row(suite, "wsgi", options["threads"], results, elapsed, sampler.peak)
+
+    def _run_asgi(self, suite, bodies, options):
+        handler = ASGIHandler()
+        route = _route(suite)
+
+        async def send(body, semaphore):
+            async with semaphore:
+                started = time.perf_counter()
+                scope = {
+                    "type": "http",
+                    "asgi": {"version": "3.0"},
+                    "http_version": "1.1",
+                    "method": "POST",
+                    "scheme": "http",
+                    "path": route,
+                    "raw_path": route.encode(),
+                    "query_string": b"",
+                    "root_path": "",
+                    "headers": [
+                        (b"host", b"testserver"),
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode()),
+                        (b"authorization", API_KEY.encode()),
+                    ],
+                    "client": ("127.0.0.1", 0),
+                    "server": ("testserver", 80),
+                }
+                messages = [{"type": "http.request", "body": body, "more_body": False}]
+                finished = asyncio.Event()
+                statuses = []
+
+                async def receive():
+                    if messages:
+                        return messages.pop(0)
+                    await finished.wait()
+                    return {"type": "http.disconnect"}
+
+                async def send_message(message):
+                    if message["type"] == "http.response.start":
+                        statuses.append(message["status"])
+                    elif not message.get("more_body"):
+                        finished.set()
+
+                await handler(scope, receive, send_message)
+                finished.set()
+                return statuses[0], time.perf_counter() - started
+
+        async def run():
+            semaphore = asyncio.Semaphore(options["concurrency"])
+            return await asyncio.gather(*(send(body, semaphore) for body in bodies))
+
+        with _ThreadSampler() as sampler:
+            started = time.perf_counter()
+            results = asyncio.run(run())
+            elapsed = time.perf_counter() - started
+
+        return _row(suite, "asgi", options["concurrency"], results, elapsed, sampler.peak)
+
+
+class _ThreadSampler:
+    """Peak of the threads of the process while the block runs."""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak = _worker_threads()
+        self._stop = threading.Event()
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            # Without the sampler itself
+            self.peak = max(self.peak, _worker_threads() - 1)
+
+
+def _worker_threads():
+    # The simulator serves each connection in a thread of its own, those
+    # threads would not run in the worker
+    return sum(
+        1 for thread in threading.enumerate() if not thread.name.endswith("(process_request_thread)")
+    )
+
+
+def _route(suite):
+    return {
+        "customers": "/wms/ml/v1/customer/",
+        "suppliers": "/wms/ml/v1/supplier/",
+        "orders": "/wms/ml/v1/order/",
+        "products": "/wms/ml/v1/product/",
+        "inventory": "/wms/ml/v1/inventory/",
+    }[suite]
+
+
+def _bodies(suite, simulator, requests, batch):
+    """Body of each request, the IDs of the simulator taken round robin."""
+    if suite in ("customers", "suppliers"):
+        ids, key = list(simulator.users), f"{suite[:-1]}_ids"
+    elif suite == "orders":
+        ids, key = list(simulator.orders), "order_ids"
+    else:
+        ids, key = list(simulator.items), "product_ids"
+
+    cycle = itertools.cycle(ids)
+    if suite == "inventory":
+        return [json.dumps({"product_id": next(cycle)}).encode() for _ in range(requests)]
+    return [
+        json.dumps({key: [next(cycle) for _ in range(batch)]}).encode()
+        for _ in range(requests)
+    ]
+
+
+def _row(suite, server, in_flight, results, elapsed, peak_threads):
+    status = {}
+    for code, _ in results:
+        status[str(code)] = status.get(str(code), 0) + 1
+
+    return {
+        "suite": suite,
+        "server": server,
+        "in_flight": in_flight,
+        "requests": len(results),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(results) / elapsed, 2) if elapsed else 0,
+        "p95_latency_ms": round(_percentile([seconds for _, seconds in results], 95) * 1000, 1),
+        "peak_threads": peak_threads,
+        "status": dict(sorted(status.items())),
+    }
+
+
+def _percentile(values, percent):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
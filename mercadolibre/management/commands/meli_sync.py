@@ -0,0 +1,40 @@
+"""Run the MercadoLibre syncs of every configured tenant."""
+
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from mercadolibre.services.sync_scheduler import SYNC_JOBS, TenantSyncScheduler
+
+
+class Command(BaseCommand):
+    help = "Sync products, orders and stock of the MercadoLibre tenants in parallel"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tenant", action="append", dest="tenants",
+            help="Tenant to sync, can be repeated. All the configured tenants by default",
+        )
+        parser.add_argument(
+            "--job", action="append", dest="jobs", choices=SYNC_JOBS,
+            help="Job to run, can be repeated. All the jobs by default",
+        )
+        parser.add_argument("--workers", type=int, help="Workers shared by all the tenants")
+        parser.add_argument("--per-tenant", type=int, help="Jobs running at once for a tenant")
+        parser.add_argument(
+            "--interval", type=int, default=0,
+            help="Seconds between runs, 0 runs once",
+        )
+
+    def handle(self, *args, **options):
+        scheduler = TenantSyncScheduler(options["workers"], options["per_tenant"])
+        jobs = options["jobs"] or SYNC_JOBS
+
+        while True:
+            result = scheduler.run(options["tenants"], jobs)
+            self.stdout.write(json.dumps(result, indent=2))
+
+            if options["interval"] <= 0:
+                break
+            time.sleep(options["interval"])
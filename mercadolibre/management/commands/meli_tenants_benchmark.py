@@ -0,0 +1,151 @@
+"""Measure the multi-tenant sync scheduler against local MercadoLibre simulators."""
+
+import json
+import threading
+import time
+from contextlib import ExitStack
+
+from django.core.management.base import BaseCommand
+
+from mercadolibre.services.internal_api_service import InternalAPIService
+from mercadolibre.services.meli_service import MeliService, register_meli_service
+from mercadolibre.services.rate_limiter import RateLimiter
+from mercadolibre.services.sync_scheduler import TenantSyncScheduler
+from mercadolibre.utils.meli_simulator import InMemoryConfigRepository, MeliSimulator
+
+# The stock push reads the tenant database and Mongo, it is left out
+JOBS = ("products", "orders")
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the product and order syncs of many simulated tenants, one of them "
+        "much larger than the others, sequentially and through TenantSyncScheduler, "
+        "and report the total time and when the tenants finish"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tenants", type=int, default=50, help="Simulated tenants")
+        parser.add_argument("--catalog", type=int, default=40, help="Items of every tenant")
+        parser.add_argument("--orders", type=int, default=20, help="Orders of every tenant")
+        parser.add_argument("--large-factor", type=int, default=20,
+                            help="The first tenant has this many times the items and orders")
+        parser.add_argument("--latency-ms", type=float, default=20, help="Latency of every MeLi response")
+        parser.add_argument("--jitter-ms", type=float, default=10, help="Random extra latency")
+        parser.add_argument("--meli-rate", type=float, default=0,
+                            help="Requests per second shared by all the tenants (one MeLi application), 0 unlimited")
+        parser.add_argument("--workers", type=int, help="Workers of the scheduler, MELI_SYNC by default")
+        parser.add_argument("--per-tenant", type=int, help="Jobs at once per tenant, MELI_SYNC by default")
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    def handle(self, *args, **options):
+        tenants = [f"tenant{number:03d}" for number in range(1, options["tenants"] + 1)]
+        rate_limiter = RateLimiter(rate=options["meli_rate"], burst=max(int(options["meli_rate"]), 1))
+
+        with ExitStack() as stack:
+            simulators = {}
+            for number, tenant in enumerate(tenants):
+                factor = options["large_factor"] if number == 0 else 1
+                simulators[tenant] = stack.enter_context(MeliSimulator(
+                    catalog_size=options["catalog"] * factor,
+                    orders=options["orders"] * factor,
+                    users=options["orders"] * factor,
+                    latency=options["latency_ms"] / 1000,
+                    jitter=options["jitter_ms"] / 1000,
+                    seed=number + 1,
+                ))
+
+            for tenant, simulator in simulators.items():
+                meli = MeliService(
+                    tenant, base_url=simulator.url,
+                    repo=InMemoryConfigRepository(simulator.config(), tenant),
+                )
+                # Every tenant calls the same MeLi host with the same application
+                meli.dependency = "meli:benchmark"
+                meli.rate_limiter = rate_limiter
+                register_meli_service(meli)
+
+            report = []
+            cases = [
+                ("sequential", 1, 1),
+                ("scheduler", options["workers"], options["per_tenant"]),
+            ]
+            for case, workers, per_tenant in cases:
+                scheduler = _BenchmarkScheduler(simulators, workers, per_tenant)
+                started = time.perf_counter()
+                result = scheduler.run(tenants, JOBS)
+                elapsed = time.perf_counter() - started
+
+                report.append({"case": case, **_summary(scheduler, tenants, result, elapsed)})
+                if not options["json"]:
+                    self.stdout.write(_format_row(report[-1]))
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+
+
+class _BenchmarkScheduler(TenantSyncScheduler):
+    """Scheduler writing to the WMS sink of the simulators, recording when each tenant finishes."""
+
+    def __init__(self, simulators, max_workers=None, per_tenant=None):
+        super().__init__(max_workers, per_tenant)
+        self.simulators = simulators
+        self.started = time.monotonic()
+        self.finished = {}
+        self._lock = threading.Lock()
+
+    def run(self, tenants=None, jobs=JOBS):
+        self.started = time.monotonic()
+        return super().run(tenants, jobs)
+
+    def _run_job(self, tenant, job, api_key):
+        result = super()._run_job(tenant, job, api_key)
+        with self._lock:
+            self.finished[tenant] = time.monotonic() - self.started
+        return result
+
+    def _wms(self, tenant):
+        return InternalAPIService(base_url=self.simulators[tenant].url)
+
+    def _sync_products(self, tenant, auth):
+        from mercadolibre.functions.Product.sync import MeliWMSSyncService
+
+        service = MeliWMSSyncService(tenant)
+        service.wms = self._wms(tenant)
+        return service.sync_all_products(auth)
+
+    def _sync_orders(self, tenant, auth):
+        from mercadolibre.functions.Order.create import MeliOrderSyncService
+
+        service = MeliOrderSyncService(tenant)
+        service.wms = self._wms(tenant)
+        return service.sync_all_orders(auth)
+
+
+def _summary(scheduler, tenants, result, elapsed):
+    small = sorted(scheduler.finished[tenant] for tenant in tenants[1:])
+    return {
+        "tenants": len(tenants),
+        "jobs": len(tenants) * len(JOBS),
+        "failed": len(result.get("data", {}).get("failed", [])),
+        "workers": scheduler.max_workers,
+        "per_tenant": scheduler.per_tenant,
+        "seconds": round(elapsed, 3),
+        "large_tenant_done_s": round(scheduler.finished[tenants[0]], 3),
+        "small_p50_done_s": round(_percentile(small, 50), 3),
+        "small_p95_done_s": round(_percentile(small, 95), 3),
+    }
+
+
+def _percentile(values, percent):
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+def _format_row(row):
+    return (
+        f"{row['case']:<11} tenants={row['tenants']:<4} jobs={row['jobs']:<4} failed={row['failed']:<3} "
+        f"workers={row['workers']:<3} {row['seconds']:>8} s  large done {row['large_tenant_done_s']:>8} s  "
+        f"small done p50 {row['small_p50_done_s']:>8} s p95 {row['small_p95_done_s']:>8} s"
+    )
@@ -0,0 +1,96 @@
+"""httpx clients of the async MercadoLibre and WMS calls."""
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Awaitable, Iterable, List, Optional
+
+# httpx sends the calls of the async views from the event loop. Without it
+# the async methods of the services run their sync versions in a thread
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+_ssl_context = None
+_ssl_context_lock = threading.Lock()
+
+
+def _get_ssl_context():
+    # Loading the CA bundle takes ~40 ms, the clients of every loop share it
+    global _ssl_context
+    if _ssl_context is None:
+        with _ssl_context_lock:
+            if _ssl_context is None:
+                _ssl_context = httpx.create_ssl_context()
+    return _ssl_context
+
+
+class AsyncClients:
+    """
+    One httpx.AsyncClient per event loop, its connection pool belongs to the
+    loop that opened the connections. Under ASGI the worker has one loop and
+    so one client, shared by the requests; under WSGI every request runs in
+    a loop of its own and opens its own connections. The transport retries
+    a failed connect up to retries times.
+
+    The client of a loop is closed when the loop ends: asyncio.run, which
+    async_to_sync uses under WSGI, cancels the tasks left before closing
+    the loop, and a task waiting on every loop closes its client then.
+    """
+
+    def __init__(self, retries: int = 0, **options: Any):
+        self.retries = retries
+        self.options = options
+        # Client and closing task of every loop
+        self._clients: "weakref.WeakKeyDictionary[Any, Any]" = weakref.WeakKeyDictionary()
+
+    def get(self) -> "httpx.AsyncClient":
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(loop)
+        if entry is None:
+            ssl_context = _get_ssl_context()
+            client = httpx.AsyncClient(
+                verify=ssl_context,
+                transport=httpx.AsyncHTTPTransport(retries=self.retries, verify=ssl_context),
+                **self.options,
+            )
+            entry = self._clients[loop] = (client, loop.create_task(self._close_at_loop_end(loop, client)))
+        return entry[0]
+
+    async def _close_at_loop_end(self, loop: Any, client: "httpx.AsyncClient") -> None:
+        try:
+            await asyncio.Event().wait()
+        finally:
+            # The task refers to the loop, the entry would keep it alive
+            self._clients.pop(loop, None)
+            await client.aclose()
+
+
+def to_httpx_timeout(timeout: Any) -> Optional["httpx.Timeout"]:
+    """Timeout of requests, seconds or (connect, read), as an httpx.Timeout."""
+    if timeout is None:
+        return None
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+async def gather_limited(
+    awaitables: Iterable[Awaitable[Any]], limit: int, return_exceptions: bool = False
+) -> List[Any]:
+    """
+    asyncio.gather running at most limit of the awaitables at once, as the
+    thread pools of the sync services do. Results keep the order.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(awaitable):
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(
+        *(run(awaitable) for awaitable in awaitables), return_exceptions=return_exceptions
+    )
@@ -1,15 +1,26 @@
 """Internal API service for centralized project endpoint requests."""
 
+import asyncio
 import logging
+import uuid
 from typing import Dict, Any, Optional, Union
 from urllib.parse import urljoin
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from asgiref.sync import sync_to_async
 from django.conf import settings
 
+from mercadolibre.services.async_http import AsyncClients, httpx, to_httpx_timeout
+from project.request_timing import measure
+
 logger = logging.getLogger(__name__)
 
+# Statuses retried by the session, and by the async calls with the same backoff
+RETRY_STATUSES = (500, 502, 503, 504)
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.3
+
 
 class InternalAPIService:
     """Service for internal API requests with session management and auth forwarding."""
@@ -24,6 +35,18 @@ class InternalAPIService:
         self.base_url = self._get_base_url(base_url)
         self._session = None
         self._setup_session()
+        self._async_clients = (
+            AsyncClients(
+                retries=RETRY_TOTAL,
+                headers={
+                    "Accept": "application/json",
+                    "Content-Type": "application/json",
+                },
+                limits=httpx.Limits(max_keepalive_connections=20),
+            )
+            if httpx is not None
+            else None
+        )
 
     def _get_base_url(self, override_url: Optional[str] = None) -> str:
         """
@@ -46,9 +69,9 @@ class InternalAPIService:
 
         # Configure retry strategy
         retry_strategy = Retry(
-            total=3,
-            backoff_factor=0.3,
-            status_forcelist=[500, 502, 503, 504],
+            total=RETRY_TOTAL,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=list(RETRY_STATUSES),
             allowed_methods=[
                 "HEAD",
                 "GET",
@@ -152,6 +175,89 @@ class InternalAPIService:
         Returns:
             Response object
         """
+        url = self._prepare_request(method, endpoint, original_request, headers, kwargs)
+
+        try:
+            with measure("wms-api"):
+                response = self.session.request(method, url, **kwargs)
+
+            # Log response status
+            logger.debug(f"Internal API response: {response.status_code}")
+
+            return response
+
+        except requests.exceptions.Timeout:
+            logger.error(f"Timeout calling internal API: {method} {url}")
+            raise
+        except requests.exceptions.ConnectionError:
+            logger.error(f"Connection error calling internal API: {method} {url}")
+            raise
+        except Exception as e:
+            logger.error(
+                f"Unexpected error calling internal API: {method} {url} - {str(e)}"
+            )
+            raise
+
+    async def aforward_request(
+        self,
+        method: str,
+        endpoint: str,
+        original_request: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        forward_request() for the async views, awaited in the event loop. The
+        5xx responses are retried as the session does; the POSTs carry an
+        Idempotency-Key, so the retry of a POST that already wrote gets its
+        stored response instead of writing again. Without httpx the sync
+        forward_request() runs in a thread.
+
+        Returns:
+            httpx.Response, or requests.Response without httpx
+        """
+        if httpx is None:
+            return await sync_to_async(self.forward_request, thread_sensitive=False)(
+                method, endpoint, original_request, headers, **kwargs
+            )
+
+        url = self._prepare_request(method, endpoint, original_request, headers, kwargs)
+        kwargs["timeout"] = to_httpx_timeout(kwargs["timeout"])
+        client = self._async_clients.get()
+
+        try:
+            for attempt in range(RETRY_TOTAL + 1):
+                with measure("wms-api"):
+                    response = await client.request(method, url, **kwargs)
+
+                if response.status_code not in RETRY_STATUSES or attempt == RETRY_TOTAL:
+                    break
+                await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+            logger.debug(f"Internal API response: {response.status_code}")
+            return response
+
+        except httpx.TimeoutException:
+            logger.error(f"Timeout calling internal API: {method} {url}")
+            raise
+        except httpx.TransportError:
+            logger.error(f"Connection error calling internal API: {method} {url}")
+            raise
+        except Exception as e:
+            logger.error(
+                f"Unexpected error calling internal API: {method} {url} - {str(e)}"
+            )
+            raise
+
+    def _prepare_request(
+        self,
+        method: str,
+        endpoint: str,
+        original_request: Any,
+        headers: Optional[Dict[str, str]],
+        kwargs: Dict[str, Any],
+    ) -> str:
+        """Set the headers and timeout of a forwarded request in kwargs, return its URL."""
         # Build complete URL
         url = self.build_url(endpoint)
 
@@ -168,6 +274,10 @@ class InternalAPIService:
         if headers:
             request_headers.update(headers)
 
+        # The session retries POSTs on 5xx, with the key a retry does not write twice
+        if method.upper() == "POST":
+            request_headers.setdefault("Idempotency-Key", str(uuid.uuid4()))
+
         # Set headers in kwargs
         if request_headers:
             kwargs["headers"] = request_headers
@@ -179,25 +289,7 @@ class InternalAPIService:
         # Log the request
         logger.debug(f"Internal API {method} request to: {url}")
 
-        try:
-            response = self.session.request(method, url, **kwargs)
-
-            # Log response status
-            logger.debug(f"Internal API response: {response.status_code}")
-
-            return response
-
-        except requests.exceptions.Timeout:
-            logger.error(f"Timeout calling internal API: {method} {url}")
-            raise
-        except requests.exceptions.ConnectionError:
-            logger.error(f"Connection error calling internal API: {method} {url}")
-            raise
-        except Exception as e:
-            logger.error(
-                f"Unexpected error calling internal API: {method} {url} - {str(e)}"
-            )
-            raise
+        return url
 
     def get(
         self, endpoint: str, original_request: Any = None, **kwargs
@@ -229,6 +321,18 @@ class InternalAPIService:
         """Make DELETE request to internal API."""
         return self.forward_request("DELETE", endpoint, original_request, **kwargs)
 
+    async def aget(self, endpoint: str, original_request: Any = None, **kwargs) -> Any:
+        """Make an async GET request to internal API."""
+        return await self.aforward_request("GET", endpoint, original_request, **kwargs)
+
+    async def apost(self, endpoint: str, original_request: Any = None, **kwargs) -> Any:
+        """Make an async POST request to internal API."""
+        return await self.aforward_request("POST", endpoint, original_request, **kwargs)
+
+    async def aput(self, endpoint: str, original_request: Any = None, **kwargs) -> Any:
+        """Make an async PUT request to internal API."""
+        return await self.aforward_request("PUT", endpoint, original_request, **kwargs)
+
     def close(self):
         """Close the session and free resources."""
         if self._session:
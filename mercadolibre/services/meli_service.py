@@ -1,15 +1,26 @@
 """MercadoLibre API service for centralized authentication and requests."""
 
+import asyncio
+import inspect
 import logging
+import threading
 import time
 import uuid
+from contextlib import asynccontextmanager, contextmanager
 from typing import Dict, Any, Optional, List
 from functools import wraps
+from urllib.parse import urlsplit
 import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 from project.config_db.repository import MeliConfigRepository
+from project import metrics, resilience
+from project.request_timing import measure
+from mercadolibre.services.async_http import AsyncClients, httpx
+from mercadolibre.services.rate_limiter import get_rate_limiter
 from mercadolibre.utils.exceptions import (
     MeliError,
     MeliAuthError,
@@ -17,6 +28,7 @@ from mercadolibre.utils.exceptions import (
     MeliBadRequestError,
     MeliRateLimitError,
     MeliServerError,
+    MeliUnavailableError,
 )
 
 logger = logging.getLogger(__name__)
@@ -29,6 +41,21 @@ def retry_on_rate_limit(max_retries: int = 3, delay: int = 5):
     """Decorator for retrying functions on rate limit errors."""
 
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                for attempt in range(1, max_retries + 1):
+                    try:
+                        return await func(*args, **kwargs)
+                    except MeliRateLimitError:
+                        if attempt == max_retries:
+                            raise
+                        logger.warning(f"Rate limit hit, retrying in {delay} seconds...")
+                        await asyncio.sleep(delay)
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             retries = 0
@@ -54,14 +81,40 @@ def retry_on_rate_limit(max_retries: int = 3, delay: int = 5):
 class MeliService:
     """Service for MercadoLibre API interactions with automatic token refresh."""
 
-    BASE_URL = "https://api.mercadolibre.com"
-    TOKEN_URL = "https://api.mercadolibre.com/oauth/token"
-
-    def __init__(self):
-        """Initialize MeLi service with repository and session."""
-        self.repo = MeliConfigRepository()
+    BASE_URL = getattr(settings, "MELI_API_URL", "https://api.mercadolibre.com").rstrip("/")
+    TOKEN_URL = f"{BASE_URL}/oauth/token"
+
+    def __init__(
+        self,
+        tenant: Optional[str] = None,
+        base_url: Optional[str] = None,
+        repo: Any = None,
+    ):
+        """
+        Initialize MeLi service with repository and session.
+
+        Args:
+            tenant: Tenant whose MeLi configuration and tokens are used,
+                None for the single configuration of one-seller deployments
+            base_url: Override BASE_URL, e.g. a local MeLi simulator
+            repo: Override the configuration repository of the tenant
+        """
+        if base_url:
+            self.BASE_URL = base_url.rstrip("/")
+            self.TOKEN_URL = f"{self.BASE_URL}/oauth/token"
+
+        self.tenant = tenant
+        # Circuit and bulkhead shared by the services calling the same host
+        self.dependency = f"meli:{urlsplit(self.BASE_URL).netloc}"
+        self.timeout = getattr(settings, "RESILIENCE", {}).get("MELI_TIMEOUT", 30)
+        self.repo = repo or MeliConfigRepository(tenant)
         self.request_id = str(uuid.uuid4())
+        self.rate_limiter = get_rate_limiter()
+        self._tokens: Optional[Dict[str, str]] = None
+        self._token_lock = threading.Lock()
         self._setup_session()
+        # Clients of the async calls, the transport retries failed connects
+        self._async_clients = AsyncClients(retries=3) if httpx is not None else None
 
     def _setup_session(self):
         """Configure requests session with retry strategy."""
@@ -76,11 +129,34 @@ class MeliService:
         self.session.mount("https://", adapter)
 
     def _get_tokens(self) -> Dict[str, str]:
+        # Tokens are kept in memory, the database is read again on a 401
+        if self._tokens is None:
+            return self._load_tokens()
+        return self._tokens
+
+    def _load_tokens(self) -> Dict[str, str]:
         tokens = self.repo.get_tokens()
         if not tokens:
             raise RuntimeError("No tokens found in database")
+        self._tokens = tokens
         return tokens
 
+    def _renew_tokens(self, used_tokens: Dict[str, str]) -> Dict[str, str]:
+        """
+        Get valid tokens after a 401 with used_tokens. Only one thread
+        refreshes per tenant; tokens already refreshed by another thread or
+        process are reused, since the refresh token can be used once.
+        """
+        with self._token_lock:
+            if self._tokens and self._tokens["access_token"] != used_tokens["access_token"]:
+                return self._tokens
+
+            stored = self._load_tokens()
+            if stored["access_token"] != used_tokens["access_token"]:
+                return stored
+
+            return self._refresh_token(current_tokens=stored)
+
     def _refresh_token(
         self, current_tokens: Optional[Dict[str, str]] = None
     ) -> Dict[str, str]:
@@ -98,7 +174,13 @@ class MeliService:
                 "refresh_token": tokens["refresh_token"],
             }
 
-            response = self.session.post(self.TOKEN_URL, data=payload)
+            with self._guard() as call:
+                with measure("meli"):
+                    response = self.session.post(
+                        self.TOKEN_URL, data=payload, timeout=self.timeout
+                    )
+                if response.status_code >= 500:
+                    call.fail()
             response.raise_for_status()
 
             data = response.json()
@@ -107,7 +189,12 @@ class MeliService:
 
             # Update tokens in database
             self.repo.update_tokens(new_access_token, new_refresh_token)
+            self._tokens = {
+                "access_token": new_access_token,
+                "refresh_token": new_refresh_token,
+            }
 
+            metrics.inc("meli_token_refreshes_total", tenant=self.tenant or "", result="success")
             logger.info(
                 "Token refreshed successfully", extra={"request_id": self.request_id}
             )
@@ -117,6 +204,7 @@ class MeliService:
             }
 
         except requests.exceptions.RequestException as e:
+            metrics.inc("meli_token_refreshes_total", tenant=self.tenant or "", result="failure")
             logger.error(
                 f"Token refresh failed: {str(e)}", extra={"request_id": self.request_id}
             )
@@ -197,16 +285,16 @@ class MeliService:
         self._log_request(method, endpoint, **kwargs)
 
         try:
-            response = self.session.request(method, url, **kwargs)
+            response = self._send(method, url, **kwargs)
 
             if response.status_code == 401 and auto_refresh:
                 logger.info(
                     "Token expired, refreshing...",
                     extra={"request_id": self.request_id},
                 )
-                new_tokens = self._refresh_token(current_tokens=tokens)
+                new_tokens = self._renew_tokens(tokens)
                 kwargs["headers"] = self._get_headers(new_tokens["access_token"])
-                response = self.session.request(method, url, **kwargs)
+                response = self._send(method, url, **kwargs)
 
             if response.status_code != 200:
                 self._handle_api_error(response)
@@ -219,6 +307,139 @@ class MeliService:
             )
             raise MeliError(f"Request failed: {str(e)}")
 
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send one call within the rate limit, counting it by status."""
+        kwargs.setdefault("timeout", self.timeout)
+
+        # The token is taken before the bulkhead, a call waiting for it
+        # must not hold a place of the MeLi host
+        self.rate_limiter.acquire()
+        with self._guard() as call:
+            try:
+                with measure("meli"):
+                    response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.RequestException:
+                metrics.inc("meli_api_requests_total", tenant=self.tenant or "", status="error")
+                raise
+
+            if response.status_code >= 500:
+                call.fail()
+
+        metrics.inc("meli_api_requests_total", tenant=self.tenant or "", status=response.status_code)
+        return response
+
+    @contextmanager
+    def _guard(self):
+        """
+        Run a call within the circuit and bulkhead of the MeLi host. Network
+        errors and 5xx responses count as failures; while the circuit is open
+        or the bulkhead is full the call fails fast with MeliUnavailableError.
+        """
+        try:
+            with resilience.guard(
+                self.dependency, failures=(requests.exceptions.RequestException,)
+            ) as call:
+                yield call
+        except resilience.DependencyUnavailable as e:
+            logger.warning(str(e), extra={"request_id": self.request_id})
+            raise MeliUnavailableError(str(e), retry_after=e.retry_after)
+
+    # -------------------
+    # Llamadas async
+    # -------------------
+    async def arequest(
+        self, method: str, endpoint: str, auto_refresh: bool = True, **kwargs
+    ) -> Any:
+        """
+        request() for the async views: the call is awaited in the event loop,
+        with the same rate limit, circuit and errors. Only the token reads
+        and refreshes, which go to Mongo, run in a thread. Without httpx the
+        sync request() runs in a thread.
+
+        Returns:
+            httpx.Response, or requests.Response without httpx
+        """
+        if httpx is None:
+            return await sync_to_async(self.request, thread_sensitive=False)(
+                method, endpoint, auto_refresh=auto_refresh, **kwargs
+            )
+        return await self._arequest(method, endpoint, auto_refresh, **kwargs)
+
+    @retry_on_rate_limit()
+    async def _arequest(
+        self, method: str, endpoint: str, auto_refresh: bool = True, **kwargs
+    ) -> "httpx.Response":
+        if not endpoint.startswith("/"):
+            endpoint = f"/{endpoint}"
+
+        url = f"{self.BASE_URL}{endpoint}"
+        tokens = self._tokens or await sync_to_async(
+            self._get_tokens, thread_sensitive=False
+        )()
+
+        headers = self._get_headers(tokens["access_token"])
+        if "headers" in kwargs:
+            headers.update(kwargs["headers"])
+        kwargs["headers"] = headers
+
+        self._log_request(method, endpoint, **kwargs)
+
+        try:
+            response = await self._asend(method, url, **kwargs)
+
+            if response.status_code == 401 and auto_refresh:
+                logger.info(
+                    "Token expired, refreshing...",
+                    extra={"request_id": self.request_id},
+                )
+                new_tokens = await sync_to_async(
+                    self._renew_tokens, thread_sensitive=False
+                )(tokens)
+                kwargs["headers"] = self._get_headers(new_tokens["access_token"])
+                response = await self._asend(method, url, **kwargs)
+
+            if response.status_code != 200:
+                self._handle_api_error(response)
+
+            return response
+
+        except httpx.HTTPError as e:
+            logger.error(
+                f"Request failed: {str(e)}", extra={"request_id": self.request_id}
+            )
+            raise MeliError(f"Request failed: {str(e)}")
+
+    async def _asend(self, method: str, url: str, **kwargs) -> "httpx.Response":
+        """_send() awaited in the event loop."""
+        kwargs.setdefault("timeout", self.timeout)
+
+        await self.rate_limiter.aacquire()
+        async with self._aguard() as call:
+            try:
+                with measure("meli"):
+                    response = await self._async_clients.get().request(method, url, **kwargs)
+            except httpx.HTTPError:
+                metrics.inc("meli_api_requests_total", tenant=self.tenant or "", status="error")
+                raise
+
+            if response.status_code >= 500:
+                call.fail()
+
+        metrics.inc("meli_api_requests_total", tenant=self.tenant or "", status=response.status_code)
+        return response
+
+    @asynccontextmanager
+    async def _aguard(self):
+        """_guard() for the calls awaited in the event loop."""
+        try:
+            async with resilience.aguard(
+                self.dependency, failures=(httpx.HTTPError,)
+            ) as call:
+                yield call
+        except resilience.DependencyUnavailable as e:
+            logger.warning(str(e), extra={"request_id": self.request_id})
+            raise MeliUnavailableError(str(e), retry_after=e.retry_after)
+
     # Métodos convenientes
     def get(self, endpoint: str, **kwargs) -> requests.Response:
         return self.request("GET", endpoint, **kwargs)
@@ -324,6 +545,28 @@ class MeliService:
 
         return product_data
 
+    def get_items_quantities(self, item_ids: List[str]) -> Dict[str, Any]:
+        """Obtiene el available_quantity de varios items, 20 por llamada"""
+        quantities = {}
+        for i in range(0, len(item_ids), 20):
+            response = self.get(
+                "/items",
+                params={
+                    "ids": ",".join(item_ids[i : i + 20]),
+                    "attributes": "id,available_quantity",
+                },
+            )
+            for item in response.json():
+                body = item.get("body")
+                if item.get("code") == 200 and isinstance(body, dict):
+                    quantities[body["id"]] = body.get("available_quantity")
+        return quantities
+
+    def update_item_stock(self, item_id: str, quantity: int) -> Dict[str, Any]:
+        """Actualiza el available_quantity de un item"""
+        response = self.put(f"/items/{item_id}", json={"available_quantity": quantity})
+        return response.json()
+
     # Métodos relacionados con órdenes
     def get_order(self, order_id: str) -> Dict[str, Any]:
         """Obtiene información de una orden en MercadoLibre"""
@@ -375,18 +618,106 @@ class MeliService:
         data = response.json()
         return data.get("results", [])
 
+    # -------------------
+    # Funciones de negocio async
+    # -------------------
+    async def aget(self, endpoint: str, **kwargs) -> Any:
+        return await self.arequest("GET", endpoint, **kwargs)
+
+    async def aget_user(self, user_id: str) -> Dict[str, Any]:
+        """get_user() async"""
+        response = await self.aget(f"/users/{user_id}")
+        return response.json()
+
+    async def aget_user_products(self, user_id: str) -> List[str]:
+        """get_user_products() async"""
+        response = await self.aget(f"/users/{user_id}/items/search")
+        return response.json().get("results", [])
+
+    async def aget_product_description(self, product_id: str) -> Optional[Dict[str, Any]]:
+        """get_product_description() async"""
+        try:
+            response = await self.aget(f"/items/{product_id}/description")
+            return response.json()
+        except Exception:
+            return None
+
+    async def aget_products_batch(self, product_ids: List[str]) -> List[Dict[str, Any]]:
+        """get_products_batch() async, the descriptions of a batch are awaited together"""
+        products = []
+
+        for i in range(0, len(product_ids), 20):
+            response = await self.aget(
+                "/items", params={"ids": ",".join(product_ids[i : i + 20])}
+            )
+            batch_products = [
+                item["body"]
+                for item in response.json()
+                if item.get("code") == 200 and isinstance(item.get("body"), dict)
+            ]
+
+            with_id = [product for product in batch_products if "id" in product]
+            descriptions = await asyncio.gather(
+                *(self.aget_product_description(product["id"]) for product in with_id)
+            )
+            for product, description in zip(with_id, descriptions):
+                if description:
+                    product["description_data"] = description
+
+            products.extend(batch_products)
+
+        return products
+
+    async def aget_product(self, product_id: str) -> Dict[str, Any]:
+        """get_product() async"""
+        response = await self.aget(f"/items/{product_id}")
+        product_data = response.json()
+
+        description = await self.aget_product_description(product_id)
+        if description:
+            product_data["description_data"] = description
+
+        return product_data
+
+    async def aget_order(self, order_id: str) -> Dict[str, Any]:
+        """get_order() async"""
+        response = await self.aget(f"/orders/{order_id}")
+        return response.json()
+
+    async def aget_user_orders(
+        self, user_id: str, status: Optional[str] = None, limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """get_user_orders() async"""
+        params = {"seller": user_id, "limit": limit}
+        if status:
+            params["order.status"] = status
+
+        response = await self.aget("/orders/search", params=params)
+        return response.json().get("results", [])
+
 
 # -------------------------------------------------------------------
 # Singleton y funciones auxiliares
 # -------------------------------------------------------------------
-_meli_service: Optional[MeliService] = None
+_meli_services: Dict[Optional[str], MeliService] = {}
+_meli_services_lock = threading.Lock()
+
+
+def get_meli_service(tenant: Optional[str] = None) -> MeliService:
+    """Get or create the MeLi service of a tenant, None is the default configuration."""
+    service = _meli_services.get(tenant)
+    if service is None:
+        with _meli_services_lock:
+            service = _meli_services.get(tenant)
+            if service is None:
+                service = _meli_services[tenant] = MeliService(tenant)
+    return service
 
 
-def get_meli_service() -> MeliService:
-    global _meli_service
-    if _meli_service is None:
-        _meli_service = MeliService()
-    return _meli_service
+def register_meli_service(service: MeliService) -> None:
+    """Use service for its tenant, e.g. one pointed at a local simulator."""
+    with _meli_services_lock:
+        _meli_services[service.tenant] = service
 
 
 def make_authenticated_request(
@@ -0,0 +1,70 @@
+"""Token bucket limiting the request rate to the MercadoLibre API."""
+
+import asyncio
+import time
+from threading import Lock
+from typing import Optional
+
+from django.conf import settings
+
+
+class RateLimiter:
+    """Thread-safe token bucket: `rate` tokens per second, up to `burst`."""
+
+    def __init__(self, rate: float = 10.0, burst: int = 20):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = Lock()
+
+    def acquire(self) -> None:
+        """Block until a request can be sent."""
+        if self.rate <= 0:
+            return
+
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def aacquire(self) -> None:
+        """Wait in the event loop until a request can be sent."""
+        if self.rate <= 0:
+            return
+
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def _take(self) -> float:
+        """Take a token, or return the seconds until there is one."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+
+            return (1 - self._tokens) / self.rate
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get or create the process wide MercadoLibre rate limiter."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        config = getattr(settings, "MELI_RATE_LIMIT", {})
+        _rate_limiter = RateLimiter(
+            rate=config.get("RATE", 10.0), burst=config.get("BURST", 20)
+        )
+    return _rate_limiter
@@ -0,0 +1,184 @@
+"""Scheduler running the MercadoLibre syncs of many tenants in parallel."""
+
+import logging
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+
+from project.config_db.repository import MeliConfigRepository
+
+logger = logging.getLogger(__name__)
+
+
+SYNC_JOBS = ("products", "orders", "stock")
+
+
+class TenantSyncScheduler:
+    """
+    Runs the product, order and stock syncs of every tenant with a MeLi
+    configuration on one thread pool.
+
+    A tenant never has more than `per_tenant` jobs running and free workers
+    are handed to the tenants round robin, so a seller with a long queue
+    cannot starve the others. Each tenant uses its own MeliService, which
+    keeps the tokens of that tenant.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, per_tenant: Optional[int] = None):
+        config = getattr(settings, "MELI_SYNC", {})
+        self.max_workers = max_workers or config.get("MAX_WORKERS", 8)
+        self.per_tenant = per_tenant or config.get("PER_TENANT", 1)
+
+        self.runners = {
+            "products": self._sync_products,
+            "orders": self._sync_orders,
+            "stock": self._push_stock,
+        }
+
+    def discover_tenants(self) -> List[str]:
+        """
+        Get the tenants with a MeLi configuration and an API key. The key is
+        needed to call the WMS endpoints on behalf of the tenant.
+        """
+        configured = MeliConfigRepository().list_tenants()
+        api_keys = self._get_api_keys()
+
+        missing = [tenant for tenant in configured if tenant not in api_keys]
+        if missing:
+            logger.warning(f"Tenants with MeLi configuration but no API key: {', '.join(missing)}")
+
+        return [tenant for tenant in configured if tenant in api_keys]
+
+    def run(
+        self,
+        tenants: Optional[Iterable[str]] = None,
+        jobs: Iterable[str] = SYNC_JOBS,
+    ) -> Dict[str, Any]:
+        """
+        Run the jobs of the tenants and wait for all of them.
+
+        Args:
+            tenants: Tenants to sync, all the discovered ones by default
+            jobs: Jobs run for each tenant, in order
+
+        Returns:
+            Dict with the result of each job by tenant
+        """
+        jobs = list(jobs)
+        unknown = [job for job in jobs if job not in self.runners]
+        if unknown:
+            return {
+                'success': False,
+                'message': f'Unknown jobs: {", ".join(unknown)}'
+            }
+
+        tenants = list(tenants) if tenants is not None else self.discover_tenants()
+        api_keys = self._get_api_keys()
+
+        started = time.monotonic()
+        queues = {tenant: deque(jobs) for tenant in tenants}
+        turn = deque(tenant for tenant in tenants if queues[tenant])
+        running = defaultdict(int)
+        results = defaultdict(dict)
+        futures = {}
+
+        logger.info(f"Syncing {len(tenants)} tenants ({', '.join(jobs)}) with {self.max_workers} workers")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while turn or futures:
+                # Hand the free workers to the tenants round robin
+                skipped = 0
+                while turn and len(futures) < self.max_workers and skipped < len(turn):
+                    tenant = turn.popleft()
+                    if running[tenant] >= self.per_tenant:
+                        turn.append(tenant)
+                        skipped += 1
+                        continue
+
+                    skipped = 0
+                    job = queues[tenant].popleft()
+                    running[tenant] += 1
+                    future = executor.submit(self._run_job, tenant, job, api_keys.get(tenant))
+                    futures[future] = (tenant, job)
+
+                    if queues[tenant]:
+                        turn.append(tenant)
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    tenant, job = futures.pop(future)
+                    running[tenant] -= 1
+                    results[tenant][job] = future.result()
+
+        failed = sorted(
+            f"{tenant}:{job}"
+            for tenant, tenant_results in results.items()
+            for job, result in tenant_results.items()
+            if not result.get('success')
+        )
+
+        return {
+            'success': not failed,
+            'message': f'{len(tenants)} tenants synced, {len(failed)} jobs failed',
+            'data': {
+                'tenants': dict(results),
+                'failed': failed,
+                'duration': round(time.monotonic() - started, 3),
+                'synced_at': datetime.now().isoformat(),
+            }
+        }
+
+    def _run_job(self, tenant: str, job: str, api_key: Optional[str]) -> Dict[str, Any]:
+        """Run one job, errors are returned as a failed result."""
+        started = time.monotonic()
+        try:
+            # WMS endpoints authenticate the tenant by its API key
+            auth = {"Authorization": api_key} if api_key else None
+            result = self.runners[job](tenant, auth)
+        except Exception as e:
+            logger.exception(f"Error running {job} sync for {tenant}")
+            result = {
+                'success': False,
+                'message': f'Unexpected error: {str(e)}'
+            }
+
+        return {
+            'success': bool(result.get('success')),
+            'message': result.get('message', ''),
+            'duration': round(time.monotonic() - started, 3),
+        }
+
+    def _sync_products(self, tenant: str, auth: Optional[Dict[str, str]]) -> Dict[str, Any]:
+        from mercadolibre.functions.Product.sync import MeliWMSSyncService
+
+        return MeliWMSSyncService(tenant).sync_all_products(auth)
+
+    def _sync_orders(self, tenant: str, auth: Optional[Dict[str, str]]) -> Dict[str, Any]:
+        from mercadolibre.functions.Order.create import MeliOrderSyncService
+
+        return MeliOrderSyncService(tenant).sync_all_orders(auth)
+
+    def _push_stock(self, tenant: str, auth: Optional[Dict[str, str]]) -> Dict[str, Any]:
+        from mercadolibre.functions.Inventory.stock_push import InventoryStockPushService
+
+        return InventoryStockPushService(tenant=tenant).push_stock(tenant)
+
+    def _get_api_keys(self) -> Dict[str, str]:
+        """API key of each tenant (settings.API_KEYS maps key -> tenant)."""
+        return {tenant: key for key, tenant in getattr(settings, "API_KEYS", {}).items()}
+
+
+# Singleton instance
+_sync_scheduler: Optional[TenantSyncScheduler] = None
+
+
+def get_sync_scheduler() -> TenantSyncScheduler:
+    """Get or create tenant sync scheduler singleton."""
+    global _sync_scheduler
+    if _sync_scheduler is None:
+        _sync_scheduler = TenantSyncScheduler()
+    return _sync_scheduler
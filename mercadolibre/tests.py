@@ -1,3 +1,265 @@
-from django.test import TestCase
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+from mercadolibre.functions.Inventory import stock_push
+from mercadolibre.services import rate_limiter
+from mercadolibre.services.async_http import AsyncClients
+from mercadolibre.services.meli_service import MeliService
+from mercadolibre.services.rate_limiter import RateLimiter
+from mercadolibre.utils.mapper.data_mapper import OrderMapper
+from mercadolibre.views.inventory import MeliStockPushView
+from project import resilience
+
+
+class FakeClock:
+    """
+    monotonic() and sleep() of a clock that only moves when slept. The
+    tests use rates whose intervals are exact binary fractions.
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+    async def asleep(self, seconds):
+        self.sleep(seconds)
+
+
+class OrderMapperTests(TestCase):
+
+    def meli_order(self, city, state, country='CO'):
+        return {
+            'id': 2000001,
+            'status': 'paid',
+            'seller': {'id': 123},
+            'buyer': {'id': 456},
+            'order_items': [],
+            'shipping': {
+                'id': 789,
+                'receiver_address': {
+                    'city': {'name': city},
+                    'state': {'name': state},
+                    'country': {'id': country},
+                    'street_name': 'Calle 10',
+                    'street_number': '20-30',
+                },
+            },
+        }
+
+    def test_dispatch_city_and_department_codes(self):
+        order = OrderMapper.from_meli_order(self.meli_order('Medellín', 'Antioquia'))
+        self.assertEqual(order.ciudad_despacho, '05001')
+        self.assertEqual(order.departamento_despacho, '05')
+        self.assertEqual(order.ciudad, 'Medellín')
+
+        order = OrderMapper.from_meli_order(self.meli_order('Bogotá D.C.', 'Bogotá D.C.'))
+        self.assertEqual(order.ciudad_despacho, '11001')
+        self.assertEqual(order.departamento_despacho, '11')
+
+    def test_dispatch_names_when_not_resolved(self):
+        order = OrderMapper.from_meli_order(self.meli_order('Xyzw', 'Qwerty'))
+        self.assertEqual(order.ciudad_despacho, 'Xyzw')
+        self.assertEqual(order.departamento_despacho, 'Qwerty')
+
+        order = OrderMapper.from_meli_order(self.meli_order('Buenos Aires', 'Capital Federal', 'AR'))
+        self.assertEqual(order.ciudad_despacho, 'Buenos Aires')
+
+
+class RateLimiterTests(SimpleTestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.multiple(
+            rate_limiter,
+            time=SimpleNamespace(monotonic=self.clock.monotonic, sleep=self.clock.sleep),
+            asyncio=SimpleNamespace(sleep=self.clock.asleep),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_then_rate(self):
+        limiter = RateLimiter(rate=4, burst=5)
+
+        for _ in range(5):
+            limiter.acquire()
+        self.assertEqual(self.clock.slept, [])
+
+        limiter.acquire()
+        self.assertEqual(self.clock.slept, [0.25])
+
+    def test_refill(self):
+        limiter = RateLimiter(rate=4, burst=5)
+        for _ in range(5):
+            limiter.acquire()
+
+        self.clock.now += 0.5
+        self.assertEqual(limiter._take(), 0)
+        self.assertEqual(limiter._take(), 0)
+        self.assertAlmostEqual(limiter._take(), 0.25)
+
+    def test_refill_is_capped_by_burst(self):
+        limiter = RateLimiter(rate=4, burst=5)
+        limiter.acquire()
+
+        self.clock.now += 3600
+        for _ in range(5):
+            self.assertEqual(limiter._take(), 0)
+        self.assertGreater(limiter._take(), 0)
+
+    def test_sustained_rate(self):
+        limiter = RateLimiter(rate=8, burst=2)
+        started = self.clock.now
+        for _ in range(18):
+            limiter.acquire()
+        self.assertEqual(self.clock.now - started, 2.0)
+
+    def test_aacquire(self):
+        limiter = RateLimiter(rate=2, burst=1)
+
+        async def run():
+            for _ in range(3):
+                await limiter.aacquire()
+
+        asyncio.run(run())
+        self.assertEqual(self.clock.slept, [0.5, 0.5])
+
+    def test_unlimited(self):
+        limiter = RateLimiter(rate=0, burst=1)
+        for _ in range(100):
+            limiter.acquire()
+        self.assertEqual(self.clock.slept, [])
+
+
+class MeliBulkheadTests(SimpleTestCase):
+    """
+    More calls than places in the bulkhead, throttled by the rate limiter:
+    the calls waiting for a token do not hold a place, so none is rejected.
+    """
+
+    CALLS = 8
+
+    def setUp(self):
+        self.meli = MeliService('tenant', base_url='http://meli.test', repo=mock.Mock())
+        self.meli.dependency = 'meli:bulkhead-test'
+        # 40 ms between calls of 10 ms, the places are never all taken
+        self.meli.rate_limiter = RateLimiter(rate=25, burst=1)
+        self.running = 0
+        self.most_running = 0
+        self.lock = threading.Lock()
+
+        bulkhead = resilience.Bulkhead(self.meli.dependency, max_concurrent=2, acquire_timeout=0.05)
+        breaker = resilience.CircuitBreaker(self.meli.dependency)
+        for patcher in (
+            mock.patch.dict(resilience._bulkheads, {self.meli.dependency: bulkhead}),
+            mock.patch.dict(resilience._breakers, {self.meli.dependency: breaker}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def enter(self):
+        with self.lock:
+            self.running += 1
+            self.most_running = max(self.most_running, self.running)
+
+    def leave(self):
+        with self.lock:
+            self.running -= 1
+
+    def test_threads(self):
+        def request(method, url, **kwargs):
+            self.enter()
+            time.sleep(0.01)
+            self.leave()
+            return SimpleNamespace(status_code=200)
+
+        self.meli.session = mock.Mock(request=request)
+        with ThreadPoolExecutor(self.CALLS) as executor:
+            responses = list(executor.map(
+                lambda _: self.meli._send('GET', 'http://meli.test/items'), range(self.CALLS)
+            ))
+
+        self.assertEqual([r.status_code for r in responses], [200] * self.CALLS)
+        self.assertLessEqual(self.most_running, 2)
+
+    def test_event_loop(self):
+        async def request(method, url, **kwargs):
+            self.enter()
+            await asyncio.sleep(0.01)
+            self.leave()
+            return SimpleNamespace(status_code=200)
+
+        self.meli._async_clients = mock.Mock(get=lambda: SimpleNamespace(request=request))
+
+        async def run():
+            return await asyncio.gather(*(
+                self.meli._asend('GET', 'http://meli.test/items') for _ in range(self.CALLS)
+            ))
+
+        responses = asyncio.run(run())
+        self.assertEqual([r.status_code for r in responses], [200] * self.CALLS)
+        self.assertLessEqual(self.most_running, 2)
+
+
+class StockPushViewTests(SimpleTestCase):
+
+    def test_pushes_with_the_service_of_the_tenant(self):
+        built = []
+
+        class FakeStockPushService:
+            def __init__(self, tenant=None):
+                built.append(tenant)
+                self.tenant = tenant
+
+            def push_stock(self, db_name, **kwargs):
+                return {'success': True, 'seller_of': self.tenant, 'db_name': db_name}
+
+        with mock.patch.object(stock_push, 'InventoryStockPushService', FakeStockPushService), \
+                mock.patch.dict(stock_push._stock_push_services, clear=True):
+            for tenant in ('tenant_a', 'tenant_b', 'tenant_a'):
+                request = RequestFactory().post('/', data=b'{}', content_type='application/json')
+                request.db_name = tenant
+                response = asyncio.run(MeliStockPushView.as_view()(request))
+
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(
+                    json.loads(response.content),
+                    {'success': True, 'seller_of': tenant, 'db_name': tenant},
+                )
+
+        # One service per tenant, reused by its next pushes
+        self.assertEqual(built, ['tenant_a', 'tenant_b'])
+
+
+class AsyncClientsTests(SimpleTestCase):
+
+    def test_one_client_per_loop_closed_with_it(self):
+        clients = AsyncClients()
+
+        async def use():
+            client = clients.get()
+            self.assertIs(clients.get(), client)
+            return client
+
+        first = asyncio.run(use())
+        # A WSGI request running an async view
+        second = async_to_sync(use)()
+
+        self.assertIsNot(first, second)
+        self.assertTrue(first.is_closed)
+        self.assertTrue(second.is_closed)
+        self.assertEqual(len(clients._clients), 0)
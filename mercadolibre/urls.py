@@ -4,7 +4,7 @@ from mercadolibre.views.auth import auth
 from mercadolibre.views.Customer import MeliCustomerSyncView
 from mercadolibre.views.product import MeliProductSyncView
 from mercadolibre.views.Supplier import SupplierSyncView
-from mercadolibre.views.inventory import MeliInventoryView
+from mercadolibre.views.inventory import MeliInventoryView, MeliStockPushView
 from mercadolibre.views.order import MeliOrderSyncView
 
 
@@ -18,6 +18,7 @@ mercadolibre_endpoints = [
     path("product/", MeliProductSyncView.as_view(), name="meli-sync"),
     # Inventario - Gestión unificada
     path("inventory/", MeliInventoryView.as_view(), name="meli-inventory"),
+    path("inventory/stock/", MeliStockPushView.as_view(), name="meli-inventory-stock"),
     # Pedidos - Sincronización unificada
     path("order/", MeliOrderSyncView.as_view(), name="meli_order_sync"),
     # Provedores
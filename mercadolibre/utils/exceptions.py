@@ -52,6 +52,18 @@ class MeliServerError(MeliError):
     pass
 
 
+class MeliUnavailableError(MeliServerError):
+    """
+    Llamada rechazada sin enviarla: el circuito de MercadoLibre está abierto
+    o hay demasiadas llamadas en curso. retry_after son los segundos sugeridos
+    antes de reintentar.
+    """
+
+    def __init__(self, message: str, retry_after: int = 1):
+        self.retry_after = retry_after
+        super().__init__(message, status_code=503)
+
+
 class UserMappingError(Exception):
     """Error al mapear un cliente desde MercadoLibre a WMS."""
 
@@ -3,6 +3,8 @@ from dataclasses import asdict, dataclass
 from datetime import datetime
 import logging
 
+from wmsAdapterV2.utils.get_info_city_department import resolve_Colombia_address
+
 logger = logging.getLogger(__name__)
 
 
@@ -683,6 +685,14 @@ class OrderMapper:
             if street or number:
                 full_address = ", ".join(filter(None, [street, number]))
 
+        # DANE codes of the dispatch city and department, the names when
+        # the address is not Colombian or is not found
+        ciudad_despacho, departamento_despacho = city, state
+        if country == "CO":
+            city_code, department_code = resolve_Colombia_address(city, state)
+            ciudad_despacho = city_code or city
+            departamento_despacho = department_code or state
+
         # ====== STATUS ======
         status = meli_order.get("status", "")
         if status == "paid":
@@ -730,7 +740,7 @@ class OrderMapper:
             item=item_id,
             nombrecliente=buyer_name,
             direccion_despacho=full_address,
-            ciudad_despacho=str(meli_order.get("seller", {}).get("id", "")),
+            ciudad_despacho=ciudad_despacho,
             ciudad=city,
             estadoerp=estado_erp,
             bodega=bodega,
@@ -740,7 +750,7 @@ class OrderMapper:
             email=buyer_email,
             notas=notas,
             pais_despacho=country.lower() if country else None,
-            departamento_despacho=state,
+            departamento_despacho=departamento_despacho,
             nit=nit,
             estadopicking=estado_picking,
             fecharegistro=fecharegistro,
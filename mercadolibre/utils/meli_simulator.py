@@ -0,0 +1,485 @@
+"""
+Local MercadoLibre API simulator.
+
+Serves the MercadoLibre endpoints used by the sync services from a synthetic
+catalog, so the syncs can run and be measured without api.mercadolibre.com.
+Point MeliService at it with `MeliService(base_url=simulator.url)` or the
+MELI_API_URL setting. Paths under /wms/ answer as an accepting WMS, so the
+sync services can also use it as their internal API.
+"""
+
+import json
+import logging
+import random
+import re
+import secrets
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from project.config_db.models import MeliConfig
+from mercadolibre.utils.mapper.data_mapper import SITE_TO_CURRENCY
+
+logger = logging.getLogger(__name__)
+
+
+# MercadoLibre limits: ids per multiget and results per search page
+MULTIGET_LIMIT = 20
+SEARCH_LIMIT = 100
+ORDERS_LIMIT = 51
+
+# Routes served: method, path template and handler
+ROUTES = [
+    ("POST", "/oauth/token", "_oauth_token"),
+    ("GET", "/items", "_get_items"),
+    ("GET", "/items/{item_id}/description", "_get_description"),
+    ("GET", "/items/{item_id}", "_get_item"),
+    ("PUT", "/items/{item_id}", "_put_item"),
+    ("GET", "/users/{user_id}/items/search", "_search_items"),
+    ("GET", "/users/{user_id}", "_get_user"),
+    ("GET", "/orders/search", "_search_orders"),
+    ("GET", "/orders/{order_id}", "_get_order"),
+]
+
+ROUTE_PATTERNS = [
+    (method, path, re.compile("^" + re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", path) + "$"), name)
+    for method, path, name in ROUTES
+]
+
+
+class _Server(ThreadingHTTPServer):
+    # The load tests open many connections at once, the default backlog of 5
+    # makes the client retry the connect after a second
+    request_queue_size = 128
+
+
+class MeliSimulator:
+    """
+    In-process HTTP server with a synthetic MercadoLibre seller.
+
+    Args:
+        catalog_size: Items published by the seller
+        orders: Orders of the seller, bought by the users round robin
+        users: Users (buyers) of the site
+        latency: Seconds added to every MercadoLibre response
+        jitter: Random extra seconds, up to this value
+        rate_429: Probability of answering 429 Too Many Requests
+        token_ttl: Seconds an access token is valid, 0 never expires
+        page_size: Default limit of the search endpoints (the API uses 50)
+        site_id: Site of the seller, items and users
+        seed: Seed of the synthetic data, the same seed gives the same data
+    """
+
+    def __init__(
+        self,
+        catalog_size: int = 200,
+        orders: int = 100,
+        users: int = 50,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_429: float = 0.0,
+        token_ttl: float = 0,
+        page_size: int = 50,
+        site_id: str = "MLM",
+        seed: int = 1,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.token_ttl = token_ttl
+        self.page_size = page_size
+        self.site_id = site_id
+        self.seller_id = 100000001
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._access_tokens: Dict[str, float] = {}
+        self._refresh_tokens = set()
+        self.calls = Counter()
+        self.status = Counter()
+
+        self.users = {str(u["id"]): u for u in (self._make_user(i) for i in range(users))}
+        self.items = {i["id"]: i for i in (self._make_item(i) for i in range(catalog_size))}
+        self.orders = {str(o["id"]): o for o in (self._make_order(i) for i in range(orders))}
+
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # -------------------
+    # Server lifecycle
+    # -------------------
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving on a background thread, port 0 picks a free port."""
+        self._server = _Server((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"MercadoLibre simulator listening on {self.url}")
+        return self.url
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "MeliSimulator":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # -------------------
+    # Tokens and stats
+    # -------------------
+    def issue_tokens(self) -> Dict[str, str]:
+        """New access and refresh token pair, as /oauth/token returns it."""
+        access_token = f"APP_USR-{secrets.token_hex(16)}"
+        refresh_token = f"TG-{secrets.token_hex(16)}"
+        with self._lock:
+            expires = time.monotonic() + self.token_ttl if self.token_ttl else float("inf")
+            self._access_tokens[access_token] = expires
+            self._refresh_tokens.add(refresh_token)
+        return {"access_token": access_token, "refresh_token": refresh_token}
+
+    def expire_tokens(self) -> None:
+        """Expire every access token issued, the refresh tokens stay valid."""
+        with self._lock:
+            self._access_tokens.clear()
+
+    def config(self) -> MeliConfig:
+        """MeliConfig of the simulated seller with a fresh token pair."""
+        return MeliConfig(
+            user_account_id=str(self.seller_id),
+            client_id="simulator",
+            client_secret="simulator",
+            **self.issue_tokens(),
+        )
+
+    def api_calls(self) -> int:
+        """MercadoLibre calls received, the /wms/ paths are not counted."""
+        return sum(count for route, count in self.calls.items() if " /wms/" not in route)
+
+    def wms_calls(self) -> int:
+        """WMS calls received on the /wms/ paths."""
+        return sum(count for route, count in self.calls.items() if " /wms/" in route)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.calls.clear()
+            self.status.clear()
+
+    # -------------------
+    # Synthetic data
+    # -------------------
+    def _make_item(self, i: int) -> Dict[str, Any]:
+        rng = self._random
+        item_id = f"{self.site_id}{1000000000 + i}"
+        ean = f"779{rng.randrange(10**9, 10**10)}"
+        weight = rng.choice([100, 250, 500, 1000, 2000])
+        return {
+            "id": item_id,
+            "site_id": self.site_id,
+            "title": f"Producto de prueba {i}",
+            "category_id": f"{self.site_id}{1000 + i % 50}",
+            "price": round(rng.uniform(10, 5000), 2),
+            "currency_id": SITE_TO_CURRENCY.get(self.site_id),
+            "available_quantity": rng.randint(0, 500),
+            "status": "active",
+            "seller_id": self.seller_id,
+            "permalink": f"https://articulo.mercadolibre.com/{item_id}",
+            "date_created": "2024-01-15T10:00:00.000Z",
+            "last_updated": "2024-06-01T10:00:00.000Z",
+            "seller_address": {"state": {"name": "Jalisco"}},
+            "attributes": [
+                {"id": "GTIN", "value_name": ean},
+                {"id": "SELLER_SKU", "value_name": f"SKU-{i:06d}"},
+                {"id": "MODEL", "value_name": f"Modelo {i % 20}"},
+                {"id": "LINE", "value_name": f"Linea {i % 5}"},
+                {"id": "PACKAGING_TYPE", "value_name": "Caja"},
+                {
+                    "id": "UNIT_WEIGHT",
+                    "value_name": f"{weight} g",
+                    "values": [{"struct": {"number": weight, "unit": "g"}}],
+                },
+            ],
+            "description": f"Descripcion del producto de prueba {i}",
+        }
+
+    def _make_user(self, i: int) -> Dict[str, Any]:
+        rng = self._random
+        return {
+            "id": 200000000 + i,
+            "nickname": f"COMPRADOR{i}",
+            "first_name": f"Nombre{i}",
+            "last_name": f"Apellido{i}",
+            "email": f"comprador{i}@example.com",
+            "country_id": "MX",
+            "site_id": self.site_id,
+            "identification": {"type": "RFC", "number": f"XAXX{rng.randrange(10**8, 10**9)}"},
+            "address": {
+                "address": f"Calle {i} #{rng.randint(1, 999)}",
+                "city": "Guadalajara",
+                "state": "Jalisco",
+                "zip_code": f"44{rng.randint(100, 999)}",
+            },
+            "phone": {"area_code": "33", "number": str(rng.randrange(10**7, 10**8))},
+        }
+
+    def _make_order(self, i: int) -> Dict[str, Any]:
+        rng = self._random
+        user_ids = list(self.users)
+        item_ids = list(self.items)
+        buyer = self.users[user_ids[i % len(user_ids)]] if user_ids else {"id": 0, "nickname": ""}
+
+        order_items = []
+        for item_id in rng.sample(item_ids, min(len(item_ids), rng.randint(1, 3))):
+            item = self.items[item_id]
+            order_items.append({
+                "item": {
+                    "id": item_id,
+                    "title": item["title"],
+                    "seller_sku": item["attributes"][1]["value_name"],
+                    "variation_attributes": [],
+                },
+                "quantity": rng.randint(1, 5),
+                "unit_price": item["price"],
+            })
+
+        return {
+            "id": 2000000000 + i,
+            "status": "paid",
+            "date_created": "2024-06-01T12:00:00.000-04:00",
+            "date_closed": "2024-06-01T12:05:00.000-04:00",
+            "buyer": {"id": buyer["id"], "nickname": buyer["nickname"]},
+            "seller": {"id": self.seller_id},
+            "order_items": order_items,
+            "total_amount": round(sum(o["quantity"] * o["unit_price"] for o in order_items), 2),
+            "currency_id": SITE_TO_CURRENCY.get(self.site_id),
+            "shipping": {"id": 4000000000 + i},
+            "tags": ["paid", "delivered"],
+        }
+
+    # -------------------
+    # Request handling
+    # -------------------
+    def _handler_class(self):
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go in two writes, with Nagle the body of a
+            # kept-alive connection waits for the delayed ACK (~40 ms)
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                simulator._handle(self, "GET")
+
+            def do_POST(self):
+                simulator._handle(self, "POST")
+
+            def do_PUT(self):
+                simulator._handle(self, "PUT")
+
+            def do_DELETE(self):
+                simulator._handle(self, "DELETE")
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return Handler
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        url = urlparse(handler.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        length = int(handler.headers.get("Content-Length") or 0)
+        raw_body = handler.rfile.read(length) if length else b""
+
+        if url.path.startswith("/wms/"):
+            route = f"{method} /wms/"
+            status, payload = self._wms_sink(method, query, raw_body)
+        else:
+            route, status, payload = self._dispatch(handler, method, url.path, query, raw_body)
+
+        with self._lock:
+            self.calls[route] += 1
+            self.status[status] += 1
+
+        body = json.dumps(payload).encode()
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _dispatch(self, handler, method, path, query, raw_body):
+        for route_method, route_path, pattern, name in ROUTE_PATTERNS:
+            match = pattern.match(path)
+            if route_method == method and match:
+                route = f"{method} {route_path}"
+                break
+        else:
+            return f"{method} {path}", 404, {"message": "resource not found", "status": 404}
+
+        if self.latency or self.jitter:
+            time.sleep(self.latency + self._random.uniform(0, self.jitter))
+
+        if self.rate_429 and self._random.random() < self.rate_429:
+            return route, 429, {"message": "Too Many Requests", "error": "too_many_requests", "status": 429}
+
+        if name == "_oauth_token":
+            return (route, *self._oauth_token(raw_body))
+
+        if not self._valid_token(handler.headers.get("Authorization", "")):
+            return route, 401, {"message": "invalid access token", "error": "unauthorized", "status": 401}
+
+        body = json.loads(raw_body) if raw_body else None
+        return (route, *getattr(self, name)(query=query, body=body, **match.groupdict()))
+
+    def _valid_token(self, authorization: str) -> bool:
+        token = authorization[len("Bearer "):] if authorization.startswith("Bearer ") else ""
+        with self._lock:
+            expires = self._access_tokens.get(token)
+        return expires is not None and expires > time.monotonic()
+
+    def _oauth_token(self, raw_body: bytes):
+        form = {key: values[-1] for key, values in parse_qs(raw_body.decode()).items()}
+        if form.get("grant_type") != "refresh_token":
+            return 400, {"error": "unsupported_grant_type", "status": 400}
+
+        with self._lock:
+            valid = form.get("refresh_token") in self._refresh_tokens
+            # Refresh tokens can be used once
+            self._refresh_tokens.discard(form.get("refresh_token"))
+        if not valid:
+            return 400, {"error": "invalid_grant", "message": "Error validating grant", "status": 400}
+
+        return 200, {
+            **self.issue_tokens(),
+            "token_type": "Bearer",
+            "expires_in": int(self.token_ttl) or 21600,
+            "user_id": self.seller_id,
+        }
+
+    def _public_item(self, item: Dict[str, Any], attributes: Optional[List[str]] = None):
+        public = {k: v for k, v in item.items() if k != "description"}
+        if attributes:
+            public = {k: v for k, v in public.items() if k in attributes}
+        return public
+
+    def _get_items(self, query, body):
+        ids = [i for i in query.get("ids", "").split(",") if i]
+        if not ids or len(ids) > MULTIGET_LIMIT:
+            return 400, {"message": f"ids must have between 1 and {MULTIGET_LIMIT} values", "status": 400}
+
+        attributes = [a for a in query.get("attributes", "").split(",") if a] or None
+        return 200, [
+            {"code": 200, "body": self._public_item(self.items[i], attributes)}
+            if i in self.items
+            else {"code": 404, "body": {"message": f"Item with id {i} not found", "status": 404}}
+            for i in ids
+        ]
+
+    def _get_item(self, query, body, item_id):
+        if item_id not in self.items:
+            return 404, {"message": f"Item with id {item_id} not found", "status": 404}
+        return 200, self._public_item(self.items[item_id])
+
+    def _get_description(self, query, body, item_id):
+        if item_id not in self.items:
+            return 404, {"message": f"Item with id {item_id} not found", "status": 404}
+        return 200, {"text": "", "plain_text": self.items[item_id]["description"]}
+
+    def _put_item(self, query, body, item_id):
+        if item_id not in self.items:
+            return 404, {"message": f"Item with id {item_id} not found", "status": 404}
+        if not isinstance(body, dict):
+            return 400, {"message": "body must be a json object", "status": 400}
+        with self._lock:
+            self.items[item_id].update(
+                {k: v for k, v in body.items() if k in ("available_quantity", "price", "status", "title")}
+            )
+        return 200, self._public_item(self.items[item_id])
+
+    def _page(self, query, results: List[Any], max_limit: int):
+        offset = int(query.get("offset", 0))
+        limit = min(int(query.get("limit", self.page_size)), max_limit)
+        return results[offset : offset + limit], {"total": len(results), "offset": offset, "limit": limit}
+
+    def _search_items(self, query, body, user_id):
+        if user_id != str(self.seller_id):
+            return 403, {"message": "caller.id does not match user_id", "status": 403}
+        results, paging = self._page(query, list(self.items), SEARCH_LIMIT)
+        return 200, {"seller_id": user_id, "results": results, "paging": paging}
+
+    def _get_user(self, query, body, user_id):
+        if user_id == str(self.seller_id):
+            return 200, {"id": self.seller_id, "nickname": "VENDEDOR", "site_id": self.site_id, "country_id": "MX"}
+        if user_id not in self.users:
+            return 404, {"message": f"User {user_id} not found", "status": 404}
+        return 200, self.users[user_id]
+
+    def _search_orders(self, query, body):
+        orders = [
+            o for o in self.orders.values()
+            if str(o["seller"]["id"]) == query.get("seller", str(self.seller_id))
+            and query.get("order.status", o["status"]) == o["status"]
+        ]
+        results, paging = self._page(query, orders, ORDERS_LIMIT)
+        return 200, {"query": query.get("q"), "results": results, "paging": paging}
+
+    def _get_order(self, query, body, order_id):
+        if order_id not in self.orders:
+            return 404, {"message": f"Order {order_id} not found", "status": 404}
+        return 200, self.orders[order_id]
+
+    def _wms_sink(self, method: str, query: Dict[str, str], raw_body: bytes):
+        """Accept every WMS write, reads find no records and upserts insert every record."""
+        if method == "GET":
+            return 200, []
+
+        try:
+            body = json.loads(raw_body) if raw_body else []
+        except ValueError:
+            return 422, {"error": "Error loading the body. Please check and try again"}
+
+        records = body if isinstance(body, list) else [body]
+        if method == "POST" and query.get("mode") == "upsert":
+            return 200, {"inserted": len(records), "updated": 0, "unchanged": 0, "errors": []}
+
+        key = {"POST": "created", "PUT": "updated"}.get(method, "deleted")
+        return 201, {key: [str(r) for r in records], "errors": []}
+
+
+class InMemoryConfigRepository:
+    """MeliConfigRepository kept in memory, e.g. with the simulator credentials."""
+
+    def __init__(self, config: MeliConfig, tenant: Optional[str] = None):
+        self.tenant = tenant
+        self._config = config
+
+    def get_config(self) -> Optional[MeliConfig]:
+        return self._config
+
+    def get_user_account_id(self) -> Optional[str]:
+        return self._config.user_account_id
+
+    def get_tokens(self) -> Optional[Dict[str, str]]:
+        return {
+            "access_token": self._config.access_token,
+            "refresh_token": self._config.refresh_token,
+        }
+
+    def update_tokens(self, access_token: str, refresh_token: str) -> bool:
+        self._config.access_token = access_token
+        self._config.refresh_token = refresh_token
+        return True
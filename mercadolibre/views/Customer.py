@@ -1,5 +1,6 @@
 import json
 import logging
+from asgiref.sync import sync_to_async
 from django.http import JsonResponse
 from django.views import View
 from django.utils.decorators import method_decorator
@@ -27,7 +28,7 @@ class MeliCustomerSyncView(View):
     # ---------------------
     # POST / Sync customers
     # ---------------------
-    def post(self, request):
+    async def post(self, request):
         try:
             data = json.loads(request.body)
             customer_ids = data.get("customer_ids", [])
@@ -49,13 +50,13 @@ class MeliCustomerSyncView(View):
                 f"Starting sync for {len(customer_ids)} customers (force_update={force_update})"
             )
 
-            result = self.sync_service.sync_specific_customers(
+            result = await self.sync_service.async_specific_customers(
                 customer_ids=customer_ids,
                 original_request=request,
             )
 
             # Status code: 200 si hay al menos un éxito, 500 si todos fallan
-            status_code = 200 if result.get("total_created", 0) > 0 else 500
+            status_code = 200 if result.get("total_synced", 0) > 0 else 500
             return JsonResponse(result, status=status_code)
 
         except json.JSONDecodeError:
@@ -73,7 +74,7 @@ class MeliCustomerSyncView(View):
     # ---------------------
     # PUT / Update single customer
     # ---------------------
-    def put(self, request):
+    async def put(self, request):
         try:
             data = json.loads(request.body)
             customer_id = data.get("customer_id")
@@ -102,7 +103,9 @@ class MeliCustomerSyncView(View):
             logger.info(f"Updating customer {customer_id}")
 
             # Llamar al update service
-            result = self.update_service.update_single_customer(customer_id, request)
+            result = await sync_to_async(
+                self.update_service.update_single_customer, thread_sensitive=False
+            )(customer_id, request)
 
             # Normalizar wms_response para siempre enviar dict
             wms_resp = getattr(result, "wms_response", None) or {}
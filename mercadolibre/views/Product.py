@@ -1,6 +1,7 @@
 """MercadoLibre synchronization views."""
 
 import json
+from asgiref.sync import sync_to_async
 from django.http import JsonResponse
 from django.views import View
 from django.utils.decorators import method_decorator
@@ -31,7 +32,7 @@ class MeliProductSyncView(View):
         self.sync_service = get_sync_service()
         self.update_service = get_update_service()
     
-    def get(self, request):
+    async def get(self, request):
         """
         Sync all products from MercadoLibre to WMS (creation mode).
         
@@ -40,7 +41,7 @@ class MeliProductSyncView(View):
         """
         try:
             logger.info("Starting full product sync...")
-            result = self.sync_service.sync_all_products(request)
+            result = await self.sync_service.async_all_products(request)
             
             # Use utility functions for response handling
             status_code = get_response_status_code(result)
@@ -53,7 +54,7 @@ class MeliProductSyncView(View):
                 'message': f'Unexpected error: {str(e)}'
             }, status=500)
     
-    def post(self, request):
+    async def post(self, request):
         """
         Sync specific products from MercadoLibre to WMS.
         
@@ -75,7 +76,7 @@ class MeliProductSyncView(View):
                 }, status=400)
             
             logger.info(f"Starting sync for {len(product_ids)} products (force_update={force_update})...")
-            result = self.sync_service.sync_specific_products(
+            result = await self.sync_service.async_specific_products(
                 product_ids, 
                 request,
                 force_update=force_update
@@ -97,7 +98,7 @@ class MeliProductSyncView(View):
                 'message': f'Unexpected error: {str(e)}'
             }, status=500)
     
-    def put(self, request):
+    async def put(self, request):
         """
         Update a single product in WMS (update mode only).
         
@@ -120,7 +121,9 @@ class MeliProductSyncView(View):
                 }, status=400)
             
             logger.info(f"Updating product {product_id}...")
-            result = self.update_service.update_single_product(product_id, request)
+            result = await sync_to_async(
+                self.update_service.update_single_product, thread_sensitive=False
+            )(product_id, request)
             
             # Use utility functions for response handling
             status_code = get_response_status_code(result)
@@ -1,5 +1,6 @@
 from dataclasses import asdict
 import json
+from asgiref.sync import sync_to_async
 from django.http import JsonResponse
 from django.views import View
 from django.utils.decorators import method_decorator
@@ -10,7 +11,7 @@ from mercadolibre.functions.Supplier.update import update_single_supplier
 
 @method_decorator(csrf_exempt, name="dispatch")
 class SupplierSyncView(View):
-    def post(self, request, *args, **kwargs):
+    async def post(self, request, *args, **kwargs):
         try:
             body = json.loads(request.body.decode("utf-8"))
             supplier_ids = body.get("supplier_ids")
@@ -28,7 +29,7 @@ class SupplierSyncView(View):
                     status=400,
                 )
 
-            results = get_supplier_sync_service().sync_specific_suppliers(
+            results = await get_supplier_sync_service().async_specific_suppliers(
                 supplier_ids, original_request=request
             )
             return JsonResponse(results, status=200, safe=False)
@@ -43,7 +44,7 @@ class SupplierSyncView(View):
                 status=500,
             )
 
-    def put(self, request, *args, **kwargs):
+    async def put(self, request, *args, **kwargs):
         try:
             body = json.loads(request.body.decode("utf-8"))
             supplier_id = body.get("supplier_id")
@@ -54,7 +55,9 @@ class SupplierSyncView(View):
                     status=400,
                 )
 
-            result = update_single_supplier(supplier_id, original_request=request)
+            result = await sync_to_async(update_single_supplier, thread_sensitive=False)(
+                supplier_id, original_request=request
+            )
 
             # Determinar el código de estado HTTP apropiado
             status_code = 200
@@ -1,6 +1,7 @@
 """MercadoLibre inventory synchronization views."""
 
 import json
+from asgiref.sync import sync_to_async
 from django.http import JsonResponse
 from django.views import View
 from django.utils.decorators import method_decorator
@@ -8,6 +9,7 @@ from django.views.decorators.csrf import csrf_exempt
 
 from mercadolibre.functions.Inventory.create import get_create_service
 from mercadolibre.functions.Inventory.update import get_update_service
+from mercadolibre.functions.Inventory.stock_push import get_stock_push_service
 from mercadolibre.utils.response_helpers import get_response_status_code
 
 import logging
@@ -29,7 +31,7 @@ class MeliInventoryView(View):
         self.create_service = get_create_service()
         self.update_service = get_update_service()
     
-    def post(self, request):
+    async def post(self, request):
         """
         Create inventory for a product in WMS.
         
@@ -52,7 +54,7 @@ class MeliInventoryView(View):
                 }, status=400)
             
             logger.info(f"Creating inventory for product {product_id}...")
-            result = self.create_service.create_inventory(product_id, request)
+            result = await self.create_service.acreate_inventory(product_id, request)
             
             # Use utility functions for response handling
             status_code = get_response_status_code(result)
@@ -70,7 +72,7 @@ class MeliInventoryView(View):
                 'message': f'Unexpected error: {str(e)}'
             }, status=500)
     
-    def put(self, request):
+    async def put(self, request):
         """
         Update inventory for a product in WMS.
         
@@ -93,7 +95,7 @@ class MeliInventoryView(View):
                 }, status=400)
             
             logger.info(f"Updating inventory for product {product_id}...")
-            result = self.update_service.update_inventory(product_id, request)
+            result = await self.update_service.aupdate_inventory(product_id, request)
             
             # Use utility functions for response handling
             status_code = get_response_status_code(result)
@@ -110,3 +112,59 @@ class MeliInventoryView(View):
                 'success': False,
                 'message': f'Unexpected error: {str(e)}'
             }, status=500)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class MeliStockPushView(View):
+    """
+    View for pushing the WMS stock of the tenant to MercadoLibre.
+    
+    Endpoints:
+    - POST: Send the items whose stock changed since the last push
+    """
+    
+    async def post(self, request):
+        """
+        Push the WMS stock to MercadoLibre available quantities.
+        
+        Expected body (all optional):
+        {
+            "field": "saldowms",
+            "warehouses": ["01"],
+            "dry_run": false
+        }
+        
+        Returns:
+            JSON response with push results
+        """
+        try:
+            data = json.loads(request.body) if request.body else {}
+            
+            logger.info(f"Pushing stock to MercadoLibre for {request.db_name}...")
+            result = await sync_to_async(_push_stock, thread_sensitive=False)(
+                request.db_name,
+                field=data.get('field', 'saldowms'),
+                warehouses=data.get('warehouses'),
+                dry_run=bool(data.get('dry_run', False)),
+            )
+            
+            # Use utility functions for response handling
+            status_code = get_response_status_code(result)
+            return JsonResponse(result, status=status_code)
+            
+        except json.JSONDecodeError:
+            return JsonResponse({
+                'success': False,
+                'message': 'Invalid JSON in request body'
+            }, status=400)
+        except Exception as e:
+            logger.exception("Error in stock push endpoint")
+            return JsonResponse({
+                'success': False,
+                'message': f'Unexpected error: {str(e)}'
+            }, status=500)
+
+
+def _push_stock(db_name, **kwargs):
+    # The service of the tenant pushes to its own MeLi seller
+    return get_stock_push_service(db_name).push_stock(db_name, **kwargs)
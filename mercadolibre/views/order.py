@@ -1,6 +1,7 @@
 """MercadoLibre order synchronization views."""
 
 import json
+from asgiref.sync import sync_to_async
 from django.http import JsonResponse
 from django.views import View
 from django.utils.decorators import method_decorator
@@ -30,7 +31,7 @@ class MeliOrderSyncView(View):
         self.sync_service = get_sync_service()
         self.update_service = get_update_service()
     
-    def get(self, request):
+    async def get(self, request):
         """
         Sync recent orders from MercadoLibre to WMS (creation mode).
         
@@ -46,7 +47,7 @@ class MeliOrderSyncView(View):
             limit = int(request.GET.get('limit', 50))
             
             logger.info(f"Starting order sync (status={status}, limit={limit})...")
-            result = self.sync_service.sync_all_orders(request, status, limit)
+            result = await self.sync_service.async_all_orders(request, status, limit)
             
             # Use utility functions for response handling
             status_code = get_response_status_code(result)
@@ -64,7 +65,7 @@ class MeliOrderSyncView(View):
                 'message': f'Unexpected error: {str(e)}'
             }, status=500)
     
-    def post(self, request):
+    async def post(self, request):
         """
         Sync specific orders from MercadoLibre to WMS.
         
@@ -86,7 +87,7 @@ class MeliOrderSyncView(View):
                 }, status=400)
             
             logger.info(f"Starting sync for {len(order_ids)} orders (force_update={force_update})...")
-            result = self.sync_service.sync_specific_orders(
+            result = await self.sync_service.async_specific_orders(
                 order_ids,
                 request,
                 force_update=force_update
@@ -108,7 +109,7 @@ class MeliOrderSyncView(View):
                 'message': f'Unexpected error: {str(e)}'
             }, status=500)
     
-    def put(self, request):
+    async def put(self, request):
         """
         Update a single order in WMS (update mode only).
         
@@ -131,7 +132,9 @@ class MeliOrderSyncView(View):
                 }, status=400)
             
             logger.info(f"Updating order {order_id}...")
-            result = self.update_service.update_single_order(order_id, request)
+            result = await sync_to_async(
+                self.update_service.update_single_order, thread_sensitive=False
+            )(order_id, request)
             
             # Use utility functions for response handling
             status_code = get_response_status_code(result)
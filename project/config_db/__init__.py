@@ -1,5 +1,5 @@
 """MongoDB configuration database module."""
 
-from .repository import MeliConfigRepository
+from .repository import MeliConfigRepository, PublishedStockRepository
 
-__all__ = ['MeliConfigRepository']
+__all__ = ['MeliConfigRepository', 'PublishedStockRepository']
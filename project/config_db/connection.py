@@ -7,6 +7,8 @@ from pymongo import MongoClient
 from pymongo.database import Database
 from dotenv import load_dotenv
 
+from project.request_timing import MongoCommandTimer
+
 load_dotenv()
 
 
@@ -39,7 +41,7 @@ class MongoConnection:
     def _connect(self):
         """Establish connection to MongoDB."""
         try:
-            self.client = MongoClient(self.database_url)
+            self.client = MongoClient(self.database_url, event_listeners=[MongoCommandTimer()])
             self.db = self.client[self.database_name]
             # Test connection
             self.client.server_info()
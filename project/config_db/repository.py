@@ -1,21 +1,64 @@
 """Repository for MercadoLibre configuration operations."""
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+
+from pymongo import UpdateOne
+from pymongo.errors import ConnectionFailure, ExecutionTimeout
+
+from project import resilience
+
 from .connection import mongo_connection
 from .models import MeliConfig
 
+# Errors that tell Mongo is down or slow, they count in its circuit
+MONGO_FAILURES = (ConnectionFailure, ExecutionTimeout)
+
+
+def _guard():
+    """Run a Mongo call within the "mongo" circuit and bulkhead."""
+    return resilience.guard("mongo", failures=MONGO_FAILURES)
+
 
 class MeliConfigRepository:
     """Repository for MercadoLibre configuration CRUD operations."""
     
     COLLECTION_NAME = "meli_test"
     CONFIG_FIELD = "meli_config"
+    TENANT_FIELD = "tenant"
     
-    def __init__(self):
-        """Initialize repository with database connection."""
+    def __init__(self, tenant: Optional[str] = None):
+        """
+        Initialize repository with database connection.
+        
+        Args:
+            tenant: Tenant database name of the configuration, None uses the
+                single document of one-seller deployments
+        """
+        self.tenant = tenant
         self.db = mongo_connection.get_database()
         self.collection = self.db[self.COLLECTION_NAME]
     
+    @property
+    def _filter(self) -> Dict[str, Any]:
+        """Filter of the configuration document of this repository."""
+        return {self.TENANT_FIELD: self.tenant} if self.tenant else {}
+    
+    def list_tenants(self) -> List[str]:
+        """
+        Get the tenants with a MercadoLibre configuration.
+        
+        Returns:
+            list of tenant database names
+        """
+        try:
+            with _guard():
+                tenants = self.collection.distinct(
+                    self.TENANT_FIELD, {self.CONFIG_FIELD: {"$exists": True}}
+                )
+            return sorted(tenant for tenant in tenants if tenant)
+        except Exception as e:
+            raise RuntimeError(f"Failed to list MercadoLibre tenants: {str(e)}")
+    
     def get_config(self) -> Optional[MeliConfig]:
         """
         Get MercadoLibre configuration.
@@ -24,7 +67,8 @@ class MeliConfigRepository:
             MeliConfig or None if not found
         """
         try:
-            document = self.collection.find_one({})
+            with _guard():
+                document = self.collection.find_one(self._filter)
             if document and self.CONFIG_FIELD in document:
                 return MeliConfig.from_dict(document[self.CONFIG_FIELD])
             return None
@@ -68,16 +112,17 @@ class MeliConfigRepository:
             True if updated successfully, False otherwise
         """
         try:
-            result = self.collection.update_one(
-                {},
-                {
-                    "$set": {
-                        f"{self.CONFIG_FIELD}.access_token": access_token,
-                        f"{self.CONFIG_FIELD}.refresh_token": refresh_token
-                    }
-                },
-                upsert=True
-            )
+            with _guard():
+                result = self.collection.update_one(
+                    self._filter,
+                    {
+                        "$set": {
+                            f"{self.CONFIG_FIELD}.access_token": access_token,
+                            f"{self.CONFIG_FIELD}.refresh_token": refresh_token
+                        }
+                    },
+                    upsert=True
+                )
             return result.modified_count > 0 or result.upserted_id is not None
         except Exception as e:
             raise RuntimeError(f"Failed to update tokens: {str(e)}")
@@ -98,11 +143,12 @@ class MeliConfigRepository:
                 for key, value in config_data.items()
             }
             
-            result = self.collection.update_one(
-                {},
-                {"$set": update_dict},
-                upsert=True
-            )
+            with _guard():
+                result = self.collection.update_one(
+                    self._filter,
+                    {"$set": update_dict},
+                    upsert=True
+                )
             return result.modified_count > 0 or result.upserted_id is not None
         except Exception as e:
             raise RuntimeError(f"Failed to update configuration: {str(e)}")
@@ -118,11 +164,73 @@ class MeliConfigRepository:
             True if operation was successful
         """
         try:
-            result = self.collection.update_one(
-                {},
-                {"$set": {self.CONFIG_FIELD: config.to_dict()}},
-                upsert=True
-            )
+            with _guard():
+                result = self.collection.update_one(
+                    self._filter,
+                    {"$set": {self.CONFIG_FIELD: config.to_dict()}},
+                    upsert=True
+                )
             return result.modified_count > 0 or result.upserted_id is not None
         except Exception as e:
             raise RuntimeError(f"Failed to upsert configuration: {str(e)}")
+
+
+class PublishedStockRepository:
+    """Repository for the stock last published to MercadoLibre per tenant."""
+    
+    COLLECTION_NAME = "meli_published_stock"
+    
+    def __init__(self):
+        """Initialize repository with database connection."""
+        self.db = mongo_connection.get_database()
+        self.collection = self.db[self.COLLECTION_NAME]
+    
+    def get_quantities(self, tenant: str) -> Dict[str, int]:
+        """
+        Get the last published quantity of every item of a tenant.
+        
+        Args:
+            tenant: Tenant database name
+            
+        Returns:
+            dict item_id -> quantity
+        """
+        try:
+            with _guard():
+                documents = self.collection.find(
+                    {"tenant": tenant}, {"_id": 0, "item_id": 1, "quantity": 1}
+                )
+                return {doc["item_id"]: doc["quantity"] for doc in documents}
+        except Exception as e:
+            raise RuntimeError(f"Failed to get published stock: {str(e)}")
+    
+    def save_quantities(self, tenant: str, quantities: Dict[str, int]) -> int:
+        """
+        Save the published quantities of a tenant in one bulk write.
+        
+        Args:
+            tenant: Tenant database name
+            quantities: dict item_id -> quantity
+            
+        Returns:
+            Number of upserted or modified items
+        """
+        if not quantities:
+            return 0
+        
+        try:
+            with _guard():
+                result = self.collection.bulk_write(
+                    [
+                        UpdateOne(
+                            {"tenant": tenant, "item_id": item_id},
+                            {"$set": {"quantity": quantity}},
+                            upsert=True
+                        )
+                        for item_id, quantity in quantities.items()
+                    ],
+                    ordered=False
+                )
+            return result.upserted_count + result.modified_count
+        except Exception as e:
+            raise RuntimeError(f"Failed to save published stock: {str(e)}")
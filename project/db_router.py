@@ -0,0 +1,134 @@
+"""Read-replica routing of the tenant reads."""
+
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from project import resilience
+from project.log_pipeline import request_context
+
+# Alias of the replica of a tenant database, registered by get_db_connection
+REPLICA_SUFFIX = "_replica"
+
+# Statements of a batch that change rows: the keyword starts a statement, or
+# follows the common table expressions of a WITH. The upserts send
+# "SET NOCOUNT ON; ... MERGE" batches
+WRITE_STATEMENTS = re.compile(
+    r"(?:^|;|\))\s*(?:INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE
+)
+
+# String literals and bracketed names, they may hold the keywords
+QUOTED = re.compile(r"'(?:[^']|'')*'|\[[^\]]*\]")
+
+
+class ReplicaRouter:
+    """
+    Choose the database alias of the tenant reads. The views pass the alias
+    to .using(), which Django routers do not override, so the reads ask this
+    router for it.
+
+    A read goes to <db_name>_replica when it is configured, except:
+        - for sticky_seconds after a write to the tenant database, so a
+          client reads its own writes;
+        - inside a transaction on the primary;
+        - when the request sends X-Read-From: primary. X-Read-From: replica
+          skips the sticky window;
+        - while the circuit of the replica is open (project.resilience).
+
+    The writes are tracked in this process by default; when BACKEND names an
+    alias of settings.CACHES they are shared by the workers.
+    """
+
+    def __init__(self, enabled=True, sticky_seconds=5, backend=None):
+        self.enabled = enabled
+        self.sticky_seconds = sticky_seconds
+        self.backend = caches[backend] if backend else None
+        self._written = {}
+        self._lock = threading.Lock()
+
+    def db_for_read(self, db_name):
+        replica = db_name + REPLICA_SUFFIX
+        if not self.enabled or replica not in connections.settings:
+            return db_name
+
+        read_from = (request_context.get() or {}).get("read_from")
+        if read_from == "primary":
+            return db_name
+
+        if read_from != "replica" and self.is_sticky(db_name):
+            return db_name
+
+        if connections[db_name].in_atomic_block:
+            return db_name
+
+        # A replica whose circuit is open is skipped, not failed
+        if resilience.get_breaker("sql:" + replica).rejecting():
+            return db_name
+
+        return replica
+
+    def mark_written(self, db_name):
+        if self.backend is not None:
+            self.backend.set(self._shared_key(db_name), True, self.sticky_seconds)
+            return
+
+        with self._lock:
+            self._written[db_name] = time.monotonic() + self.sticky_seconds
+
+    def is_sticky(self, db_name):
+        if self.backend is not None:
+            return self.backend.get(self._shared_key(db_name)) is not None
+
+        return self._written.get(db_name, 0) > time.monotonic()
+
+    def _shared_key(self, db_name):
+        return f"wms_replica:written:{db_name}"
+
+
+_config = getattr(settings, "DB_REPLICAS", {})
+
+router = ReplicaRouter(
+    enabled=_config.get("ENABLED", True),
+    sticky_seconds=_config.get("STICKY_SECONDS", 5),
+    backend=_config.get("BACKEND"),
+)
+
+
+def db_for_read(db_name):
+    """Alias for a read of the tenant database db_name."""
+    return router.db_for_read(db_name)
+
+
+def is_write(sql):
+    """
+    Whether a statement or batch changes rows.
+
+    Args:
+        sql: SQL sent to the database
+    """
+    return WRITE_STATEMENTS.search(QUOTED.sub("''", sql)) is not None
+
+
+def _track_writes(execute, sql, params, many, context):
+    result = execute(sql, params, many, context)
+
+    if is_write(sql):
+        router.mark_written(context["connection"].alias)
+
+    return result
+
+
+def _install_write_tracker(sender, connection, **kwargs):
+    # Replicas are never written, their connections need no tracking
+    if connection.alias.endswith(REPLICA_SUFFIX) or _track_writes in connection.execute_wrappers:
+        return
+    connection.execute_wrappers.append(_track_writes)
+
+
+if router.enabled:
+    connection_created.connect(_install_write_tracker)
@@ -0,0 +1,129 @@
+"""Non-blocking structured logging for the request path."""
+
+import atexit
+import contextvars
+import json
+import logging
+import random
+from logging.handlers import QueueHandler, QueueListener
+from queue import Full, Queue
+
+from django.conf import settings
+
+# Fields of the request being handled (tenant, endpoint, route, method), set
+# by the middlewares and added to every record logged while it runs.
+request_context = contextvars.ContextVar("request_context", default=None)
+
+STRUCTURED_FIELDS = (
+    "tenant",
+    "endpoint",
+    "route",
+    "method",
+    "status",
+    "rows",
+    "errors",
+    "duration_ms",
+    "timings",
+    "payload_bytes",
+    "payload",
+)
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Add the fields of the current request to the record. It runs in the
+    thread that logs, before the record goes to the queue.
+    """
+
+    def filter(self, record):
+        for key, value in (request_context.get() or {}).items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class StructuredFormatter(logging.Formatter):
+    """Format the records as one JSON object per line."""
+
+    def format(self, record):
+        data = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                data[field] = value
+
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(data, default=str)
+
+
+class QueueListenerHandler(QueueHandler):
+    """
+    Handler that only puts the records in a bounded queue, a listener thread
+    passes them to the real handlers. Logging never blocks the request: when
+    the queue is full the record is dropped and counted.
+
+    The handlers are given as cfg://handlers.<name> in LOGGING so dictConfig
+    passes the configured handler objects.
+    """
+
+    def __init__(self, handlers, queue_size=10000):
+        super().__init__(Queue(queue_size))
+        self.dropped = 0
+        self.addFilter(RequestContextFilter())
+
+        # dictConfig resolves the cfg:// items on item access, not on iteration
+        handlers = [handlers[index] for index in range(len(handlers))]
+        self.listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.stop)
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
+
+    def stop(self):
+        """Write the queued records and stop the listener."""
+        listener, self.listener = self.listener, None
+        if listener is not None:
+            try:
+                listener.stop()
+            except Full:
+                # The listener thread is a daemon, it ends with the process
+                pass
+
+    def close(self):
+        self.stop()
+        super().close()
+
+
+def log_payload(logger, request, rows=None, message="Request received"):
+    """
+    Log the size of the request body and, for a sample of the requests, its
+    first PAYLOAD_MAX_BYTES bytes.
+
+    Args:
+        logger: Logger of the caller
+        request: Django request
+        rows: Records in the body
+        message: Log message
+    """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
+    config = getattr(settings, "STRUCTURED_LOGGING", {})
+    body = request.body
+    extra = {"rows": rows, "payload_bytes": len(body)}
+
+    if random.random() < config.get("PAYLOAD_SAMPLE_RATE", 0):
+        extra["payload"] = body[: config.get("PAYLOAD_MAX_BYTES", 2048)].decode("utf-8", errors="replace")
+
+    logger.info(message, extra=extra)
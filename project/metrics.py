@@ -0,0 +1,279 @@
+"""Request, row and MeLi metrics in the Prometheus text format."""
+
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+
+from project.log_pipeline import request_context
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SIZE_BUCKETS = tuple(1024 * 4 ** power for power in range(10))  # 1 KB to 256 MB
+
+# name: (type, help, labels, buckets)
+METRICS = {
+    "wms_requests_total": (
+        "counter", "Requests handled, by response status", ("tenant", "route", "method", "status"), None,
+    ),
+    "wms_request_duration_seconds": (
+        "histogram", "Time to build the response", ("tenant", "route", "method"), LATENCY_BUCKETS,
+    ),
+    "wms_request_body_bytes": (
+        "histogram", "Size of the request body", ("tenant", "route"), SIZE_BUCKETS,
+    ),
+    "wms_response_body_bytes": (
+        "histogram", "Size of the response body, streamed responses excluded", ("tenant", "route"), SIZE_BUCKETS,
+    ),
+    "wms_rows_total": (
+        "counter", "Records created, updated or deleted", ("tenant", "route", "operation"), None,
+    ),
+    "wms_row_errors_total": (
+        "counter", "Records rejected in the errors list of the response", ("tenant", "route"), None,
+    ),
+    "meli_api_requests_total": (
+        "counter", "Calls to the MercadoLibre API, by response status", ("tenant", "status"), None,
+    ),
+    "meli_token_refreshes_total": (
+        "counter", "MercadoLibre token refreshes", ("tenant", "result"), None,
+    ),
+    "dependency_circuit_opens_total": (
+        "counter", "Times the circuit of a dependency opened", ("dependency",), None,
+    ),
+    "dependency_rejections_total": (
+        "counter", "Calls rejected by an open circuit or a full bulkhead", ("dependency", "reason"), None,
+    ),
+}
+
+
+class MetricsRegistry:
+    """
+    Counters and histograms of this process. Each thread updates its own
+    shard without locks, the shards are added up when the metrics are read.
+
+    With several worker processes, set METRICS["DIRECTORY"]: every process
+    writes its values there every FLUSH_INTERVAL seconds and the endpoint adds
+    up the files of all the processes. Empty the directory when the service
+    starts, the files of stopped processes are kept so the counters never
+    go back.
+    """
+
+    def __init__(self, directory=None, flush_interval=5):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}
+        self._shards_lock = threading.Lock()
+        self._flusher = None
+
+    def inc(self, name, value=1, **labels):
+        values = self._values(name, labels, 1)
+        values[0] += value
+
+    def observe(self, name, value, **labels):
+        buckets = METRICS[name][3]
+        values = self._values(name, labels, len(buckets) + 3)
+
+        # One slot per bucket plus +Inf, then the sum and the count
+        index = 0
+        while index < len(buckets) and value > buckets[index]:
+            index += 1
+        values[index] += 1
+        values[-2] += value
+        values[-1] += 1
+
+    def _values(self, name, labels, size):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append((threading.current_thread(), shard))
+            self._start_flusher()
+
+        key = (name, tuple(str(labels.get(label, "")) for label in METRICS[name][2]))
+        values = shard.get(key)
+        if values is None:
+            values = shard[key] = [0] * size
+        return values
+
+    def snapshot(self):
+        """Values of this process, added up across the threads."""
+        with self._shards_lock:
+            # Threads that ended do not write anymore, their values are kept apart
+            for thread, shard in [item for item in self._shards if not item[0].is_alive()]:
+                for key, values in shard.items():
+                    _add(self._retired, key, values)
+            self._shards = [item for item in self._shards if item[0].is_alive()]
+
+            totals = {key: list(values) for key, values in self._retired.items()}
+            shards = [shard for _, shard in self._shards]
+
+        for shard in shards:
+            for key, values in list(shard.items()):
+                _add(totals, key, values)
+        return totals
+
+    def collect(self):
+        """Values of all the processes."""
+        totals = self.snapshot()
+        if not self.directory:
+            return totals
+
+        own = self._path()
+        for path in glob.glob(os.path.join(self.directory, "metrics_*.json")):
+            if path == own:
+                continue
+            try:
+                with open(path) as file:
+                    rows = json.load(file)
+            except (OSError, ValueError):
+                # Being replaced by its process, read on the next scrape
+                continue
+            for name, labels, values in rows:
+                if name in METRICS:
+                    _add(totals, (name, tuple(labels)), values)
+        return totals
+
+    def flush(self):
+        """Write the values of this process to the metrics directory."""
+        if not self.directory:
+            return
+
+        rows = [[name, list(labels), values] for (name, labels), values in self.snapshot().items()]
+        path = self._path()
+        temporary = f"{path}.tmp"
+        with open(temporary, "w") as file:
+            json.dump(rows, file)
+        os.replace(temporary, path)
+
+    def render(self):
+        """The metrics in the Prometheus text format."""
+        by_name = {}
+        for (name, labels), values in sorted(self.collect().items()):
+            by_name.setdefault(name, []).append((labels, values))
+
+        lines = []
+        for name, (kind, help_text, label_names, buckets) in METRICS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+            for labels, values in by_name.get(name, ()):
+                pairs = list(zip(label_names, labels))
+                if kind == "counter":
+                    lines.append(f"{name}{_labels(pairs)} {_number(values[0])}")
+                    continue
+
+                cumulative = 0
+                for bound, count in zip(buckets + ("+Inf",), values):
+                    cumulative += count
+                    le = bound if bound == "+Inf" else _number(bound)
+                    lines.append(f"{name}_bucket{_labels(pairs + [('le', le)])} {cumulative}")
+                lines.append(f"{name}_sum{_labels(pairs)} {_number(values[-2])}")
+                lines.append(f"{name}_count{_labels(pairs)} {values[-1]}")
+
+        return "\n".join(lines) + "\n"
+
+    def _path(self):
+        return os.path.join(self.directory, f"metrics_{os.getpid()}.json")
+
+    def _start_flusher(self):
+        if not self.directory or self._flusher is not None:
+            return
+
+        with self._shards_lock:
+            if self._flusher is not None:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            self._flusher = threading.Thread(target=self._flush_forever, name="metrics-flush", daemon=True)
+            self._flusher.start()
+            atexit.register(self.flush)
+
+    def _flush_forever(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except OSError:
+                pass
+
+
+def _add(totals, key, values):
+    current = totals.get(key)
+    if current is None:
+        totals[key] = list(values)
+    else:
+        for index, value in enumerate(values):
+            current[index] += value
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Registry of the process, configured from settings.METRICS."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                config = getattr(settings, "METRICS", {})
+                _registry = MetricsRegistry(config.get("DIRECTORY"), config.get("FLUSH_INTERVAL", 5))
+    return _registry
+
+
+def inc(name, value=1, **labels):
+    get_registry().inc(name, value, **labels)
+
+
+def observe(name, value, **labels):
+    get_registry().observe(name, value, **labels)
+
+
+def record_rows(rows, errors=0):
+    """
+    Count the records a wmsAdapterV2 endpoint changed and rejected, labeled
+    with the tenant and route of the request being handled.
+
+    Args:
+        rows: Records by operation, e.g. {"created": 10}
+        errors: Records rejected
+    """
+    context = request_context.get() or {}
+    labels = {"tenant": context.get("tenant", ""), "route": context.get("route", "")}
+
+    for operation, count in rows.items():
+        if count:
+            inc("wms_rows_total", count, operation=operation, **labels)
+    if errors:
+        inc("wms_row_errors_total", errors, **labels)
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint. When METRICS["TOKEN"] is set, it must come as
+    a bearer token.
+    """
+    token = getattr(settings, "METRICS", {}).get("TOKEN")
+    if token and request.headers.get("Authorization") != f"Bearer {token}":
+        return JsonResponse({"error": "Unauthorized"}, safe=False, status=401)
+
+    return HttpResponse(get_registry().render(), content_type="text/plain; version=0.0.4; charset=utf-8")
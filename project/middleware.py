@@ -1,26 +1,29 @@
 """Functions"""
 
+import logging
+import random
 import re
 
 # from settings import get_apikeys
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.conf import settings
 
 """ Dependencies """
 from django.http.response import JsonResponse
+from django.middleware.gzip import GZipMiddleware
+from django.utils.deprecation import MiddlewareMixin
 
+from project import metrics, request_timing, resilience
+from project.log_pipeline import request_context
 
-class MiddlewareApiKey:
+logger = logging.getLogger(__name__)
+
+
+class MiddlewareApiKey(MiddlewareMixin):
     """
     This middleware is used to validate the apikey
     """
 
-    def __init__(self, get_response):
-        self.get_response = get_response
-
-    def __call__(self, request):
-        response = self.get_response(request)
-        return response
-
     def process_view(self, request, view_func, view_args, view_kwargs):
 
         # Get endpoint
@@ -32,7 +35,7 @@ class MiddlewareApiKey:
         endpoint = endpoint.split("?")
 
         # This endpoint doesn't need apikey validation
-        if endpoint[0] == "/create-apikey":
+        if endpoint[0] in ("/create-apikey", "/metrics"):
             return None
         elif endpoint[0] == "/health_check":
             return JsonResponse({"status": "ok"}, status=200)
@@ -51,7 +54,12 @@ class MiddlewareApiKey:
 
                 # Validate apikey
                 db_name = apikeys[ak]
-                print(db_name)
+
+                context = request_context.get()
+                if context is not None:
+                    context["tenant"] = db_name
+                    # primary or replica, overrides the read routing (project.db_router)
+                    context["read_from"] = request.headers.get("X-Read-From")
 
                 # add db_name to request
                 try:
@@ -88,3 +96,161 @@ class MiddlewareApiKey:
                 return JsonResponse({"error": "Unauthorized"}, safe=False, status=401)
 
         return None
+
+
+class MiddlewareTenantGuard:
+    """
+    This middleware runs the views of a tenant within the bulkhead and the
+    circuit of its database (project.resilience). A slow tenant database
+    holds at most MAX_CONCURRENT["sql"] workers, and while its circuit is
+    open its requests get a 503 with Retry-After at once.
+
+    The MercadoLibre views (/wms/ml/) reach the database only through the
+    adapter endpoints, which are guarded themselves; holding a place while
+    they wait for MeLi would let a slow MeLi fill the bulkhead.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        try:
+            return self.get_response(request)
+        finally:
+            self._release(request)
+
+    async def __acall__(self, request):
+        try:
+            return await self.get_response(request)
+        finally:
+            if getattr(request, "tenant_bulkhead", None) is not None:
+                # The sync views ran in the thread of the request connections
+                await sync_to_async(self._release)(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # Set by MiddlewareApiKey, the exempt endpoints have none
+        db_name = getattr(request, "db_name", None)
+        if db_name is None or request.path.startswith("/wms/ml/"):
+            return None
+
+        try:
+            _, request.tenant_bulkhead = resilience.enter("sql:" + db_name)
+        except resilience.DependencyUnavailable as e:
+            response = JsonResponse(
+                {"error": "The database is unavailable, please retry later"},
+                safe=False,
+                status=503,
+            )
+            response["Retry-After"] = str(e.retry_after)
+            return response
+
+        return None
+
+    def _release(self, request):
+        bulkhead = getattr(request, "tenant_bulkhead", None)
+        if bulkhead is not None:
+            resilience.record_connection_errors(request.db_name)
+            bulkhead.release()
+
+
+class MiddlewareGZip(GZipMiddleware):
+    """
+    This middleware compresses the responses of GZIP_MIN_LENGTH bytes or more
+    for the clients that accept gzip. Small bodies cost more CPU than they
+    save on the wire.
+    """
+
+    def process_response(self, request, response):
+        min_length = getattr(settings, "GZIP_MIN_LENGTH", 1024)
+        if not response.streaming and len(response.content) < min_length:
+            return response
+        return super().process_response(request, response)
+
+
+class MiddlewareRequestTiming:
+    """
+    This middleware logs one line per request, records its latency, sizes
+    and status in the metrics and, for a sample of the requests, splits its
+    time between SQL (by alias), Mongo, MeLi, the WMS API and JSON work. The
+    split goes in the Server-Timing header and in the log line.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "REQUEST_TIMING", {}).get("SAMPLE_RATE", 1.0)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        # Fields added to every record logged while the request runs
+        context_token = request_context.set({"endpoint": request.path, "method": request.method})
+
+        timings = request_timing.RequestTimings()
+        sampled = random.random() < self.sample_rate
+        timings_token = request_timing.activate(timings) if sampled else None
+
+        try:
+            response = self.get_response(request)
+            return self._finish(request, response, timings, sampled)
+
+        finally:
+            if timings_token is not None:
+                request_timing.deactivate(timings_token)
+            request_context.reset(context_token)
+
+    async def __acall__(self, request):
+        context_token = request_context.set({"endpoint": request.path, "method": request.method})
+
+        timings = request_timing.RequestTimings()
+        sampled = random.random() < self.sample_rate
+        timings_token = request_timing.activate(timings) if sampled else None
+
+        try:
+            response = await self.get_response(request)
+            return self._finish(request, response, timings, sampled)
+
+        finally:
+            if timings_token is not None:
+                request_timing.deactivate(timings_token)
+            request_context.reset(context_token)
+
+    def _finish(self, request, response, timings, sampled):
+        extra = {"status": response.status_code, "duration_ms": timings.duration_ms()}
+        self._record_metrics(request, response, extra["duration_ms"] / 1000)
+        if sampled:
+            extra["timings"] = timings.as_dict()
+            response["Server-Timing"] = timings.server_timing()
+
+        logger.info("Request finished", extra=extra)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # The route, not the path, keeps the metric labels few
+        context = request_context.get()
+        if context is not None:
+            context["route"] = request.resolver_match.route.strip("^$")
+        return None
+
+    def _record_metrics(self, request, response, seconds):
+        context = request_context.get()
+        labels = {"tenant": context.get("tenant", ""), "route": context.get("route", "unmatched")}
+
+        metrics.inc("wms_requests_total", method=request.method, status=response.status_code, **labels)
+        metrics.observe("wms_request_duration_seconds", seconds, method=request.method, **labels)
+        metrics.observe("wms_request_body_bytes", int(request.META.get("CONTENT_LENGTH") or 0), **labels)
+        if not response.streaming:
+            metrics.observe("wms_response_body_bytes", len(response.content), **labels)
@@ -0,0 +1,128 @@
+"""Time spent by a request in SQL, Mongo, outbound HTTP and JSON work."""
+
+import contextvars
+import functools
+import time
+from contextlib import contextmanager
+
+from django.db.backends.signals import connection_created
+from pymongo import monitoring
+
+# Timings of the request being handled, None when it is not sampled
+_current = contextvars.ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    """
+    Wall time and calls of each category of work done by a request: sql-<alias>,
+    mongo, meli, wms-api and json. A category measured inside itself (a
+    retried MeLi call, a repository method calling another one) counts once.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.totals = {}
+        self.active = set()
+
+    def add(self, category, seconds, count=1):
+        total = self.totals.setdefault(category, [0.0, 0])
+        total[0] += seconds
+        total[1] += count
+
+    def duration_ms(self):
+        return round((time.perf_counter() - self.started) * 1000, 1)
+
+    def as_dict(self):
+        """Milliseconds and calls by category, for the request log line."""
+        return {
+            category: {"ms": round(seconds * 1000, 1), "count": count}
+            for category, (seconds, count) in self.totals.items()
+        }
+
+    def server_timing(self):
+        """Value of the Server-Timing header."""
+        metrics = [
+            f'{category};dur={seconds * 1000:.1f};desc="{count} calls"'
+            for category, (seconds, count) in self.totals.items()
+        ]
+        metrics.append(f"total;dur={self.duration_ms():.1f}")
+        return ", ".join(metrics)
+
+
+def activate(timings):
+    """Add the work of the current request to timings, returns the reset token."""
+    return _current.set(timings)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+@contextmanager
+def measure(category):
+    """Add the time of the block to the category, when the request is measured."""
+    timings = _current.get()
+    if timings is None or category in timings.active:
+        yield
+        return
+
+    timings.active.add(category)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.active.discard(category)
+        timings.add(category, time.perf_counter() - started)
+
+
+def timed(category):
+    """Decorator form of measure()."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with measure(category):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _sql_wrapper(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.add(f"sql-{context['connection'].alias}", time.perf_counter() - started)
+
+
+def _install_sql_wrapper(sender, connection, **kwargs):
+    # Installed once per connection object, it only measures sampled requests
+    if _sql_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_sql_wrapper)
+
+
+connection_created.connect(_install_sql_wrapper)
+
+
+class MongoCommandTimer(monitoring.CommandListener):
+    """Command listener adding the time of each Mongo command to the request."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._add(event)
+
+    def failed(self, event):
+        self._add(event)
+
+    def _add(self, event):
+        timings = _current.get()
+        if timings is not None:
+            timings.add("mongo", event.duration_micros / 1_000_000)
@@ -0,0 +1,367 @@
+"""Circuit breakers and bulkheads of the outbound dependencies."""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+
+from django.conf import settings
+from django.db import InterfaceError, OperationalError, connections
+from django.db.backends.signals import connection_created
+
+from project import metrics
+
+logger = logging.getLogger(__name__)
+
+# Errors of a statement that tell the tenant database is down or slow, not
+# that the statement is wrong (IntegrityError, ProgrammingError, ...)
+SQL_FAILURES = (OperationalError, InterfaceError)
+
+
+class DependencyUnavailable(Exception):
+    """
+    A call was rejected without reaching the dependency: its circuit is open
+    or its bulkhead is full.
+    """
+
+    def __init__(self, dependency, reason, retry_after):
+        self.dependency = dependency
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(f"{dependency} is unavailable ({reason}), retry in {retry_after} seconds")
+
+
+class CircuitBreaker:
+    """
+    Circuit of one dependency. It opens after failure_threshold failures in
+    a row and rejects the calls for reset_timeout seconds; then it lets one
+    probe call through (half open). The circuit closes when the probe
+    succeeds and opens again when it fails. A probe that reports nothing
+    within reset_timeout gives its place to the next call.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_until = 0.0
+        self._probe_until = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        if self.state == self.CLOSED:
+            return True
+
+        with self._lock:
+            now = time.monotonic()
+            if self.state == self.OPEN:
+                if now < self._opened_until:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probe_until = 0.0
+
+            if self.state == self.HALF_OPEN:
+                if now < self._probe_until:
+                    return False
+                self._probe_until = now + self.reset_timeout
+
+            return True
+
+    def rejecting(self):
+        """True while allow() would reject a call, without taking the probe."""
+        now = time.monotonic()
+        if self.state == self.OPEN:
+            return now < self._opened_until
+        return self.state == self.HALF_OPEN and now < self._probe_until
+
+    def record_success(self):
+        if self.state == self.CLOSED and not self._failures:
+            return
+
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("Circuit closed", extra={"dependency": self.name})
+            self.state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.OPEN:
+                return
+            if self.state == self.CLOSED and self._failures < self.failure_threshold:
+                return
+
+            self.state = self.OPEN
+            self._opened_until = time.monotonic() + self.reset_timeout
+
+        metrics.inc("dependency_circuit_opens_total", dependency=self.name)
+        logger.warning("Circuit opened", extra={"dependency": self.name, "failures": self._failures})
+
+    def retry_after(self):
+        """Seconds until the circuit lets a probe through."""
+        return max(int(self._opened_until - time.monotonic() + 0.999), 1)
+
+
+class Bulkhead:
+    """
+    Calls running at once against one dependency. A call waits up to
+    acquire_timeout seconds for a place; max_concurrent 0 disables the limit.
+    Threads wait on the semaphore, calls in an event loop wait in a queue
+    that release() wakes in order.
+    """
+
+    def __init__(self, name, max_concurrent=10, acquire_timeout=1.0):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.acquire_timeout = acquire_timeout
+        self._semaphore = threading.BoundedSemaphore(max_concurrent) if max_concurrent else None
+        self._waiters = deque()
+        self._waiters_lock = threading.Lock()
+
+    def acquire(self):
+        if self._semaphore is None:
+            return True
+        return self._semaphore.acquire(timeout=self.acquire_timeout)
+
+    async def aacquire(self):
+        """acquire() for the event loop, it waits without blocking the thread."""
+        if self._semaphore is None:
+            return True
+
+        deadline = time.monotonic() + self.acquire_timeout
+        loop = asyncio.get_running_loop()
+        while not self._semaphore.acquire(blocking=False):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+
+            waiter = (loop, loop.create_future())
+            with self._waiters_lock:
+                self._waiters.append(waiter)
+
+            # A place freed before the waiter was queued wakes nobody
+            if self._semaphore.acquire(blocking=False):
+                self._leave(waiter)
+                return True
+
+            try:
+                await asyncio.wait_for(waiter[1], remaining)
+            except asyncio.TimeoutError:
+                self._leave(waiter)
+                return False
+            except BaseException:
+                # Cancelled, e.g. the client went away
+                self._leave(waiter)
+                raise
+        return True
+
+    def release(self):
+        if self._semaphore is not None:
+            self._semaphore.release()
+            self._wake_next()
+
+    def _wake_next(self):
+        with self._waiters_lock:
+            if not self._waiters:
+                return
+            loop, future = self._waiters.popleft()
+        loop.call_soon_threadsafe(_set_done, future)
+
+    def _leave(self, waiter):
+        with self._waiters_lock:
+            try:
+                self._waiters.remove(waiter)
+                return
+            except ValueError:
+                pass
+        # Woken by a release it will not use, the wake goes to the next one
+        self._wake_next()
+
+
+class Call:
+    """Outcome of a guarded call, fail() marks it failed without an exception."""
+
+    def __init__(self):
+        self.failed = False
+
+    def fail(self):
+        self.failed = True
+
+
+_config = getattr(settings, "RESILIENCE", {})
+_breakers = {}
+_bulkheads = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(dependency):
+    """
+    Circuit of a dependency: "meli:<host>", "sql:<alias>" or "mongo".
+    """
+    breaker = _breakers.get(dependency)
+    if breaker is None:
+        with _registry_lock:
+            breaker = _breakers.setdefault(dependency, CircuitBreaker(
+                dependency,
+                failure_threshold=_config.get("FAILURE_THRESHOLD", 5),
+                reset_timeout=_config.get("RESET_TIMEOUT", 30),
+            ))
+    return breaker
+
+
+def get_bulkhead(dependency):
+    """
+    Bulkhead of a dependency, its size is MAX_CONCURRENT of its kind (the
+    part of the name before ":").
+    """
+    bulkhead = _bulkheads.get(dependency)
+    if bulkhead is None:
+        kind = dependency.split(":", 1)[0]
+        with _registry_lock:
+            bulkhead = _bulkheads.setdefault(dependency, Bulkhead(
+                dependency,
+                max_concurrent=_config.get("MAX_CONCURRENT", {}).get(kind, 10),
+                acquire_timeout=_config.get("ACQUIRE_TIMEOUT", 1.0),
+            ))
+    return bulkhead
+
+
+def enter(dependency):
+    """
+    Take a place in the bulkhead of the dependency and check its circuit,
+    raising DependencyUnavailable when the circuit is open or the bulkhead is
+    full. The caller must call bulkhead.release() when the call ends.
+    """
+    breaker = get_breaker(dependency)
+    bulkhead = get_bulkhead(dependency)
+
+    # Fail fast on an open circuit before waiting for a place
+    if breaker.rejecting():
+        _reject(dependency, "open", breaker.retry_after())
+
+    if not bulkhead.acquire():
+        _reject(dependency, "full", 1)
+
+    return _admit(dependency, breaker, bulkhead)
+
+
+async def aenter(dependency):
+    """enter() for the event loop."""
+    breaker = get_breaker(dependency)
+    bulkhead = get_bulkhead(dependency)
+
+    if breaker.rejecting():
+        _reject(dependency, "open", breaker.retry_after())
+
+    if not await bulkhead.aacquire():
+        _reject(dependency, "full", 1)
+
+    return _admit(dependency, breaker, bulkhead)
+
+
+@contextmanager
+def guard(dependency, failures=(Exception,)):
+    """
+    Run a call to the dependency within its bulkhead and circuit, or raise
+    DependencyUnavailable without running it. Exceptions of the failures
+    types, or call.fail(), count as failures; the other exceptions are errors
+    of the caller and count as successes.
+    """
+    breaker, bulkhead = enter(dependency)
+    call = Call()
+    try:
+        yield call
+    except failures:
+        breaker.record_failure()
+        raise
+    except BaseException:
+        breaker.record_success()
+        raise
+    else:
+        _record(breaker, call)
+    finally:
+        bulkhead.release()
+
+
+@asynccontextmanager
+async def aguard(dependency, failures=(Exception,)):
+    """guard() for the calls awaited in the event loop."""
+    breaker, bulkhead = await aenter(dependency)
+    call = Call()
+    try:
+        yield call
+    except failures:
+        breaker.record_failure()
+        raise
+    except BaseException:
+        breaker.record_success()
+        raise
+    else:
+        _record(breaker, call)
+    finally:
+        bulkhead.release()
+
+
+def record_connection_errors(alias):
+    """
+    Count in the circuit of alias a connect that failed in this thread. The
+    connect runs before the execute wrappers, Django only leaves the
+    connection unset with errors_occurred.
+    """
+    connection = connections[alias]
+    if connection.errors_occurred and connection.connection is None:
+        get_breaker("sql:" + alias).record_failure()
+
+
+def _set_done(future):
+    if not future.done():
+        future.set_result(None)
+
+
+def _admit(dependency, breaker, bulkhead):
+    if not breaker.allow():
+        bulkhead.release()
+        _reject(dependency, "open", breaker.retry_after())
+    return breaker, bulkhead
+
+
+def _record(breaker, call):
+    if call.failed:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+
+
+def _reject(dependency, reason, retry_after):
+    metrics.inc("dependency_rejections_total", dependency=dependency, reason=reason)
+    raise DependencyUnavailable(dependency, reason, retry_after)
+
+
+def _record_sql(execute, sql, params, many, context):
+    # The calls are admitted per request (MiddlewareTenantGuard), every
+    # statement reports to the circuit of its alias
+    breaker = get_breaker("sql:" + context["connection"].alias)
+    try:
+        result = execute(sql, params, many, context)
+    except SQL_FAILURES:
+        breaker.record_failure()
+        raise
+    breaker.record_success()
+    return result
+
+
+def _install_sql_recorder(sender, connection, **kwargs):
+    if _record_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_sql)
+
+
+connection_created.connect(_install_sql_recorder)
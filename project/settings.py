@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 import os
 from dotenv import load_dotenv
+from corsheaders.defaults import default_headers
 
 from settings import get_apikeys, get_db_connection, get_time_zones
 
@@ -54,7 +55,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its timings cover the whole request
+    "project.middleware.MiddlewareRequestTiming",
+    # Outside the next two, so the 304 responses get the CORS headers too
     "corsheaders.middleware.CorsMiddleware",
+    # Compress after ConditionalGetMiddleware hashed the plain body
+    "project.middleware.MiddlewareGZip",
+    "django.middleware.http.ConditionalGetMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -63,6 +70,8 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "project.middleware.MiddlewareApiKey",
+    # After MiddlewareApiKey, it guards the database it chose
+    "project.middleware.MiddlewareTenantGuard",
 ]
 
 ROOT_URLCONF = "project.urls"
@@ -154,9 +163,114 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 CORS_ORIGIN_ALLOW_ALL = True
 
+# Pagination token of the GET endpoints, time split of the request and
+# replays of the bulk POSTs
+CORS_EXPOSE_HEADERS = ["X-Next-Cursor", "Server-Timing", "Idempotent-Replayed"]
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key", "x-read-from")
+
 # WMS Configuration
 WMS_BASE_URL = os.getenv("WMS_BASE_URL", "http://localhost:8000")
 
+# Cache of the low-churn GET reads (warehouses, logistic variables, articles).
+# BACKEND is an optional alias of CACHES shared by the workers, when it is
+# empty every process keeps its own LRU cache and a write only invalidates the
+# entries of the worker that made it: set BACKEND when running more than one
+# worker, or keep TTL within the staleness the clients accept.
+WMS_READ_CACHE = {
+    "TTL": int(os.getenv("WMS_READ_CACHE_TTL", 60)),
+    "MAX_ENTRIES": int(os.getenv("WMS_READ_CACHE_MAX_ENTRIES", 1000)),
+    "BACKEND": os.getenv("WMS_READ_CACHE_BACKEND") or None,
+}
+
+# Responses of the bulk POSTs sent with an Idempotency-Key, replayed to the
+# retries for TTL seconds. BACKEND is an optional alias of CACHES shared by the
+# workers, when it is empty every process keeps its own. A retry arriving while
+# the first run goes on waits up to WAIT_TIMEOUT seconds for its response (under
+# the 60 s of the usual gateway timeouts), then gets a 409 with RETRY_AFTER
+# seconds in the Retry-After header. CLAIM_TIMEOUT frees in the shared cache
+# the keys of a worker that died mid-run.
+WMS_IDEMPOTENCY = {
+    "TTL": int(os.getenv("WMS_IDEMPOTENCY_TTL", 86400)),
+    "MAX_ENTRIES": int(os.getenv("WMS_IDEMPOTENCY_MAX_ENTRIES", 1000)),
+    "BACKEND": os.getenv("WMS_IDEMPOTENCY_BACKEND") or None,
+    "WAIT_TIMEOUT": int(os.getenv("WMS_IDEMPOTENCY_WAIT_TIMEOUT", 30)),
+    "RETRY_AFTER": int(os.getenv("WMS_IDEMPOTENCY_RETRY_AFTER", 5)),
+    "CLAIM_TIMEOUT": int(os.getenv("WMS_IDEMPOTENCY_CLAIM_TIMEOUT", 900)),
+}
+
+# MercadoLibre API, can point to a local simulator (mercadolibre.utils.meli_simulator)
+MELI_API_URL = os.getenv("MELI_API_URL", "https://api.mercadolibre.com")
+
+# Requests per second sent to the MercadoLibre API by this process, BURST is
+# the number of requests that can go at once after an idle period.
+MELI_RATE_LIMIT = {
+    "RATE": float(os.getenv("MELI_RATE_LIMIT_RATE", 10)),
+    "BURST": int(os.getenv("MELI_RATE_LIMIT_BURST", 20)),
+}
+
+# Multi-tenant MercadoLibre syncs (manage.py meli_sync): workers shared by
+# all the tenants and jobs running at once for a single tenant.
+MELI_SYNC = {
+    "MAX_WORKERS": int(os.getenv("MELI_SYNC_MAX_WORKERS", 8)),
+    "PER_TENANT": int(os.getenv("MELI_SYNC_PER_TENANT", 1)),
+}
+
+# Structured logs of the request path (project, wmsAdapterV2, mercadolibre).
+# Records go through a queue to a background thread so a slow stdout never
+# blocks a worker. PAYLOAD_SAMPLE_RATE is the part of the request bodies
+# logged, cut to PAYLOAD_MAX_BYTES.
+STRUCTURED_LOGGING = {
+    "ENABLED": os.getenv("STRUCTURED_LOGGING", "true") == "true",
+    "LEVEL": os.getenv("STRUCTURED_LOGGING_LEVEL", "INFO"),
+    "QUEUE_SIZE": int(os.getenv("STRUCTURED_LOGGING_QUEUE_SIZE", 10000)),
+    "PAYLOAD_SAMPLE_RATE": float(os.getenv("STRUCTURED_LOGGING_PAYLOAD_SAMPLE_RATE", 0.01)),
+    "PAYLOAD_MAX_BYTES": int(os.getenv("STRUCTURED_LOGGING_PAYLOAD_MAX_BYTES", 2048)),
+}
+
+# Server-Timing header and time split of the request log line. SAMPLE_RATE
+# is the part of the requests measured, 0 turns it off.
+REQUEST_TIMING = {
+    "SAMPLE_RATE": float(os.getenv("REQUEST_TIMING_SAMPLE_RATE", 1.0)),
+}
+
+# Reads of the tenants with a replica (db_replica in the wms config) go to it,
+# except for STICKY_SECONDS after a write to the tenant. BACKEND is an
+# optional alias of CACHES to share the writes between the workers.
+DB_REPLICAS = {
+    "ENABLED": os.getenv("DB_REPLICAS", "true") == "true",
+    "STICKY_SECONDS": float(os.getenv("DB_REPLICAS_STICKY_SECONDS", 5)),
+    "BACKEND": os.getenv("DB_REPLICAS_BACKEND") or None,
+}
+
+# Circuit breakers and bulkheads of MeLi (per host), the tenant databases
+# (per alias) and Mongo. A circuit opens after FAILURE_THRESHOLD failures in a
+# row and lets a probe through after RESET_TIMEOUT seconds. MAX_CONCURRENT
+# limits the calls (requests, for the tenant databases) running at once per
+# dependency; the others wait up to ACQUIRE_TIMEOUT seconds and fail.
+RESILIENCE = {
+    "FAILURE_THRESHOLD": int(os.getenv("RESILIENCE_FAILURE_THRESHOLD", 5)),
+    "RESET_TIMEOUT": float(os.getenv("RESILIENCE_RESET_TIMEOUT", 30)),
+    "ACQUIRE_TIMEOUT": float(os.getenv("RESILIENCE_ACQUIRE_TIMEOUT", 1)),
+    "MAX_CONCURRENT": {
+        "meli": int(os.getenv("RESILIENCE_MELI_CONCURRENCY", 16)),
+        "sql": int(os.getenv("RESILIENCE_SQL_CONCURRENCY", 8)),
+        "mongo": int(os.getenv("RESILIENCE_MONGO_CONCURRENCY", 16)),
+    },
+    "MELI_TIMEOUT": float(os.getenv("MELI_TIMEOUT", 30)),
+}
+
+# Smallest response body compressed with gzip
+GZIP_MIN_LENGTH = int(os.getenv("GZIP_MIN_LENGTH", 1024))
+
+# Prometheus metrics served on /metrics. With several worker processes set
+# METRICS_DIR to a directory shared by them and emptied on start. TOKEN, when
+# set, is required as a bearer token by the endpoint.
+METRICS = {
+    "DIRECTORY": os.getenv("METRICS_DIR"),
+    "FLUSH_INTERVAL": float(os.getenv("METRICS_FLUSH_INTERVAL", 5)),
+    "TOKEN": os.getenv("METRICS_TOKEN"),
+}
+
 #Configuracion de logging
 # settings.py
 
@@ -225,3 +339,25 @@ LOGGING = {
         },
     },
 }
+
+if STRUCTURED_LOGGING["ENABLED"]:
+    LOGGING['formatters']['structured'] = {
+        '()': 'project.log_pipeline.StructuredFormatter',
+    }
+    LOGGING['handlers']['json_stdout'] = {
+        'class': 'logging.StreamHandler',
+        'stream': 'ext://sys.stdout',
+        'formatter': 'structured',
+    }
+    # Handlers are configured by name order, json_stdout and file come first
+    LOGGING['handlers']['queue'] = {
+        'class': 'project.log_pipeline.QueueListenerHandler',
+        'handlers': ['cfg://handlers.json_stdout', 'cfg://handlers.file'],
+        'queue_size': STRUCTURED_LOGGING["QUEUE_SIZE"],
+    }
+    for logger_name in ('project', 'wmsAdapterV2', 'mercadolibre'):
+        LOGGING['loggers'][logger_name] = {
+            'handlers': ['queue'],
+            'level': STRUCTURED_LOGGING["LEVEL"],
+            'propagate': False,
+        }
@@ -0,0 +1,158 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from project import db_router, resilience
+from project.db_router import ReplicaRouter
+from project.resilience import Bulkhead, CircuitBreaker
+
+
+class WriteTrackerTests(SimpleTestCase):
+
+    def track(self, sql):
+        router = ReplicaRouter(sticky_seconds=60)
+        context = {'connection': SimpleNamespace(alias='tenant')}
+        with mock.patch.object(db_router, 'router', router):
+            db_router._track_writes(lambda *args: None, sql, [], False, context)
+        return router.is_sticky('tenant')
+
+    def test_write_statements(self):
+        for sql in (
+            'INSERT INTO [TDA_WMS_EPK] ([TIPODOCTO]) VALUES (%s)',
+            '  update [TDA_WMS_EPK] SET [ESTADO] = %s',
+            'DELETE FROM [TDA_WMS_EPK] WHERE [PICKING] = %s',
+            'SET NOCOUNT ON; SELECT * INTO #upsert FROM [TDA_WMS_ART] WHERE 1 = 0; '
+            'MERGE [TDA_WMS_ART] AS target USING #upsert AS source ON 1 = 1',
+            'WITH [old] AS (SELECT [ID] FROM [TDA_WMS_EPK] WHERE [ESTADO] = %s) '
+            'DELETE FROM [old]',
+        ):
+            with self.subTest(sql=sql):
+                self.assertTrue(self.track(sql))
+
+    def test_reads(self):
+        for sql in (
+            'SELECT [FECHA_ULTIMA_ACTUALIZACION] FROM [TDA_WMS_EPK]',
+            'SELECT [UPDATED_AT], [DELETED] FROM [TDA_WMS_ART]',
+            'EXEC dbo.sp_VerificarDatosNoExistentesEPK @jsonArray = %s',
+            'SELECT [ESTADO] AS [UPDATE], [ID] AS [DELETE] FROM [TDA_WMS_EPK]',
+            "SELECT [ID] FROM [TDA_WMS_EPK] WHERE [OBSERVACIONES] = 'pedido; delete'",
+            "SELECT [ID] FROM [TDA_WMS_EPK] WHERE [OBSERVACIONES] LIKE '%(update)%'",
+            'SELECT [ID] FROM [TDA_WMS_EPK] WITH (NOLOCK) WHERE [INSERTADO] = %s',
+        ):
+            with self.subTest(sql=sql):
+                self.assertFalse(self.track(sql))
+
+
+class CircuitBreakerTests(SimpleTestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch.object(resilience, 'time', SimpleNamespace(monotonic=lambda: self.now))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker('test', failure_threshold=3, reset_timeout=30)
+
+    def open(self):
+        for _ in range(3):
+            self.assertTrue(self.breaker.allow())
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+    def test_opens_after_failures_in_a_row(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+        self.open()
+        self.assertFalse(self.breaker.allow())
+        self.assertTrue(self.breaker.rejecting())
+        self.assertEqual(self.breaker.retry_after(), 30)
+
+    def test_half_open_probe_closes(self):
+        self.open()
+        self.now += 30
+
+        self.assertFalse(self.breaker.rejecting())
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        # One probe at a time
+        self.assertFalse(self.breaker.allow())
+
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow())
+
+    def test_half_open_probe_failure_opens_again(self):
+        self.open()
+        self.now += 30
+        self.assertTrue(self.breaker.allow())
+
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+
+    def test_silent_probe_gives_its_place(self):
+        self.open()
+        self.now += 30
+        self.assertTrue(self.breaker.allow())
+        self.now += 30
+        self.assertTrue(self.breaker.allow())
+
+
+class BulkheadTests(SimpleTestCase):
+
+    def test_acquire_times_out_when_full(self):
+        bulkhead = Bulkhead('test', max_concurrent=2, acquire_timeout=0.05)
+        self.assertTrue(bulkhead.acquire())
+        self.assertTrue(bulkhead.acquire())
+        self.assertFalse(bulkhead.acquire())
+
+        bulkhead.release()
+        self.assertTrue(bulkhead.acquire())
+
+    def test_aacquire_times_out_and_is_woken(self):
+        bulkhead = Bulkhead('test', max_concurrent=1, acquire_timeout=0.05)
+
+        async def run():
+            self.assertTrue(await bulkhead.aacquire())
+            self.assertFalse(await bulkhead.aacquire())
+
+            waiting = asyncio.create_task(bulkhead.aacquire())
+            await asyncio.sleep(0.01)
+            bulkhead.release()
+            self.assertTrue(await waiting)
+
+        asyncio.run(run())
+        self.assertEqual(len(bulkhead._waiters), 0)
+
+    def test_guard_rejects_when_full(self):
+        bulkhead = Bulkhead('test:full', max_concurrent=1, acquire_timeout=0.01)
+        breaker = CircuitBreaker('test:full')
+        entered = threading.Event()
+        leave = threading.Event()
+
+        def hold():
+            with resilience.guard('test:full'):
+                entered.set()
+                leave.wait(1)
+
+        with mock.patch.dict(resilience._bulkheads, {'test:full': bulkhead}), \
+                mock.patch.dict(resilience._breakers, {'test:full': breaker}):
+            thread = threading.Thread(target=hold)
+            thread.start()
+            entered.wait(1)
+            try:
+                with self.assertRaises(resilience.DependencyUnavailable) as rejected:
+                    with resilience.guard('test:full'):
+                        pass
+            finally:
+                leave.set()
+                thread.join()
+
+        self.assertEqual(rejected.exception.reason, 'full')
+        # A rejection is not a failure of the dependency
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
@@ -123,6 +123,14 @@ def get_db_connection() -> dict:
                     "db_base"
                 ]  # base
 
+                # optional read replicas, used by the GET reads (project.db_router)
+                if item["wms"].get("db_replica"):
+                    db_connection[str(collection.name) + "_replica"] = item["wms"]["db_replica"]
+                if item["wms"].get("db_base_replica"):
+                    db_connection[str(collection.name) + "_base_replica"] = item["wms"][
+                        "db_base_replica"
+                    ]
+
         # close the connection
         client.close()
 
@@ -1,6 +1,6 @@
 from wmsAdapterV2.models import TdaWmsClt
 from wmsAdapterV2.utils.convert_field_to_string import convert_to_string
-from wmsAdapterV2.utils.get_time_by_timezone import get_time_by_timezone
+from wmsAdapterV2.utils.get_time_by_timezone import get_request_clock
 from wmsAdapterV2.utils.validate_request_data import validate_request_data
 
 
@@ -8,7 +8,7 @@ def create_list_customers(request, db_name, request_data=None):
     # Convert request data to a list of dictionaries
     try:
         request_data = validate_request_data(request, list, request_data)
-        time_record = get_time_by_timezone(db_name)
+        time_record = get_request_clock(db_name, request).text
     except Exception as e:
         raise ValueError(e)
 
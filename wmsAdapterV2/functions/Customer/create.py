@@ -1,8 +1,11 @@
 import json
+import logging
 from django.utils import timezone
 from wmsAdapterV2.models import TdaWmsClt
 from django.http.response import JsonResponse
 
+logger = logging.getLogger(__name__)
+
 
 def create_clt(request, db_name, request_data=None):
     
@@ -44,8 +47,8 @@ def create_clt(request, db_name, request_data=None):
 
                 return 'created successfully'
             except Exception as e:
-                print(e)
+                logger.warning(f"Error creating customer: {e}")
                 return str(e.__cause__).lower()
         except Exception as e:
-            print(e)
+            logger.warning(f"Error creating customer: {e}")
             return str(e.__cause__).lower()
\ No newline at end of file
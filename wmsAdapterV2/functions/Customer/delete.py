@@ -1,5 +1,9 @@
+import logging
+
 from wmsAdapterV2.functions.Customer.read import read_clt
 
+logger = logging.getLogger(__name__)
+
 
 def delete_clt(request, db_name):
     try:
@@ -16,5 +20,5 @@ def delete_clt(request, db_name):
             else:
                 return 'More than one clt found'
     except Exception as e:
-        print(e)
+        logger.warning(f"Error deleting customer: {e}")
         return str(e.__cause__)
@@ -0,0 +1,47 @@
+from django.db.models import F
+
+from wmsAdapterV2.functions.Customer.bulk_customer import validate_clt_data
+from wmsAdapterV2.models import TdaWmsClt
+from wmsAdapterV2.utils.get_time_by_timezone import get_request_clock
+from wmsAdapterV2.utils.read_cache import invalidate_read_cache
+from wmsAdapterV2.utils.upsert_data import format_upsert_rows, upsert_data
+from wmsAdapterV2.utils.validate_request_data import validate_request_data
+
+# Fields the upsert never takes from the request
+SKIPPED_FIELDS = ('fecharegistro',)
+
+
+def upsert_customers(request, db_name, request_data=None):
+    '''
+    Create or update customers by item with a single MERGE into TDA_WMS_CLT.
+    The new customers get the same values as create_list_customers; the
+    existing ones are only written when a value changes.
+    @return:
+        counts: inserted, updated and unchanged customers
+        errors: customers rejected before the merge
+    '''
+    try:
+        request_data = validate_request_data(request, list, request_data)
+        time_record = get_request_clock(db_name, request).text
+    except Exception as e:
+        raise ValueError(e)
+
+    rows, errors = format_upsert_rows(TdaWmsClt, request_data, validate_clt_data, SKIPPED_FIELDS)
+
+    counts = upsert_data(
+        db_name,
+        TdaWmsClt,
+        list(rows.values()),
+        insert_values={
+            'fecharegistro': str(time_record),
+            'activocliente': 1,
+            'isactivocliente': 1,
+        },
+        insert_defaults={'nit': F('item')},
+        time_record=time_record,
+    )
+
+    if counts['inserted'] or counts['updated']:
+        invalidate_read_cache(db_name, TdaWmsClt)
+
+    return counts, errors
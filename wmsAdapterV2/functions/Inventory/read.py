@@ -4,8 +4,10 @@ from datetime import datetime, timedelta
 
 from wmsAdapterV2.models import TdaWmsArt, TdaWmsInv
 from wmsAdapterV2.utils.filter_by_field import filter_by_field
-from wmsAdapterV2.utils.get_data import exec_query_orm
+from wmsAdapterV2.utils.get_cursor import get_cursor
+from wmsAdapterV2.utils.conditional_read import conditional_query_orm
 from wmsAdapterV2.utils.get_date_range import get_date_range
+from wmsAdapterV2.utils.get_export_format import get_export_format
 from wmsAdapterV2.utils.get_fields_filter import get_fields_filter
 from wmsAdapterV2.utils.get_limit import get_limit
 from wmsAdapterV2.utils.get_since_identifier import get_since_identifier
@@ -30,7 +32,9 @@ def read_inventory(request, db_name):
     params = dict(request.GET)
 
     try:
-        default_limit, params = get_limit(params)
+        export, params = get_export_format(params)
+        default_limit, params = get_limit(params, export)
+        cursor, params = get_cursor(params)
         query, params = get_since_identifier(query, params)
         fields, params = get_fields_filter(params)
         sort, params = get_sort(TdaWmsInv, params)
@@ -47,12 +51,14 @@ def read_inventory(request, db_name):
             'query': query,
             'fields': fields,
             'default_limit': default_limit,
+            'cursor': cursor,
+            'stream': export,
             'sort': sort,
         }
 
-        inventory, query, _ = exec_query_orm(json_query_orm)
+        inventory, query, _, next_cursor = conditional_query_orm(request, json_query_orm)
 
-        return inventory, query
+        return inventory, query, next_cursor
 
     # If there is an error
     except Exception as e:
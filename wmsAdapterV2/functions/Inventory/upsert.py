@@ -0,0 +1,177 @@
+from django.db import connections, transaction
+
+from wmsAdapterV2.functions.Inventory.bulk import validate_inv_data
+from wmsAdapterV2.models import TdaWmsInv
+from wmsAdapterV2.utils.convert_field_to_string import convert_to_string
+from wmsAdapterV2.utils.get_time_by_timezone import get_request_clock
+from wmsAdapterV2.utils.read_cache import invalidate_read_cache
+from wmsAdapterV2.utils.upsert_data import create_stage_table, insert_value, stage_rows
+from wmsAdapterV2.utils.validate_request_data import validate_request_data
+
+# Unique key of TDA_WMS_INV
+KEY_FIELDS = ('bod', 'ubicacion', 'productoean')
+
+# Fields the upsert never takes from the request
+SKIPPED_FIELDS = ('id', 'fecharegistro', 'fecha_ultima_actualizacion')
+
+# Field zeroed on the rows missing from the snapshot
+STOCK_FIELD = 'saldopt'
+
+STAGE_TABLE = '#tda_wms_inv_snapshot'
+
+
+def upsert_inventory(request, db_name, request_data=None, zero_missing=False):
+    '''
+    Apply an inventory snapshot: the rows are staged in a temp table and
+    merged into TDA_WMS_INV on (bod, ubicacion, productoean) with a single
+    MERGE.
+    @params:
+        zero_missing: zero the stock of the rows missing from the snapshot,
+            only on the warehouses (bod) present in it
+    @return:
+        counts: inserted, updated, unchanged and zeroed rows
+        errors: rows rejected before the merge
+    '''
+    try:
+        request_data = validate_request_data(request, list, request_data)
+        time_record = get_request_clock(db_name, request).text
+    except Exception as e:
+        raise ValueError(e)
+
+    errors = []
+    rows = {}
+    inv_fields = {
+        field.name: field
+        for field in TdaWmsInv._meta.concrete_fields
+        if field.name not in SKIPPED_FIELDS
+    }
+
+    for rd in request_data:
+        try:
+            key_inv = ' '.join(convert_to_string(rd.get(f)) for f in KEY_FIELDS)
+        except Exception:
+            key_inv = ''
+
+        valid_inv = validate_inv_data(rd)
+        if valid_inv:
+            errors.append('error: ' + str(key_inv) + ' ' + str(valid_inv))
+            continue
+
+        if key_inv in rows:
+            errors.append('error: ' + str(key_inv) + ' Inventory record is duplicated in the request')
+            continue
+
+        try:
+            row = {
+                key: inv_fields[key].to_python(value)
+                for key, value in rd.items()
+                if key in inv_fields
+            }
+        except Exception as e:
+            errors.append('error: ' + str(key_inv) + ' ' + '; '.join(getattr(e, 'messages', [str(e)])))
+            continue
+
+        row['ubicacion'] = row.get('ubicacion') or ''
+        row['codigoalmacen'] = row.get('codigoalmacen') or row['bod']
+        rows[key_inv] = row
+
+    counts = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'zeroed': 0}
+    if not rows:
+        return counts, errors
+
+    # Stage only the columns the snapshot brings
+    stage_fields = [
+        field for name, field in inv_fields.items()
+        if any(name in row for row in rows.values())
+    ]
+
+    connection = connections[db_name]
+    with transaction.atomic(using=db_name):
+        with connection.cursor() as cursor:
+            create_stage_table(connection, cursor, STAGE_TABLE, stage_fields)
+            stage_rows(connection, cursor, STAGE_TABLE, stage_fields, rows.values())
+
+            cursor.execute(
+                *_merge_sql(connection, stage_fields, inv_fields, zero_missing, time_record)
+            )
+            actions = dict(cursor.fetchall())
+            # Only on success, see create_stage_table
+            cursor.execute(f'DROP TABLE {STAGE_TABLE}')
+
+    counts['inserted'] = actions.get('INSERT', 0)
+    counts['updated'] = actions.get('UPDATE', 0)
+    counts['zeroed'] = actions.get('ZERO', 0)
+    counts['unchanged'] = len(rows) - counts['inserted'] - counts['updated']
+
+    if counts['inserted'] or counts['updated'] or counts['zeroed']:
+        invalidate_read_cache(db_name, TdaWmsInv)
+
+    return counts, errors
+
+
+def _merge_sql(connection, stage_fields, inv_fields, zero_missing, time_record):
+    qn = connection.ops.quote_name
+    table = qn(TdaWmsInv._meta.db_table)
+    stage_names = {field.name for field in stage_fields}
+    params = []
+
+    def column(name):
+        return qn(TdaWmsInv._meta.get_field(name).column)
+
+    on = ' AND '.join(f't.{column(f)} = s.{column(f)}' for f in KEY_FIELDS)
+
+    sql = f'''
+        SET NOCOUNT ON;
+        DECLARE @actions TABLE (action NVARCHAR(10));
+        MERGE {table} WITH (HOLDLOCK) AS t
+        USING {STAGE_TABLE} AS s
+        ON {on}
+    '''
+
+    # Only rows with a changed value are updated, missing values keep the stored ones
+    values = [f for f in stage_fields if f.name not in KEY_FIELDS]
+    if values:
+        source = ', '.join(f'COALESCE(s.{qn(f.column)}, t.{qn(f.column)})' for f in values)
+        target = ', '.join(f't.{qn(f.column)}' for f in values)
+        update = ', '.join(f'{qn(f.column)} = COALESCE(s.{qn(f.column)}, t.{qn(f.column)})' for f in values)
+        sql += f'''
+        WHEN MATCHED AND EXISTS (SELECT {source} EXCEPT SELECT {target}) THEN
+            UPDATE SET {update}, {column('fecha_ultima_actualizacion')} = %s
+        '''
+        params.append(time_record)
+
+    # Not null text columns get the same empty default as the ORM inserts
+    insert_fields = list(stage_fields) + [
+        field for name, field in inv_fields.items()
+        if name not in stage_names and not field.null and field.get_internal_type() == 'CharField'
+    ]
+    insert_columns = ', '.join(qn(f.column) for f in insert_fields)
+    insert_values = ', '.join(
+        insert_value(f, f's.{qn(f.column)}', f.name in stage_names) for f in insert_fields
+    )
+    sql += f'''
+        WHEN NOT MATCHED BY TARGET THEN
+            INSERT ({insert_columns}, {column('fecharegistro')}, {column('fecha_ultima_actualizacion')})
+            VALUES ({insert_values}, %s, %s)
+    '''
+    params.extend([time_record, time_record])
+
+    if zero_missing:
+        stock = column(STOCK_FIELD)
+        sql += f'''
+        WHEN NOT MATCHED BY SOURCE
+            AND t.{column('bod')} IN (SELECT {column('bod')} FROM {STAGE_TABLE})
+            AND (t.{stock} IS NULL OR t.{stock} <> 0) THEN
+            UPDATE SET {stock} = 0, {column('fecha_ultima_actualizacion')} = %s
+        '''
+        params.append(time_record)
+
+    # Zeroed rows have no source row
+    sql += f'''
+        OUTPUT CASE WHEN $action = 'UPDATE' AND s.{column('bod')} IS NULL THEN 'ZERO' ELSE $action END
+        INTO @actions;
+
+        SELECT action, COUNT(*) FROM @actions GROUP BY action;
+    '''
+
+    return sql, params
@@ -1,16 +1,22 @@
+import logging
+
 from django.db.models import Q
 
 
 from wmsAdapterV2.models.TdaWmsCecoMrm import TdaWmsCecoMrm
 from wmsAdapterV2.utils.filter_by_field import filter_by_field
+from wmsAdapterV2.utils.get_cursor import get_cursor
 from wmsAdapterV2.utils.get_data import exec_query_orm
 from wmsAdapterV2.utils.get_date_range import get_date_range
+from wmsAdapterV2.utils.get_export_format import get_export_format
 from wmsAdapterV2.utils.get_fields_filter import get_fields_filter
 from wmsAdapterV2.utils.get_limit import get_limit
 from wmsAdapterV2.utils.get_since_identifier import get_since_identifier
 from wmsAdapterV2.utils.get_sort import get_sort
 from wmsAdapterV2.utils.validate_fields import validate_fields
 
+logger = logging.getLogger(__name__)
+
 def read_inventory_adjustment(request, db_name):
 
     '''
@@ -27,14 +33,16 @@ def read_inventory_adjustment(request, db_name):
     params = dict(request.GET)
 
     try:
-        default_limit, params = get_limit(params)
+        export, params = get_export_format(params)
+        default_limit, params = get_limit(params, export)
+        cursor, params = get_cursor(params)
         query, params = get_since_identifier(query, params)
         fields, params = get_fields_filter(params)
         sort, params = get_sort(TdaWmsCecoMrm, params)
         fields = validate_fields(fields, TdaWmsCecoMrm)
         query, params = filter_by_field(TdaWmsCecoMrm, query, params)
         query, params = get_date_range(query, Q(), params, 'fecha_contabilizacion')
-        print(query)
+        logger.debug(f"Inventory adjustment query: {query}")
     except Exception as e:
         raise ValueError(e)
 
@@ -45,12 +53,14 @@ def read_inventory_adjustment(request, db_name):
                 'query': query, 
                 'fields': fields,
                 'default_limit': default_limit, 
+                'cursor': cursor,
+                'stream': export,
                 'sort': sort,
             }
             
-        suppliers, query, _ = exec_query_orm(json_query_orm)
+        suppliers, query, _, next_cursor = exec_query_orm(json_query_orm)
             
-        return suppliers, query
+        return suppliers, query, next_cursor
 
     # If there is an error
     except Exception as e:
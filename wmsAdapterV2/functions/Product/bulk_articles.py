@@ -1,6 +1,7 @@
 from wmsAdapterV2.models import TdaWmsArt
 from wmsAdapterV2.utils.convert_field_to_string import convert_to_string
-from wmsAdapterV2.utils.get_time_by_timezone import get_time_by_timezone
+from wmsAdapterV2.utils.get_time_by_timezone import get_request_clock
+from wmsAdapterV2.utils.read_cache import invalidate_read_cache
 from wmsAdapterV2.utils.validate_request_data import validate_request_data
 
 
@@ -8,7 +9,7 @@ def create_list_articles(request, db_name, request_data=None):
     # Convert request data to a list of dictionaries
     try:
         request_data = validate_request_data(request, list, request_data)
-        time_record = get_time_by_timezone(db_name)
+        time_record = get_request_clock(db_name, request).text
     except Exception as e:
         raise ValueError(e)
 
@@ -143,4 +144,7 @@ def create_arts(db_name, valid_products, errors):
                         f"error: {str(r.productoean)} {str(r.descripcion)} - {str(e)}"
                     )
 
+    if created_products:
+        invalidate_read_cache(db_name, TdaWmsArt)
+
     return created_products, errors
@@ -3,12 +3,14 @@ from django.db.models import Q
 from datetime import datetime, timedelta
 
 from wmsAdapterV2.utils.filter_by_field import filter_by_field
-from wmsAdapterV2.utils.get_data import exec_query_orm
+from wmsAdapterV2.utils.get_cursor import get_cursor
 from wmsAdapterV2.utils.get_date_range import get_date_range
+from wmsAdapterV2.utils.get_export_format import get_export_format
 from wmsAdapterV2.utils.get_fields_filter import get_fields_filter
 from wmsAdapterV2.utils.get_limit import get_limit
 from wmsAdapterV2.utils.get_since_identifier import get_since_identifier
 from wmsAdapterV2.utils.get_sort import get_sort
+from wmsAdapterV2.utils.read_cache import cached_query_orm
 from wmsAdapterV2.utils.validate_fields import validate_fields
 
 """ Models and functions """
@@ -30,7 +32,9 @@ def read_articles(request, db_name):
         params = dict(request.GET)
 
         try:
-            default_limit, params = get_limit(params)
+            export, params = get_export_format(params)
+            default_limit, params = get_limit(params, export)
+            cursor, params = get_cursor(params)
             query, params = get_since_identifier(query, params)
             fields, params = get_fields_filter(params)
             sort, params = get_sort(TdaWmsArt, params)
@@ -48,12 +52,14 @@ def read_articles(request, db_name):
                 'query': query, 
                 'fields': fields,
                 'default_limit': default_limit, 
+                'cursor': cursor,
+                'stream': export,
                 'sort': sort,
             }
             
-            articles, query, _ = exec_query_orm(json_query_orm)
+            articles, query, _, next_cursor = cached_query_orm(json_query_orm)
             
-            return articles, query 
+            return articles, query, next_cursor
 
         # If there is an error
         except Exception as e:
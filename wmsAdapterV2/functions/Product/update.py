@@ -3,6 +3,7 @@ from django.db.models import Q
 
 from wmsAdapterV2.utils.filter_by_field import filter_by_field
 from wmsAdapterV2.utils.get_fields_filter import get_fields_filter
+from wmsAdapterV2.utils.get_time_by_timezone import get_request_clock
 from wmsAdapterV2.utils.update_data import update_data
 from wmsAdapterV2.utils.update_multiple_records import update_multiple_records
 from wmsAdapterV2.utils.validate_fields import validate_fields
@@ -28,7 +29,8 @@ def update_articles(request, db_name, request_data=None):
             'db_name': db_name, 
             'model': TdaWmsArt, 
             'query': query, 
-            'mult': mult
+            'mult': mult,
+            'clock': get_request_clock(db_name, request)
         }
         
         updated, errors = update_data(json_query_orm, request_data)
@@ -1,10 +1,19 @@
 from wmsAdapterV2.models import TdaWmsEpn, TdaWmsDpn
 from wmsAdapterV2.utils.convert_field_to_string import convert_to_string
 from wmsAdapterV2.utils.get_next_lineaidpicking import get_next_lineaidop, get_sequence
-from wmsAdapterV2.utils.get_time_by_timezone import get_time_by_timezone
+from wmsAdapterV2.utils.get_time_by_timezone import get_request_clock
+from wmsAdapterV2.utils.key_index import (
+    filter_by_values,
+    index_rows,
+    join_key,
+    request_values,
+)
 from wmsAdapterV2.utils.validate_request_data import validate_request_data
 from wmsAdapterV2.utils.verify_datetime_field import verify_datetime_field
 
+EPN_KEY_FIELDS = ("tipodocto", "doctoerp", "numpedido", "productoean")
+PICKING_JOIN_FIELDS = ("picking", "tipodocto", "doctoerp", "numpedido")
+
 
 def create_list_production_order(request, db_name, request_data=None):
 
@@ -12,7 +21,8 @@ def create_list_production_order(request, db_name, request_data=None):
         next_lineaidop = get_next_lineaidop(db_name)
         next_picking = get_sequence("secuencia_picking", db_name)
         request_data = validate_request_data(request, list, request_data)
-        time_record = get_time_by_timezone(db_name)
+        clock = get_request_clock(db_name, request)
+        time_record = clock.text
     except Exception as e:
         raise ValueError(e)
 
@@ -23,72 +33,49 @@ def create_list_production_order(request, db_name, request_data=None):
     dpn_keys = set()
     dpn_keys_id = set()
     errors = []
-    start_date = get_time_by_timezone(db_name, 'days', -15)
+    start_date = clock.shift('days', -15)
+
+    # Only the orders of the request can collide with the existing ones
+    doctoerps = request_values(request_data, "doctoerp")
 
-    epn_list = list(
+    epn_list = filter_by_values(
         TdaWmsEpn.objects.using(db_name)
         .filter(fecharegistro__gte=start_date)
-        .values("tipodocto", "doctoerp", "numpedido", "productoean", "picking")
+        .values("tipodocto", "doctoerp", "numpedido", "productoean", "picking"),
+        "doctoerp",
+        doctoerps,
     )
-    epn_keys = {
-        str(epn["tipodocto"])
-        + " "
-        + str(epn["doctoerp"])
-        + " "
-        + str(epn["numpedido"])
-        + " "
-        + str(epn["productoean"])
-        for epn in epn_list
-    }
+    epn_keys = {join_key(epn, EPN_KEY_FIELDS) for epn in epn_list}
 
     for e in epn_list:
-        pickings[
-            str(e["tipodocto"])
-            + str(e["doctoerp"])
-            + str(e["numpedido"])
-            + str(e["productoean"])
-        ] = e["picking"]
-
-    dpn_list = list(
+        pickings[join_key(e, EPN_KEY_FIELDS, sep="")] = e["picking"]
+
+    dpn_list = filter_by_values(
         TdaWmsDpn.objects.using(db_name)
         .filter(fecharegistro__gte=start_date)
         .values(
             "tipodocto", "doctoerp", "numpedido", "productoean", "picking", "lineaidop"
-        )
+        ),
+        "doctoerp",
+        doctoerps,
     )
+
+    # Hash join of the details with their header
+    epn_index = index_rows(epn_list, PICKING_JOIN_FIELDS)
+
     for dpn in dpn_list:
-        for epn in epn_list:
-            if (
-                dpn["picking"] == epn["picking"]
-                and dpn["tipodocto"] == epn["tipodocto"]
-                and dpn["doctoerp"] == epn["doctoerp"]
-                and dpn["numpedido"] == epn["numpedido"]
-            ):
-
-                dpn_keys.add(
-                    str(dpn["tipodocto"])
-                    + " "
-                    + str(dpn["doctoerp"])
-                    + " "
-                    + str(dpn["numpedido"])
-                    + " "
-                    + str(epn["productoean"])
-                    + " "
-                    + str(dpn["productoean"])
-                )
-                dpn_keys_id.add(
-                    str(dpn["tipodocto"])
-                    + " "
-                    + str(dpn["doctoerp"])
-                    + " "
-                    + str(dpn["numpedido"])
-                    + " "
-                    + str(epn["productoean"])
-                    + " "
-                    + str(dpn["productoean"])
-                    + " "
-                    + str(dpn["lineaidop"])
-                )
+        dpn_join = tuple(str(dpn[field]) for field in PICKING_JOIN_FIELDS)
+
+        for epn in epn_index.get(dpn_join, []):
+            key_dpn = (
+                join_key(dpn, ("tipodocto", "doctoerp", "numpedido"))
+                + " "
+                + str(epn["productoean"])
+                + " "
+                + str(dpn["productoean"])
+            )
+            dpn_keys.add(key_dpn)
+            dpn_keys_id.add(key_dpn + " " + str(dpn["lineaidop"]))
 
     for rd in request_data:
 
@@ -4,8 +4,10 @@ from django.db.models import Q
 
 from wmsAdapterV2.models import TdaWmsDpn, TdaWmsEpn
 from wmsAdapterV2.utils.filter_by_field import filter_by_field
-from wmsAdapterV2.utils.get_data import exec_query_orm
+from wmsAdapterV2.utils.get_cursor import get_cursor
+from wmsAdapterV2.utils.conditional_read import conditional_query_orm
 from wmsAdapterV2.utils.get_date_range import get_date_range
+from wmsAdapterV2.utils.get_export_format import get_export_format
 from wmsAdapterV2.utils.get_fields_filter import get_fields_filter
 from wmsAdapterV2.utils.get_include_filter import get_include_filter
 from wmsAdapterV2.utils.get_limit import get_limit
@@ -33,7 +35,9 @@ def read_production_orders(request, db_name):
         params = dict(request.GET)
 
         try:
-            default_limit, params = get_limit(params)
+            export, params = get_export_format(params)
+            default_limit, params = get_limit(params, export)
+            cursor, params = get_cursor(params)
             query, params = get_since_identifier(query, params)
             fields, params = get_fields_filter(params)
             sort, params = get_sort(TdaWmsEpn, params)
@@ -57,13 +61,15 @@ def read_production_orders(request, db_name):
                 'fields': fields,
                 'include': include,
                 'default_limit': default_limit, 
+                'cursor': cursor,
+                'stream': export,
                 'sort': sort,
                 'field_join': 'picking'
             }
             
-            orders, query, query_detail= exec_query_orm(json_query_orm)
+            orders, query, query_detail, next_cursor = conditional_query_orm(request, json_query_orm)
             
-            return orders, query, query_detail
+            return orders, query, query_detail, next_cursor
 
         # If there is an error
         except Exception as e:
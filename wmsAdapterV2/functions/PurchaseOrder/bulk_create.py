@@ -1,16 +1,25 @@
+import logging
+
 from wmsAdapterV2.models import TdaWmsDuk, TdaWmsEuk
 from wmsAdapterV2.utils.convert_field_to_string import convert_to_string
 from wmsAdapterV2.utils.get_next_lineaidpicking import get_next_lineaidpicking
-from wmsAdapterV2.utils.get_time_by_timezone import get_time_by_timezone
+from wmsAdapterV2.utils.get_time_by_timezone import get_request_clock
+from wmsAdapterV2.utils.key_index import filter_by_values, join_key, request_values
 from wmsAdapterV2.utils.validate_request_data import validate_request_data
 from wmsAdapterV2.utils.verify_datetime_field import verify_datetime_field
 
+EUK_KEY_FIELDS = ("tipodocto", "doctoerp", "numdocumento")
+DUK_KEY_FIELDS = EUK_KEY_FIELDS + ("productoean",)
+
+logger = logging.getLogger(__name__)
+
 
 def create_list_purchase_order(request, db_name, request_data=None):
     try:
         next_lineaidpicking = get_next_lineaidpicking(db_name, TdaWmsDuk)
         request_data = validate_request_data(request, list, request_data)
-        time_record = get_time_by_timezone(db_name)
+        clock = get_request_clock(db_name, request)
+        time_record = clock.text
     except Exception as e:
         raise ValueError(e)
 
@@ -20,51 +29,33 @@ def create_list_purchase_order(request, db_name, request_data=None):
     duk_keys = set()
     duk_keys_id = set()
     errors = []
-    start_date = get_time_by_timezone(db_name, 'days', -15)
+    start_date = clock.shift('days', -15)
+
+    # Only the orders of the request can collide with the existing ones
+    doctoerps = request_values(request_data, "doctoerp")
 
-    euk_list = list(
+    euk_list = filter_by_values(
         TdaWmsEuk.objects.using(db_name)
         .filter(fecharegistro__gte=start_date)
-        .values("tipodocto", "doctoerp", "numdocumento")
+        .values("tipodocto", "doctoerp", "numdocumento"),
+        "doctoerp",
+        doctoerps,
     )
-    euk_keys = {
-        str(euk["tipodocto"])
-        + " "
-        + str(euk["doctoerp"])
-        + " "
-        + str(euk["numdocumento"])
-        for euk in euk_list
-    }
-
-    duk_list = list(
+    euk_keys = {join_key(euk, EUK_KEY_FIELDS) for euk in euk_list}
+
+    duk_list = filter_by_values(
         TdaWmsDuk.objects.using(db_name)
         .filter(fecharegistro__gte=start_date)
         .values(
             "tipodocto", "doctoerp", "numdocumento", "productoean", "lineaidpicking"
-        )
+        ),
+        "doctoerp",
+        doctoerps,
     )
 
     for duk in duk_list:
-        duk_keys.add(
-            str(duk["tipodocto"])
-            + " "
-            + str(duk["doctoerp"])
-            + " "
-            + str(duk["numdocumento"])
-            + " "
-            + str(duk["productoean"])
-        )
-        duk_keys_id.add(
-            str(duk["tipodocto"])
-            + " "
-            + str(duk["doctoerp"])
-            + " "
-            + str(duk["numdocumento"])
-            + " "
-            + str(duk["productoean"])
-            + " "
-            + str(duk["lineaidpicking"])
-        )
+        duk_keys.add(join_key(duk, DUK_KEY_FIELDS))
+        duk_keys_id.add(join_key(duk, DUK_KEY_FIELDS + ("lineaidpicking",)))
 
     for rd in request_data:
 
@@ -259,7 +250,7 @@ def format_duk_object(rd, od, duk_keys, key_duk, order_details, errors, next, ti
         filtered_detail["caja_destino"] = filtered_detail.get("caja_destino") or None
 
         filtered_detail = verify_datetime_field(TdaWmsDuk, filtered_detail)
-        print(filtered_detail)
+        logger.debug("Purchase order detail: %s", filtered_detail)
         order_details.append(TdaWmsDuk(**filtered_detail))
         duk_keys.add(key_duk)
 
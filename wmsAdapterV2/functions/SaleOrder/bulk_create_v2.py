@@ -1,5 +1,3 @@
-import json
-
 from wmsAdapterV2.models import TdaWmsEpk, TdaWmsDpk
 from wmsAdapterV2.utils.convert_field_to_string import convert_to_string
 from wmsAdapterV2.utils.get_next_lineaidpicking import (
@@ -7,8 +5,8 @@ from wmsAdapterV2.utils.get_next_lineaidpicking import (
     get_sequence,
 )
 from wmsAdapterV2.utils.get_non_existent_records import get_non_existent_records
-from wmsAdapterV2.utils.get_time_by_timezone import get_time_by_timezone
-from wmsAdapterV2.utils.serializer import serializer
+from wmsAdapterV2.utils.get_time_by_timezone import get_request_clock
+from wmsAdapterV2.utils.json_encoder import dumps_payload
 from wmsAdapterV2.utils.validate_request_data import validate_request_data
 from wmsAdapterV2.utils.verify_datetime_field import verify_datetime_field
 
@@ -16,7 +14,7 @@ from wmsAdapterV2.utils.verify_datetime_field import verify_datetime_field
 def create_list_sale_order_without_orm_validation(request, db_name, request_data=None):
     try:
         request_data = validate_request_data(request, list, request_data)
-        time_record = get_time_by_timezone(db_name)
+        time_record = get_request_clock(db_name, request).text
     except Exception as e:
         raise ValueError(e)
 
@@ -80,13 +78,13 @@ def create_list_sale_order_without_orm_validation(request, db_name, request_data
                 )
 
     try:
-        orders_string = json.dumps(formatted_orders, default=serializer, indent=4)
+        orders_string = dumps_payload(formatted_orders)
     except Exception as e:
         errors.append(f"error: formatting the sales order dictionary - {e}")
         return [], [], errors
 
     try:
-        details_string = json.dumps(formatted_details, default=serializer, indent=4)
+        details_string = dumps_payload(formatted_details)
     except Exception as e:
         errors.append(f"error: formatting the sales order detail dictionary - {e}")
         return [], [], errors
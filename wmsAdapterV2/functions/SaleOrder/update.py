@@ -3,6 +3,7 @@ from django.db.models import Q
 from wmsAdapterV2.models import TdaWmsDpk, TdaWmsEpk
 from wmsAdapterV2.utils.filter_by_field import filter_by_field
 from wmsAdapterV2.utils.get_fields_filter import get_fields_filter
+from wmsAdapterV2.utils.get_time_by_timezone import get_request_clock
 from wmsAdapterV2.utils.update_data import update_data
 from wmsAdapterV2.utils.update_multiple_records import update_multiple_records
 from wmsAdapterV2.utils.validate_fields import validate_fields
@@ -31,7 +32,8 @@ def update_sale_order(request, db_name, request_data=None):
             'model_detail': TdaWmsDpk,
             'query': query, 
             'query_detail': query_detail,
-            'mult': mult
+            'mult': mult,
+            'clock': get_request_clock(db_name, request)
         }
         
         if isinstance(request_data, dict):
@@ -1,5 +1,9 @@
+import logging
+
 from wmsAdapterV2.functions.Supplier.read import read_prv
 
+logger = logging.getLogger(__name__)
+
 
 def delete_prv(request, db_name):
     try:
@@ -16,5 +20,5 @@ def delete_prv(request, db_name):
             else:
                 return 'More than one prv found'
     except Exception as e:
-        print(e)
+        logger.warning(f"Error deleting supplier: {e}")
         return str(e.__cause__)
\ No newline at end of file
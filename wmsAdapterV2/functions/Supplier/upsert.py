@@ -0,0 +1,46 @@
+from django.db.models import F
+
+from wmsAdapterV2.functions.Supplier.bulk_supplier import validate_prv_data
+from wmsAdapterV2.models import TdaWmsPrv
+from wmsAdapterV2.utils.get_time_by_timezone import get_request_clock
+from wmsAdapterV2.utils.read_cache import invalidate_read_cache
+from wmsAdapterV2.utils.upsert_data import format_upsert_rows, upsert_data
+from wmsAdapterV2.utils.validate_request_data import validate_request_data
+
+# Fields the upsert never takes from the request
+SKIPPED_FIELDS = ('fecharegistro',)
+
+
+def upsert_suppliers(request, db_name, request_data=None):
+    '''
+    Create or update suppliers by item with a single MERGE into TDA_WMS_PRV.
+    The new suppliers get the same values as create_list_suppliers; the
+    existing ones are only written when a value changes.
+    @return:
+        counts: inserted, updated and unchanged suppliers
+        errors: suppliers rejected before the merge
+    '''
+    try:
+        request_data = validate_request_data(request, list, request_data)
+        time_record = get_request_clock(db_name, request).text
+    except Exception as e:
+        raise ValueError(e)
+
+    rows, errors = format_upsert_rows(TdaWmsPrv, request_data, validate_prv_data, SKIPPED_FIELDS)
+
+    counts = upsert_data(
+        db_name,
+        TdaWmsPrv,
+        list(rows.values()),
+        insert_values={
+            'fecharegistro': time_record,
+            'isactivoproveedor': 1,
+        },
+        insert_defaults={'nit': F('item')},
+        time_record=time_record,
+    )
+
+    if counts['inserted'] or counts['updated']:
+        invalidate_read_cache(db_name, TdaWmsPrv)
+
+    return counts, errors
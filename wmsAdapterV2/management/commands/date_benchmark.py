@@ -0,0 +1,99 @@
+"""Measure parse_date_string on a mix of the supported date formats."""
+
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+
+from wmsAdapterV2.utils import date_parser
+
+# Layouts of the date strings, with their part of the mix
+FORMATS = (
+    ("%Y-%m-%d %H:%M:%S", 30),
+    ("%Y-%m-%dT%H:%M:%S", 15),
+    ("%Y-%m-%dT%H:%M:%SZ", 10),
+    ("%Y-%m-%d", 10),
+    ("%Y-%m-%d %H:%M", 5),
+    ("%Y-%m-%d %H", 3),
+    ("%Y%m%d", 5),
+    ("%Y/%m/%d %H:%M:%S", 5),
+    ("%Y/%m/%d", 3),
+    ("%m/%d/%Y", 5),
+    ("%a, %d %b %Y %H:%M:%S +0000", 3),
+    # Only dateutil reads it
+    ("%d %B %Y %H:%M", 1),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Parse a mix of the supported date formats with the format list of the "
+        "previous parser, the layout fast path and the fast path with the memo"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--strings", type=int, default=20000, help="Date strings parsed per case")
+        parser.add_argument("--distinct", type=float, default=0.1,
+                            help="Part of the strings that are distinct, the others repeat them like a batch does")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per case")
+        parser.add_argument("--seed", type=int, default=1, help="Seed of the synthetic data")
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    def handle(self, *args, **options):
+        strings = _date_strings(options["strings"], options["distinct"], random.Random(options["seed"]))
+
+        cases = [
+            ("formats", date_parser._parse_date_string_formats, None),
+            ("fast", _parse_uncached, None),
+            ("memoized", date_parser.parse_date_string, date_parser._parse_date_string_cached.cache_clear),
+        ]
+
+        expected = [date_parser._parse_date_string_formats(s) for s in strings]
+
+        report = []
+        for case, parse, reset in cases:
+            timings = []
+            for _ in range(options["repeat"]):
+                if reset:
+                    reset()
+                started = time.perf_counter()
+                results = [parse(s) for s in strings]
+                timings.append(time.perf_counter() - started)
+
+            timings.sort()
+            seconds = timings[len(timings) // 2]
+            report.append({
+                "case": case,
+                "strings": len(strings),
+                "distinct": len(set(strings)),
+                "mismatches": sum(1 for a, b in zip(results, expected) if a != b),
+                "ms": round(seconds * 1000, 2),
+                "us_per_string": round(seconds / len(strings) * 10 ** 6, 3),
+            })
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        for row in report:
+            self.stdout.write(
+                f"{row['case']:<9} strings={row['strings']:<7} distinct={row['distinct']:<7} "
+                f"mismatches={row['mismatches']:<4} {row['ms']:>9} ms {row['us_per_string']:>8} us/string"
+            )
+
+
+def _parse_uncached(date_string):
+    return date_parser._parse_date_string_cached.__wrapped__(date_string) or date_parser._parse_with_dateutil(date_string)
+
+
+def _date_strings(count, distinct, generator):
+    layouts = [layout for layout, weight in FORMATS for _ in range(weight)]
+    start = datetime(2024, 1, 1)
+
+    values = [
+        (start + timedelta(seconds=generator.randrange(3 * 365 * 86400))).strftime(generator.choice(layouts))
+        for _ in range(max(1, int(count * distinct)))
+    ]
+    return [generator.choice(values) for _ in range(count)]
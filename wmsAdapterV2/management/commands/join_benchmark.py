@@ -0,0 +1,153 @@
+"""Measure the header/detail join of exec_query_orm on sale orders with order_detail."""
+
+import json
+import time
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from wmsAdapterV2.models import TdaWmsDpk, TdaWmsEpk
+from wmsAdapterV2.utils import get_data
+from wmsAdapterV2.utils.sqlserver_standin import SqlServerStandIn
+
+# Keys per detail statement of each case
+CASES = {
+    "single": None,
+    "chunked": get_data.JOIN_CHUNK_SIZE,
+}
+
+# SQL Server rejects statements with more parameters
+SQLSERVER_MAX_PARAMS = 2100
+
+
+class Command(BaseCommand):
+    help = (
+        "Read sale orders with include=order_detail through exec_query_orm on a "
+        "SQLite stand-in of the tenant database, with every key in one detail "
+        "statement (the previous join) and in chunks of JOIN_CHUNK_SIZE keys"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--headers", type=int, default=10000, help="Sale orders in the table and in the read")
+        parser.add_argument("--lines", type=int, default=20, help="Detail lines per order")
+        parser.add_argument("--repeat", type=int, default=3, help="Reads per case")
+        parser.add_argument("--case", action="append", dest="cases", choices=CASES,
+                            help="Case to run, can be repeated. All by default")
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    def handle(self, *args, **options):
+        report = []
+
+        standin = SqlServerStandIn("join_benchmark").install()
+        try:
+            _load(standin.alias, options["headers"], options["lines"])
+
+            for case in options["cases"] or CASES:
+                result = _measure(standin.alias, options["headers"], case, options["repeat"])
+                report.append({"case": case, "headers": options["headers"], **result})
+                if not options["json"]:
+                    self.stdout.write(_format_row(report[-1]))
+        finally:
+            standin.uninstall()
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+
+
+def _load(db_name, headers, lines):
+    TdaWmsEpk.objects.using(db_name).bulk_create(
+        [
+            TdaWmsEpk(tipodocto="PV", doctoerp=f"PV{index:07d}", numpedido=f"PV{index:07d}", picking=index)
+            for index in range(1, headers + 1)
+        ],
+        batch_size=5000,
+    )
+    TdaWmsDpk.objects.using(db_name).bulk_create(
+        [
+            TdaWmsDpk(
+                tipodocto="PV", doctoerp=f"PV{index:07d}", numpedido=f"PV{index:07d}",
+                picking=str(index), productoean=f"77{line:011d}", lineaidpicking=line,
+                qtypedido=line,
+            )
+            for index in range(1, headers + 1)
+            for line in range(1, lines + 1)
+        ],
+        batch_size=5000,
+    )
+
+
+def _measure(db_name, headers, case, repeat):
+    chunk_size = CASES[case]
+    json_data = {
+        "db_name": db_name,
+        "model": TdaWmsEpk,
+        "model_detail": TdaWmsDpk,
+        "fields": ["doctoerp", "numpedido", "picking"],
+        "include": ["productoean", "lineaidpicking", "qtypedido"],
+        "field_join": "picking",
+        "default_limit": headers,
+    }
+
+    timings = []
+    with _join_chunk_size(chunk_size or headers), _StatementCounter(db_name) as counter:
+        for _ in range(repeat):
+            counter.reset()
+            started = time.perf_counter()
+            records, *_ = get_data.exec_query_orm(json_data)
+            timings.append(time.perf_counter() - started)
+
+    details = sum(len(record.get("order_detail", ())) for record in records)
+    timings.sort()
+    seconds = timings[len(timings) // 2]
+    return {
+        "details": details,
+        "statements": counter.statements,
+        "max_params": counter.max_params,
+        "sqlserver_ok": counter.max_params <= SQLSERVER_MAX_PARAMS,
+        "seconds": round(seconds, 3),
+        "details_per_second": round(details / seconds, 1) if seconds else 0,
+    }
+
+
+@contextmanager
+def _join_chunk_size(chunk_size):
+    previous = get_data.JOIN_CHUNK_SIZE
+    get_data.JOIN_CHUNK_SIZE = chunk_size
+    try:
+        yield
+    finally:
+        get_data.JOIN_CHUNK_SIZE = previous
+
+
+class _StatementCounter:
+    """Statements and largest parameter list sent while the block runs."""
+
+    def __init__(self, db_name):
+        self.db_name = db_name
+        self.reset()
+
+    def reset(self):
+        self.statements = 0
+        self.max_params = 0
+
+    def __enter__(self):
+        connections[self.db_name].execute_wrappers.append(self._execute)
+        return self
+
+    def __exit__(self, *exc_info):
+        connections[self.db_name].execute_wrappers.remove(self._execute)
+
+    def _execute(self, execute, sql, params, many, context):
+        self.statements += 1
+        self.max_params = max(self.max_params, len(params or ()))
+        return execute(sql, params, many, context)
+
+
+def _format_row(row):
+    return (
+        f"{row['case']:<11} headers={row['headers']:<7} details={row['details']:<8} "
+        f"statements={row['statements']:<4} max_params={row['max_params']:<6} "
+        f"{'ok' if row['sqlserver_ok'] else 'over 2100':<10}{row['seconds']:>8} s "
+        f"{row['details_per_second']:>11} details/s"
+    )
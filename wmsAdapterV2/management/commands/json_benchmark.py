@@ -0,0 +1,99 @@
+"""Measure the JSON encoding of a large sale order read and order ingest."""
+
+import json
+import random
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+from wmsAdapterV2.models import TdaWmsDpk, TdaWmsEpk
+from wmsAdapterV2.utils import json_encoder
+from wmsAdapterV2.utils.serializer import serializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Encode a page of sale orders with order_detail (every column of "
+        "TDA_WMS_EPK and TDA_WMS_DPK) and the stored procedure payload of the "
+        "same orders, with the previous stdlib encoding and with json_encoder"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=500, help="Orders in the page")
+        parser.add_argument("--lines", type=int, default=4, help="Detail lines per order")
+        parser.add_argument("--repeat", type=int, default=20, help="Encodings per case")
+        parser.add_argument("--seed", type=int, default=1, help="Seed of the synthetic data")
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    def handle(self, *args, **options):
+        generator = random.Random(options["seed"])
+        page = []
+        for _ in range(options["orders"]):
+            order = _record(TdaWmsEpk, generator)
+            order["order_detail"] = [_record(TdaWmsDpk, generator) for _ in range(options["lines"])]
+            page.append(order)
+
+        headers = [{k: v for k, v in order.items() if k != "order_detail"} for order in page]
+
+        encoder = "orjson" if json_encoder.orjson is not None else "stdlib"
+        cases = [
+            ("response", "stdlib", lambda: json.dumps(page, cls=DjangoJSONEncoder).encode()),
+            ("response", encoder, lambda: json_encoder.dumps(page)),
+            ("payload", "stdlib", lambda: json.dumps(headers, default=serializer, indent=4)),
+            ("payload", encoder, lambda: json_encoder.dumps_payload(headers)),
+        ]
+
+        report = []
+        for case, name, encode in cases:
+            timings = []
+            for _ in range(options["repeat"]):
+                started = time.perf_counter()
+                body = encode()
+                timings.append(time.perf_counter() - started)
+
+            timings.sort()
+            report.append({
+                "case": case,
+                "encoder": name,
+                "orders": len(page),
+                "bytes": len(body),
+                "p50_ms": round(timings[len(timings) // 2] * 1000, 2),
+                "min_ms": round(timings[0] * 1000, 2),
+            })
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        for row in report:
+            self.stdout.write(
+                f"{row['case']:<9} {row['encoder']:<7} orders={row['orders']:<6} "
+                f"{row['bytes']:>10} bytes {row['p50_ms']:>9} ms p50 {row['min_ms']:>9} ms min"
+            )
+
+
+def _record(model, generator):
+    """Row of model as the reads return it, with a value of its type in every column."""
+    record = {}
+    for field in model._meta.concrete_fields:
+        if isinstance(field, models.DecimalField):
+            value = Decimal(generator.randrange(10 ** 6)).scaleb(-field.decimal_places)
+        elif isinstance(field, models.DateTimeField):
+            value = datetime(2025, 1, 1) + timedelta(seconds=generator.randrange(10 ** 7), milliseconds=generator.randrange(1000))
+        elif isinstance(field, models.DateField):
+            value = date(2025, 1, 1) + timedelta(days=generator.randrange(365))
+        elif isinstance(field, (models.FloatField,)):
+            value = generator.random() * 1000
+        elif isinstance(field, (models.IntegerField, models.AutoField)):
+            value = generator.randrange(10 ** 6)
+        elif isinstance(field, models.BooleanField):
+            value = generator.random() < 0.5
+        else:
+            length = min(field.max_length or 30, 30)
+            value = "".join(generator.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 ") for _ in range(length))
+        record[field.name] = value
+    return record
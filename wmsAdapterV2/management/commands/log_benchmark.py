@@ -0,0 +1,131 @@
+"""Measure the latency the request logging adds to a large POST."""
+
+import json
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.http.response import JsonResponse
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+from project.log_pipeline import QueueListenerHandler, log_payload
+from project.middleware import MiddlewareApiKey
+
+MODES = ("print", "off", "on")
+API_KEY = "log-benchmark"
+
+logger = logging.getLogger("wmsAdapterV2.views.Customer")
+
+
+class Command(BaseCommand):
+    help = (
+        "Send a large customer import through the API key middleware and the "
+        "front half of the clt POST view (body parsing and logging, no database) "
+        "with the old prints, with logging off and with the queue pipeline on. "
+        "The prints and log records go to stdout, the report to stderr"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--mode", action="append", dest="modes", choices=MODES,
+                            help="Mode to run, can be repeated. All by default")
+        parser.add_argument("--size-mb", type=float, default=20, help="Size of the request body")
+        parser.add_argument("--requests", type=int, default=10, help="Requests per mode")
+
+    def handle(self, *args, **options):
+        body = _customer_import(int(options["size_mb"] * 1024 * 1024))
+        queue_handlers = [h for h in _handlers(logger) if isinstance(h, QueueListenerHandler)]
+
+        if not queue_handlers:
+            self.stderr.write("STRUCTURED_LOGGING is disabled, the on mode logs without the queue")
+
+        report = []
+        # The body is bigger than the default upload limit
+        with override_settings(API_KEYS={API_KEY: "benchmark"}, DATA_UPLOAD_MAX_MEMORY_SIZE=None):
+            factory = RequestFactory()
+            middleware = MiddlewareApiKey(lambda request: _dispatch(middleware, request, self._views))
+
+            for mode in options["modes"] or MODES:
+                self._mode = mode
+                dropped = sum(h.dropped for h in queue_handlers)
+
+                if mode == "off":
+                    logging.disable(logging.CRITICAL)
+                try:
+                    latencies = []
+                    for _ in range(options["requests"]):
+                        request = factory.post(
+                            "/wms/adapter/v2/clt", data=body, content_type="application/json",
+                            HTTP_AUTHORIZATION=API_KEY,
+                        )
+                        started = time.perf_counter()
+                        middleware(request)
+                        latencies.append(time.perf_counter() - started)
+                finally:
+                    logging.disable(logging.NOTSET)
+
+                latencies.sort()
+                report.append({
+                    "mode": mode,
+                    "body_mb": round(len(body) / 1024 / 1024, 1),
+                    "p50_ms": round(latencies[len(latencies) // 2] * 1000, 1),
+                    "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 1),
+                    "max_ms": round(latencies[-1] * 1000, 1),
+                    "dropped_records": sum(h.dropped for h in queue_handlers) - dropped,
+                })
+
+        self.stderr.write(json.dumps(report, indent=2))
+
+    def _views(self, request):
+        """Front half of the clt POST view, as it was and as it is now."""
+        request_data = json.loads(request.body)
+
+        if self._mode == "print":
+            print(request.db_name)
+            print(len(request_data))
+            print(request_data)
+        else:
+            log_payload(logger, request, len(request_data))
+            logger.info("Records created", extra={"rows": len(request_data), "errors": 0})
+
+        return JsonResponse({"created": len(request_data)}, status=201)
+
+
+def _handlers(logger):
+    """Handlers the records of the logger reach."""
+    handlers = []
+    while logger is not None:
+        handlers.extend(logger.handlers)
+        logger = logger.parent if logger.propagate else None
+    return handlers
+
+
+def _dispatch(middleware, request, view):
+    response = middleware.process_view(request, view, (), {})
+    return response if response is not None else view(request)
+
+
+def _customer_import(size):
+    """JSON list of customers of about size bytes."""
+    customers = []
+    length = 2
+    index = 0
+    while length < size:
+        customer = {
+            "item": f"CLT{index:08d}",
+            "nit": f"{900000000 + index}",
+            "nombrecliente": f"CLIENTE DE PRUEBA {index}",
+            "direccion": f"CALLE {index % 200} # {index % 97}-{index % 50}",
+            "ciudaddestino": "BOGOTA",
+            "dptodestino": "CUNDINAMARCA",
+            "paisdestino": "COLOMBIA",
+            "telefono": f"3{index:09d}",
+            "email": f"cliente{index}@example.com",
+            "contacto": f"CONTACTO {index}",
+            "notas": "Cliente importado desde el ERP",
+            "isactivocliente": 1,
+        }
+        customers.append(customer)
+        length += len(json.dumps(customer)) + 2
+        index += 1
+    return json.dumps(customers).encode()
@@ -0,0 +1,207 @@
+"""Measure the existing-key preload of the production order bulk create."""
+
+import json
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from wmsAdapterV2.functions.ProductionOrder.bulk_create import (
+    EPN_KEY_FIELDS,
+    PICKING_JOIN_FIELDS,
+    create_list_production_order,
+)
+from wmsAdapterV2.models import TdaWmsDpn, TdaWmsEpn
+from wmsAdapterV2.utils.get_time_by_timezone import get_request_clock
+from wmsAdapterV2.utils.key_index import filter_by_values, index_rows, join_key, request_values
+from wmsAdapterV2.utils.sqlserver_standin import SqlServerStandIn
+
+ALIAS = "preload_benchmark"
+
+EPN_VALUES = ("tipodocto", "doctoerp", "numpedido", "productoean", "picking")
+DPN_VALUES = ("tipodocto", "doctoerp", "numpedido", "productoean", "picking", "lineaidop")
+
+
+class Command(BaseCommand):
+    help = (
+        "Load production orders (TDA_WMS_EPN) and their details (TDA_WMS_DPN) in "
+        "a SQLite stand-in and time the preload of the existing keys: the previous "
+        "nested loop over the 15-day window (estimated from a sample), a hash join "
+        "over the window, the current hash join over the request keys and a whole POST"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--headers", type=int, default=100000, help="EPN rows in the 15-day window")
+        parser.add_argument("--details", type=int, default=1000000, help="DPN rows in the 15-day window")
+        parser.add_argument("--request", type=int, default=500, help="Orders in the POST, half of them existing")
+        parser.add_argument("--sample", type=int, default=200,
+                            help="DPN rows run through the nested loop to estimate its time")
+        parser.add_argument("--seed", type=int, default=1, help="Seed of the synthetic data")
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    def handle(self, *args, **options):
+        generator = random.Random(options["seed"])
+        standin = SqlServerStandIn(ALIAS).install()
+        try:
+            started = time.perf_counter()
+            _load(options["headers"], options["details"], generator)
+            self.stderr.write(f"Loaded in {time.perf_counter() - started:.1f} s")
+
+            start_date = get_request_clock(ALIAS).shift("days", -15)
+            request_data = _request(options["headers"], options["request"], generator)
+
+            report = [
+                {"case": "nested_loop", **_nested_loop(start_date, options["sample"])},
+                {"case": "hash_join", **_hash_join(start_date, None)},
+                {"case": "request_keys", **_hash_join(start_date, request_values(request_data, "doctoerp"))},
+                {"case": "post", **_post(standin, request_data)},
+            ]
+        finally:
+            standin.uninstall()
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        for row in report:
+            self.stdout.write(
+                f"{row['case']:<13} epn={row['epn']:<7} dpn={row['dpn']:<8} "
+                f"read={_seconds(row['read_s'])} join={_seconds(row['join_s'])} "
+                f"total={_seconds(row['seconds'])}" + (" (estimated)" if row.get("estimated") else "")
+            )
+
+
+def _load(headers, details, generator):
+    """Rows with raw inserts, the ORM takes minutes for a million objects."""
+    now = get_request_clock(ALIAS).now.replace(tzinfo=None)
+
+    def registered():
+        return (now - timedelta(minutes=generator.randrange(14 * 24 * 60))).strftime("%Y-%m-%d %H:%M:%S")
+
+    connection = connections[ALIAS]
+    qn = connection.ops.quote_name
+
+    def insert(model, fields, rows):
+        columns = [model._meta.get_field(field).column for field in fields]
+        sql = (
+            f"INSERT INTO {qn(model._meta.db_table)} ({', '.join(qn(c) for c in columns)}) "
+            f"VALUES ({', '.join(['%s'] * len(columns))})"
+        )
+        with connection.cursor() as cursor:
+            for i in range(0, len(rows), 50000):
+                cursor.executemany(sql, rows[i : i + 50000])
+
+    insert(
+        TdaWmsEpn,
+        ("tipodocto", "doctoerp", "numpedido", "productoean", "picking", "item", "bodega",
+         "cantidad", "cantidadempaque", "fecharegistro"),
+        [
+            ("OP", f"OP{index:07d}", f"OP{index:07d}", f"77{index:011d}", index, "PRV001", "BOD01",
+             1, 1, registered())
+            for index in range(1, headers + 1)
+        ],
+    )
+    insert(
+        TdaWmsDpn,
+        ("tipodocto", "doctoerp", "numpedido", "productoean", "picking", "lineaidop", "bodega",
+         "fecharegistro"),
+        [
+            ("OP", f"OP{index:07d}", f"OP{index:07d}", f"78{line:011d}", str(index), line, "BOD01",
+             registered())
+            for line in range(1, details + 1)
+            for index in (generator.randrange(1, headers + 1),)
+        ],
+    )
+
+    # The tenant tables are searched by document, like the indexes of the tenants
+    with connection.cursor() as cursor:
+        for model in (TdaWmsEpn, TdaWmsDpn):
+            table = model._meta.db_table
+            column = model._meta.get_field("doctoerp").column
+            cursor.execute(f"CREATE INDEX {table}_doctoerp ON {qn(table)} ({qn(column)})")
+
+
+def _request(headers, size, generator):
+    """Orders of the POST, the even ones already stored."""
+    orders = []
+    for number in range(size):
+        index = generator.randrange(1, headers + 1) if number % 2 == 0 else headers + number + 1
+        orders.append({
+            "tipodocto": "OP",
+            "doctoerp": f"OP{index:07d}",
+            "numpedido": f"OP{index:07d}",
+            "productoean": f"77{index:011d}",
+            "item": "PRV001",
+            "bodega": "BOD01",
+            "cantidad": 1,
+            "order_detail": [{"productoean": f"78{line:011d}", "qtypedido": 1} for line in range(1, 4)],
+        })
+    return orders
+
+
+def _read(start_date, doctoerps):
+    epn = TdaWmsEpn.objects.using(ALIAS).filter(fecharegistro__gte=start_date).values(*EPN_VALUES)
+    dpn = TdaWmsDpn.objects.using(ALIAS).filter(fecharegistro__gte=start_date).values(*DPN_VALUES)
+    if doctoerps is None:
+        return list(epn), list(dpn)
+    return filter_by_values(epn, "doctoerp", doctoerps), filter_by_values(dpn, "doctoerp", doctoerps)
+
+
+def _nested_loop(start_date, sample):
+    """The join before the hash index, timed on a sample of the details."""
+    started = time.perf_counter()
+    epn_list, dpn_list = _read(start_date, None)
+    read = time.perf_counter() - started
+
+    dpn_keys = set()
+    started = time.perf_counter()
+    for dpn in dpn_list[:sample]:
+        for epn in epn_list:
+            if (
+                dpn["picking"] == epn["picking"]
+                and dpn["tipodocto"] == epn["tipodocto"]
+                and dpn["doctoerp"] == epn["doctoerp"]
+                and dpn["numpedido"] == epn["numpedido"]
+            ):
+                dpn_keys.add(join_key(dpn, ("tipodocto", "doctoerp", "numpedido", "productoean")))
+    join = (time.perf_counter() - started) * len(dpn_list) / max(1, min(sample, len(dpn_list)))
+
+    return {"epn": len(epn_list), "dpn": len(dpn_list), "read_s": round(read, 3),
+            "join_s": round(join, 1), "seconds": round(read + join, 1), "estimated": True}
+
+
+def _hash_join(start_date, doctoerps):
+    """The join of create_list_production_order, over the window or the request keys."""
+    started = time.perf_counter()
+    epn_list, dpn_list = _read(start_date, doctoerps)
+    read = time.perf_counter() - started
+
+    started = time.perf_counter()
+    epn_keys = {join_key(epn, EPN_KEY_FIELDS) for epn in epn_list}
+    epn_index = index_rows(epn_list, PICKING_JOIN_FIELDS)
+    dpn_keys = set()
+    for dpn in dpn_list:
+        for epn in epn_index.get(tuple(str(dpn[field]) for field in PICKING_JOIN_FIELDS), []):
+            dpn_keys.add(join_key(dpn, ("tipodocto", "doctoerp", "numpedido")) + " "
+                         + str(epn["productoean"]) + " " + str(dpn["productoean"]))
+    join = time.perf_counter() - started
+
+    return {"epn": len(epn_list), "dpn": len(dpn_list), "read_s": round(read, 3),
+            "join_s": round(join, 3), "seconds": round(read + join, 3)}
+
+
+def _post(standin, request_data):
+    """The whole bulk create: preload, validation and inserts."""
+    with standin.activate():
+        started = time.perf_counter()
+        *_, errors = create_list_production_order(None, ALIAS, request_data)
+        elapsed = time.perf_counter() - started
+
+    return {"epn": len(request_data), "dpn": len(request_data) * 3, "errors": len(errors),
+            "read_s": None, "join_s": None, "seconds": round(elapsed, 3)}
+
+
+def _seconds(value):
+    return f"{'-' if value is None else value:>9} s"
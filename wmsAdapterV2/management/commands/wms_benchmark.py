@@ -0,0 +1,303 @@
+"""Measure the wmsAdapterV2 bulk endpoints against a local SQL Server stand-in."""
+
+import copy
+import json
+import os
+import random
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+
+from wmsAdapterV2.functions.ProductionOrder.bulk_create import create_list_production_order
+from wmsAdapterV2.functions.PurchaseOrder.bulk_create import create_list_purchase_order
+from wmsAdapterV2.functions.SaleOrder.bulk_create_v2 import create_list_sale_order_without_orm_validation
+from wmsAdapterV2.models import TdaWmsDpk, TdaWmsDpn, TdaWmsDuk, TdaWmsEpk, TdaWmsEpn, TdaWmsEuk
+from wmsAdapterV2.utils.delete_data import delete_data
+from wmsAdapterV2.utils.sqlserver_standin import SqlServerStandIn
+from wmsAdapterV2.utils.update_data import update_data
+
+OPERATIONS = ("sale_orders", "purchase_orders", "production_orders", "update", "delete")
+SIZES = (1000, 10000, 100000)
+
+
+class SyntheticTenant:
+    """
+    Catalog, partners and warehouses of a made up tenant, used to build the
+    request bodies of the bulk endpoints. Each tenant gets its own sizes and
+    order shapes from the seed, like real tenants differ.
+    """
+
+    def __init__(self, name, seed, lines=4):
+        self.name = name
+        self.random = random.Random(seed)
+        self.lines = lines
+
+        self.products = [
+            (f"77{self.random.randrange(10 ** 10):010d}{index % 10}", f"PRODUCTO {name.upper()} {index}")
+            for index in range(self.random.randint(500, 5000))
+        ]
+        self.customers = [f"CLT{index:06d}" for index in range(self.random.randint(100, 2000))]
+        self.suppliers = [f"PRV{index:05d}" for index in range(self.random.randint(20, 300))]
+        self.warehouses = [f"BOD{index:02d}" for index in range(1, self.random.randint(2, 6))]
+
+    def sale_orders(self, rows):
+        orders = []
+        for index, details in enumerate(self._split(rows)):
+            doctoerp = f"{self.name}PV{index:07d}"
+            orders.append({
+                "tipodocto": "PV",
+                "doctoerp": doctoerp,
+                "numpedido": doctoerp,
+                "item": self.random.choice(self.customers),
+                "bodega": self.random.choice(self.warehouses),
+                "order_detail": [
+                    {
+                        "productoean": productoean,
+                        "descripcion": descripcion,
+                        "qtypedido": self.random.randint(1, 20),
+                    }
+                    for productoean, descripcion in self.random.sample(self.products, details)
+                ],
+            })
+        return orders
+
+    def purchase_orders(self, rows):
+        orders = []
+        for index, details in enumerate(self._split(rows)):
+            doctoerp = f"{self.name}OC{index:07d}"
+            orders.append({
+                "tipodocto": "OC",
+                "doctoerp": doctoerp,
+                "numdocumento": doctoerp,
+                "item": self.random.choice(self.suppliers),
+                "bodega": self.random.choice(self.warehouses),
+                "order_detail": [
+                    {
+                        "productoean": productoean,
+                        "descripcion": descripcion,
+                        "qtypedido": self.random.randint(1, 500),
+                    }
+                    for productoean, descripcion in self.random.sample(self.products, details)
+                ],
+            })
+        return orders
+
+    def production_orders(self, rows):
+        orders = []
+        for index, details in enumerate(self._split(rows)):
+            doctoerp = f"{self.name}OP{index:07d}"
+            products = self.random.sample(self.products, details + 1)
+            orders.append({
+                "tipodocto": "OP",
+                "doctoerp": doctoerp,
+                "numpedido": doctoerp,
+                "item": self.random.choice(self.suppliers),
+                "bodega": self.random.choice(self.warehouses),
+                "productoean": products[0][0],
+                "descripcion": products[0][1],
+                "cantidad": self.random.randint(1, 100),
+                "order_detail": [
+                    {
+                        "productoean": productoean,
+                        "descripcion": descripcion,
+                        "qtypedido": self.random.randint(1, 50),
+                    }
+                    for productoean, descripcion in products[1:]
+                ],
+            })
+        return orders
+
+    def _split(self, rows):
+        """Details of each order, adding up to rows."""
+        while rows > 0:
+            details = min(rows, self.random.randint(1, self.lines * 2 - 1), len(self.products) - 1)
+            rows -= details
+            yield details
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the bulk create, update and delete paths of wmsAdapterV2 on a SQLite "
+        "stand-in of the tenant database and report rows/s, queries per row and peak memory"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--operation", action="append", dest="operations", choices=OPERATIONS,
+                            help="Operation to run, can be repeated. All by default")
+        parser.add_argument("--rows", action="append", type=int, dest="sizes",
+                            help="Detail rows sent per operation, can be repeated. 1000, 10000 and 100000 by default")
+        parser.add_argument("--tenants", type=int, default=1, help="Synthetic tenants")
+        parser.add_argument("--lines", type=int, default=4, help="Average detail lines per order")
+        parser.add_argument("--duplicates", type=float, default=0.1,
+                            help="Part of the orders already in the database before the request")
+        parser.add_argument("--seed", type=int, default=1, help="Seed of the synthetic data")
+        parser.add_argument("--database-dir", help="Keep the SQLite files in this directory, in memory by default")
+        parser.add_argument("--no-memory", action="store_true",
+                            help="Do not trace the peak memory, tracing slows the operations")
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    def handle(self, *args, **options):
+        if not 0 <= options["duplicates"] < 1:
+            raise CommandError("--duplicates must be between 0 and 1")
+
+        operations = options["operations"] or OPERATIONS
+        report = []
+
+        for number in range(1, options["tenants"] + 1):
+            tenant = SyntheticTenant(f"t{number}", options["seed"] + number, options["lines"])
+
+            for size in options["sizes"] or SIZES:
+                alias = f"wms_benchmark_{tenant.name}_{size}"
+                name = ":memory:"
+                if options["database_dir"]:
+                    name = os.path.join(options["database_dir"], f"{alias}.sqlite3")
+                    if os.path.exists(name):
+                        os.remove(name)
+
+                standin = SqlServerStandIn(alias, name).install()
+                try:
+                    runner = _Runner(standin, tenant, size, options["duplicates"], not options["no_memory"])
+                    for operation in operations:
+                        result = getattr(runner, operation)()
+                        report.append({"tenant": tenant.name, "size": size, "operation": operation, **result})
+                        if not options["json"]:
+                            self.stdout.write(_format_row(report[-1]))
+                finally:
+                    standin.uninstall()
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+
+
+class _Runner:
+    """Operations of one tenant and size, sharing the stand-in database."""
+
+    def __init__(self, standin, tenant, size, duplicates, memory):
+        self.standin = standin
+        self.db_name = standin.alias
+        self.tenant = tenant
+        self.size = size
+        self.duplicates = duplicates
+        self.memory = memory
+
+    def sale_orders(self):
+        orders = self.tenant.sale_orders(self.size)
+        return self._create(create_list_sale_order_without_orm_validation, orders, (TdaWmsEpk, TdaWmsDpk))
+
+    def purchase_orders(self):
+        orders = self.tenant.purchase_orders(self.size)
+        return self._create(create_list_purchase_order, orders, (TdaWmsEuk, TdaWmsDuk))
+
+    def production_orders(self):
+        orders = self.tenant.production_orders(self.size)
+        return self._create(create_list_production_order, orders, (TdaWmsEpn, TdaWmsDpn))
+
+    def update(self):
+        """Change the state of the sale orders and the quantity of their details."""
+        self._ensure_sale_orders()
+
+        details = {}
+        for dpk in TdaWmsDpk.objects.using(self.db_name).values(
+            "tipodocto", "doctoerp", "numpedido", "productoean", "lineaidpicking", "qtypedido"
+        ):
+            details.setdefault((dpk["tipodocto"], dpk["doctoerp"], dpk["numpedido"]), []).append({
+                "productoean": dpk["productoean"],
+                "lineaidpicking": dpk["lineaidpicking"],
+                "qtypedido": float(dpk["qtypedido"] or 0) + 1,
+            })
+
+        request_data = [
+            {"tipodocto": key[0], "doctoerp": key[1], "numpedido": key[2], "estadoerp": 2, "order_detail": detail}
+            for key, detail in details.items()
+        ]
+        json_data = {"db_name": self.db_name, "model": TdaWmsEpk, "model_detail": TdaWmsDpk, "mult": 0}
+
+        def run():
+            updated, errors = update_data(json_data, request_data)
+            return len(updated), errors
+
+        return self._measure(run)
+
+    def delete(self):
+        """Delete the sale orders with their details."""
+        self._ensure_sale_orders()
+
+        request_data = [
+            {"tipodocto": epk["tipodocto"], "doctoerp": epk["doctoerp"], "numpedido": epk["numpedido"]}
+            for epk in TdaWmsEpk.objects.using(self.db_name).values("tipodocto", "doctoerp", "numpedido")
+        ]
+        # Orders with several details need the confirmation parameter
+        json_data = {"db_name": self.db_name, "model": TdaWmsEpk, "model_detail": TdaWmsDpk, "mult": 1}
+
+        def run():
+            _, errors = delete_data(json_data, request_data)
+            return None, errors
+
+        return self._measure(run, (TdaWmsEpk, TdaWmsDpk))
+
+    def _create(self, create, orders, models):
+        # Part of the orders exist already, so the existence checks find matches
+        existing = orders[: int(len(orders) * self.duplicates)]
+        if existing:
+            with self.standin.activate():
+                create(None, self.db_name, copy.deepcopy(existing))
+
+        def run():
+            *_, errors = create(None, self.db_name, orders)
+            return None, errors
+
+        return self._measure(run, models)
+
+    def _ensure_sale_orders(self):
+        """Load the sale orders when update or delete run without sale_orders."""
+        if not TdaWmsEpk.objects.using(self.db_name).exists():
+            with self.standin.activate():
+                create_list_sale_order_without_orm_validation(
+                    None, self.db_name, self.tenant.sale_orders(self.size)
+                )
+
+    def _count(self, models):
+        return sum(model.objects.using(self.db_name).count() for model in models)
+
+    def _measure(self, run, models=()):
+        """
+        Time run(), which returns the rows changed and the errors. When it
+        returns None as rows, they are the change in the row count of models.
+        """
+        before = self._count(models)
+        if self.memory:
+            tracemalloc.start()
+
+        with self.standin.activate():
+            self.standin.queries = 0
+            started = time.perf_counter()
+            rows, errors = run()
+            elapsed = time.perf_counter() - started
+            queries = self.standin.queries
+
+        peak = 0
+        if self.memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        if rows is None:
+            rows = abs(self._count(models) - before)
+
+        return {
+            "rows": rows,
+            "errors": len(errors),
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(rows / elapsed, 1) if elapsed else 0,
+            "queries": queries,
+            "queries_per_row": round(queries / rows, 3) if rows else 0,
+            "peak_memory_mb": round(peak / 1024 / 1024, 1),
+        }
+
+
+def _format_row(row):
+    return (
+        f"{row['tenant']:<4} {row['size']:>7} {row['operation']:<18} rows={row['rows']:<7} "
+        f"errors={row['errors']:<6} {row['rows_per_second']:>9} rows/s "
+        f"{row['queries_per_row']:>7} queries/row {row['peak_memory_mb']:>7} MB"
+    )
@@ -1,3 +1,710 @@
-from django.test import TestCase
+import json
+import threading
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.db.models import F, Q
+from django.http import JsonResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from project import resilience
+from wmsAdapterV2.models import TdaWmsClt, TdaWmsDpk, TdaWmsEpk
+from wmsAdapterV2.utils import conditional_read, date_parser, get_data, json_encoder
+from wmsAdapterV2.utils.get_cursor import encode_cursor, get_cursor, get_cursor_query
+from wmsAdapterV2.utils import idempotency
+from wmsAdapterV2.utils.get_data import exec_query_orm
+from wmsAdapterV2.utils.idempotency import IdempotencyStore
+from wmsAdapterV2.utils.read_cache import ReadCache
+from wmsAdapterV2.utils.serializer import serializer
+from wmsAdapterV2.utils import delete_data
+from wmsAdapterV2.utils.upsert_data import _merge_sql, create_stage_table, format_upsert_rows
+from wmsAdapterV2.utils.validate_transfer_state import GUARD_MAX_PARAMS, count_records
+
+
+class UnmanagedTablesTestCase(TestCase):
+    '''
+    TestCase creating the tables of the unmanaged models in the test
+    database of the default alias.
+    '''
+
+    models = ()
+
+    @classmethod
+    def setUpClass(cls):
+        # Before the class transaction, SQLite alters no schema inside one
+        with connection.schema_editor() as editor:
+            for model in cls.models:
+                editor.create_model(model)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        with connection.schema_editor() as editor:
+            for model in cls.models:
+                editor.delete_model(model)
+
+
+class CursorTests(TestCase):
+
+    def test_round_trip(self):
+        values = [None, 7, 'A-10', Decimal('12.3400'), datetime(2024, 5, 1, 10, 0, 0, 123456)]
+        for value in values:
+            token = encode_cursor('-fecha', value, 42)
+            cursor, params = get_cursor({'cursor': [token], 'limit': ['5']})
+
+            self.assertEqual(params, {'limit': ['5']})
+            self.assertEqual(cursor['sort'], '-fecha')
+            self.assertEqual(cursor['pk'], 42)
+            expected = value.isoformat() if isinstance(value, datetime) else value
+            expected = str(expected) if isinstance(expected, Decimal) else expected
+            self.assertEqual(cursor['value'], expected)
+
+    def test_token_is_url_safe(self):
+        token = encode_cursor('doctoerp', '??>>~~', 1)
+        self.assertRegex(token, r'^[A-Za-z0-9_-]+$')
+
+    def test_without_cursor(self):
+        cursor, params = get_cursor({'limit': ['5']})
+        self.assertIsNone(cursor)
+        self.assertEqual(params, {'limit': ['5']})
+
+    def test_invalid_cursors(self):
+        token = encode_cursor('doctoerp', 'A', 1)
+        invalid = [
+            'not a cursor',
+            token[:-3],
+            token[:5] + ('x' if token[5] != 'x' else 'y') + token[6:],
+            # Valid base64 of a list and of a dict without pk
+            'WzEsMl0',
+            'eyJzb3J0IjpudWxsfQ',
+        ]
+        for value in invalid:
+            with self.assertRaisesMessage(ValueError, 'Cursor is not valid'):
+                get_cursor({'cursor': [value]})
+
+    def test_cursor_of_another_sort(self):
+        cursor, _ = get_cursor({'cursor': [encode_cursor('doctoerp', 'A', 1)]})
+        with self.assertRaisesMessage(ValueError, 'Cursor does not match the requested sort'):
+            get_cursor_query(cursor, '-doctoerp', 'id')
+
+
+class KeysetPaginationTests(UnmanagedTablesTestCase):
+
+    models = (TdaWmsEpk,)
+
+    @classmethod
+    def setUpTestData(cls):
+        # Repeated and NULL sort values
+        TdaWmsEpk.objects.bulk_create([
+            TdaWmsEpk(
+                tipodocto='PV',
+                doctoerp=f'D{i % 4}',
+                numpedido=None if i % 5 == 0 else f'N{i % 3}',
+                picking=i,
+            )
+            for i in range(1, 24)
+        ])
+
+    def read_pages(self, sort, limit):
+        ids = []
+        pages = 0
+        cursor = None
+        while True:
+            records, _, _, next_cursor = exec_query_orm({
+                'db_name': 'default',
+                'model': TdaWmsEpk,
+                'fields': ['id', 'doctoerp', 'numpedido'],
+                'default_limit': limit,
+                'sort': sort,
+                'cursor': cursor,
+            })
+            self.assertLessEqual(len(records), limit)
+            ids.extend(record['id'] for record in records)
+            pages += 1
+
+            if next_cursor is None:
+                return ids, pages
+            cursor, _ = get_cursor({'cursor': [next_cursor]})
+
+    def test_pages_have_no_gaps_or_duplicates(self):
+        for sort in (None, 'id', '-id', 'doctoerp', '-doctoerp', 'numpedido', '-numpedido'):
+            for limit in (1, 4, 7, 23, 50):
+                with self.subTest(sort=sort, limit=limit):
+                    ids, pages = self.read_pages(sort, limit)
+                    expected = list(
+                        TdaWmsEpk.objects.order_by(
+                            *([sort, '-id' if sort.startswith('-') else 'id'] if sort else ['id'])
+                        ).values_list('id', flat=True)
+                    )
+                    self.assertEqual(ids, expected)
+                    self.assertEqual(pages, -(-23 // limit))
+
+    def test_last_page_has_no_cursor(self):
+        records, _, _, next_cursor = exec_query_orm({
+            'db_name': 'default',
+            'model': TdaWmsEpk,
+            'fields': ['id'],
+            'default_limit': 23,
+        })
+        self.assertEqual(len(records), 23)
+        self.assertIsNone(next_cursor)
+
+
+class StreamExportTests(UnmanagedTablesTestCase):
+
+    models = (TdaWmsEpk, TdaWmsDpk)
+
+    @classmethod
+    def setUpTestData(cls):
+        TdaWmsEpk.objects.bulk_create([
+            TdaWmsEpk(tipodocto='PV', doctoerp=f'D{i}', picking=i) for i in range(1, 12)
+        ])
+        TdaWmsDpk.objects.bulk_create([
+            TdaWmsDpk(
+                productoean=f'EAN{line}', picking=str(i), lineaidpicking=line,
+                doctoerp=f'D{i}',
+            )
+            for i in range(1, 12)
+            for line in range(1, i % 3 + 2)
+        ])
+
+    def stream(self, **json_data):
+        records, _, _, _ = exec_query_orm({
+            'db_name': 'default',
+            'model': TdaWmsEpk,
+            'model_detail': TdaWmsDpk,
+            'fields': ['doctoerp', 'picking'],
+            'include': ['productoean', 'lineaidpicking'],
+            'field_join': 'picking',
+            'stream': True,
+            'chunk_size': 4,
+            **json_data,
+        })
+        return records
+
+    def test_stream_with_include(self):
+        with CaptureQueriesContext(connection) as queries:
+            records = list(self.stream(default_limit=0))
+
+        self.assertEqual([r['doctoerp'] for r in records], [f'D{i}' for i in range(1, 12)])
+        for record in records:
+            lines = [d['lineaidpicking'] for d in record['order_detail']]
+            self.assertEqual(lines, list(range(1, record['picking'] % 3 + 2)))
+
+        # Every header page is fetched whole before its detail query
+        tables = [
+            'EPK' if 'TDA_WMS_EPK' in q['sql'] else 'DPK' for q in queries.captured_queries
+        ]
+        self.assertEqual(tables, ['EPK', 'DPK'] * 3)
+
+    def test_stream_limit_and_cursor(self):
+        records = list(self.stream(default_limit=6))
+        self.assertEqual([r['doctoerp'] for r in records], [f'D{i}' for i in range(1, 7)])
+
+        cursor, _ = get_cursor({'cursor': [encode_cursor(None, None, 9)]})
+        records = list(self.stream(default_limit=0, cursor=cursor))
+        self.assertEqual([r['doctoerp'] for r in records], ['D10', 'D11'])
+
+    def test_stream_takes_a_tenant_place_per_page(self):
+        bulkhead = resilience.get_bulkhead('sql:default')
+        records = self.stream(default_limit=0)
+
+        first = next(records)
+        self.assertEqual(first['doctoerp'], 'D1')
+        # Released between pages, the body is sent outside the request guard
+        self.assertTrue(bulkhead.acquire())
+        bulkhead.release()
+
+        self.assertEqual(len(list(records)), 10)
+
+
+class DetailJoinTests(UnmanagedTablesTestCase):
+
+    models = (TdaWmsEpk, TdaWmsDpk)
+
+    @classmethod
+    def setUpTestData(cls):
+        TdaWmsEpk.objects.bulk_create([
+            TdaWmsEpk(tipodocto='PV', doctoerp=f'D{i}', picking=i) for i in range(1, 12)
+        ])
+        TdaWmsDpk.objects.bulk_create([
+            TdaWmsDpk(productoean=f'EAN{i % 2}', picking=str(i), lineaidpicking=1, doctoerp=f'D{i}')
+            for i in range(1, 12)
+        ])
+
+    def test_detail_chunks(self):
+        json_data = {
+            'db_name': 'default',
+            'model': TdaWmsEpk,
+            'model_detail': TdaWmsDpk,
+            'fields': ['doctoerp', 'picking'],
+            'include': ['productoean'],
+            'field_join': 'picking',
+            'default_limit': 20,
+        }
+        expected, *_ = exec_query_orm(dict(json_data))
+
+        with mock.patch.object(get_data, 'JOIN_CHUNK_SIZE', 3), \
+                CaptureQueriesContext(connection) as queries:
+            records, *_ = exec_query_orm(dict(json_data))
+
+        self.assertEqual(records, expected)
+        self.assertEqual(len(records[0]['order_detail']), 1)
+        # 11 keys in chunks of 3, one connection
+        self.assertEqual(sum('TDA_WMS_DPK' in q['sql'] for q in queries.captured_queries), 4)
+
+    def test_detail_filter_from_another_database(self):
+        query_detail = Q(productoean='EAN1')
+        with mock.patch.object(get_data, 'JOIN_CHUNK_SIZE', 2):
+            query, key_chunks = get_data._filter_by_detail(
+                Q(), 'tenant', 'default', TdaWmsDpk, query_detail, 'picking', 'picking'
+            )
+        self.assertEqual([len(chunk) for chunk in key_chunks], [2, 2, 2])
+
+        for sort, limit in ((None, 20), ('-doctoerp', 3)):
+            with self.subTest(sort=sort, limit=limit):
+                rows, *_ = get_data._read_headers(
+                    'default', TdaWmsEpk, query, 'picking', ['id'], sort, None, limit, key_chunks
+                )
+                expected = TdaWmsEpk.objects.filter(picking__in=[1, 3, 5, 7, 9, 11]).order_by(
+                    *([sort, '-id'] if sort else ['id'])
+                ).values_list('id', flat=True)[:limit]
+                self.assertEqual([row['id'] for row in rows], list(expected))
+
+
+class ReadCacheTests(TestCase):
+
+    def test_returns_a_copy(self):
+        cache = ReadCache()
+        cache.set(('t1', 'epk'), 'k', ([{'id': 1}], None))
+
+        records, _ = cache.get(('t1', 'epk'), 'k')
+        records[0]['id'] = 2
+        records.append({'id': 3})
+
+        self.assertEqual(cache.get(('t1', 'epk'), 'k'), ([{'id': 1}], None))
+
+    def test_invalidate_only_drops_the_scope(self):
+        cache = ReadCache()
+        cache.set(('t1', 'epk'), 'k', 1)
+        cache.set(('t2', 'epk'), 'k', 2)
+
+        cache.invalidate(('t1', 'epk'))
+
+        self.assertIsNone(cache.get(('t1', 'epk'), 'k'))
+        self.assertEqual(cache.get(('t2', 'epk'), 'k'), 2)
+
+
+class DateParserTests(TestCase):
+
+    def test_layouts_match_the_format_list(self):
+        values = [
+            '2024-10-28 12', '2024-10-28T12', '2024-10-28T12:30:15Z', '2024-10-28T12:30:15',
+            '2024-10-28T12:30', '2024-10-28', '20241028', '2024-10-28 12:30:15',
+            '2024-10-28 12:30', '2024/10/28 12:30:15', '2024/10/28 12:30', '2024/10/28',
+            '10/28/2024', 'Mon, 28 Oct 2024 12:30:15 +0000',
+        ]
+        for value in values:
+            with self.subTest(value=value):
+                self.assertEqual(
+                    date_parser.parse_date_string(value), date_parser._parse_date_string_formats(value)
+                )
+
+    def test_dateutil_results_are_not_cached(self):
+        date_parser._parse_date_string_cached.cache_clear()
+
+        self.assertEqual(date_parser.parse_date_string('28 October 2024 12:30'), datetime(2024, 10, 28, 12, 30))
+        self.assertEqual(date_parser.parse_date_string('12:30').time().isoformat(), '12:30:00')
+
+        self.assertIsNone(date_parser._parse_date_string_cached('12:30'))
+
+    def test_invalid_date(self):
+        with self.assertRaisesMessage(ValueError, 'The date cannot be formatted: 2024-13-45'):
+            date_parser.parse_date_string('2024-13-45')
+
+
+class ConditionalReadTests(SimpleTestCase):
+
+    def test_rows_checksum_sql(self):
+        queryset = TdaWmsEpk.objects.filter(doctoerp='D1').values('tipodocto').annotate(
+            checksum=conditional_read.RowsChecksum()
+        )
+        self.assertIn('CHECKSUM_AGG(BINARY_CHECKSUM(*))', str(queryset.query))
+
+    def test_validator_checksum_only_on_sql_server(self):
+        result = {'last': datetime(2025, 1, 1), 'rows': 2, 'checksum': 7}
+
+        for vendor, checksum in (('microsoft', 7), ('sqlite', None)):
+            aggregates = {}
+
+            def aggregate(queryset, **kwargs):
+                aggregates.update(kwargs)
+                return {name: result[name] for name in kwargs}
+
+            with mock.patch.object(conditional_read, 'connections', {'default': mock.Mock(vendor=vendor)}), \
+                    mock.patch('django.db.models.query.QuerySet.aggregate', aggregate):
+                validator = conditional_read._get_validator('default', TdaWmsEpk, 'fecharegistro', Q())
+
+            self.assertEqual(validator, ('2025-01-01 00:00:00', 2, checksum))
+            self.assertEqual('checksum' in aggregates, vendor == 'microsoft')
+
+
+class ConditionalPageTests(UnmanagedTablesTestCase):
+
+    models = (TdaWmsEpk, TdaWmsDpk)
+
+    json_data = {
+        'db_name': 'default',
+        'model': TdaWmsEpk,
+        'model_detail': TdaWmsDpk,
+        'fields': ['doctoerp', 'picking'],
+        'include': ['productoean'],
+        'field_join': 'picking',
+        'default_limit': 3,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        TdaWmsEpk.objects.bulk_create([
+            TdaWmsEpk(tipodocto='PV', doctoerp=f'D{i}', picking=i) for i in range(1, 7)
+        ])
+        TdaWmsDpk.objects.bulk_create([
+            TdaWmsDpk(productoean=f'EAN{i}', picking=str(i), lineaidpicking=1, doctoerp=f'D{i}')
+            for i in range(1, 7)
+        ])
+
+    def etag(self, **headers):
+        request = RequestFactory().get('/wms/adapter/v2/sale_order', **headers)
+        return conditional_read.get_validator_etag(request, dict(self.json_data))
+
+    def test_no_validator_without_if_none_match(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertIsNone(self.etag())
+        self.assertEqual(len(queries.captured_queries), 0)
+
+    def test_detail_validator_covers_the_page(self):
+        etag = self.etag(HTTP_IF_NONE_MATCH='"old"')
+
+        # Details of headers after the page do not change its ETag
+        TdaWmsDpk.objects.filter(picking='5').delete()
+        self.assertEqual(self.etag(HTTP_IF_NONE_MATCH='"old"'), etag)
+
+        TdaWmsDpk.objects.filter(picking='2').delete()
+        self.assertNotEqual(self.etag(HTTP_IF_NONE_MATCH='"old"'), etag)
+
+    def test_detail_validator_reads_the_page_keys(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.etag(HTTP_IF_NONE_MATCH='"old"')
+
+        detail = [q['sql'] for q in queries.captured_queries if 'TDA_WMS_DPK' in q['sql']]
+        self.assertEqual(len(detail), 1)
+        self.assertIn("IN ('1', '2', '3')", detail[0])
+
+
+class JsonEncoderTests(SimpleTestCase):
+
+    def test_dumps_matches_django_encoder(self):
+        bogota = timezone(timedelta(hours=-5))
+        data = {
+            'naive': datetime(2025, 3, 4, 5, 6, 7, 123000),
+            'micro': datetime(2025, 3, 4, 5, 6, 7, 123456),
+            'whole': datetime(2025, 3, 4, 5, 6, 7),
+            'utc': datetime(2025, 3, 4, 5, 6, 7, 123456, tzinfo=timezone.utc),
+            'bogota': datetime(2025, 3, 4, 5, 6, 7, tzinfo=bogota),
+            'date': date(2025, 3, 4),
+            'time': time(5, 6, 7, 123456),
+            'whole_time': time(5, 6, 7),
+            'duration': timedelta(days=1, seconds=5),
+            'decimal': Decimal('10.500'),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'rows': [{'fecha': datetime(2025, 3, 4, 5, 6, 7, 1000), 'qty': Decimal('1.0')}],
+        }
+
+        expected = json.loads(json.dumps(data, cls=DjangoJSONEncoder))
+        self.assertEqual(json.loads(json_encoder.dumps(data)), expected)
+        self.assertEqual(expected['utc'], '2025-03-04T05:06:07.123Z')
+
+    def test_dumps_payload_matches_serializer(self):
+        bogota = timezone(timedelta(hours=-5))
+        orders = [
+            {
+                'TIPODOCTO': 'PV',
+                'DOCTOERP': 'PV-1001',
+                'NOMBRECLIENTE': 'Peña Ñúñez',
+                'PICKING': 1001,
+                'VALORDECLARADO': Decimal('125000.50'),
+                'F_PEDIDO': datetime(2025, 3, 4, 5, 6, 7, 123456),
+                'F_ULTIMA_ACTUALIZACION': datetime(2025, 3, 4, 5, 6, 7, tzinfo=bogota),
+                'OBSERVACIONES': None,
+                'URGENTE': False,
+            },
+        ]
+
+        old = json.dumps(orders, default=serializer, indent=4)
+        self.assertEqual(json.loads(json_encoder.dumps_payload(orders)), json.loads(old))
+
+        for value in (date(2025, 3, 4), time(5, 6, 7)):
+            with self.subTest(value=value):
+                with self.assertRaises(TypeError):
+                    json_encoder.dumps_payload([{'F_PEDIDO': value}])
+
+
+class CountRecordsTests(UnmanagedTablesTestCase):
+
+    models = (TdaWmsEpk,)
+
+    @classmethod
+    def setUpTestData(cls):
+        TdaWmsEpk.objects.bulk_create([
+            TdaWmsEpk(tipodocto='PV', doctoerp=f'D{i}', numpedido=f'N{i}', picking=i % 3)
+            for i in range(400)
+        ])
+
+    def test_counts_in_statements_under_the_parameter_limit(self):
+        records = [
+            Q(tipodocto='PV', doctoerp=f'D{i}', numpedido=f'N{i}') for i in range(0, 800, 2)
+        ]
+        params = []
+
+        def execute(execute, sql, sql_params, many, context):
+            params.append(len(sql_params or ()))
+            return execute(sql, sql_params, many, context)
+
+        with connection.execute_wrapper(execute):
+            counts, errors = count_records('default', TdaWmsEpk, records, Q(picking__gte=1))
+
+        self.assertEqual(errors, {})
+        self.assertEqual(counts, [int(i < 400 and i % 3 >= 1) for i in range(0, 800, 2)])
+        # 3 parameters per record, bound twice, plus the picking filter
+        aggregates = [p for p in params if p > 1]
+        self.assertEqual(len(aggregates), 2)
+        self.assertLessEqual(max(aggregates), GUARD_MAX_PARAMS)
+
+    def test_invalid_record_query(self):
+        counts, errors = count_records('default', TdaWmsEpk, [Q(doctoerp='D1'), Q(unknown=1)])
+        self.assertEqual(counts, [1, 0])
+        self.assertIn(1, errors)
+
+
+class UpsertDataTests(SimpleTestCase):
+
+    def fields(self, model, *names):
+        return [model._meta.get_field(name) for name in names]
+
+    def test_format_upsert_rows(self):
+        def validate(rd):
+            return None if rd.get('nombrecliente') else 'The nombrecliente field is mandatory'
+
+        rows, errors = format_upsert_rows(TdaWmsClt, [
+            {'item': 'C1', 'nombrecliente': 'Ana', 'activocliente': '1',
+             'fecharegistro': '2020-01-01', 'unknown': 'x'},
+            {'item': 'C2'},
+            {'item': 'C1', 'nombrecliente': 'Ana again'},
+            {'item': 'C3', 'nombrecliente': 'Luis', 'activocliente': 'yes'},
+        ], validate, skipped_fields=('fecharegistro',))
+
+        # Converted to python, the skipped and unknown fields left out
+        self.assertEqual(rows, {'C1': {'item': 'C1', 'nombrecliente': 'Ana', 'activocliente': 1}})
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(errors[0], 'error: C2 The nombrecliente field is mandatory')
+        self.assertEqual(errors[1], 'error: C1 record is duplicated in the request')
+        self.assertTrue(errors[2].startswith('error: C3 '))
+
+    def test_merge_sql(self):
+        sql, params = _merge_sql(
+            connection, TdaWmsClt, '#tda_wms_clt_upsert',
+            self.fields(TdaWmsClt, 'item', 'nombrecliente', 'nit'), '',
+            {'fecharegistro': '2025-01-02 03:04:05', 'activocliente': 1},
+            {'nit': F('item')}, None,
+        )
+        sql = ' '.join(sql.split())
+
+        self.assertTrue(sql.startswith('SET NOCOUNT ON;'))
+        self.assertIn('MERGE "TDA_WMS_CLT" WITH (HOLDLOCK) AS t USING #tda_wms_clt_upsert AS s '
+                      'ON t."item" = s."item"', sql)
+        # Only changed rows are updated, the key never is
+        self.assertIn('WHEN MATCHED AND EXISTS (SELECT COALESCE(s."nombreCliente", t."nombreCliente"), '
+                      'COALESCE(s."nit", t."nit") EXCEPT SELECT t."nombreCliente", t."nit") THEN '
+                      'UPDATE SET "nombreCliente" = COALESCE(s."nombreCliente", t."nombreCliente"), '
+                      '"nit" = COALESCE(s."nit", t."nit") WHEN NOT MATCHED', sql)
+        self.assertIn('INSERT ("nit", "nombreCliente", "item", "ActivoCliente", "fechaRegistro") '
+                      'VALUES (COALESCE(s."nit", s."item"), s."nombreCliente", COALESCE(s."item", \'\'), %s, %s)', sql)
+        self.assertEqual(params, [1, '2025-01-02 03:04:05'])
+
+    def test_merge_sql_stamps_the_last_update(self):
+        sql, params = _merge_sql(
+            connection, TdaWmsEpk, '#tda_wms_epk_upsert',
+            self.fields(TdaWmsEpk, 'id', 'estadoerp'), 'f_ultima_actualizacion',
+            {}, {}, '2025-01-02 03:04:05',
+        )
+
+        self.assertIn('"f_ultima_actualizacion" = %s', sql)
+        self.assertEqual(sql.count('%s'), len(params))
+        self.assertEqual(params, ['2025-01-02 03:04:05'] * 2)
+
+    def test_stage_table_replaces_a_leftover(self):
+        cursor = mock.Mock()
+        create_stage_table(connection, cursor, '#tda_wms_clt_upsert', self.fields(TdaWmsClt, 'item'))
+
+        sql = cursor.execute.call_args.args[0]
+        self.assertTrue(sql.startswith(
+            "IF OBJECT_ID('tempdb..#tda_wms_clt_upsert') IS NOT NULL DROP TABLE #tda_wms_clt_upsert; "
+            'CREATE TABLE #tda_wms_clt_upsert ("item" '
+        ))
+
+
+class DeleteRecordsTests(UnmanagedTablesTestCase):
+
+    models = (TdaWmsEpk,)
+
+    def setUp(self):
+        TdaWmsEpk.objects.bulk_create([
+            TdaWmsEpk(tipodocto='PV', doctoerp=f'D{i % 2}', numpedido=f'N{i}', picking=i)
+            for i in range(6)
+        ])
+
+    def test_quantity_deleted_is_the_rows_removed(self):
+        records = [Q(doctoerp='D0'), Q(numpedido='N1'), Q(numpedido='N2'), Q(doctoerp='D1')]
+        with mock.patch.object(delete_data, 'DELETE_CHUNK_SIZE', 3):
+            deleted, errors = delete_data._delete_multiple_records('default', TdaWmsEpk, records)
+
+        # N2 was removed by D0 before its turn, D1 still had N3 and N5
+        self.assertEqual([d['quantity_deleted'] for d in deleted], [3, 1, 2])
+        self.assertEqual(sum(d['quantity_deleted'] for d in deleted), 6)
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0]['error'], 'No matching record found')
+        self.assertFalse(TdaWmsEpk.objects.exists())
+
+    def test_single_records_deleted_by_an_earlier_record(self):
+        records = [Q(numpedido='N1'), Q(numpedido='N1', picking=1), Q(numpedido='N2')]
+        deleted, errors = delete_data._delete_single_record('default', TdaWmsEpk, records)
+
+        self.assertEqual(len(deleted), 2)
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(TdaWmsEpk.objects.count(), 4)
+
+
+def idempotent_post():
+    request = RequestFactory().post('/bulk', b'[1]', content_type='application/json', HTTP_IDEMPOTENCY_KEY='k')
+    request.db_name = 'default'
+    return request
+
+
+class IdempotencyStoreTests(SimpleTestCase):
+
+    key = ('t1', '/wms/adapter/v2/sale_order', 'abc')
+    record = {'fingerprint': 'f1', 'status': 201, 'content': b'{}', 'content_type': 'application/json'}
+
+    def stores(self):
+        # In this process and in a shared cache
+        return [IdempotencyStore(), IdempotencyStore(backend='default')]
+
+    def test_run_busy_replay(self):
+        for store in self.stores():
+            with self.subTest(backend=store.backend):
+                self.assertEqual(store.begin(self.key, 'f1'), (IdempotencyStore.RUN, None))
+                self.assertEqual(store.begin(self.key, 'f1'), (IdempotencyStore.BUSY, None))
+                self.assertEqual(store.begin(self.key, 'f2'), (IdempotencyStore.MISMATCH, None))
+
+                store.finish(self.key, self.record)
+
+                self.assertEqual(store.begin(self.key, 'f1'), (IdempotencyStore.REPLAY, self.record))
+                self.assertEqual(store.begin(self.key, 'f2'), (IdempotencyStore.MISMATCH, None))
+
+    def test_release(self):
+        for store in self.stores():
+            with self.subTest(backend=store.backend):
+                key = self.key[:2] + ('released',)
+                self.assertEqual(store.begin(key, 'f1')[0], IdempotencyStore.RUN)
+                store.release(key)
+                self.assertEqual(store.begin(key, 'f2')[0], IdempotencyStore.RUN)
+                store.release(key)
+
+    def test_duplicate_waits_for_the_first_run(self):
+        for store in self.stores():
+            with self.subTest(backend=store.backend):
+                key = self.key[:2] + ('waits',)
+                self.assertEqual(store.begin(key, 'f1')[0], IdempotencyStore.RUN)
+
+                first_run = threading.Timer(0.05, store.finish, (key, self.record))
+                first_run.start()
+                self.assertEqual(store.begin(key, 'f1', timeout=5), (IdempotencyStore.REPLAY, self.record))
+                first_run.join()
+
+    def test_duplicate_gets_409_after_the_wait(self):
+        store = IdempotencyStore(wait_timeout=0.05, retry_after=7)
+        retry = idempotent_post()
+        retry.tenant_bulkhead = place = mock.Mock()
+        responses = []
+
+        def view(request):
+            # The retry arrives while the first run goes on
+            responses.append(wrapped(retry))
+            return JsonResponse({'created': [1]}, status=201)
+
+        wrapped = idempotency.idempotent(view)
+
+        with mock.patch.object(idempotency, 'idempotency_store', store):
+            first = wrapped(idempotent_post())
+            replay = wrapped(idempotent_post())
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(responses[0].status_code, 409)
+        self.assertEqual(responses[0]['Retry-After'], '7')
+        # The retry waited without the tenant database place
+        place.release.assert_called_once_with()
+        self.assertIsNone(retry.tenant_bulkhead)
+        self.assertEqual(replay.status_code, 201)
+        self.assertEqual(replay['Idempotent-Replayed'], 'true')
+
+
+class IdempotentServerErrorTests(UnmanagedTablesTestCase):
+
+    models = (TdaWmsEpk,)
+
+    def run_twice(self, view):
+        wrapped = idempotency.idempotent(view)
+        with mock.patch.object(idempotency, 'idempotency_store', IdempotencyStore()):
+            return [wrapped(idempotent_post()) for _ in range(2)]
+
+    def test_server_error_after_a_commit_is_replayed(self):
+        calls = []
+
+        def view(request):
+            calls.append(request)
+            TdaWmsEpk.objects.filter(picking=0).update(doctoerp='D0')
+            return JsonResponse({'error': 'failed after the insert'}, status=500)
+
+        # The class transaction of the test stands for the commit of the view
+        with mock.patch.object(idempotency.transaction, 'on_commit', lambda func, using: func()):
+            first, retry = self.run_twice(view)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(retry.status_code, 500)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+
+    def test_server_error_without_a_commit_runs_again(self):
+        calls = []
+
+        def view(request):
+            calls.append(request)
+            list(TdaWmsEpk.objects.all())
+            return JsonResponse({'error': 'failed before the insert'}, status=500)
+
+        self.run_twice(view)
+        self.assertEqual(len(calls), 2)
+
+    def test_write_inside_a_transaction_commits_with_it(self):
+        tracker = idempotency._CommitTracker()
+        with self.captureOnCommitCallbacks() as callbacks, connection.execute_wrapper(tracker):
+            TdaWmsEpk.objects.filter(picking=0).update(doctoerp='D0')
+
+        self.assertFalse(tracker.committed)
+        callbacks[0]()
+        self.assertTrue(tracker.committed)
@@ -0,0 +1,145 @@
+import hashlib
+
+from django.db import connections
+from django.db.models import Aggregate, Count, IntegerField, Max, Q
+from django.db.models.expressions import Star
+from django.utils.http import parse_etags, quote_etag
+
+from project.db_router import db_for_read
+from wmsAdapterV2.utils.get_data import (
+    _chunks,
+    _filter_by_detail,
+    _get_join_keys,
+    _read_headers,
+    exec_query_orm,
+)
+from wmsAdapterV2.utils.validate_fields import get_update_date_field
+
+
+def conditional_query_orm(request, json_data):
+    '''
+    exec_query_orm for the tables with a last update date. When the client
+    sends If-None-Match, a MAX(last update)/COUNT(*) query over the filtered
+    rows gives the ETag of the result; when it matches the read is skipped
+    and request.not_modified is set, so paginated_response answers 304.
+    Without If-None-Match the page is read at once and
+    ConditionalGetMiddleware takes the ETag from the body.
+
+    Every write of the adapter stamps the last update date. Rows changed
+    without it by other systems keep the date and the count, on SQL Server
+    the query also takes CHECKSUM_AGG(BINARY_CHECKSUM(*)) of the rows so
+    their content changes the ETag as well.
+    @params:
+        request: request object
+        json_data: arguments of exec_query_orm
+    '''
+    etag = get_validator_etag(request, json_data)
+
+    if etag is not None:
+        request.etag = etag
+        if etag_matches(request, etag):
+            request.not_modified = True
+            return [], json_data.get("query"), json_data.get("query_detail"), None
+
+    return exec_query_orm(json_data)
+
+
+def get_validator_etag(request, json_data):
+    '''
+    ETag of the page the request reads, None when the client sent no
+    If-None-Match, the tables have no last update date or the request is an
+    export. The detail part only covers the details of the headers of the
+    page.
+    '''
+    if json_data.get("stream") or not request.META.get("HTTP_IF_NONE_MATCH"):
+        return None
+
+    db_name = json_data.get("db_name")
+    model = json_data.get("model")
+    update_field = get_update_date_field(model)
+    if not update_field:
+        return None
+
+    # The parameters come in the query string or in the body
+    parts = [db_name, request.get_full_path(), hashlib.sha1(request.body).hexdigest()]
+    parts.append(_get_validator(db_name, model, update_field, json_data.get("query") or Q()))
+
+    model_detail = json_data.get("model_detail")
+    query_detail = json_data.get("query_detail") or Q()
+    if model_detail is not None and (json_data.get("include") or query_detail):
+        detail_update_field = get_update_date_field(model_detail)
+        if not detail_update_field:
+            return None
+
+        field_join_detail = json_data.get("field_join_detail") or json_data.get("field_join", "")
+        db_name_detail = json_data.get("db_name_detail") or db_name
+        for chunk in _chunks(_get_page_keys(json_data)):
+            parts.append(_get_validator(
+                db_name_detail, model_detail, detail_update_field,
+                query_detail & Q(**{f"{field_join_detail}__in": chunk})
+            ))
+
+    return quote_etag(hashlib.sha1(repr(parts).encode()).hexdigest())
+
+
+def etag_matches(request, etag):
+    '''
+    Weak comparison of If-None-Match, the compressed responses carry W/ ETags.
+    '''
+    header = request.META.get("HTTP_IF_NONE_MATCH")
+    if not header:
+        return False
+
+    etags = parse_etags(header)
+    return "*" in etags or _strip_weak(etag) in {_strip_weak(e) for e in etags}
+
+
+class RowsChecksum(Aggregate):
+    '''
+    CHECKSUM_AGG(BINARY_CHECKSUM(*)) of the filtered rows, SQL Server only.
+    '''
+    template = "CHECKSUM_AGG(BINARY_CHECKSUM(%(expressions)s))"
+    output_field = IntegerField()
+
+    def __init__(self, **extra):
+        super().__init__(Star(), **extra)
+
+
+def _get_validator(db_name, model, update_field, query):
+    # Same database as the read the validator stands for
+    alias = db_for_read(db_name)
+    aggregates = {"last": Max(update_field), "rows": Count("pk")}
+    if connections[alias].vendor == "microsoft":
+        aggregates["checksum"] = RowsChecksum()
+
+    validator = model.objects.using(alias).filter(query).aggregate(**aggregates)
+    return str(validator["last"]), validator["rows"], validator.get("checksum")
+
+
+def _get_page_keys(json_data):
+    # Join keys of the headers exec_query_orm reads for the page
+    db_name = db_for_read(json_data.get("db_name"))
+    db_name_detail = json_data.get("db_name_detail")
+    db_name_detail = db_for_read(db_name_detail) if db_name_detail else db_name
+    model = json_data.get("model")
+    query = json_data.get("query") or Q()
+    query_detail = json_data.get("query_detail") or Q()
+    field_join = json_data.get("field_join", "")
+    field_join_detail = json_data.get("field_join_detail") or field_join
+
+    key_chunks = None
+    if not query and query_detail:
+        query, key_chunks = _filter_by_detail(
+            query, db_name, db_name_detail, json_data.get("model_detail"), query_detail,
+            field_join, field_join_detail
+        )
+
+    model_list, _, _ = _read_headers(
+        db_name, model, query, field_join, [field_join], json_data.get("sort"),
+        json_data.get("cursor"), json_data.get("default_limit", 100), key_chunks
+    )
+    return _get_join_keys(model_list, field_join)
+
+
+def _strip_weak(etag):
+    return etag[2:] if etag.startswith("W/") else etag
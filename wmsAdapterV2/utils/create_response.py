@@ -1,6 +1,11 @@
-from django.http import JsonResponse
+from django.http import HttpResponseNotModified, StreamingHttpResponse
 
+from project.metrics import record_rows
+from project.request_timing import timed
+from wmsAdapterV2.utils.json_encoder import FastJsonResponse, dumps
 
+
+@timed("json")
 def created_response(created:list, errors:list, type):
     '''
     This function return the response for the created articles
@@ -16,35 +21,38 @@ def created_response(created:list, errors:list, type):
         else:
             key = 'deleted'
 
+        record_rows({key: len(created)}, len(errors))
+
         # Initialize response
         response = {}
 
         # Check if there are created articles
         if len(created) > 0 and len(errors) == 0:
-            response =  JsonResponse( 
+            response =  FastJsonResponse( 
                     {key: created, 'errors': errors}, safe=False, status=201)
         
         # Check if there are created articles and errors
         if len(created) > 0 and len(errors) > 0:
-            response = JsonResponse( 
+            response = FastJsonResponse( 
                     {key: created, 'errors': errors}, safe=False, status=207)
 
         # Check if there are created articles
         if len(created) == 0 and len(errors) > 0:
-            response = JsonResponse({key: created, 'errors': errors}, safe=False, status=400)
+            response = FastJsonResponse({key: created, 'errors': errors}, safe=False, status=400)
         
          # Check if there are created articles
         if len(created) == 0 and len(errors) == 0:
-            response = JsonResponse(
+            response = FastJsonResponse(
                 {key: ["All records already exist"], "errors": errors}, safe=False, status=200
             )
 
         # Return the response
         return response
     except Exception as e:
-        return JsonResponse({'error': str(e)}, safe=False, status=500)
+        return FastJsonResponse({'error': str(e)}, safe=False, status=500)
 
 
+@timed("json")
 def created_response_orders(created: list, created_detail:list, errors: list):
     """
     This function return the response for the created articles
@@ -53,34 +61,120 @@ def created_response_orders(created: list, created_detail:list, errors: list):
         errors: list of errors
     """
     try:
+        record_rows({"created": len(created) + len(created_detail)}, len(errors))
+
         # Initialize response
         response = {}
 
         # Check if there are created articles
         if (len(created) + len(created_detail)) > 0 and len(errors) == 0:
-            response = JsonResponse(
+            response = FastJsonResponse(
                 {"order": created, "detail":created_detail, "errors": errors}, safe=False, status=201
             )
 
         # Check if there are created articles and errors
         if (len(created) + len(created_detail)) > 0 and len(errors) > 0:
-            response = JsonResponse(
+            response = FastJsonResponse(
                 {"order": created, "detail":created_detail, "errors": errors}, safe=False, status=207
             )
 
         # Check if there are created articles
         if (len(created) + len(created_detail)) == 0 and len(errors) > 0:
-            response = JsonResponse(
+            response = FastJsonResponse(
                 {"order": created, "detail":created_detail, "errors": errors}, safe=False, status=400
             )
         
         # Check if there are created articles
         if (len(created) + len(created_detail)) == 0 and len(errors) == 0:
-            response = JsonResponse(
+            response = FastJsonResponse(
                 {"order": ["All records already exist"], "detail": ["All records already exist"], "errors": errors}, safe=False, status=200
             )
 
         # Return the response
         return response
     except Exception as e:
-        return JsonResponse({"error": str(e)}, safe=False, status=500)
+        return FastJsonResponse({"error": str(e)}, safe=False, status=500)
+
+
+@timed("json")
+def upserted_response(counts: dict, errors: list):
+    """
+    This function return the response for an upsert
+    @params:
+        counts: inserted, updated, unchanged and zeroed records
+        errors: list of errors
+    """
+    try:
+        applied = sum(counts.values())
+        record_rows({key: value for key, value in counts.items() if key != "unchanged"}, len(errors))
+
+        # Check if there are applied records and errors
+        if applied > 0 and len(errors) > 0:
+            status = 207
+        elif applied == 0 and len(errors) > 0:
+            status = 400
+        else:
+            status = 200
+
+        return FastJsonResponse({**counts, "errors": errors}, safe=False, status=status)
+    except Exception as e:
+        return FastJsonResponse({"error": str(e)}, safe=False, status=500)
+
+
+@timed("json")
+def paginated_response(records: list, next_cursor=None, request=None):
+    """
+    This function return the response for a page of records
+    @params:
+        records: list of records of the page
+        next_cursor: opaque token of the next page, None on the last page
+        request: request read with conditional_query_orm, for its ETag
+    """
+    etag = getattr(request, "etag", None)
+
+    # The client has this page already, nothing was read
+    if getattr(request, "not_modified", False):
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        return response
+
+    # Exports come as a lazy iterator of rows
+    if not isinstance(records, list):
+        return ndjson_response(records)
+
+    response = FastJsonResponse(records, safe=False, status=200)
+
+    # Without it ConditionalGetMiddleware hashes the body
+    if etag:
+        response["ETag"] = etag
+
+    # The body stays a plain list, the next page travels in a header
+    if next_cursor:
+        response["X-Next-Cursor"] = next_cursor
+
+    return response
+
+
+def ndjson_response(records, lines_per_write=500):
+    """
+    This function stream the records as newline delimited json
+    @params:
+        records: iterator of records
+        lines_per_write: number of lines sent on each write
+    """
+
+    def encode():
+        lines = []
+        for record in records:
+            lines.append(dumps(record))
+
+            if len(lines) >= lines_per_write:
+                yield b"\n".join(lines) + b"\n"
+                lines = []
+
+        if lines:
+            yield b"\n".join(lines) + b"\n"
+
+    return StreamingHttpResponse(
+        encode(), content_type="application/x-ndjson", status=200
+    )
@@ -1,6 +1,11 @@
 from datetime import datetime
+from functools import lru_cache
 from dateutil import parser
 
+# Timestamps repeat a lot inside one batch (same fecharegistro on every line)
+PARSE_CACHE_SIZE = 4096
+
+
 def parse_date_string(date_string):
     """
     Parse different date string formats into datetime objects.
@@ -14,6 +19,91 @@ def parse_date_string(date_string):
     Raises:
         ValueError: If the date string cannot be parsed
     """
+    if not isinstance(date_string, str):
+        return _parse_date_string_formats(date_string)
+
+    parsed_date = _parse_date_string_cached(date_string)
+    if parsed_date is None:
+        # dateutil fills the missing parts from the current date, so its
+        # results are never cached
+        parsed_date = _parse_with_dateutil(date_string)
+
+    return parsed_date
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_date_string_cached(date_string):
+    # The shape (length and separator positions) tells the layout, the
+    # common ones are sliced by hand
+    try:
+        parsed_date = _parse_fixed_layout(date_string)
+        if parsed_date is not None:
+            return parsed_date
+    except ValueError:
+        pass
+
+    return _parse_with_formats(date_string)
+
+
+def _digits(date_string, start, end):
+    value = date_string[start:end]
+    if not (value.isascii() and value.isdigit()):
+        raise ValueError(f"Not a number: {value}")
+    return int(value)
+
+
+def _parse_fixed_layout(s):
+    """
+    Fast path for the fixed layouts of the format list, None when the string
+    has another shape.
+    """
+    n = len(s)
+
+    # YYYY-MM-DD, YYYY/MM/DD and the variants with time
+    if n >= 10 and s[4] == s[7] and s[4] in '-/':
+        date = (_digits(s, 0, 4), _digits(s, 5, 7), _digits(s, 8, 10))
+
+        if n == 10:
+            return datetime(*date)
+
+        sep = s[10]
+        if sep != ' ' and not (sep == 'T' and s[4] == '-'):
+            return None
+
+        if n == 13:
+            # YYYY-MM-DD HH, YYYY-MM-DDTHH
+            if s[4] == '-':
+                return datetime(*date, _digits(s, 11, 13))
+        elif n == 16 and s[13] == ':':
+            return datetime(*date, _digits(s, 11, 13), _digits(s, 14, 16))
+        elif n in (19, 20) and s[13] == ':' and s[16] == ':':
+            # YYYY-MM-DDTHH:MM:SSZ is read as a naive datetime
+            if n == 20 and not (s[19] == 'Z' and sep == 'T'):
+                return None
+            return datetime(*date, _digits(s, 11, 13), _digits(s, 14, 16), _digits(s, 17, 19))
+
+        return None
+
+    # YYYYMMDD
+    if n == 8:
+        return datetime(_digits(s, 0, 4), _digits(s, 4, 6), _digits(s, 6, 8))
+
+    # MM/DD/YYYY
+    if n == 10 and s[2] == '/' and s[5] == '/':
+        return datetime(_digits(s, 6, 10), _digits(s, 0, 2), _digits(s, 3, 5))
+
+    return None
+
+
+def _parse_date_string_formats(date_string):
+    parsed_date = _parse_with_formats(date_string)
+    if parsed_date is None:
+        parsed_date = _parse_with_dateutil(date_string)
+
+    return parsed_date
+
+
+def _parse_with_formats(date_string):
     # Lista de formatos posibles
     date_formats = [
         # Formatos con hora parcial
@@ -56,6 +146,10 @@ def parse_date_string(date_string):
         except ValueError:
             continue
 
+    return None
+
+
+def _parse_with_dateutil(date_string):
     # Si ningún formato coincide, intentar con dateutil.parser
     try:
         parsed_date = parser.parse(date_string)
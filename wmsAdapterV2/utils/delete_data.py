@@ -1,11 +1,21 @@
+from django.db import transaction
 from django.db.models import Q
 
 from wmsAdapterV2.utils.filter_by_field import filter_by_field_request_data
 from wmsAdapterV2.utils.query_comparing import query_comparing
+from wmsAdapterV2.utils.read_cache import invalidate_read_cache
 from wmsAdapterV2.utils.update_data import _format_response_from_query_dict
 from wmsAdapterV2.utils.validate_fields_model_and_detail import validate_field_model_and_detail
 from wmsAdapterV2.utils.validate_request_data import validate_request_data
-from wmsAdapterV2.utils.validate_transfer_state import validate_delete_model, validate_records_with_transfer_state
+from wmsAdapterV2.utils.validate_transfer_state import (
+    count_records,
+    get_blocked_records,
+    validate_delete_model,
+    validate_records_with_transfer_state,
+)
+
+# Records deleted per statement (SQL Server allows 2100 parameters)
+DELETE_CHUNK_SIZE = 100
 
 def delete_data(json_data, request_data):
     try:
@@ -20,11 +30,18 @@ def delete_data(json_data, request_data):
             if request_data:
                 request_data = validate_request_data(None, dict, request_data)
             
-            deleted, errors = _format_with_query(db_name, model, query, request_data, mult, model_detail, query_detail)
+            with transaction.atomic(using=db_name):
+                deleted, errors = _format_with_query(db_name, model, query, request_data, mult, model_detail, query_detail)
             
         else:
             request_data = validate_request_data(None, list, request_data)
-            deleted, errors = _format_without_query(db_name, model, request_data, mult, model_detail)
+
+            with transaction.atomic(using=db_name):
+                deleted, errors = _format_without_query(db_name, model, request_data, mult, model_detail)
+
+        if deleted:
+            invalidate_read_cache(db_name, model)
+            invalidate_read_cache(db_name, model_detail)
         
         return deleted, errors
 
@@ -109,6 +126,7 @@ def _format_without_query(db_name, model, request_data, mult, model_detail):
     errors = []
     detail_records = []
     deleted = []
+    requested = []
     
     for rd in request_data:
         rd_aux = rd.copy()
@@ -130,17 +148,36 @@ def _format_without_query(db_name, model, request_data, mult, model_detail):
                     detail_records_aux.append(query_detail)  
                     flag_delete_order = False              
             
-            validate_records_with_transfer_state(db_name, model, query, model_detail, Q(), detail_records_aux, flag_delete_order)
-            if flag_delete_order:
-                records.append(query)
-            else:
-                detail_records.extend(detail_records_aux)
+            requested.append((rd_aux, query, detail_records_aux, flag_delete_order))
             
         except Exception as e:
             rd_aux['error'] = str(e)
-            errors.append(rd_aux)
+            requested.append((rd_aux, None, None, None))
             continue
 
+    # Transfer state of the whole batch at once
+    checked = [r for r in requested if r[1] is not None]
+    blocked = get_blocked_records(
+        db_name,
+        model,
+        [r[1] for r in checked],
+        model_detail,
+        [[r[1]] if r[3] else r[2] for r in checked],
+    )
+    blocked = {id(checked[index]): error for index, error in blocked.items()}
+
+    for r in requested:
+        rd_aux, query, detail_records_aux, flag_delete_order = r
+        if query is None:
+            errors.append(rd_aux)
+        elif id(r) in blocked:
+            rd_aux['error'] = blocked[id(r)]
+            errors.append(rd_aux)
+        elif flag_delete_order:
+            records.append(query)
+        else:
+            detail_records.extend(detail_records_aux)
+
     if mult == 1:
         if detail_records:
             u, error = _delete_multiple_records(db_name, model_detail, detail_records)
@@ -213,23 +250,31 @@ def _format_without_query(db_name, model, request_data, mult, model_detail):
 def _delete_multiple_records(db_name, model, records):
     deleted = []
     errors = []
-    for r in records:
-        
-        query_dict = dict(r.children)
-        query_json = _format_response_from_query_dict(query_dict)
-        try:         
-            deleted_count, _ = model.objects.using(db_name).filter(r).delete()
-            query_json['quantity_deleted'] = deleted_count
+    counts, count_errors = count_records(db_name, model, records)
+
+    for i in range(0, len(records), DELETE_CHUNK_SIZE):
+        to_delete = []
+        for index in range(i, min(i + DELETE_CHUNK_SIZE, len(records))):
+            r = records[index]
+            query_dict = dict(r.children)
+            query_json = _format_response_from_query_dict(query_dict)
 
-            if deleted_count == 0:
+            if index in count_errors:
+                query_json['error'] = count_errors[index]
+                errors.append(query_json)
+                continue
+
+            query_json['quantity_deleted'] = counts[index]
+
+            if counts[index] == 0:
                 query_json['error'] = 'No matching record found'
                 errors.append(query_json)
             else:
-                deleted.append(query_json)
+                to_delete.append((r, query_json, counts[index]))
 
-        except Exception as e:
-            query_json['error'] = str(e)
-            errors.append(query_json)
+        d, error = _delete_records(db_name, model, to_delete)
+        deleted.extend(d)
+        errors.extend(error)
 
     return deleted, errors
 
@@ -237,29 +282,82 @@ def _delete_multiple_records(db_name, model, records):
 def _delete_single_record(db_name, model, records):
     deleted = []
     errors = []
-    for r in records:
-        query_dict = dict(r.children)
-        query_json = _format_response_from_query_dict(query_dict)
-
-        try:            
-            model_instance = model.objects.using(db_name).get(r)
-            model_instance.delete(using=db_name)
-            deleted.append(query_json)
-            
-        except model.MultipleObjectsReturned:
-            query_json['error'] = 'Cannot delete multiple records without sending the confirmation parameter'
-            errors.append(query_json)
-            continue
+    counts, count_errors = count_records(db_name, model, records)
 
-        except model.DoesNotExist:
-            query_json['error'] = 'No matching record found'
-            errors.append(query_json)
-            continue
+    for i in range(0, len(records), DELETE_CHUNK_SIZE):
+        to_delete = []
+        for index in range(i, min(i + DELETE_CHUNK_SIZE, len(records))):
+            r = records[index]
+            query_dict = dict(r.children)
+            query_json = _format_response_from_query_dict(query_dict)
+
+            if index in count_errors:
+                query_json['error'] = count_errors[index]
+                errors.append(query_json)
+            elif counts[index] == 0:
+                query_json['error'] = 'No matching record found'
+                errors.append(query_json)
+            elif counts[index] > 1:
+                query_json['error'] = 'Cannot delete multiple records without sending the confirmation parameter'
+                errors.append(query_json)
+            else:
+                to_delete.append((r, query_json, counts[index]))
+
+        d, error = _delete_records(db_name, model, to_delete)
+        deleted.extend(d)
+        errors.extend(error)
 
-        except Exception as e:
-            query_json['error'] = str(e)
-            errors.append(query_json)
-            continue
-    
     return deleted, errors
 
+
+class _OverlappingRecords(Exception):
+    pass
+
+
+def _delete_records(db_name, model, to_delete):
+    """
+    Delete a chunk of records with one statement, falling back to one
+    statement per record when the chunk fails or its records overlap (it
+    removes fewer rows than the ones counted for them). One by one, a
+    record finds no rows when an earlier one already deleted them, and
+    quantity_deleted is the rows each statement removed.
+    """
+    if not to_delete:
+        return [], []
+
+    query = Q()
+    for r, _, _ in to_delete:
+        query |= r
+
+    try:
+        with transaction.atomic(using=db_name):
+            if _delete_rows(db_name, model, query) != sum(count for _, _, count in to_delete):
+                raise _OverlappingRecords()
+        return [query_json for _, query_json, _ in to_delete], []
+
+    except Exception:
+        deleted = []
+        errors = []
+        for r, query_json, _ in to_delete:
+            try:
+                with transaction.atomic(using=db_name):
+                    rows = _delete_rows(db_name, model, r)
+            except Exception as e:
+                query_json['error'] = str(e)
+                errors.append(query_json)
+                continue
+
+            if 'quantity_deleted' in query_json:
+                query_json['quantity_deleted'] = rows
+            if rows == 0:
+                query_json['error'] = 'No matching record found'
+                errors.append(query_json)
+            else:
+                deleted.append(query_json)
+
+        return deleted, errors
+
+
+def _delete_rows(db_name, model, query):
+    _, rows = model.objects.using(db_name).filter(query).delete()
+    return rows.get(model._meta.label, 0)
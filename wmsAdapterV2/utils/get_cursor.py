@@ -0,0 +1,83 @@
+import base64
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from django.db.models import Q
+
+
+def get_cursor(params):
+    '''
+    Pop the opaque 'cursor' param and decode it into its sort key, last
+    sort value and last primary key.
+    '''
+    cursor = None
+
+    if 'cursor' in params:
+        try:
+            token = str(params['cursor'][0])
+            token += '=' * (-len(token) % 4)
+            cursor = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+
+            if not isinstance(cursor, dict) or 'pk' not in cursor:
+                raise ValueError
+        except Exception:
+            raise ValueError('Cursor is not valid')
+
+        params.pop('cursor')
+
+    return cursor, params
+
+
+def encode_cursor(sort, value, pk):
+    '''
+    Build the opaque token pointing right after the row (value, pk) for the
+    given sort.
+    '''
+    cursor = {'sort': sort, 'value': value, 'pk': pk}
+    token = json.dumps(cursor, default=_serialize_key, separators=(',', ':'))
+    return base64.urlsafe_b64encode(token.encode()).decode().rstrip('=')
+
+
+def get_cursor_query(cursor, sort, pk_name):
+    '''
+    Keyset predicate selecting the rows after the cursor for the ordering
+    (sort, pk). NULL sort values go first on ascending and last on
+    descending order, as SQL Server sorts them.
+    '''
+    if cursor.get('sort') != sort:
+        raise ValueError('Cursor does not match the requested sort')
+
+    pk = cursor['pk']
+
+    if not sort:
+        return Q(**{f'{pk_name}__gt': pk})
+
+    descending = sort.startswith('-')
+    sort_field = sort.lstrip('-')
+    value = cursor.get('value')
+    op = 'lt' if descending else 'gt'
+
+    if sort_field == pk_name:
+        return Q(**{f'{pk_name}__{op}': pk})
+
+    if value is None:
+        query = Q(**{f'{sort_field}__isnull': True, f'{pk_name}__{op}': pk})
+        if not descending:
+            query |= Q(**{f'{sort_field}__isnull': False})
+        return query
+
+    query = Q(**{f'{sort_field}__{op}': value})
+    query |= Q(**{sort_field: value, f'{pk_name}__{op}': pk})
+    if descending:
+        query |= Q(**{f'{sort_field}__isnull': True})
+    return query
+
+
+def _serialize_key(value):
+    # Keep full precision, the keyset predicate compares on these values
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    elif isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type {type(value)} not serializable")
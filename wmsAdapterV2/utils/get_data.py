@@ -1,5 +1,14 @@
 from django.db.models import Q
 from collections import defaultdict
+from contextlib import contextmanager
+
+from project import resilience
+from project.db_router import db_for_read
+from wmsAdapterV2.utils.get_cursor import encode_cursor, get_cursor_query
+
+# SQL Server accepts at most 2100 parameters per statement, the key chunks
+# leave room for the parameters of the filters
+JOIN_CHUNK_SIZE = 1000
 
 
 def exec_query_orm(json_data):
@@ -15,33 +24,128 @@ def exec_query_orm(json_data):
     field_join = json_data.get("field_join", "")
     field_join_detail = json_data.get("field_join_detail", None)
     db_name_detail = json_data.get("db_name_detail", None)
+    cursor = json_data.get("cursor", None)
+    stream = json_data.get("stream", False)
+    chunk_size = json_data.get("chunk_size", 2000)
 
     if not field_join_detail:
         field_join_detail = field_join
 
-    if not db_name_detail:
-        db_name_detail = db_name
+    # Replica of the tenant database, unless the request must read the primary
+    db_name = db_for_read(db_name)
+    db_name_detail = db_for_read(db_name_detail) if db_name_detail else db_name
 
-    detail_list = []
-    
+    key_chunks = None
     if not query and query_detail:
-        detail_list = _execute_query_detail(
-            db_name_detail, model_detail, query_detail, {}, field_join_detail
+        query, key_chunks = _filter_by_detail(
+            query, db_name, db_name_detail, model_detail, query_detail,
+            field_join, field_join_detail
+        )
+
+    # Export mode: rows are produced lazily, one keyset page at a time
+    if stream:
+        # A cursor for another sort fails now, not in the middle of the body
+        if cursor:
+            get_cursor_query(cursor, sort, model._meta.pk.name)
+
+        records = _stream_records(
+            json_data.get("db_name"), db_name, model, query, field_join, fields,
+            sort, cursor, default_limit, chunk_size, db_name_detail, model_detail,
+            query_detail, field_join_detail, include, key_chunks
         )
-        query = _update_query(query, detail_list, field_join, field_join_detail)
-    
-    model_list = _create_model_base_query(
-        db_name, model, query, field_join, fields, sort, default_limit
+        return records, query, query_detail, None
+
+    # One extra row tells whether there is a next page
+    model_list, sort_field, pk_name = _read_headers(
+        db_name, model, query, field_join, fields, sort, cursor, default_limit + 1, key_chunks
+    )
+
+    model_list, next_cursor = _create_model_base_query(
+        model_list, sort, sort_field, pk_name, default_limit
     )
-    
+    _remove_order_fields(model_list, sort_field, pk_name, field_join, fields)
+
+    records, query_detail = _join_model_detail(
+        model_list, db_name_detail, model_detail, query_detail, field_join,
+        field_join_detail, fields, include
+    )
+
+    return records, query, query_detail, next_cursor
+
+
+def _create_model_base_queryset(db_name, model, query, field_join, fields, sort, cursor):
+    # Keyset pagination: order by (sort, pk) and start right after the cursor
+    pk_name = model._meta.pk.name
+    sort_field = sort.lstrip("-") if sort else pk_name
+
+    order_by = [sort or pk_name]
+    if sort_field != pk_name:
+        order_by.append(("-" if sort.startswith("-") else "") + pk_name)
+
+    if cursor:
+        query &= get_cursor_query(cursor, sort, pk_name)
+
+    values = list(fields)
+    for field in (field_join, sort_field, pk_name):
+        if field and field not in values:
+            values.append(field)
+
+    queryset = model.objects.using(db_name).filter(query).values(*values).order_by(*order_by)
+
+    return queryset, sort_field, pk_name
+
+
+def _read_headers(db_name, model, query, field_join, fields, sort, cursor, size, key_chunks=None):
+    queryset, sort_field, pk_name = _create_model_base_queryset(
+        db_name, model, query, field_join, fields, sort, cursor
+    )
+    if key_chunks is None:
+        return list(queryset[:size]), sort_field, pk_name
+
+    # The first rows of every chunk of join keys, merged in the page order.
+    # NULL goes first, as SQL Server sorts it
+    model_list = []
+    for chunk in key_chunks:
+        model_list.extend(queryset.filter(**{f"{field_join}__in": chunk})[:size])
+
+    model_list.sort(
+        key=lambda row: (row[sort_field] is not None, row[sort_field], row[pk_name]),
+        reverse=bool(sort) and sort.startswith("-"),
+    )
+    return model_list[:size], sort_field, pk_name
+
+
+def _create_model_base_query(model_list, sort, sort_field, pk_name, default_limit):
+    next_cursor = None
+    if len(model_list) > default_limit:
+        model_list = model_list[:default_limit]
+        last = model_list[-1]
+        next_cursor = encode_cursor(sort, last[sort_field], last[pk_name])
+
+    return model_list, next_cursor
+
+
+def _remove_order_fields(model_list, sort_field, pk_name, field_join, fields):
+    for field in {sort_field, pk_name}:
+        if field not in fields and field != field_join:
+            for obj in model_list:
+                del obj[field]
+
+
+def _join_model_detail(
+    model_list, db_name_detail, model_detail, query_detail, field_join,
+    field_join_detail, fields, include
+):
     records = []
     if include or query_detail:
         
-        query_detail = _update_query(query_detail, model_list, field_join, field_join_detail)
-        
-        detail_list = _execute_query_detail(
-            db_name_detail, model_detail, query_detail, include, field_join_detail
+        keys = _get_join_keys(model_list, field_join)
+
+        detail_list = _execute_query_detail_chunked(
+            db_name_detail, model_detail, query_detail, include, field_join_detail, keys
         )
+
+        query_detail &= Q(**{f"{field_join_detail}__in": keys})
         
         records = _include_filter_detail(
             model_list, detail_list, field_join, field_join_detail, fields, include
@@ -54,33 +158,94 @@ def exec_query_orm(json_data):
         else:
             records = model_list
 
-    return records, query, query_detail
+    return records, query_detail
 
 
-def _create_model_base_query(
-    db_name, model, query, field_join, fields, sort, default_limit
+def _stream_records(
+    tenant, db_name, model, query, field_join, fields, sort, cursor, limit,
+    chunk_size, db_name_detail, model_detail, query_detail, field_join_detail,
+    include, key_chunks=None
 ):
-    if field_join:
-        if sort:
-            model_list = list(model.objects.using(db_name).filter(query).values(*fields, field_join).order_by(sort)[:default_limit])
-        else:
-            model_list = list(model.objects.using(db_name).filter(query).values(*fields, field_join)[:default_limit])
-    else:
-        if sort:
-            model_list = list(model.objects.using(db_name).filter(query).values(*fields).order_by(sort)[:default_limit])
-        else:
-            model_list = list(model.objects.using(db_name).filter(query).values(*fields)[:default_limit])
+    # Each page is fetched whole before its detail join runs: without MARS a
+    # connection runs one statement at a time. The detail join runs once per
+    # page, never on the whole export
+    remaining = limit
+    while True:
+        size = min(chunk_size, remaining) if remaining else chunk_size
+
+        # The body is sent after MiddlewareTenantGuard released the place of
+        # the request, every page takes one again
+        with _tenant_place(tenant):
+            chunk, sort_field, pk_name = _read_headers(
+                db_name, model, query, field_join, fields, sort, cursor, size, key_chunks
+            )
+            if not chunk:
+                return
+
+            last = chunk[-1]
+            cursor = {"sort": sort, "value": last[sort_field], "pk": last[pk_name]}
+
+            records = _stream_chunk(
+                chunk, sort_field, pk_name, db_name_detail, model_detail,
+                query_detail, field_join, field_join_detail, fields, include
+            )
+
+        yield from records
+
+        if len(chunk) < size:
+            return
+        if remaining:
+            remaining -= len(chunk)
+            if remaining <= 0:
+                return
+
+
+@contextmanager
+def _tenant_place(db_name):
+    _, bulkhead = resilience.enter("sql:" + db_name)
+    try:
+        yield
+    finally:
+        bulkhead.release()
+
 
-    return model_list
+def _stream_chunk(
+    chunk, sort_field, pk_name, db_name_detail, model_detail, query_detail,
+    field_join, field_join_detail, fields, include
+):
+    _remove_order_fields(chunk, sort_field, pk_name, field_join, fields)
+
+    records, _ = _join_model_detail(
+        chunk, db_name_detail, model_detail, query_detail, field_join,
+        field_join_detail, fields, include
+    )
+
+    return records
+
+
+def _filter_by_detail(
+    query, db_name, db_name_detail, model_detail, query_detail, field_join,
+    field_join_detail
+):
+    detail_keys = model_detail.objects.using(db_name_detail).filter(query_detail)
+
+    # Same database: a subquery lets the header limit apply before any key
+    # is collected
+    if db_name_detail == db_name:
+        return query & Q(**{f"{field_join}__in": detail_keys.values(field_join_detail)}), None
 
+    # Another database: the headers are read once per chunk of keys
+    keys = list(detail_keys.values_list(field_join_detail, flat=True).distinct())
+    return query, _chunks(keys)
 
-def _update_query(q, m_list, field_join, field_join_detail):
-    list_field_join = []
+
+def _get_join_keys(m_list, field_join):
+    keys = {}
     for obj in m_list:
-        list_field_join.append(obj[field_join])
+        if obj[field_join] is not None:
+            keys[obj[field_join]] = None
 
-    q &= Q(**{f"{field_join_detail}__in": list_field_join})
-    return q
+    return list(keys)
 
 
 def _execute_query_detail(db_name, m, q, f, field_join):
@@ -88,17 +253,32 @@ def _execute_query_detail(db_name, m, q, f, field_join):
     return m_list
 
 
+def _execute_query_detail_chunked(db_name, m, q, f, field_join, keys):
+    m_list = []
+    for chunk in _chunks(keys):
+        m_list.extend(
+            _execute_query_detail(db_name, m, q & Q(**{f"{field_join}__in": chunk}), f, field_join)
+        )
+    return m_list
+
+
+def _chunks(keys):
+    return [keys[i:i + JOIN_CHUNK_SIZE] for i in range(0, len(keys), JOIN_CHUNK_SIZE)]
+
+
 def _include_filter_detail(model_list, detail_list, field_join, field_join_detail, fields, include):
+    # Hash join, header and detail join columns do not always share a type
+    # (e.g. picking is numeric on EPK and varchar on DPK)
     order_details_dict = defaultdict(list)
 
     orders = []
     for detail in detail_list:
         picking = detail.pop(field_join_detail)
-        order_details_dict[picking].append(detail)
+        order_details_dict[str(picking)].append(detail)
 
     for order in model_list:
         order_picking = order[field_join]
-        order_detail = order_details_dict.get(order_picking, [])
+        order_detail = order_details_dict.get(str(order_picking), [])
 
         if order_detail:
             if include:
@@ -0,0 +1,16 @@
+def get_export_format(params):
+    # Initialize format
+    export = False
+
+    # Check if format is in params
+    if 'format' in params:
+        export_format = str(params['format'][0]).lower()
+
+        if export_format == 'ndjson':
+            export = True
+        elif export_format != 'json':
+            raise ValueError('Format must be json or ndjson')
+
+        params.pop('format')
+
+    return export, params
@@ -1,15 +1,15 @@
-def get_limit(params):
-    # Initialize limit
-    default_limit = 100
+def get_limit(params, export=False):
+    # Initialize limit, exports are not limited by default
+    default_limit = None if export else 100
 
     # Check if limit is in params
     if 'limit' in params:
         try: 
             default_limit = int(params['limit'][0])
-            if default_limit > 500:
+            if default_limit > 500 and not export:
                 raise ValueError('Limit must be less than 500')
         except Exception as e:
             raise ValueError(e)
         
         params.pop('limit')
-    return default_limit, params
\ No newline at end of file
+    return default_limit, params
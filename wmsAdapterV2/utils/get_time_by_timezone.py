@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import pytz
 from django.utils import timezone
 
@@ -29,26 +31,85 @@ from project.settings import TIME_ZONES_BD
 #     return time_record
 
 
-def get_time_by_timezone(db_name, delta_type=None, delta_value=None):
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@lru_cache(maxsize=None)
+def get_timezone(db_name):
+    '''
+    Time zone object of the tenant, resolved once per db_name.
+    '''
     try:
-        time_now = timezone.now()
-        zona_horaria = TIME_ZONES_BD[db_name]
-        time_record = time_now.astimezone(pytz.timezone(zona_horaria))
+        return pytz.timezone(TIME_ZONES_BD[db_name])
     except:
-        time_record = timezone.now()
+        return None
+
+
+def _shift(time_record, delta_type=None, delta_value=None):
+    if delta_type and delta_value:
+        if delta_type == "days":
+            time_record = time_record + timezone.timedelta(days=delta_value)
+        elif delta_type == "hours":
+            time_record = time_record + timezone.timedelta(hours=delta_value)
+        else:
+            time_record = time_record + timezone.timedelta(minutes=delta_value)
+    return time_record
+
+
+def get_time_by_timezone(db_name, delta_type=None, delta_value=None):
+    time_record = timezone.now()
+    tz = get_timezone(db_name)
+    if tz is not None:
+        time_record = time_record.astimezone(tz)
     try:
-        if delta_type and delta_value:
-            if delta_type == "days":
-                time_record = time_record + timezone.timedelta(days=delta_value)
-            elif delta_type == "hours":
-                time_record = time_record + timezone.timedelta(hours=delta_value)
-            else:
-                time_record = time_record + timezone.timedelta(minutes=delta_value)
         # CAMBIO: Formato sin microsegundos y con espacio en lugar de T
         # YYYY-MM-DD HH:MM:SS
         # se eliminaron Microsegundo y cambiar o sustituir las T para garantizar minimo de
         # espacios
-        time_record = time_record.strftime("%Y-%m-%d %H:%M:%S")
+        time_record = _shift(time_record, delta_type, delta_value).strftime(TIME_FORMAT)
     except:
         pass
     return time_record
+
+
+class RequestClock:
+    '''
+    Time of a request in the tenant time zone, taken once so every record of
+    the batch gets the same timestamp.
+
+    @params:
+        now: aware datetime in the tenant time zone
+        text: now formatted as get_time_by_timezone returns it
+    '''
+
+    def __init__(self, db_name):
+        self.db_name = db_name
+        self.tz = get_timezone(db_name)
+        self.now = timezone.now()
+        if self.tz is not None:
+            self.now = self.now.astimezone(self.tz)
+        self.text = self.now.strftime(TIME_FORMAT)
+
+    def shift(self, delta_type=None, delta_value=None):
+        '''
+        Request time moved by the delta, formatted as the text form.
+        '''
+        if not (delta_type and delta_value):
+            return self.text
+        return _shift(self.now, delta_type, delta_value).strftime(TIME_FORMAT)
+
+
+def get_request_clock(db_name, request=None):
+    '''
+    Clock of the request, created on the first call and reused by every
+    function handling the same request and tenant.
+    '''
+    clock = getattr(request, "wms_clock", None)
+    if clock is None or clock.db_name != db_name:
+        clock = RequestClock(db_name)
+        if request is not None:
+            try:
+                request.wms_clock = clock
+            except AttributeError:
+                pass
+    return clock
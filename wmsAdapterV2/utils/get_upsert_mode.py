@@ -0,0 +1,28 @@
+def get_upsert_mode(params):
+    '''
+    Pop the write mode params of a POST.
+    @params:
+        mode: 'insert' (default) or 'upsert'
+        zero_missing: 1 to zero out the rows missing from an upsert snapshot
+    '''
+    # Initialize mode
+    upsert = False
+    zero_missing = False
+
+    # Check if mode is in params
+    if 'mode' in params:
+        mode = str(params['mode'][0]).lower()
+        if mode not in ('insert', 'upsert'):
+            raise ValueError('mode must be insert or upsert')
+        upsert = mode == 'upsert'
+        params.pop('mode')
+
+    # Check if zero_missing is in params
+    if 'zero_missing' in params:
+        try:
+            zero_missing = int(params['zero_missing'][0]) == 1
+        except Exception:
+            raise ValueError('zero_missing must be an integer')
+        params.pop('zero_missing')
+
+    return upsert, zero_missing, params
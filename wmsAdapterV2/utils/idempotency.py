@@ -0,0 +1,316 @@
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from functools import wraps
+from threading import Event, Lock
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections, transaction
+from django.http import HttpResponse, JsonResponse
+
+from project import resilience
+from project.db_router import is_write
+
+logger = logging.getLogger(__name__)
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+# How often a request waiting for a run in another process checks the shared cache
+POLL_INTERVAL = 0.1
+
+
+class IdempotencyStore:
+    """
+    Final responses of the bulk POSTs, by tenant, endpoint and Idempotency-Key,
+    with the hash of the body they answered.
+
+    A key is claimed by the first request that sends it; a request with the
+    same key that arrives while that run is going on waits up to
+    wait_timeout for its response. By default the responses and the claims
+    live in this process (LRU bounded, with TTL); when BACKEND names an alias
+    of settings.CACHES they go to that shared cache, and the waiting requests
+    poll it. A claim in the shared cache expires after claim_timeout, so a
+    worker that dies does not block the key.
+    """
+
+    RUN = "run"
+    REPLAY = "replay"
+    MISMATCH = "mismatch"
+    BUSY = "busy"
+
+    def __init__(self, ttl=86400, max_entries=1000, backend=None, wait_timeout=30, retry_after=5,
+                 claim_timeout=900):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.backend = caches[backend] if backend else None
+        self.wait_timeout = wait_timeout
+        self.retry_after = retry_after
+        self.claim_timeout = claim_timeout
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = Lock()
+
+    def begin(self, key, fingerprint, timeout=0):
+        '''
+        Claim the key, or wait up to timeout seconds for the run that
+        claimed it.
+        @params:
+            key: tenant, endpoint and Idempotency-Key
+            fingerprint: hash of the request body
+            timeout: seconds to wait for a run going on
+        @returns:
+            (RUN, None) when the caller must run the request and call finish
+            or release, (REPLAY, record) with the stored response, (MISMATCH,
+            None) when the key was used with another body and (BUSY, None)
+            when the first run did not end within timeout.
+        '''
+        if self.backend is not None:
+            return self._begin_shared(key, fingerprint, timeout)
+
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                record = self._get_local(key)
+                if record is not None:
+                    return self._replay(record, fingerprint)
+
+                pending = self._pending.get(key)
+                if pending is None:
+                    self._pending[key] = (fingerprint, Event())
+                    return self.RUN, None
+
+                if pending[0] != fingerprint:
+                    return self.MISMATCH, None
+
+            if not pending[1].wait(max(deadline - time.monotonic(), 0)):
+                return self.BUSY, None
+
+    def finish(self, key, record):
+        '''
+        Store the response of a claimed key and wake the requests waiting for it.
+        '''
+        if self.backend is not None:
+            self.backend.set(self._shared_key(key), record, self.ttl)
+            self.backend.delete(self._shared_key(key) + ":claim")
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, record)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+            _, event = self._pending.pop(key)
+        event.set()
+
+    def release(self, key):
+        '''
+        Drop the claim without a response, the next request with the key runs.
+        '''
+        if self.backend is not None:
+            self.backend.delete(self._shared_key(key) + ":claim")
+            return
+
+        with self._lock:
+            _, event = self._pending.pop(key)
+        event.set()
+
+    def _begin_shared(self, key, fingerprint, timeout):
+        shared_key = self._shared_key(key)
+        deadline = time.monotonic() + timeout
+
+        while True:
+            record = self.backend.get(shared_key)
+            if record is not None:
+                return self._replay(record, fingerprint)
+
+            if self.backend.add(shared_key + ":claim", fingerprint, self.claim_timeout):
+                return self.RUN, None
+
+            # None when the run ended after the add, its response is read again
+            claim = self.backend.get(shared_key + ":claim")
+            if claim is not None and claim != fingerprint:
+                return self.MISMATCH, None
+
+            if time.monotonic() >= deadline:
+                return self.BUSY, None
+            time.sleep(POLL_INTERVAL)
+
+    def _replay(self, record, fingerprint):
+        if record["fingerprint"] != fingerprint:
+            return self.MISMATCH, None
+        return self.REPLAY, record
+
+    def _get_local(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires, record = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return record
+
+    def _shared_key(self, key):
+        return "wms_idempotency:" + hashlib.sha1(":".join(key).encode()).hexdigest()
+
+
+_config = getattr(settings, "WMS_IDEMPOTENCY", {})
+
+idempotency_store = IdempotencyStore(
+    ttl=_config.get("TTL", 86400),
+    max_entries=_config.get("MAX_ENTRIES", 1000),
+    backend=_config.get("BACKEND"),
+    wait_timeout=_config.get("WAIT_TIMEOUT", 30),
+    retry_after=_config.get("RETRY_AFTER", 5),
+    claim_timeout=_config.get("CLAIM_TIMEOUT", 900),
+)
+
+
+def idempotent(view):
+    '''
+    Decorator of the bulk create views. A POST with an Idempotency-Key header
+    runs once per tenant and endpoint; a retry with the same key and body gets
+    the stored response without touching the database, with the
+    Idempotent-Replayed header. A retry arriving while the first run goes on
+    waits for its response, without the tenant database place, and gets a
+    409 with Retry-After when the run takes longer than wait_timeout.
+
+    A 5xx response is stored when the run committed a write to the tenant
+    database, so the retries of the client do not write again; otherwise
+    the key is released and the retry runs.
+    '''
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        idempotency_key = request.headers.get(HEADER)
+        db_name = getattr(request, "db_name", None)
+        if request.method != "POST" or not idempotency_key or db_name is None:
+            return view(request, *args, **kwargs)
+
+        if len(idempotency_key) > MAX_KEY_LENGTH:
+            return JsonResponse(
+                {"error": f"The {HEADER} header can have up to {MAX_KEY_LENGTH} characters"},
+                safe=False,
+                status=400,
+            )
+
+        key = (db_name, request.path, idempotency_key)
+        fingerprint = hashlib.sha256(request.body).hexdigest()
+
+        state, record = idempotency_store.begin(key, fingerprint)
+
+        if state == IdempotencyStore.BUSY:
+            # A replay reads no database, the place goes to other requests
+            left_place = _leave_tenant_place(request)
+            state, record = idempotency_store.begin(key, fingerprint, idempotency_store.wait_timeout)
+
+            if state == IdempotencyStore.RUN and left_place:
+                unavailable = _take_tenant_place(request)
+                if unavailable is not None:
+                    idempotency_store.release(key)
+                    return unavailable
+
+        if state == IdempotencyStore.REPLAY:
+            logger.info("Idempotent request replayed", extra={"status": record["status"]})
+            response = HttpResponse(record["content"], status=record["status"], content_type=record["content_type"])
+            response["Idempotent-Replayed"] = "true"
+            return response
+
+        if state == IdempotencyStore.MISMATCH:
+            return JsonResponse(
+                {"error": f"The {HEADER} was already used with a different body"},
+                safe=False,
+                status=422,
+            )
+
+        if state == IdempotencyStore.BUSY:
+            response = JsonResponse(
+                {"error": f"A request with the same {HEADER} is still running, retry later"},
+                safe=False,
+                status=409,
+            )
+            response["Retry-After"] = str(idempotency_store.retry_after)
+            return response
+
+        tracker = _CommitTracker()
+        try:
+            with connections[db_name].execute_wrapper(tracker):
+                response = view(request, *args, **kwargs)
+        except BaseException:
+            idempotency_store.release(key)
+            raise
+
+        if response.streaming or (response.status_code >= 500 and not tracker.committed):
+            idempotency_store.release(key)
+        else:
+            idempotency_store.finish(key, {
+                "fingerprint": fingerprint,
+                "status": response.status_code,
+                "content": response.content,
+                "content_type": response["Content-Type"],
+            })
+
+        return response
+
+    return wrapper
+
+
+class _CommitTracker:
+    '''
+    Execute wrapper telling whether a run committed a write: one outside a
+    transaction, or one whose transaction committed.
+    '''
+
+    def __init__(self):
+        self.committed = False
+
+    def __call__(self, execute, sql, params, many, context):
+        result = execute(sql, params, many, context)
+
+        if not self.committed and is_write(sql):
+            connection = context["connection"]
+            if connection.in_atomic_block:
+                transaction.on_commit(self._commit, using=connection.alias)
+            else:
+                self._commit()
+
+        return result
+
+    def _commit(self):
+        self.committed = True
+
+
+def _leave_tenant_place(request):
+    bulkhead = getattr(request, "tenant_bulkhead", None)
+    if bulkhead is None:
+        return False
+
+    # MiddlewareTenantGuard releases nothing more
+    request.tenant_bulkhead = None
+    bulkhead.release()
+    return True
+
+
+def _take_tenant_place(request):
+    '''
+    Take again the place of MiddlewareTenantGuard before running the view,
+    a 503 response when the database is unavailable.
+    '''
+    try:
+        _, request.tenant_bulkhead = resilience.enter("sql:" + request.db_name)
+    except resilience.DependencyUnavailable as e:
+        response = JsonResponse(
+            {"error": "The database is unavailable, please retry later"},
+            safe=False,
+            status=503,
+        )
+        response["Retry-After"] = str(e.retry_after)
+        return response
+    return None
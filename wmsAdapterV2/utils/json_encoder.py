@@ -0,0 +1,68 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+from wmsAdapterV2.utils.serializer import serializer
+
+# orjson encodes the rows in C. Without it the stdlib encoder is used, with
+# the same output as before
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Response bodies keep the datetime format of DjangoJSONEncoder (milliseconds,
+# Z for UTC), orjson writes microseconds and +00:00
+_django_encoder = DjangoJSONEncoder()
+
+
+def dumps(data):
+    '''
+    Encode the body of a response with the output of DjangoJSONEncoder.
+    Decimal goes as a string, so the numbers keep their scale, and datetime,
+    date and time are passed to DjangoJSONEncoder for the same format.
+    @returns:
+        bytes
+    '''
+    if orjson is not None:
+        return orjson.dumps(
+            data,
+            default=_django_encoder.default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+        )
+    return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
+
+def dumps_payload(data):
+    '''
+    Encode the JSON sent to the stored procedures with the serializer
+    callback: datetime goes in ISO format, Decimal as a number and the other
+    types it does not know (date, time...) raise TypeError. The JSON is not
+    indented, the procedures parse it the same.
+    @returns:
+        str
+    '''
+    if orjson is not None:
+        return orjson.dumps(
+            data,
+            default=serializer,
+            option=(
+                orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_PASSTHROUGH_DATACLASS
+            ),
+        ).decode()
+    return json.dumps(data, default=serializer)
+
+
+class FastJsonResponse(HttpResponse):
+    '''
+    JsonResponse encoded with dumps. Lists are always allowed, safe is
+    accepted for compatibility with the JsonResponse calls.
+    '''
+
+    def __init__(self, data, safe=False, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=dumps(data), **kwargs)
+
@@ -0,0 +1,46 @@
+from collections import defaultdict
+
+# SQL Server accepts at most 2100 parameters per statement
+KEY_CHUNK_SIZE = 1000
+
+
+def join_key(row, fields, sep=" "):
+    '''
+    Key of a row as the existing-record checks build it, e.g.
+    "tipodocto doctoerp numpedido".
+    '''
+    return sep.join(str(row[field]) for field in fields)
+
+
+def index_rows(rows, fields):
+    '''
+    Hash index of the rows by the given fields. Values are compared as
+    strings since the same column can be numeric on a header table and
+    varchar on its detail table (picking on EPN/DPN).
+    '''
+    index = defaultdict(list)
+    for row in rows:
+        index[tuple(str(row[field]) for field in fields)].append(row)
+    return index
+
+
+def request_values(request_data, field):
+    '''
+    Distinct non empty values of a field in the request records.
+    '''
+    return {
+        rd[field]
+        for rd in request_data
+        if isinstance(rd, dict) and rd.get(field) not in (None, "")
+    }
+
+
+def filter_by_values(queryset, field, values, chunk_size=KEY_CHUNK_SIZE):
+    '''
+    Rows of the queryset whose field is in values, read by chunks of keys.
+    '''
+    values = list(values)
+    rows = []
+    for i in range(0, len(values), chunk_size):
+        rows.extend(queryset.filter(**{f"{field}__in": values[i : i + chunk_size]}))
+    return rows
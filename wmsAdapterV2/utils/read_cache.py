@@ -0,0 +1,176 @@
+import hashlib
+import logging
+import pickle
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from django.conf import settings
+from django.core.cache import caches
+
+from wmsAdapterV2.utils.get_data import exec_query_orm
+
+logger = logging.getLogger(__name__)
+
+
+class ReadCache:
+    """
+    Read-through cache for the GET reads of low-churn tables.
+
+    Entries are scoped by tenant (db_name) and model, so a write on a model
+    only drops the entries of that model for that tenant. By default the
+    entries live in this process (LRU bounded, with TTL); when BACKEND names
+    an alias of settings.CACHES the entries go to that shared cache and the
+    invalidation bumps a generation counter stored there.
+
+    The entries of this process only see the writes made by this process:
+    with more than one worker a write leaves the other workers serving the
+    old rows until the TTL ends, so those deployments need BACKEND.
+
+    Values are stored pickled, like the Django cache backends do, so a
+    caller changing the rows it got back never changes the cached ones.
+    """
+
+    def __init__(self, ttl=60, max_entries=1000, backend=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.backend = caches[backend] if backend else None
+        self._entries = OrderedDict()
+        self._scopes = {}
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, scope, key):
+        if self.backend is not None:
+            value = self.backend.get(self._shared_key(scope, key))
+        else:
+            value = self._get_local(scope, key)
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+            lookups = self.hits + self.misses
+            if lookups % 1000 == 0:
+                logger.info(f"Read cache hit rate: {self.hit_rate():.2%} ({lookups} lookups)")
+
+        return value
+
+    def set(self, scope, key, value):
+        if self.backend is not None:
+            self.backend.set(self._shared_key(scope, key), value, self.ttl)
+            return
+
+        with self._lock:
+            self._entries[(scope, key)] = (
+                time.monotonic() + self.ttl, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            )
+            self._entries.move_to_end((scope, key))
+            self._scopes.setdefault(scope, set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                (old_scope, old_key), _ = self._entries.popitem(last=False)
+                self._scopes[old_scope].discard(old_key)
+
+    def invalidate(self, scope):
+        if self.backend is not None:
+            generation_key = self._generation_key(scope)
+            try:
+                self.backend.incr(generation_key)
+            except ValueError:
+                self.backend.set(generation_key, 1, None)
+            return
+
+        with self._lock:
+            for key in self._scopes.pop(scope, set()):
+                self._entries.pop((scope, key), None)
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate(),
+            "entries": len(self._entries),
+        }
+
+    def _get_local(self, scope, key):
+        with self._lock:
+            entry = self._entries.get((scope, key))
+            if entry is None:
+                return None
+
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[(scope, key)]
+                self._scopes[scope].discard(key)
+                return None
+
+            self._entries.move_to_end((scope, key))
+        return pickle.loads(value)
+
+    def _generation_key(self, scope):
+        return "wms_read:gen:" + ":".join(scope)
+
+    def _shared_key(self, scope, key):
+        generation = self.backend.get(self._generation_key(scope), 0)
+        return f"wms_read:{':'.join(scope)}:{generation}:{key}"
+
+
+_config = getattr(settings, "WMS_READ_CACHE", {})
+
+read_cache = ReadCache(
+    ttl=_config.get("TTL", 60),
+    max_entries=_config.get("MAX_ENTRIES", 1000),
+    backend=_config.get("BACKEND"),
+)
+
+
+def _get_scope(db_name, model):
+    return (db_name, model._meta.label_lower)
+
+
+def _get_query_key(json_data):
+    # Normalized query: filters, fields, include, sort, limit and cursor
+    query_key = repr((
+        str(json_data.get("query")),
+        str(json_data.get("query_detail")),
+        sorted(json_data.get("fields", [])),
+        sorted(json_data.get("include", [])),
+        json_data.get("sort"),
+        json_data.get("default_limit"),
+        json_data.get("cursor"),
+    ))
+    return hashlib.sha1(query_key.encode()).hexdigest()
+
+
+def cached_query_orm(json_data):
+    '''
+    exec_query_orm behind the read cache. Exports are never cached.
+    '''
+    if json_data.get("stream"):
+        return exec_query_orm(json_data)
+
+    scope = _get_scope(json_data.get("db_name"), json_data.get("model"))
+    key = _get_query_key(json_data)
+
+    result = read_cache.get(scope, key)
+    if result is None:
+        result = exec_query_orm(json_data)
+        read_cache.set(scope, key, result)
+
+    return result
+
+
+def invalidate_read_cache(db_name, model):
+    '''
+    Drop the cached reads of a model for a tenant, called after every write.
+    '''
+    if model is not None:
+        read_cache.invalidate(_get_scope(db_name, model))
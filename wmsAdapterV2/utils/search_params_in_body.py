@@ -1,5 +1,8 @@
+import logging
 from json import loads
 
+logger = logging.getLogger(__name__)
+
 
 def search_params_in_body(request, params):
     body = request.body
@@ -8,7 +11,7 @@ def search_params_in_body(request, params):
         if body:
             for key, value in body.items():
                 if key in params:
-                    print(value)
+                    logger.debug(f"Joining body value of {key}: {value}")
                     params[key] = params[key][0] + "," + value
                 else:
                     params[key] = [value]
@@ -0,0 +1,154 @@
+import json
+import re
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from wmsAdapterV2.models import TdaWmsDpk, TdaWmsEpk
+
+# Statements of the adapter that only SQL Server understands
+SEQUENCE_PATTERN = re.compile(r"^\s*SELECT\s+NEXT\s+VALUE\s+FOR\s+(\w+)\s*$", re.IGNORECASE)
+PROCEDURE_PATTERN = re.compile(
+    r"^\s*EXEC\s+dbo\.sp_VerificarDatosNoExistentes(\w+)\s+@jsonArray\s*=\s*%s\s*$",
+    re.IGNORECASE,
+)
+
+SEQUENCE_TABLE = "standin_sequence"
+SEQUENCES = ("secuencia_picking",)
+
+# Fields the existence procedures compare, lineaidpicking only when sent
+PROCEDURE_KEYS = {
+    "EPK": (TdaWmsEpk, ("tipodocto", "doctoerp", "numpedido"), None),
+    "DPK": (TdaWmsDpk, ("tipodocto", "doctoerp", "numpedido", "productoean"), "lineaidpicking"),
+}
+
+# SQLite accepts 32766 parameters per statement
+LOOKUP_CHUNK_SIZE = 500
+
+
+class SqlServerStandIn:
+    '''
+    SQLite database with the TDA_WMS_* tables of the adapter, answering the
+    SQL Server only statements the bulk endpoints run: the picking sequence
+    (NEXT VALUE FOR) and the sp_VerificarDatosNoExistentesEPK/DPK procedures.
+    Meant for benchmarks and local runs, never for a tenant database.
+
+    @params:
+        alias: database alias registered in django.db.connections
+        name: SQLite file, in memory by default
+    '''
+
+    def __init__(self, alias, name=":memory:"):
+        self.alias = alias
+        self.name = name
+        self.queries = 0
+
+    def install(self):
+        '''
+        Register the database and create the tables and the sequences.
+        '''
+        databases = connections.settings
+        databases[self.alias] = {"ENGINE": "django.db.backends.sqlite3", "NAME": self.name}
+        connections.configure_settings(databases)
+
+        connection = connections[self.alias]
+        with connection.schema_editor() as schema_editor:
+            for model in apps.get_app_config("wmsAdapterV2").get_models():
+                schema_editor.create_model(model)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE {SEQUENCE_TABLE} (name VARCHAR(128) PRIMARY KEY, value BIGINT NOT NULL)"
+            )
+            for sequence in SEQUENCES:
+                cursor.execute(f"INSERT INTO {SEQUENCE_TABLE} (name, value) VALUES (%s, 0)", [sequence])
+
+        return self
+
+    def uninstall(self):
+        '''
+        Close the connection and forget the alias.
+        '''
+        connections[self.alias].close()
+        del connections[self.alias]
+        if self.alias != DEFAULT_DB_ALIAS:
+            connections.settings.pop(self.alias, None)
+
+    @contextmanager
+    def activate(self):
+        '''
+        Translate the SQL Server statements and count the queries sent to the
+        database while the block runs.
+        '''
+        with connections[self.alias].execute_wrapper(self._execute):
+            yield self
+
+    def _execute(self, execute, sql, params, many, context):
+        self.queries += 1
+
+        match = SEQUENCE_PATTERN.match(sql)
+        if match:
+            return self._next_value(execute, match.group(1), many, context)
+
+        match = PROCEDURE_PATTERN.match(sql)
+        if match:
+            return self._non_existent_records(execute, match.group(1).upper(), params[0], many, context)
+
+        return execute(sql, params, many, context)
+
+    def _next_value(self, execute, sequence, many, context):
+        raw = context["connection"].connection
+        updated = raw.execute(
+            f"UPDATE {SEQUENCE_TABLE} SET value = value + 1 WHERE name = ?", [sequence]
+        ).rowcount
+        if not updated:
+            raise ValueError(f"Invalid object name '{sequence}'")
+
+        return execute(f"SELECT value FROM {SEQUENCE_TABLE} WHERE name = %s", [sequence], many, context)
+
+    def _non_existent_records(self, execute, table, json_string, many, context):
+        '''
+        Same result as the procedure: a JSON array whose JsonData items are
+        the records of the input without a row in the table.
+        '''
+        if table not in PROCEDURE_KEYS:
+            raise ValueError(f"Could not find stored procedure 'sp_VerificarDatosNoExistentes{table}'")
+
+        model, fields, optional = PROCEDURE_KEYS[table]
+        records = json.loads(json_string)
+        existing = self._existing_keys(context["connection"].connection, model, fields, optional, records)
+
+        result = []
+        for record in records:
+            key = tuple(str(record.get(f)) for f in fields)
+            line = record.get(optional) if optional else None
+            if key in existing and (not line or str(line) in existing[key]):
+                continue
+            result.append({"JsonData": json.dumps(record)})
+
+        return execute("SELECT %s", [json.dumps(result)], many, context)
+
+    def _existing_keys(self, raw, model, fields, optional, records):
+        columns = [model._meta.get_field(f).column for f in fields]
+        select = list(columns)
+        if optional:
+            select.append(model._meta.get_field(optional).column)
+
+        doctoerp = model._meta.get_field("doctoerp").column
+        values = list({str(r.get("doctoerp")) for r in records})
+
+        existing = {}
+        for i in range(0, len(values), LOOKUP_CHUNK_SIZE):
+            chunk = values[i : i + LOOKUP_CHUNK_SIZE]
+            rows = raw.execute(
+                f'SELECT {", ".join(select)} FROM {model._meta.db_table} '
+                f'WHERE {doctoerp} IN ({", ".join("?" * len(chunk))})',
+                chunk,
+            )
+            for row in rows:
+                lines = existing.setdefault(tuple(str(v) for v in row[: len(fields)]), set())
+                if optional:
+                    lines.add(str(row[-1]))
+
+        return existing
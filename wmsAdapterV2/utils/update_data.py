@@ -1,8 +1,9 @@
 from django.db.models import Q
 
 from wmsAdapterV2.utils.filter_by_field import filter_by_primary_and_unique
-from wmsAdapterV2.utils.get_time_by_timezone import get_time_by_timezone
+from wmsAdapterV2.utils.get_time_by_timezone import get_request_clock
 from wmsAdapterV2.utils.query_comparing import query_comparing
+from wmsAdapterV2.utils.read_cache import invalidate_read_cache
 from wmsAdapterV2.utils.validate_fields import get_update_date_field
 from wmsAdapterV2.utils.validate_fields_model_and_detail import (
     validate_field_model_and_detail,
@@ -20,19 +21,31 @@ def update_data(json_data, request_data):
         query = json_data.get("query", Q())
         query_detail = json_data.get("query_detail", Q())
         mult = json_data.get("mult", 0)
+        clock = json_data.get("clock") or get_request_clock(db_name)
 
         if query.children or query_detail.children:
             request_data = validate_request_data(None, dict, request_data)
             updated, errors = _format_with_query(
-                db_name, model, query, request_data, mult, model_detail, query_detail
+                db_name,
+                model,
+                query,
+                request_data,
+                mult,
+                model_detail,
+                query_detail,
+                clock.text,
             )
 
         else:
             request_data = validate_request_data(None, list, request_data)
             updated, errors = _format_without_query(
-                db_name, model, request_data, mult, model_detail
+                db_name, model, request_data, mult, model_detail, clock.text
             )
 
+        if updated:
+            invalidate_read_cache(db_name, model)
+            invalidate_read_cache(db_name, model_detail)
+
         return updated, errors
 
     except Exception as e:
@@ -40,10 +53,9 @@ def update_data(json_data, request_data):
 
 
 def _format_with_query(
-    db_name, model, query, request_data, mult, model_detail, query_detail
+    db_name, model, query, request_data, mult, model_detail, query_detail, time_now
 ):
     update_field = get_update_date_field(model)
-    time_now = get_time_by_timezone(db_name)
 
     records = []
     detail_records = []
@@ -105,9 +117,8 @@ def _format_with_query(
     return updated, errors
 
 
-def _format_without_query(db_name, model, request_data, mult, model_detail):
+def _format_without_query(db_name, model, request_data, mult, model_detail, time_now):
     update_field = get_update_date_field(model)
-    time_now = get_time_by_timezone(db_name)
 
     records = []
     errors = []
@@ -120,7 +131,7 @@ def _format_without_query(db_name, model, request_data, mult, model_detail):
             detail = params.get("order_detail", [])
             if detail:
                 detail_record = _format_detail_query(
-                    db_name, model_detail, query, detail
+                    model_detail, query, detail, time_now
                 )
                 del params["order_detail"]
                 detail_records.extend(detail_record)
@@ -237,9 +248,8 @@ def _update_single_record(db_name, model, records):
     return updated, errors
 
 
-def _format_detail_query(db_name, model_detail, query, params):
+def _format_detail_query(model_detail, query, params, time_now):
     update_field = get_update_date_field(model_detail)
-    time_now = get_time_by_timezone(db_name)
 
     detail_records = []
     for p in params:
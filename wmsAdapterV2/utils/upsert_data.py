@@ -0,0 +1,243 @@
+from django.db import connections, transaction
+from django.db.models import F
+
+from wmsAdapterV2.utils.convert_field_to_string import convert_to_string
+from wmsAdapterV2.utils.validate_fields import get_update_date_field
+
+STAGE_CHUNK_SIZE = 1000
+
+
+def format_upsert_rows(model, request_data, validate_data, skipped_fields=()):
+    '''
+    Rows of an upsert keyed by the primary key of the model, with the
+    values converted to python. Invalid and repeated records are rejected.
+    @params:
+        model: model of the table
+        request_data: list of records of the request
+        validate_data: function returning the error of a record or None
+        skipped_fields: fields never taken from the request
+    @return:
+        rows: dict of key and row
+        errors: records rejected
+    '''
+    errors = []
+    rows = {}
+    pk = model._meta.pk.name
+    fields = {
+        field.name: field
+        for field in model._meta.concrete_fields
+        if field.name not in skipped_fields
+    }
+
+    for rd in request_data:
+        try:
+            key = convert_to_string(rd.get(pk))
+        except Exception:
+            key = ''
+
+        valid = validate_data(rd)
+        if valid:
+            errors.append(f'error: {key} {valid}')
+            continue
+
+        if key in rows:
+            errors.append(f'error: {key} record is duplicated in the request')
+            continue
+
+        try:
+            row = {
+                name: fields[name].to_python(value)
+                for name, value in rd.items()
+                if name in fields
+            }
+        except Exception as e:
+            errors.append(f'error: {key} ' + '; '.join(getattr(e, 'messages', [str(e)])))
+            continue
+
+        rows[key] = row
+
+    return rows, errors
+
+
+def upsert_data(db_name, model, rows, insert_values=None, insert_defaults=None, time_record=None):
+    '''
+    Merge rows into the table of a model by its primary key with a single
+    MERGE. The rows are staged in a temp table; a stored row is only updated
+    when a value changes, and the values missing from a row keep the stored
+    ones.
+    @params:
+        rows: dicts of field name and python value, one per key
+        insert_values: values of the inserted rows, over the ones of the
+            request; the updates take the request values
+        insert_defaults: values of the inserted rows that bring none, an F()
+            takes the value of another field of the row
+        time_record: last update date of the written rows, on the tables
+            that have one
+    @return:
+        counts: inserted, updated and unchanged rows
+    '''
+    counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+    if not rows:
+        return counts
+
+    update_field = get_update_date_field(model)
+
+    # Stage only the columns the rows bring
+    stage_fields = [
+        field for field in model._meta.concrete_fields
+        if field.name != update_field and any(field.name in row for row in rows)
+    ]
+    stage_table = f'#{model._meta.db_table.lower()}_upsert'
+
+    connection = connections[db_name]
+    with transaction.atomic(using=db_name):
+        with connection.cursor() as cursor:
+            create_stage_table(connection, cursor, stage_table, stage_fields)
+            stage_rows(connection, cursor, stage_table, stage_fields, rows)
+
+            cursor.execute(*_merge_sql(
+                connection, model, stage_table, stage_fields, update_field,
+                insert_values or {}, insert_defaults or {}, time_record,
+            ))
+            actions = dict(cursor.fetchall())
+            # Only on success, see create_stage_table
+            cursor.execute(f'DROP TABLE {stage_table}')
+
+    counts['inserted'] = actions.get('INSERT', 0)
+    counts['updated'] = actions.get('UPDATE', 0)
+    counts['unchanged'] = len(rows) - counts['inserted'] - counts['updated']
+    return counts
+
+
+def create_stage_table(connection, cursor, stage_table, stage_fields):
+    '''
+    Create the temp table of an upsert with the columns of stage_fields.
+
+    The table is only dropped after a successful MERGE: after an error the
+    transaction can be doomed and a DROP would raise over the original
+    error. A table left by a failed upsert on the same connection is
+    dropped here.
+    '''
+    qn = connection.ops.quote_name
+    # tempdb can have another collation than the tenant database
+    columns = ', '.join(
+        f'{qn(field.column)} {field.db_type(connection)}'
+        + (' COLLATE DATABASE_DEFAULT' if field.get_internal_type() == 'CharField' else '')
+        + ' NULL'
+        for field in stage_fields
+    )
+    cursor.execute(
+        f"IF OBJECT_ID('tempdb..{stage_table}') IS NOT NULL DROP TABLE {stage_table}; "
+        f'CREATE TABLE {stage_table} ({columns})'
+    )
+
+
+def stage_rows(connection, cursor, stage_table, stage_fields, rows):
+    '''
+    Insert the rows in the temp table of an upsert, in chunks of
+    STAGE_CHUNK_SIZE rows per round trip.
+    '''
+    qn = connection.ops.quote_name
+    columns = ', '.join(qn(field.column) for field in stage_fields)
+    placeholders = ', '.join(['%s'] * len(stage_fields))
+    sql = f'INSERT INTO {stage_table} ({columns}) VALUES ({placeholders})'
+
+    # pyodbc sends the whole parameter array in one round trip
+    try:
+        cursor.cursor.cursor.fast_executemany = True
+    except AttributeError:
+        pass
+
+    values = [
+        [field.get_db_prep_save(row.get(field.name), connection) for field in stage_fields]
+        for row in rows
+    ]
+    for i in range(0, len(values), STAGE_CHUNK_SIZE):
+        cursor.executemany(sql, values[i : i + STAGE_CHUNK_SIZE])
+
+
+def insert_value(field, source, staged):
+    '''
+    Value of a column in the INSERT of a MERGE. Not null text columns get
+    the same empty default as the ORM inserts.
+    '''
+    if field.null or field.get_internal_type() != 'CharField':
+        return source
+    if not staged:
+        return "''"
+    return f"COALESCE({source}, '')"
+
+
+def _merge_sql(connection, model, stage_table, stage_fields, update_field,
+               insert_values, insert_defaults, time_record):
+    qn = connection.ops.quote_name
+    table = qn(model._meta.db_table)
+    pk = model._meta.pk
+    stage_names = {field.name for field in stage_fields}
+    params = []
+
+    def prep(field, value):
+        return field.get_db_prep_save(field.to_python(value), connection)
+
+    sql = f'''
+        SET NOCOUNT ON;
+        DECLARE @actions TABLE (action NVARCHAR(10));
+        MERGE {table} WITH (HOLDLOCK) AS t
+        USING {stage_table} AS s
+        ON t.{qn(pk.column)} = s.{qn(pk.column)}
+    '''
+
+    # Only rows with a changed value are updated, missing values keep the stored ones
+    values = [f for f in stage_fields if not f.primary_key]
+    if values:
+        source = ', '.join(f'COALESCE(s.{qn(f.column)}, t.{qn(f.column)})' for f in values)
+        target = ', '.join(f't.{qn(f.column)}' for f in values)
+        update = ', '.join(f'{qn(f.column)} = COALESCE(s.{qn(f.column)}, t.{qn(f.column)})' for f in values)
+        if update_field and time_record is not None:
+            field = model._meta.get_field(update_field)
+            update += f', {qn(field.column)} = %s'
+            params.append(prep(field, time_record))
+        sql += f'''
+        WHEN MATCHED AND EXISTS (SELECT {source} EXCEPT SELECT {target}) THEN
+            UPDATE SET {update}
+        '''
+
+    insert_columns = []
+    insert_sql = []
+    for field in model._meta.concrete_fields:
+        staged = field.name in stage_names
+        source = f's.{qn(field.column)}'
+
+        if field.name in insert_values:
+            value = '%s'
+            params.append(prep(field, insert_values[field.name]))
+        elif field.name == update_field and time_record is not None:
+            value = '%s'
+            params.append(prep(field, time_record))
+        elif field.name in insert_defaults:
+            default = insert_defaults[field.name]
+            if isinstance(default, F):
+                value = f's.{qn(model._meta.get_field(default.name).column)}'
+            else:
+                value = '%s'
+                params.append(prep(field, default))
+            if staged:
+                value = f'COALESCE({source}, {value})'
+        elif staged or (not field.null and field.get_internal_type() == 'CharField'):
+            value = insert_value(field, source, staged)
+        else:
+            continue
+
+        insert_columns.append(qn(field.column))
+        insert_sql.append(value)
+
+    sql += f'''
+        WHEN NOT MATCHED BY TARGET THEN
+            INSERT ({', '.join(insert_columns)})
+            VALUES ({', '.join(insert_sql)})
+        OUTPUT $action INTO @actions;
+
+        SELECT action, COUNT(*) FROM @actions GROUP BY action;
+    '''
+
+    return sql, params
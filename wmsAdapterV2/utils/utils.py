@@ -1,7 +1,11 @@
-from django.db import connections
+import logging
 import re
+
+from django.db import connections
 # from BackendApp.producer import PublishAMQP
 
+logger = logging.getLogger(__name__)
+
 
 def convert_array_records_to_array_json(array=[], descriptions=()) -> list:
     if len(array) == 0:
@@ -17,8 +21,7 @@ def convert_array_records_to_array_json(array=[], descriptions=()) -> list:
 
 def exec_query(query='', params=(), database="default"):
     cursor = connections[database].cursor()
-    print(query)
-    print(params)
+    logger.debug(f"Query: {query} {params}")
     try:
         cursor.execute(query, params)
         response = cursor.fetchall()
@@ -1,4 +1,5 @@
 import json
+from project.request_timing import measure
 
 
 def validate_request_data(request, type_data, request_data=None):
@@ -6,7 +7,8 @@ def validate_request_data(request, type_data, request_data=None):
         if not isinstance(request_data, list) and type_data == list:
             request_data = [request_data]
     elif request.body:
-        request_data = json.loads(request.body)
+        with measure("json"):
+            request_data = json.loads(request.body)
     else:
         raise ValueError('No data to create')
     
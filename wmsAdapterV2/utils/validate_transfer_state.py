@@ -1,22 +1,167 @@
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Count, Q
 
 from wmsAdapterV2.utils.format_json_from_query import format_response_from_query_dict
 from wmsAdapterV2.utils.validate_fields import get_transfer_state_field
 
-def validate_transfer_state(db_name, model, query):
+# Parameters of an aggregated statement, SQL Server allows 2100
+GUARD_MAX_PARAMS = 2000
+
+TRANSFER_STATE_ERROR = 'Record cannot be deleted, it has already been executed to forward to erp.'
+
+
+def get_transfer_state_query(model):
     transfer_field = get_transfer_state_field(model)
 
     if transfer_field:
-        query &= Q(**{f'{transfer_field}__gte': 3})
+        return Q(**{f'{transfer_field}__gte': 3})
 
-        results = list(model.objects.using(db_name).filter(query))
+    return None
+
+
+def validate_transfer_state(db_name, model, query):
+    transfer_query = get_transfer_state_query(model)
+
+    if transfer_query is not None:
+        if model.objects.using(db_name).filter(query & transfer_query).exists():
+            return 1
 
-        if len(results) > 0:
-            return len(results)
-        
     return 0
 
 
+def count_records(db_name, model, records, query=Q()):
+    '''
+    Count the rows of the model matching each record query (and the extra
+    query) with one aggregated query per chunk of records.
+
+    @params:
+        records: list of Q, one per record
+    @return:
+        counts: list of counts in the order of records
+        errors: dict record index -> error of its query
+    '''
+    counts = [0] * len(records)
+    errors = {}
+    queryset = model.objects.using(db_name).filter(query)
+
+    # Queries that can not be built for the model fail on their own
+    valid = []
+    for index, r in enumerate(records):
+        try:
+            queryset.filter(r)
+            valid.append(index)
+        except Exception as e:
+            errors[index] = str(e)
+
+    for chunk in _chunk_by_params(records, valid, _count_params(query)):
+        candidates = Q()
+        for index in chunk:
+            candidates |= records[index]
+
+        # Savepoints, the callers run inside the transaction of the delete
+        try:
+            with transaction.atomic(using=db_name):
+                result = queryset.filter(candidates).aggregate(
+                    **{f'r{index}': Count('pk', filter=records[index]) for index in chunk}
+                )
+            for index in chunk:
+                counts[index] = result[f'r{index}'] or 0
+
+        except Exception:
+            for index in chunk:
+                try:
+                    with transaction.atomic(using=db_name):
+                        counts[index] = queryset.filter(records[index]).count()
+                except Exception as e:
+                    errors[index] = str(e)
+
+    return counts, errors
+
+
+def _count_params(query):
+    '''
+    Parameters a Q binds, a list value binds one per item.
+    '''
+    params = 0
+    for child in query.children:
+        if isinstance(child, Q):
+            params += _count_params(child)
+        else:
+            value = child[1]
+            params += len(value) if isinstance(value, (list, tuple, set)) else 1
+    return params
+
+
+def _chunk_by_params(records, indexes, base_params):
+    '''
+    Chunks of record indexes whose aggregated statement stays under
+    GUARD_MAX_PARAMS. Every record query is bound twice: in the OR filter
+    and in its Count filter.
+    '''
+    chunk = []
+    params = base_params
+    for index in indexes:
+        record_params = 2 * _count_params(records[index])
+        if chunk and params + record_params > GUARD_MAX_PARAMS:
+            yield chunk
+            chunk = []
+            params = base_params
+        chunk.append(index)
+        params += record_params
+
+    if chunk:
+        yield chunk
+
+
+def get_blocked_records(db_name, model, records, model_detail=None, detail_records=None):
+    '''
+    Records that can not be deleted because the model rows, or the detail
+    rows, were already transferred to the ERP.
+
+    @params:
+        records: list of Q on the model
+        detail_records: list of lists of Q on model_detail, one list per
+            record. By default the record query itself is used on the detail
+    @return:
+        dict record index -> error
+    '''
+    blocked = {}
+
+    transfer_query = get_transfer_state_query(model)
+    if transfer_query is not None:
+        counts, errors = count_records(db_name, model, records, transfer_query)
+        blocked.update(errors)
+        for index, count in enumerate(counts):
+            if count > 0:
+                blocked.setdefault(index, TRANSFER_STATE_ERROR)
+
+    if model_detail is None:
+        return blocked
+
+    transfer_query = get_transfer_state_query(model_detail)
+    if transfer_query is None:
+        return blocked
+
+    if detail_records is None:
+        detail_records = [[r] for r in records]
+
+    owners = []
+    flat_records = []
+    for index, queries in enumerate(detail_records):
+        for q in queries:
+            owners.append(index)
+            flat_records.append(q)
+
+    counts, errors = count_records(db_name, model_detail, flat_records, transfer_query)
+    for flat_index, index in enumerate(owners):
+        if flat_index in errors:
+            blocked.setdefault(index, errors[flat_index])
+        elif counts[flat_index] > 0:
+            blocked.setdefault(index, TRANSFER_STATE_ERROR)
+
+    return blocked
+
+
 def validate_records_with_transfer_state(db_name, model, query, model_detail, query_detail, detail_records, flag_delete_order):
     if flag_delete_order:
         tranfers_model = validate_transfer_state(db_name, model, query)
@@ -26,7 +171,7 @@ def validate_records_with_transfer_state(db_name, model, query, model_detail, qu
             tranfers_detail_model = validate_transfer_state(db_name, model_detail, query)
         
         if tranfers_model > 0 or tranfers_detail_model > 0:
-            raise ValueError('Record cannot be deleted, it has already been executed to forward to erp.')
+            raise ValueError(TRANSFER_STATE_ERROR)
                 
     elif detail_records:
         tranfers_model = validate_transfer_state(db_name, model, query)
@@ -35,7 +180,7 @@ def validate_records_with_transfer_state(db_name, model, query, model_detail, qu
             for det in detail_records:
                 tranfers_detail_model = validate_transfer_state(db_name, model_detail, det)
                 if tranfers_model > 0 or tranfers_detail_model > 0:
-                    raise ValueError('Record cannot be deleted, it has already been executed to forward to erp.')
+                    raise ValueError(TRANSFER_STATE_ERROR)
 
     elif query_detail.children:
         tranfers_model = validate_transfer_state(db_name, model, query)
@@ -45,32 +190,28 @@ def validate_records_with_transfer_state(db_name, model, query, model_detail, qu
             tranfers_detail_model = validate_transfer_state(db_name, model_detail, query_detail)
         
         if tranfers_model > 0 or tranfers_detail_model > 0:
-            raise ValueError('Record cannot be deleted, it has already been executed to forward to erp.')
+            raise ValueError(TRANSFER_STATE_ERROR)
         
         
 def validate_delete_model(db_name, model, model_detail, records):
     aux_records = []
     errors = []
-    for r in records:
-        try:
-            validate_records_with_transfer_state(db_name, model, r, model_detail, Q(), [], True)
 
-            count = 0
-            if model_detail:
-                count = len(list(model_detail.objects.using(db_name).filter(r).values()))
+    blocked = get_blocked_records(db_name, model, records, model_detail)
 
-            if count > 0:
-                query_dict = dict(r.children)
-                query_json = format_response_from_query_dict(query_dict)
-                query_json['error'] = 'Cannot be deleted, there are still associated order details'
-                errors.append(query_json)  
-            else:
-                aux_records.append(r)
+    detail_counts = [0] * len(records)
+    if model_detail:
+        detail_counts, detail_errors = count_records(db_name, model_detail, records)
+        for index, error in detail_errors.items():
+            blocked.setdefault(index, error)
 
-        except Exception as e:
+    for index, r in enumerate(records):
+        if index in blocked or detail_counts[index] > 0:
             query_dict = dict(r.children)
             query_json = format_response_from_query_dict(query_dict)
-            query_json['error'] = str(e)
-            errors.append(query_json)  
+            query_json['error'] = blocked.get(index, 'Cannot be deleted, there are still associated order details')
+            errors.append(query_json)
+        else:
+            aux_records.append(r)
 
     return aux_records, errors
@@ -1,6 +1,7 @@
 """Dependencies"""
 
 import json
+import logging
 from django.http.response import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 
@@ -10,10 +11,22 @@ from wmsAdapterV2.functions.Customer.bulk_customer import create_list_customers
 from wmsAdapterV2.functions.Customer.read import read_clt
 from wmsAdapterV2.functions.Customer.create import create_clt
 from wmsAdapterV2.functions.Customer.update import update_clt
-from wmsAdapterV2.utils.create_response import created_response
+from wmsAdapterV2.functions.Customer.upsert import upsert_customers
+from wmsAdapterV2.utils.create_response import (
+    created_response,
+    paginated_response,
+    upserted_response,
+)
+from wmsAdapterV2.utils.get_upsert_mode import get_upsert_mode
+from project.log_pipeline import log_payload
+from project.request_timing import measure
+from wmsAdapterV2.utils.idempotency import idempotent
+
+logger = logging.getLogger(__name__)
 
 
 @csrf_exempt
+@idempotent
 def clt(request):
     """
     This view is used to create, read, update and delete articles
@@ -32,10 +45,10 @@ def clt(request):
 
         try:
             # Get articles
-            response, _ = read_clt(request, db_name=db_name)
+            response, _, next_cursor = read_clt(request, db_name=db_name)
 
             # Check the response
-            return JsonResponse(response, safe=False, status=200)
+            return paginated_response(response, next_cursor)
 
         # If there is an error
         except Exception as e:
@@ -47,11 +60,11 @@ def clt(request):
 
             try:
                 # Check the request data
-                request_data = json.loads(request.body)
-                print(len(request_data))
-                print(request_data)
+                with measure("json"):
+                    request_data = json.loads(request.body)
+                log_payload(logger, request, len(request_data))
             except Exception as e:
-                print(str(e))
+                logger.warning(f"Error loading the body: {e}")
                 return JsonResponse(
                     {"error": "Error loading the body. Please check and try again"},
                     safe=False,
@@ -65,6 +78,15 @@ def clt(request):
             # Check if the request data is a list
             if isinstance(request_data, list):
                 try:
+                    upsert, _, _ = get_upsert_mode(dict(request.GET))
+
+                    # Create or update the whole list with a single merge
+                    if upsert:
+                        counts, errors = upsert_customers(
+                            request, db_name=db_name, request_data=request_data
+                        )
+                        return upserted_response(counts, errors)
+
                     # Create the article
                     created, errors = create_list_customers(
                         None, db_name=db_name, request_data=request_data
@@ -93,8 +115,7 @@ def clt(request):
                     errors.append({"index": "0", "error": str(e)})
 
                 # Return the response
-                print(created)
-                print(errors)
+                logger.info("Records created", extra={"rows": len(created), "errors": len(errors)})
                 return created_response(created, errors, "create")
 
             # If the request data is not a list or a dict
@@ -107,7 +128,7 @@ def clt(request):
 
         # If there is an error
         except Exception as e:
-            print(str(e))
+            logger.exception("Error creating the records")
             return JsonResponse({"error": str(e)}, safe=False, status=500)
 
     # Update an article
@@ -115,9 +136,10 @@ def clt(request):
 
         try:
             # Check the request data
-            request_data = json.loads(request.body)
+            with measure("json"):
+                request_data = json.loads(request.body)
         except Exception as e:
-            print(e)
+            logger.warning(f"Error loading the body: {e}")
             return JsonResponse(
                 {"error": "Error loading the body. Please check and try again"},
                 safe=False,
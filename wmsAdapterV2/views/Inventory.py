@@ -1,6 +1,7 @@
 """Dependencies"""
 
 import json
+import logging
 from django.http.response import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 
@@ -9,10 +10,22 @@ from django.views.decorators.csrf import csrf_exempt
 from wmsAdapterV2.functions.Inventory.bulk import create_list_inventory
 from wmsAdapterV2.functions.Inventory.read import read_inventory
 from wmsAdapterV2.functions.Inventory.update import update_inventory
-from wmsAdapterV2.utils.create_response import created_response
+from wmsAdapterV2.functions.Inventory.upsert import upsert_inventory
+from wmsAdapterV2.utils.create_response import (
+    created_response,
+    paginated_response,
+    upserted_response,
+)
+from wmsAdapterV2.utils.get_upsert_mode import get_upsert_mode
+from project.log_pipeline import log_payload
+from project.request_timing import measure
+from wmsAdapterV2.utils.idempotency import idempotent
+
+logger = logging.getLogger(__name__)
 
 
 @csrf_exempt
+@idempotent
 def inventory(request):
     """
     This view is used to create, read, update and delete articles
@@ -31,10 +44,10 @@ def inventory(request):
 
         try:
             # Get articles
-            response, _ = read_inventory(request, db_name=db_name)
+            response, _, next_cursor = read_inventory(request, db_name=db_name)
 
             # Check the response
-            return JsonResponse(response, safe=False, status=200)
+            return paginated_response(response, next_cursor, request)
 
         # If there is an error
         except Exception as e:
@@ -44,11 +57,11 @@ def inventory(request):
     if request.method == "POST":
         try:
             # Check the request data
-            request_data = json.loads(request.body)
-            print(len(request_data))
-            print(request_data)
+            with measure("json"):
+                request_data = json.loads(request.body)
+            log_payload(logger, request, len(request_data))
         except Exception as e:
-            print(str(e))
+            logger.warning(f"Error loading the body: {e}")
             return JsonResponse(
                 {"error": "Error loading the body. Please check and try again"},
                 safe=False,
@@ -61,26 +74,38 @@ def inventory(request):
 
         # Check if the request data is a list
         try:
+            upsert, zero_missing, _ = get_upsert_mode(dict(request.GET))
+
+            # Apply the whole snapshot with a single merge
+            if upsert:
+                counts, errors = upsert_inventory(
+                    request,
+                    db_name=db_name,
+                    request_data=request_data,
+                    zero_missing=zero_missing,
+                )
+                return upserted_response(counts, errors)
+
             # Create the article
             created, errors = create_list_inventory(
                 None, db_name=db_name, request_data=request_data
             )
-            print(created)
-            print(errors)
+            logger.info("Records created", extra={"rows": len(created), "errors": len(errors)})
             # Return the response
             return created_response(created, errors, "create")
 
         # If there is an error
         except Exception as e:
-            print(str(e))
+            logger.exception("Error creating the records")
             return JsonResponse({"error": str(e)}, safe=False, status=500)
 
     if request.method == "PUT":
         try:
             # Check the request data
-            request_data = json.loads(request.body)
+            with measure("json"):
+                request_data = json.loads(request.body)
         except Exception as e:
-            print(str(e))
+            logger.warning(f"Error loading the body: {e}")
             return JsonResponse(
                 {"error": "Error loading the body. Please check and try again"},
                 safe=False,
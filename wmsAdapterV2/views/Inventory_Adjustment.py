@@ -1,6 +1,7 @@
 """Dependencies"""
 
 import json
+import logging
 from django.http.response import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 
@@ -10,7 +11,11 @@ from wmsAdapterV2.functions.InventoryAdjustment.read import read_inventory_adjus
 from wmsAdapterV2.functions.InventoryAdjustment.update import (
     update_inventory_adjustment,
 )
-from wmsAdapterV2.utils.create_response import created_response
+from wmsAdapterV2.utils.create_response import created_response, paginated_response
+from project.request_timing import measure
+
+
+logger = logging.getLogger(__name__)
 
 
 @csrf_exempt
@@ -25,10 +30,10 @@ def inventory_adjustment(request):
     if request.method == "GET":
         try:
             # Get articles
-            response, _ = read_inventory_adjustment(request, db_name=db_name)
+            response, _, next_cursor = read_inventory_adjustment(request, db_name=db_name)
 
             # Check the response
-            return JsonResponse(response, safe=False, status=200)
+            return paginated_response(response, next_cursor)
 
         # If there is an error
         except Exception as e:
@@ -39,9 +44,10 @@ def inventory_adjustment(request):
 
         try:
             # Check the request data
-            request_data = json.loads(request.body)
+            with measure("json"):
+                request_data = json.loads(request.body)
         except Exception as e:
-            print(e)
+            logger.warning(f"Error loading the body: {e}")
             return JsonResponse(
                 {"error": "Error loading the body. Please check and try again"},
                 safe=False,
@@ -10,10 +10,13 @@ from wmsAdapterV2.functions.Product.bulk_articles import create_list_articles
 from wmsAdapterV2.functions.Product.read import read_articles
 from wmsAdapterV2.functions.Product.update import update_articles
 from wmsAdapterV2.functions.Product.delete import delete_articles
-from wmsAdapterV2.utils.create_response import created_response
+from wmsAdapterV2.utils.create_response import created_response, paginated_response
+from project.request_timing import measure
+from wmsAdapterV2.utils.idempotency import idempotent
 
 
 @csrf_exempt
+@idempotent
 def art(request):
     """
     This view is used to create, read, update and delete articles
@@ -32,10 +35,10 @@ def art(request):
 
         try:
             # Get articles
-            response, _ = read_articles(request, db_name=db_name)
+            response, _, next_cursor = read_articles(request, db_name=db_name)
 
             # Check the response
-            return JsonResponse(response, safe=False, status=200)
+            return paginated_response(response, next_cursor)
 
         # If there is an error
         except Exception as e:
@@ -45,7 +48,8 @@ def art(request):
     if request.method == "POST":
         try:
             # Check the request data
-            request_data = json.loads(request.body)
+            with measure("json"):
+                request_data = json.loads(request.body)
         except Exception as e:
             return JsonResponse(
                 {"error": "Error loading the body. Please check and try again"},
@@ -74,7 +78,8 @@ def art(request):
 
         try:
             # Check the request data
-            request_data = json.loads(request.body)
+            with measure("json"):
+                request_data = json.loads(request.body)
         except Exception as e:
             return JsonResponse(
                 {"error": "Error loading the body. Please check and try again"},
@@ -108,7 +113,8 @@ def art(request):
 
             try:
                 # Check the request data
-                request_data = json.loads(request.body)
+                with measure("json"):
+                    request_data = json.loads(request.body)
             except Exception as e:
                 request_data = {}
 
@@ -1,6 +1,7 @@
 """Dependencies"""
 
 import json
+import logging
 from django.http.response import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 
@@ -9,10 +10,16 @@ from django.views.decorators.csrf import csrf_exempt
 from wmsAdapterV2.functions.PurchaseOrder.bulk_create import create_list_purchase_order
 from wmsAdapterV2.functions.PurchaseOrder.read import read_purchase_orders
 from wmsAdapterV2.functions.PurchaseOrder.update import update_purchase_order
-from wmsAdapterV2.utils.create_response import created_response, created_response_orders
+from wmsAdapterV2.utils.create_response import created_response, created_response_orders, paginated_response
+from project.log_pipeline import log_payload
+from project.request_timing import measure
+from wmsAdapterV2.utils.idempotency import idempotent
+
+logger = logging.getLogger(__name__)
 
 
 @csrf_exempt
+@idempotent
 def purchase_order(request):
     """
     This view is used to create, read, update and delete purchase_orders
@@ -31,10 +38,10 @@ def purchase_order(request):
 
         try:
             # Get articles
-            response, _, _ = read_purchase_orders(request, db_name=db_name)
+            response, _, _, next_cursor = read_purchase_orders(request, db_name=db_name)
 
             # Check the response
-            return JsonResponse(response, safe=False, status=200)
+            return paginated_response(response, next_cursor, request)
 
         # If there is an error
         except Exception as e:
@@ -44,11 +51,11 @@ def purchase_order(request):
     if request.method == "POST":
         try:
             # Check the request data
-            request_data = json.loads(request.body)
-            print(len(request_data))
-            print(request_data)
+            with measure("json"):
+                request_data = json.loads(request.body)
+            log_payload(logger, request, len(request_data))
         except Exception as e:
-            print(str(e))
+            logger.warning(f"Error loading the body: {e}")
             return JsonResponse(
                 {"error": "Error loading the body. Please check and try again"},
                 safe=False,
@@ -64,12 +71,14 @@ def purchase_order(request):
             created, created_detail, errors = create_list_purchase_order(
                 None, db_name=db_name, request_data=request_data
             )
-            print(created)
-            print(errors)
+            logger.info(
+                "Records created",
+                extra={"rows": len(created) + len(created_detail), "errors": len(errors)},
+            )
             return created_response_orders(created, created_detail, errors)
         # If there is an error
         except Exception as e:
-            print(str(e))
+            logger.exception("Error creating the records")
             return JsonResponse({"error": str(e)}, safe=False, status=500)
 
     # Update an article
@@ -77,9 +86,10 @@ def purchase_order(request):
 
         try:
             # Check the request data
-            request_data = json.loads(request.body)
+            with measure("json"):
+                request_data = json.loads(request.body)
         except Exception as e:
-            print(e)
+            logger.warning(f"Error loading the body: {e}")
             return JsonResponse(
                 {"error": "Error loading the body. Please check and try again"},
                 safe=False,
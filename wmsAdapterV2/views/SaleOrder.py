@@ -1,6 +1,7 @@
 """Dependencies"""
 
 import json
+import logging
 from django.http.response import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 
@@ -11,10 +12,16 @@ from wmsAdapterV2.functions.SaleOrder.bulk_create_v2 import (
 from wmsAdapterV2.functions.SaleOrder.delete import delete_sale_order
 from wmsAdapterV2.functions.SaleOrder.read import read_sale_orders
 from wmsAdapterV2.functions.SaleOrder.update import update_sale_order
-from wmsAdapterV2.utils.create_response import created_response, created_response_orders
+from wmsAdapterV2.utils.create_response import created_response, created_response_orders, paginated_response
+from project.log_pipeline import log_payload
+from project.request_timing import measure
+from wmsAdapterV2.utils.idempotency import idempotent
+
+logger = logging.getLogger(__name__)
 
 
 @csrf_exempt
+@idempotent
 def sale_order(request):
     """
     This view is used to create, read, update and delete articles
@@ -33,10 +40,10 @@ def sale_order(request):
 
         try:
             # Get articles
-            response, _, _ = read_sale_orders(request, db_name=db_name)
+            response, _, _, next_cursor = read_sale_orders(request, db_name=db_name)
 
             # Check the response
-            return JsonResponse(response, safe=False, status=200)
+            return paginated_response(response, next_cursor, request)
 
         # If there is an error
         except Exception as e:
@@ -46,10 +53,9 @@ def sale_order(request):
     if request.method == "POST":
         try:
             # Check the request data
-            request_data = json.loads(request.body)
-            # Solo mostrar información básica de la request
-            if db_name == "couca01_test":
-                print(f"Request for {db_name}: {len(request_data)} items")
+            with measure("json"):
+                request_data = json.loads(request.body)
+            log_payload(logger, request, len(request_data))
 
         except Exception as e:
             return JsonResponse(
@@ -70,9 +76,10 @@ def sale_order(request):
                 )
             )
 
-            # Solo mostrar información básica para seguimiento funcional
-            if db_name == "couca01_test":
-                print(f"Created orders for {db_name}: {len(created)} EPK, {len(created_detail)} DPK")
+            logger.info(
+                "Records created",
+                extra={"rows": len(created) + len(created_detail), "errors": len(error)},
+            )
 
             return created_response_orders(created, created_detail, error)
         # If there is an error
@@ -84,7 +91,8 @@ def sale_order(request):
 
         try:
             # Check the request data
-            request_data = json.loads(request.body)
+            with measure("json"):
+                request_data = json.loads(request.body)
         except Exception as e:
             return JsonResponse(
                 {"error": "Error loading the body. Please check and try again"},
@@ -115,7 +123,8 @@ def sale_order(request):
 
         try:
             # Check the request data
-            request_data = json.loads(request.body)
+            with measure("json"):
+                request_data = json.loads(request.body)
         except Exception as e:
             request_data = {}
 
@@ -9,10 +9,19 @@ from wmsAdapterV2.functions.Supplier.bulk_supplier import create_list_suppliers
 from wmsAdapterV2.functions.Supplier.create import create_prv
 from wmsAdapterV2.functions.Supplier.read import read_prv
 from wmsAdapterV2.functions.Supplier.update import update_prv
-from wmsAdapterV2.utils.create_response import created_response
+from wmsAdapterV2.functions.Supplier.upsert import upsert_suppliers
+from wmsAdapterV2.utils.create_response import (
+    created_response,
+    paginated_response,
+    upserted_response,
+)
+from wmsAdapterV2.utils.get_upsert_mode import get_upsert_mode
+from project.request_timing import measure
+from wmsAdapterV2.utils.idempotency import idempotent
 
 
 @csrf_exempt
+@idempotent
 def prv(request):
     """
     This view is used to create, read, update and delete articles
@@ -31,10 +40,10 @@ def prv(request):
 
         try:
             # Get articles
-            response, _ = read_prv(request, db_name=db_name)
+            response, _, next_cursor = read_prv(request, db_name=db_name)
 
             # Check the response
-            return JsonResponse(response, safe=False, status=200)
+            return paginated_response(response, next_cursor)
 
         # If there is an error
         except Exception as e:
@@ -46,7 +55,8 @@ def prv(request):
 
             try:
                 # Check the request data
-                request_data = json.loads(request.body)
+                with measure("json"):
+                    request_data = json.loads(request.body)
             except Exception as e:
                 return JsonResponse(
                     {"error": "Error loading the body. Please check and try again"},
@@ -61,6 +71,15 @@ def prv(request):
             # Check if the request data is a list
             if isinstance(request_data, list):
                 try:
+                    upsert, _, _ = get_upsert_mode(dict(request.GET))
+
+                    # Create or update the whole list with a single merge
+                    if upsert:
+                        counts, errors = upsert_suppliers(
+                            request, db_name=db_name, request_data=request_data
+                        )
+                        return upserted_response(counts, errors)
+
                     # Create the article
                     created, errors = create_list_suppliers(
                         None, db_name=db_name, request_data=request_data
@@ -108,7 +127,8 @@ def prv(request):
 
         try:
             # Check the request data
-            request_data = json.loads(request.body)
+            with measure("json"):
+                request_data = json.loads(request.body)
         except Exception as e:
             return JsonResponse(
                 {"error": "Error loading the body. Please check and try again"},
@@ -3,10 +3,12 @@ from django.db.models import Q
 from datetime import datetime, timedelta
 
 """ Models and functions """
+from wmsAdapterV2.utils.get_cursor import get_cursor
 from wmsAdapterV2.utils.get_data import exec_query_orm
 from wmsAdapterV2.utils.get_limit import get_limit
 from wmsAdapterV2.utils.filter_by_field import filter_by_field
 from wmsAdapterV2.utils.get_date_range import get_date_range
+from wmsAdapterV2.utils.get_export_format import get_export_format
 from wmsAdapterV2.utils.get_fields_filter import get_fields_filter
 from wmsAdapterV2.utils.get_sort import get_sort
 from wmsAdapterV2.utils.validate_fields import validate_fields
@@ -20,7 +22,9 @@ def read_t_relacion_codbarras(request, db_name):
     params = dict(request.GET)
 
     try:
-        default_limit, params = get_limit(params)
+        export, params = get_export_format(params)
+        default_limit, params = get_limit(params, export)
+        cursor, params = get_cursor(params)
         fields, params = get_fields_filter(params)
         sort, params = get_sort(TRelacionCodbarras, params)
         fields = validate_fields(fields, TRelacionCodbarras)
@@ -38,12 +42,14 @@ def read_t_relacion_codbarras(request, db_name):
                 'query': query, 
                 'fields': fields,
                 'default_limit': default_limit, 
+                'cursor': cursor,
+                'stream': export,
                 'sort': sort,
             }
             
-        barcodes, query, _ = exec_query_orm(json_query_orm)
+        barcodes, query, _, next_cursor = exec_query_orm(json_query_orm)
             
-        return barcodes, query
+        return barcodes, query, next_cursor
 
     # If there is an error
     except Exception as e:
@@ -1,6 +1,7 @@
 from django.utils import timezone
 
 from wmsAdapterV2.utils.convert_field_to_string import convert_to_string
+from wmsAdapterV2.utils.read_cache import invalidate_read_cache
 from wmsAdapterV2.utils.validate_request_data import validate_request_data
 from wmsBase.models.TDetalleRefenciaCv import TDetalleRefenciaCv
 
@@ -105,4 +106,7 @@ def create_logistic_variables(db_name, valid_logistic_variables, errors):
                 except Exception as e:
                     errors.append(f'error: {str(r.bodega)} {str(r.productoean)} - {str(e)}')
 
+    if created_logistic_variables:
+        invalidate_read_cache(db_name, TDetalleRefenciaCv)
+
     return created_logistic_variables, errors
\ No newline at end of file
@@ -2,13 +2,15 @@
 from django.db.models import Q
 
 """ Models and functions """
-from wmsAdapterV2.utils.get_data import exec_query_orm
+from wmsAdapterV2.utils.get_cursor import get_cursor
 from wmsAdapterV2.utils.get_limit import get_limit
 from wmsAdapterV2.utils.filter_by_field import filter_by_field
 from wmsAdapterV2.utils.get_fields_filter import get_fields_filter
 from wmsAdapterV2.utils.get_sort import get_sort
+from wmsAdapterV2.utils.read_cache import cached_query_orm
 from wmsAdapterV2.utils.validate_fields import validate_fields
 from wmsAdapterV2.utils.get_date_range import get_date_range
+from wmsAdapterV2.utils.get_export_format import get_export_format
 from wmsBase.models.TDetalleRefenciaCv import TDetalleRefenciaCv
 
 
@@ -20,7 +22,9 @@ def read_logistic_variables(request, db_name):
     params = dict(request.GET)
 
     try:
-        default_limit, params = get_limit(params)
+        export, params = get_export_format(params)
+        default_limit, params = get_limit(params, export)
+        cursor, params = get_cursor(params)
         fields, params = get_fields_filter(params)
         sort, params = get_sort(TDetalleRefenciaCv, params)
         fields = validate_fields(fields, TDetalleRefenciaCv)
@@ -38,12 +42,14 @@ def read_logistic_variables(request, db_name):
                 'query': query, 
                 'fields': fields,
                 'default_limit': default_limit, 
+                'cursor': cursor,
+                'stream': export,
                 'sort': sort,
             }
             
-        barcodes, query, _ = exec_query_orm(json_query_orm)
+        barcodes, query, _, next_cursor = cached_query_orm(json_query_orm)
             
-        return barcodes, query
+        return barcodes, query, next_cursor
 
     # If there is an error
     except Exception as e:
@@ -1,11 +1,13 @@
 """ Dependencies """
 from django.db.models import Q
 
-from wmsAdapterV2.utils.get_data import exec_query_orm
+from wmsAdapterV2.utils.get_cursor import get_cursor
+from wmsAdapterV2.utils.get_export_format import get_export_format
 from wmsAdapterV2.utils.get_limit import get_limit
 from wmsAdapterV2.utils.filter_by_field import filter_by_field
 from wmsAdapterV2.utils.get_fields_filter import get_fields_filter
 from wmsAdapterV2.utils.get_sort import get_sort
+from wmsAdapterV2.utils.read_cache import cached_query_orm
 from wmsAdapterV2.utils.validate_fields import validate_fields
 from wmsBase.models.TInsBodega import TInsBodega
 
@@ -17,7 +19,9 @@ def read_cellars(request, db_name):
     params = dict(request.GET)
 
     try:
-        default_limit, params = get_limit(params)
+        export, params = get_export_format(params)
+        default_limit, params = get_limit(params, export)
+        cursor, params = get_cursor(params)
         fields, params = get_fields_filter(params)
         sort, params = get_sort(TInsBodega, params)
         fields = validate_fields(fields, TInsBodega)
@@ -33,12 +37,14 @@ def read_cellars(request, db_name):
             'query': query, 
             'fields': fields,
             'default_limit': default_limit, 
+            'cursor': cursor,
+            'stream': export,
             'sort': sort,
         }
         
-        articles, query, _ = exec_query_orm(json_query_orm)
+        articles, query, _, next_cursor = cached_query_orm(json_query_orm)
         
-        return articles, query
+        return articles, query, next_cursor
 
     # If there is an error
     except Exception as e:
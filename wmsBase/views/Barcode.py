@@ -1,15 +1,17 @@
 import json
 from django.views.decorators.csrf import csrf_exempt
 from django.http.response import JsonResponse
-from wmsAdapterV2.utils.create_response import created_response
+from wmsAdapterV2.utils.create_response import created_response, paginated_response
 from wmsBase.functions.Barcode.bulk_create import create_list_cod_barras
 from wmsBase.functions.Barcode.create import create_t_relacion_codbarras
 from wmsBase.functions.Barcode.read import read_t_relacion_codbarras
 from wmsBase.functions.Barcode.update import update_barcode
+from wmsAdapterV2.utils.idempotency import idempotent
 
 
 
 @csrf_exempt
+@idempotent
 def t_relacion_codbarras(request):
     '''
     This view is used to create, read, update and delete articles
@@ -28,10 +30,10 @@ def t_relacion_codbarras(request):
 
         try:
             # Get articles
-            response, _ = read_t_relacion_codbarras(request, db_name=db_name)
+            response, _, next_cursor = read_t_relacion_codbarras(request, db_name=db_name)
 
             # Check the response
-            return JsonResponse(response, safe=False, status=200)
+            return paginated_response(response, next_cursor)
             
         # If there is an error    
         except Exception as e:
@@ -1,15 +1,17 @@
 import json
 from django.views.decorators.csrf import csrf_exempt
 from django.http.response import JsonResponse
-from wmsAdapterV2.utils.create_response import created_response
+from wmsAdapterV2.utils.create_response import created_response, paginated_response
 from wmsBase.functions.LogisticVariables.bulk_create import create_list_logistic_variables
 from wmsBase.functions.LogisticVariables.delete import delete_logistic_variables
 from wmsBase.functions.LogisticVariables.read import read_logistic_variables
 from wmsBase.functions.LogisticVariables.update import update_logistic_variables
+from wmsAdapterV2.utils.idempotency import idempotent
 
 
 
 @csrf_exempt
+@idempotent
 def logistic_variables(request):
     '''
     This view is used to create, read, update and delete articles
@@ -28,10 +30,10 @@ def logistic_variables(request):
 
         try:
             # Get articles
-            response, _ = read_logistic_variables(request, db_name=db_name)
+            response, _, next_cursor = read_logistic_variables(request, db_name=db_name)
 
             # Check the response
-            return JsonResponse(response, safe=False, status=200)
+            return paginated_response(response, next_cursor)
             
         # If there is an error    
         except Exception as e:
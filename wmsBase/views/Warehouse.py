@@ -2,6 +2,7 @@
 from django.http.response import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 
+from wmsAdapterV2.utils.create_response import paginated_response
 from wmsBase.functions.Warehouse.read import read_cellars
 
 @csrf_exempt
@@ -22,10 +23,10 @@ def bod(request):
 
         try:
             # Get articles
-            response, _ = read_cellars(request, db_name=db_name)
+            response, _, next_cursor = read_cellars(request, db_name=db_name)
 
             # Check the response
-            return JsonResponse(response, safe=False, status=200)
+            return paginated_response(response, next_cursor)
             
         # If there is an error    
         except Exception as e: